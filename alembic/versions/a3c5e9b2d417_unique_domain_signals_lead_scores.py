@@ -0,0 +1,56 @@
+"""unique_domain_signals_lead_scores
+
+Revision ID: a3c5e9b2d417
+Revises: f10557dbcac8
+Create Date: 2026-10-17 12:00:00.000000
+
+NOTES:
+- Scan results are written with INSERT ... ON CONFLICT (domain) DO UPDATE (app/core/scan_persistence.py)
+- Duplicate rows per domain are removed first, keeping the latest (scanned_at / updated_at, then id)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e9b2d417'
+down_revision: Union[str, None] = 'f10557dbcac8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the latest row per domain before adding the unique constraints
+    op.execute("""
+        DELETE FROM domain_signals
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY domain ORDER BY scanned_at DESC, id DESC
+                ) AS rn
+                FROM domain_signals
+            ) ranked
+            WHERE rn > 1
+        );
+    """)
+    op.execute("""
+        DELETE FROM lead_scores
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY domain ORDER BY updated_at DESC, id DESC
+                ) AS rn
+                FROM lead_scores
+            ) ranked
+            WHERE rn > 1
+        );
+    """)
+
+    op.create_unique_constraint('uq_domain_signals_domain', 'domain_signals', ['domain'])
+    op.create_unique_constraint('uq_lead_scores_domain', 'lead_scores', ['domain'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_lead_scores_domain', 'lead_scores', type_='unique')
+    op.drop_constraint('uq_domain_signals_domain', 'domain_signals', type_='unique')
@@ -0,0 +1,137 @@
+"""add_lead_read_model
+
+Revision ID: b7d4e1f8c2a6
+Revises: a3c5e9b2d417
+Create Date: 2026-10-17 14:00:00.000000
+
+NOTES:
+- lead_read_model replaces the leads_ready VIEW for GET /leads, /leads/export, /leads/{domain} and the dashboard
+- One row per scanned domain; kept up to date by refresh_lead_read_model() (app/core/lead_read_model.py)
+- Backfill mirrors the refresh query; infrastructure_summary mirrors format_infra_summary()
+- priority_score is inlined from priority_score_sql() as of this revision (thresholds frozen here)
+- leads_ready is left in place for ad-hoc queries
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4e1f8c2a6'
+down_revision: Union[str, None] = 'a3c5e9b2d417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'lead_read_model',
+        sa.Column('domain', sa.String(length=255), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('canonical_name', sa.String(length=255), nullable=False),
+        sa.Column('provider', sa.String(length=50), nullable=True),
+        sa.Column('tenant_size', sa.String(length=50), nullable=True),
+        sa.Column('country', sa.String(length=2), nullable=True),
+        sa.Column('contact_emails', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('contact_quality_score', sa.Integer(), nullable=True),
+        sa.Column('linkedin_pattern', sa.String(length=255), nullable=True),
+        sa.Column('spf', sa.Boolean(), nullable=True),
+        sa.Column('dkim', sa.Boolean(), nullable=True),
+        sa.Column('dmarc_policy', sa.String(length=50), nullable=True),
+        sa.Column('dmarc_coverage', sa.Integer(), nullable=True),
+        sa.Column('mx_root', sa.String(length=255), nullable=True),
+        sa.Column('local_provider', sa.String(length=255), nullable=True),
+        sa.Column('registrar', sa.String(length=255), nullable=True),
+        sa.Column('expires_at', sa.Date(), nullable=True),
+        sa.Column('nameservers', postgresql.ARRAY(sa.Text()), nullable=True),
+        sa.Column('scan_status', sa.String(length=50), nullable=True),
+        sa.Column('scanned_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('readiness_score', sa.Integer(), nullable=False),
+        sa.Column('segment', sa.String(length=50), nullable=False),
+        sa.Column('reason', sa.Text(), nullable=True),
+        sa.Column('technical_heat', sa.String(length=20), nullable=True),
+        sa.Column('commercial_segment', sa.String(length=50), nullable=True),
+        sa.Column('commercial_heat', sa.String(length=20), nullable=True),
+        sa.Column('priority_category', sa.String(length=10), nullable=True),
+        sa.Column('priority_label', sa.String(length=100), nullable=True),
+        sa.Column('priority_score', sa.Integer(), nullable=False),
+        sa.Column('infrastructure_summary', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['domain'], ['companies.domain'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('domain'),
+    )
+    # Default /leads order: priority_score ASC, readiness_score DESC, domain ASC
+    op.create_index(
+        'idx_lead_read_model_priority',
+        'lead_read_model',
+        ['priority_score', sa.text('readiness_score DESC'), 'domain'],
+    )
+    op.create_index('idx_lead_read_model_segment_score', 'lead_read_model', ['segment', 'readiness_score'])
+    op.create_index('idx_lead_read_model_provider', 'lead_read_model', ['provider'])
+    op.create_index('idx_lead_read_model_scanned_at', 'lead_read_model', ['scanned_at'])
+
+    # Backfill every scanned domain
+    op.execute("""
+        INSERT INTO lead_read_model (
+            domain, company_id, canonical_name, provider, tenant_size, country,
+            contact_emails, contact_quality_score, linkedin_pattern,
+            spf, dkim, dmarc_policy, dmarc_coverage, mx_root, local_provider,
+            registrar, expires_at, nameservers, scan_status, scanned_at,
+            readiness_score, segment, reason, technical_heat, commercial_segment,
+            commercial_heat, priority_category, priority_label, priority_score,
+            infrastructure_summary
+        )
+        SELECT
+            c.domain, c.id, c.canonical_name, c.provider, c.tenant_size, c.country,
+            c.contact_emails, c.contact_quality_score, c.linkedin_pattern,
+            ds.spf, ds.dkim, ds.dmarc_policy, ds.dmarc_coverage, ds.mx_root, ds.local_provider,
+            ds.registrar, ds.expires_at, ds.nameservers, ds.scan_status, ds.scanned_at,
+            ls.readiness_score, ls.segment, ls.reason, ls.technical_heat, ls.commercial_segment,
+            ls.commercial_heat, ls.priority_category, ls.priority_label,
+            CASE
+                WHEN ls.segment IS NULL OR ls.readiness_score IS NULL THEN 7
+                WHEN TRIM(ls.segment) = 'Migration' THEN (CASE
+                    WHEN ls.readiness_score >= 80 THEN 1
+                    WHEN ls.readiness_score >= 70 THEN 2
+                    WHEN ls.readiness_score >= 60 THEN 3
+                    ELSE 4 END)
+                WHEN TRIM(ls.segment) = 'Existing' THEN (CASE
+                    WHEN ls.readiness_score >= 70 THEN 3
+                    WHEN ls.readiness_score >= 50 THEN 4
+                    WHEN ls.readiness_score >= 30 THEN 5
+                    ELSE 6 END)
+                WHEN TRIM(ls.segment) = 'Cold' THEN (CASE
+                    WHEN ls.readiness_score >= 40 THEN 5
+                    WHEN ls.readiness_score >= 20 THEN 6
+                    ELSE 7 END)
+                ELSE 7
+            END,
+            NULLIF(CONCAT_WS(', ',
+                'Hosted on ' || CASE ie.usage_type
+                    WHEN 'DCH' THEN 'DataCenter'
+                    WHEN 'COM' THEN 'Commercial'
+                    WHEN 'RES' THEN 'Residential'
+                    WHEN 'MOB' THEN 'Mobile'
+                    ELSE NULLIF(ie.usage_type, '') END,
+                'ISP: ' || NULLIF(ie.isp, ''),
+                'Country: ' || NULLIF(ie.country, '')
+            ), '')
+        FROM companies c
+        JOIN lead_scores ls ON ls.domain = c.domain
+        LEFT JOIN domain_signals ds ON ds.domain = c.domain
+        LEFT JOIN (
+            SELECT DISTINCT ON (domain) domain, usage_type, isp, country
+            FROM ip_enrichment
+            ORDER BY domain, updated_at DESC
+        ) ie ON ie.domain = c.domain;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_lead_read_model_scanned_at', table_name='lead_read_model')
+    op.drop_index('idx_lead_read_model_provider', table_name='lead_read_model')
+    op.drop_index('idx_lead_read_model_segment_score', table_name='lead_read_model')
+    op.drop_index('idx_lead_read_model_priority', table_name='lead_read_model')
+    op.drop_table('lead_read_model')
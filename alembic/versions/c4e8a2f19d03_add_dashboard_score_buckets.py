@@ -0,0 +1,44 @@
+"""add_dashboard_score_buckets
+
+Revision ID: c4e8a2f19d03
+Revises: b7d4e1f8c2a6
+Create Date: 2026-10-17 15:00:00.000000
+
+NOTES:
+- GET /dashboard and /dashboard/kpis aggregate this table (<= 4 segments x 101 scores) instead of every lead
+- Counts are adjusted by deltas in upsert_scan_results() (app/core/scan_persistence.py)
+- reconcile_dashboard_stats_task (hourly, Celery Beat) rebuilds it from lead_scores
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2f19d03'
+down_revision: Union[str, None] = 'b7d4e1f8c2a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'dashboard_score_buckets',
+        sa.Column('segment', sa.String(length=50), nullable=False),
+        sa.Column('readiness_score', sa.Integer(), nullable=False),
+        sa.Column('lead_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('segment', 'readiness_score'),
+    )
+
+    # Backfill from existing scores
+    op.execute("""
+        INSERT INTO dashboard_score_buckets (segment, readiness_score, lead_count)
+        SELECT segment, readiness_score, COUNT(*)
+        FROM lead_scores
+        GROUP BY segment, readiness_score;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('dashboard_score_buckets')
@@ -0,0 +1,44 @@
+"""add_rescan_run_candidates
+
+Revision ID: c8e2f5a9d3b1
+Revises: f3c9d2a7b5e1
+Create Date: 2026-10-17 19:00:00.000000
+
+NOTES:
+- Per-run snapshot of the rescan staleness ranking (app/core/rescan_scheduler.py)
+- Filled once when a run starts; rescan_chunk_task pages it with the (staleness, domain) cursor
+  instead of re-ranking domain_signals for every chunk
+- Only the latest run keeps its rows (older snapshots are deleted when a new run starts)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2f5a9d3b1'
+down_revision: Union[str, None] = 'f3c9d2a7b5e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rescan_run_candidates',
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('domain', sa.String(length=255), nullable=False),
+        sa.Column('staleness', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['rescan_runs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('run_id', 'domain'),
+    )
+    op.create_index(
+        'idx_rescan_run_candidates_rank',
+        'rescan_run_candidates',
+        ['run_id', sa.text('staleness DESC'), 'domain'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_rescan_run_candidates_rank', table_name='rescan_run_candidates')
+    op.drop_table('rescan_run_candidates')
@@ -0,0 +1,42 @@
+"""unique_tags_domain_tag
+
+Revision ID: d5f1a7c3e9b4
+Revises: c4e8a2f19d03
+Create Date: 2026-10-17 16:00:00.000000
+
+NOTES:
+- Auto-tags are written with INSERT ... ON CONFLICT (domain, tag) DO NOTHING (app/core/auto_tagging.py)
+- Duplicate tags per domain are removed first, keeping the oldest (created_at, then id)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1a7c3e9b4'
+down_revision: Union[str, None] = 'c4e8a2f19d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the oldest row per domain+tag before adding the unique constraint
+    op.execute("""
+        DELETE FROM tags
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY domain, tag ORDER BY created_at ASC, id ASC
+                ) AS rn
+                FROM tags
+            ) ranked
+            WHERE rn > 1
+        );
+    """)
+
+    op.create_unique_constraint('uq_tags_domain_tag', 'tags', ['domain', 'tag'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_tags_domain_tag', 'tags', type_='unique')
@@ -0,0 +1,46 @@
+"""add_rescan_runs
+
+Revision ID: e2b8f4d6a1c7
+Revises: d5f1a7c3e9b4
+Create Date: 2026-10-17 17:00:00.000000
+
+NOTES:
+- Checkpoint table for the resumable daily rescan (app/core/rescan_scheduler.py)
+- daily_rescan_task starts/resumes a run; rescan_chunk_task advances its (staleness, domain) cursor
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8f4d6a1c7'
+down_revision: Union[str, None] = 'd5f1a7c3e9b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rescan_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('as_of', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('budget', sa.Integer(), nullable=False),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('cursor_staleness', sa.Float(), nullable=True),
+        sa.Column('cursor_domain', sa.String(length=255), nullable=True),
+        sa.Column('started_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('completed_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_rescan_runs_id'), 'rescan_runs', ['id'], unique=False)
+    op.create_index('idx_rescan_runs_as_of', 'rescan_runs', ['as_of'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_rescan_runs_as_of', table_name='rescan_runs')
+    op.drop_index(op.f('ix_rescan_runs_id'), table_name='rescan_runs')
+    op.drop_table('rescan_runs')
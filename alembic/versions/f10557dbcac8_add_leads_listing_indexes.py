@@ -0,0 +1,41 @@
+"""add_leads_listing_indexes
+
+Revision ID: f10557dbcac8
+Revises: f786f93501ea
+Create Date: 2026-10-17 10:00:00.000000
+
+NOTES:
+- Supports SQL-side pagination/sorting of GET /leads
+- domain_signals (domain, scanned_at DESC) backs DISTINCT ON (domain) ... ORDER BY domain, scanned_at DESC
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f10557dbcac8'
+down_revision: Union[str, None] = 'f786f93501ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Latest scan per domain (DISTINCT ON (domain) ORDER BY domain, scanned_at DESC)
+    op.create_index(
+        'idx_domain_signals_domain_scanned_at',
+        'domain_signals',
+        ['domain', sa.text('scanned_at DESC')],
+    )
+    # Favorites filter subquery (user_id -> domains)
+    op.create_index(
+        'idx_favorites_user_id_domain',
+        'favorites',
+        ['user_id', 'domain'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_favorites_user_id_domain', table_name='favorites')
+    op.drop_index('idx_domain_signals_domain_scanned_at', table_name='domain_signals')
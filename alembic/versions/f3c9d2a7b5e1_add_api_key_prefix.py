@@ -0,0 +1,31 @@
+"""add_api_key_prefix
+
+Revision ID: f3c9d2a7b5e1
+Revises: e2b8f4d6a1c7
+Create Date: 2026-10-17 18:00:00.000000
+
+NOTES:
+- New keys look like hk_<key_prefix>_<secret>; verify_api_key() fetches the single row by key_prefix
+- Existing keys keep key_prefix NULL and are verified by the legacy scan over NULL-prefix rows
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9d2a7b5e1'
+down_revision: Union[str, None] = 'e2b8f4d6a1c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('api_keys', sa.Column('key_prefix', sa.String(length=32), nullable=True))
+    op.create_index(op.f('ix_api_keys_key_prefix'), 'api_keys', ['key_prefix'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_api_keys_key_prefix'), table_name='api_keys')
+    op.drop_column('api_keys', 'key_prefix')
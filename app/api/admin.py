@@ -6,7 +6,12 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 from app.db.session import get_db
 from app.db.models import ApiKey
-from app.core.api_key_auth import hash_api_key, generate_api_key
+from app.core.api_key_auth import (
+    hash_api_key,
+    generate_api_key,
+    api_key_lookup_id,
+    invalidate_api_key_cache,
+)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -70,18 +75,18 @@ async def create_api_key(request: CreateApiKeyRequest, db: Session = Depends(get
     try:
         # Generate API key
         api_key = generate_api_key()
-        key_hash = hash_api_key(api_key)
 
-        # Check if hash already exists (extremely unlikely, but check anyway)
-        existing = db.query(ApiKey).filter(ApiKey.key_hash == key_hash).first()
+        # Check if lookup id already exists (extremely unlikely, but check anyway)
+        existing = db.query(ApiKey).filter(ApiKey.key_prefix == api_key_lookup_id(api_key)).first()
         if existing:
             # Regenerate if collision (extremely unlikely)
             api_key = generate_api_key()
-            key_hash = hash_api_key(api_key)
+        key_hash = hash_api_key(api_key)
 
         # Create API key record
         api_key_record = ApiKey(
             key_hash=key_hash,
+            key_prefix=api_key_lookup_id(api_key),
             name=request.name,
             rate_limit_per_minute=request.rate_limit_per_minute,
             is_active=True,
@@ -161,6 +166,8 @@ async def deactivate_api_key(key_id: int, db: Session = Depends(get_db)):
 
     api_key.is_active = False
     db.commit()
+    # Other workers drop their cached copy within API_KEY_CACHE_TTL
+    invalidate_api_key_cache(api_key.id)
 
     return {"message": f"API key '{api_key.name}' deactivated successfully"}
 
@@ -2,16 +2,23 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from pydantic import BaseModel
 from typing import Optional
-from app.db.session import get_db
+from app.db.session import get_async_db, run_db
 from app.core.constants import HIGH_PRIORITY_SCORE
 
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
+def _fetch_stats_row(db: Session, query: str):
+    """Run a single-row aggregate query (sync; called through run_db)."""
+    result = db.execute(text(query), {"high_priority_score": HIGH_PRIORITY_SCORE})
+    return result.fetchone()
+
+
 class KPIsResponse(BaseModel):
     """Response model for dashboard KPIs (G19)."""
 
@@ -35,7 +42,7 @@ class DashboardResponse(BaseModel):
 
 
 @router.get("", response_model=DashboardResponse)
-async def get_dashboard(db: Session = Depends(get_db)):
+async def get_dashboard(db: AsyncSession = Depends(get_async_db)):
     """
     Get dashboard statistics with aggregated lead data.
 
@@ -51,24 +58,23 @@ async def get_dashboard(db: Session = Depends(get_db)):
         - high_priority: Count of high priority leads (Migration + score >= HIGH_PRIORITY_SCORE)
     """
     try:
-        # Query for segment counts and average score
-        # Only count leads that have been scanned (readiness_score IS NOT NULL)
+        # Aggregate the pre-computed (segment, score) buckets: at most
+        # 4 segments x 101 scores rows, independent of the number of leads
         query = """
             SELECT 
-                COUNT(*) AS total_leads,
-                COUNT(CASE WHEN segment = 'Migration' THEN 1 END) AS migration,
-                COUNT(CASE WHEN segment = 'Existing' THEN 1 END) AS existing,
-                COUNT(CASE WHEN segment = 'Cold' THEN 1 END) AS cold,
-                COUNT(CASE WHEN segment = 'Skip' THEN 1 END) AS skip,
-                COALESCE(AVG(readiness_score), 0.0) AS avg_score,
+                COALESCE(SUM(lead_count), 0) AS total_leads,
+                COALESCE(SUM(CASE WHEN segment = 'Migration' THEN lead_count END), 0) AS migration,
+                COALESCE(SUM(CASE WHEN segment = 'Existing' THEN lead_count END), 0) AS existing,
+                COALESCE(SUM(CASE WHEN segment = 'Cold' THEN lead_count END), 0) AS cold,
+                COALESCE(SUM(CASE WHEN segment = 'Skip' THEN lead_count END), 0) AS skip,
+                COALESCE(SUM(readiness_score * lead_count)::float / NULLIF(SUM(lead_count), 0), 0.0) AS avg_score,
                 MAX(readiness_score) AS max_score,
-                COUNT(CASE WHEN segment = 'Migration' AND readiness_score >= :high_priority_score THEN 1 END) AS high_priority
-            FROM leads_ready
-            WHERE readiness_score IS NOT NULL
+                COALESCE(SUM(CASE WHEN segment = 'Migration' AND readiness_score >= :high_priority_score THEN lead_count END), 0) AS high_priority
+            FROM dashboard_score_buckets
+            WHERE lead_count > 0
         """
 
-        result = db.execute(text(query), {"high_priority_score": HIGH_PRIORITY_SCORE})
-        row = result.fetchone()
+        row = await run_db(db, _fetch_stats_row, query)
 
         if not row:
             # Empty database case
@@ -99,7 +105,7 @@ async def get_dashboard(db: Session = Depends(get_db)):
 
 
 @router.get("/kpis", response_model=KPIsResponse)
-async def get_kpis(db: Session = Depends(get_db)):
+async def get_kpis(db: AsyncSession = Depends(get_async_db)):
     """
     Get dashboard KPIs (G19).
 
@@ -113,16 +119,15 @@ async def get_kpis(db: Session = Depends(get_db)):
     try:
         query = """
             SELECT 
-                COUNT(*) AS total_leads,
-                COUNT(CASE WHEN segment = 'Migration' THEN 1 END) AS migration_leads,
-                COUNT(CASE WHEN segment = 'Migration' AND readiness_score >= :high_priority_score THEN 1 END) AS high_priority,
+                COALESCE(SUM(lead_count), 0) AS total_leads,
+                COALESCE(SUM(CASE WHEN segment = 'Migration' THEN lead_count END), 0) AS migration_leads,
+                COALESCE(SUM(CASE WHEN segment = 'Migration' AND readiness_score >= :high_priority_score THEN lead_count END), 0) AS high_priority,
                 MAX(readiness_score) AS max_score
-            FROM leads_ready
-            WHERE readiness_score IS NOT NULL
+            FROM dashboard_score_buckets
+            WHERE lead_count > 0
         """
 
-        result = db.execute(text(query), {"high_priority_score": HIGH_PRIORITY_SCORE})
-        row = result.fetchone()
+        row = await run_db(db, _fetch_stats_row, query)
 
         if not row:
             return KPIsResponse(
@@ -1,10 +1,11 @@
 """Email generation and validation endpoints."""
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from app.core.email_generator import generate_generic_emails
-from app.core.email_validator import validate_email, EmailValidationResult
+from app.core.email_validator import validate_emails, EmailValidationResult
 
 router = APIRouter(prefix="/email", tags=["email"])
 
@@ -107,8 +108,8 @@ async def generate_and_validate_emails(req: EmailGenerateAndValidateRequest):
     Generates common generic email addresses (info, sales, admin, etc.)
     for the given domain and validates each email address using:
     - Syntax validation (regex)
-    - MX record validation (DNS)
-    - Optional SMTP validation (if use_smtp=True)
+    - MX record validation (DNS, resolved once for the domain)
+    - Optional SMTP validation (if use_smtp=True, one SMTP session for all addresses)
 
     Args:
         req: Request with domain name and use_smtp flag
@@ -139,10 +140,10 @@ async def generate_and_validate_emails(req: EmailGenerateAndValidateRequest):
 
     normalized_domain = normalize_domain(domain)
 
-    # Validate each email
-    results: List[EmailValidationResult] = [
-        validate_email(email, use_smtp=req.use_smtp) for email in emails
-    ]
+    # Validate all emails in one batch (off the event loop: DNS/SMTP are blocking)
+    results: List[EmailValidationResult] = await run_in_threadpool(
+        validate_emails, emails, use_smtp=req.use_smtp
+    )
 
     # Convert to response model
     return EmailGenerateAndValidateResponse(
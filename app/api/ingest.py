@@ -1,5 +1,6 @@
 """Ingest endpoints for domain and CSV data ingestion."""
 
+import json
 import pandas as pd
 import asyncio
 from fastapi import (
@@ -12,9 +13,10 @@ from fastapi import (
     BackgroundTasks,
     Request,
 )
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from pydantic import BaseModel, Field, field_validator
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from app.db.session import get_db
 from app.db.models import RawLead, ApiKey
 from app.core.normalizer import (
@@ -22,16 +24,32 @@ from app.core.normalizer import (
     extract_domain_from_email,
     extract_domain_from_website,
 )
-from app.core.merger import upsert_companies
-from app.core.importer import guess_company_column, guess_domain_column
+from app.core.merger import (
+    BULK_UPSERT_CHUNK_SIZE,
+    upsert_companies,
+    bulk_upsert_companies,
+    bulk_insert_raw_leads,
+    bulk_update_company_enrichment,
+)
+from app.core.importer import (
+    guess_company_column,
+    guess_domain_column,
+    prepare_ingest_frame,
+)
 from app.core.analyzer_dns import analyze_dns
 from app.core.analyzer_whois import get_whois_info
 from app.core.provider_map import classify_provider
 from app.core.scorer import score_domain
-from app.core.api_key_auth import verify_api_key
+from app.core.api_key_auth import get_api_key_limiter, verify_api_key
 from app.core.enrichment import enrich_company_data
-from app.core.webhook_retry import create_webhook_retry
-from app.db.models import Company, DomainSignal, LeadScore, ProviderChangeHistory
+from app.core.webhook_retry import create_webhook_retry, create_webhook_retries_bulk
+from app.core.lead_read_model import refresh_lead_read_model
+from app.core.scan_persistence import (
+    domain_signal_row,
+    lead_score_row,
+    upsert_scan_results,
+)
+from app.db.models import Company, ProviderChangeHistory
 from app.api.jobs import (
     create_job,
     update_job_progress,
@@ -148,356 +166,301 @@ async def ingest_domain(request: DomainIngestRequest, db: Session = Depends(get_
         raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
 
 
-@router.post("/csv", status_code=202)
-async def ingest_csv(
-    file: UploadFile = File(..., description="CSV or Excel file to ingest"),
-    auto_detect_columns: bool = Query(
-        False, description="Auto-detect company/domain columns (for OSB Excel files)"
-    ),
-    auto_scan: bool = Query(
-        True, description="Automatically scan domains after ingestion (creates leads)"
-    ),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
-    db: Session = Depends(get_db),
-):
+def _process_ingest_file(
+    contents: bytes,
+    is_excel: bool,
+    auto_detect_columns: bool,
+    auto_scan: bool,
+    db: Session,
+) -> dict:
     """
-    Ingest domains from a CSV or Excel file.
+    Parse, ingest and optionally scan an uploaded CSV/Excel file.
 
-    Supported formats:
-    - CSV (.csv)
-    - Excel (.xlsx, .xls)
-
-    Expected columns (when auto_detect_columns=False):
-    - domain (required): Domain name
-    - company_name (optional): Company name
-    - email (optional): Email address
-    - website (optional): Website URL
-
-    When auto_detect_columns=True:
-    - Automatically detects company and domain columns using heuristics
-    - Useful for OSB Excel files with varying column names
+    Synchronous (pandas, DB writes, DNS/WHOIS auto-scan); ingest_csv runs it
+    in the threadpool so the event loop stays free.
 
     Args:
-        file: CSV or Excel file upload
+        contents: Raw file bytes
+        is_excel: True for .xlsx/.xls, False for .csv
         auto_detect_columns: If True, auto-detect company/domain columns
+        auto_scan: If True, scan domains after ingestion
         db: Database session
 
     Returns:
         Dictionary with ingestion results
     """
-    # Validate file type
-    filename_lower = file.filename.lower() if file.filename else ""
-    is_excel = filename_lower.endswith((".xlsx", ".xls"))
-    is_csv = filename_lower.endswith(".csv")
+    if is_excel:
+        df = pd.read_excel(pd.io.common.BytesIO(contents))
+    else:
+        df = pd.read_csv(pd.io.common.BytesIO(contents))
 
-    if not (is_csv or is_excel):
-        raise HTTPException(
-            status_code=400, detail="Dosya CSV (.csv) veya Excel (.xlsx, .xls) formatında olmalı"
-        )
+    # Column detection (if auto_detect_columns=True)
+    if auto_detect_columns:
+        company_col = guess_company_column(df)
+        domain_col = guess_domain_column(df)
 
-    try:
-        # Read file
-        contents = await file.read()
+        if not company_col or not domain_col:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Kolonlar otomatik tespit edilemedi. Şirket: {company_col}, Domain: {domain_col}. "
+                f"Mevcut kolonlar: {list(df.columns)}",
+            )
 
-        if is_excel:
-            df = pd.read_excel(pd.io.common.BytesIO(contents))
-        else:
-            df = pd.read_csv(pd.io.common.BytesIO(contents))
-
-        # Column detection (if auto_detect_columns=True)
-        if auto_detect_columns:
-            company_col = guess_company_column(df)
-            domain_col = guess_domain_column(df)
-
-            if not company_col or not domain_col:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Kolonlar otomatik tespit edilemedi. Şirket: {company_col}, Domain: {domain_col}. "
-                    f"Mevcut kolonlar: {list(df.columns)}",
-                )
+        # Rename columns to standard names for processing
+        df = df.rename(columns={company_col: "company_name", domain_col: "domain"})
 
-            # Rename columns to standard names for processing
-            df = df.rename(columns={company_col: "company_name", domain_col: "domain"})
+    # Normalize column names (case-insensitive)
+    df.columns = df.columns.str.lower().str.strip()
 
-        # Normalize column names (case-insensitive)
-        df.columns = df.columns.str.lower().str.strip()
+    # Validate required columns
+    if "domain" not in df.columns:
+        raise HTTPException(
+            status_code=400,
+            detail="CSV dosyası 'domain' kolonu içermeli (veya auto_detect_columns=true kullanın)",
+        )
 
-        # Validate required columns
-        if "domain" not in df.columns:
-            raise HTTPException(
-                status_code=400,
-                detail="CSV dosyası 'domain' kolonu içermeli (veya auto_detect_columns=true kullanın)",
+    # Create job for progress tracking
+    total_domains = len(df) + (len(df) if auto_scan else 0)  # Ingest + scan
+    job_id = create_job(total_domains, "CSV ingestion and scanning")
+    start_job(job_id)
+
+    # Normalize, validate and resolve domains for the whole column at once
+    prepared, errors = prepare_ingest_frame(df)
+    scanned_count = 0
+    for error_msg in errors:
+        update_job_progress(job_id, failed=len(errors), error=error_msg)
+
+    # Unique domains in first-seen order (only these are counted/scanned)
+    scanned_domains: List[str] = list(pd.unique(prepared["domain"]))
+    ingested_count = len(scanned_domains)
+
+    bulk_upsert_companies(
+        db,
+        (
+            {"domain": domain, "company_name": company_name}
+            for domain, company_name in zip(
+                prepared["domain"], prepared["company_name"]
             )
+        ),
+    )
+    bulk_insert_raw_leads(
+        db,
+        [
+            {
+                "source": "csv",
+                "company_name": company_name,
+                "email": email,
+                "website": website,
+                "domain": domain,
+                "payload": {
+                    "original_domain": original_domain,
+                    "row_index": int(row_index),
+                    "email": email,
+                    "website": website,
+                },
+            }
+            for domain, original_domain, company_name, email, website, row_index in zip(
+                prepared["domain"],
+                prepared["original_domain"],
+                prepared["company_name"],
+                prepared["email"],
+                prepared["website"],
+                prepared["row_index"],
+            )
+        ],
+    )
 
-        # Create job for progress tracking
-        total_domains = len(df) + (len(df) if auto_scan else 0)  # Ingest + scan
-        job_id = create_job(total_domains, "CSV ingestion and scanning")
-        start_job(job_id)
-
-        # Process each row
-        ingested_count = 0
-        scanned_count = 0
-        errors: List[str] = []
-        scanned_domains: List[str] = []
-        unique_domains: set = set()  # Track unique domains to prevent duplicate counting
+    # Commit all successful ingestions
+    db.commit()
+    update_job_progress(
+        job_id,
+        processed=ingested_count,
+        successful=0,  # Will be updated during scanning
+        message=f"Yükleme tamamlandı: {ingested_count} unique domain yüklendi. Scan başlıyor...",
+    )
 
-        for idx, row in df.iterrows():
+    # Auto-scan domains if requested
+    if auto_scan and scanned_domains:
+        scan_index = 0
+        signal_rows: List[dict] = []
+        score_rows: List[dict] = []
+        for domain in scanned_domains:
+            scan_index += 1
             try:
-                # Get domain (required)
-                domain = str(row.get("domain", "")).strip()
-                if not domain:
-                    errors.append(f"Satır {idx + 1}: Boş domain")
-                    continue
+                # Perform DNS analysis
+                dns_result = analyze_dns(domain)
+
+                # Perform WHOIS lookup (optional, graceful fail)
+                whois_result = get_whois_info(domain)
+
+                # Determine scan status
+                scan_status = dns_result.get("status", "success")
+                if scan_status == "success" and whois_result is None:
+                    scan_status = "whois_failed"
+
+                # Classify provider based on MX root
+                mx_root = dns_result.get("mx_root")
+                provider = classify_provider(mx_root)
+
+                # Classify local provider (G20: Domain Intelligence)
+                local_provider = None
+                if provider == "Local":
+                    from app.core.provider_map import classify_local_provider
+                    local_provider = classify_local_provider(mx_root)
+
+                # Update company provider if we have new information
+                company = db.query(Company).filter(Company.domain == domain).first()
+                previous_provider = company.provider if company else None
+                provider_changed = False
+
+                if company and provider and provider != "Unknown":
+                    if previous_provider != provider:
+                        provider_changed = True
+                    company.provider = provider
+
+                # Prepare signals for scoring
+                signals = {
+                    "spf": dns_result.get("spf", False),
+                    "dkim": dns_result.get("dkim", False),
+                    "dmarc_policy": dns_result.get("dmarc_policy"),
+                }
+
+                # Calculate score and determine segment
+                scoring_result = score_domain(
+                    domain=domain,
+                    provider=provider,
+                    signals=signals,
+                    mx_records=dns_result.get("mx_records", []),
+                )
 
-                # Normalize domain
-                normalized_domain = normalize_domain(domain)
-                if not normalized_domain:
-                    errors.append(
-                        f"Satır {idx + 1}: Geçersiz domain formatı '{domain}'"
+                # Collected and written with one UPSERT per table after the loop
+                signal_rows.append(
+                    domain_signal_row(
+                        domain,
+                        dns_result,
+                        whois_result,
+                        scan_status,
+                        local_provider=local_provider,
                     )
-                    continue
-
-                # Additional validation: check if normalized domain is still valid
-                from app.core.normalizer import is_valid_domain
+                )
+                score_rows.append(lead_score_row(domain, scoring_result))
 
-                if not is_valid_domain(normalized_domain):
-                    errors.append(
-                        f"Satır {idx + 1}: Normalizasyon sonrası geçersiz domain '{normalized_domain}'"
+                # Log provider change if detected
+                if provider_changed and previous_provider:
+                    change_history = ProviderChangeHistory(
+                        domain=domain,
+                        previous_provider=previous_provider,
+                        new_provider=provider,
                     )
-                    continue
+                    db.add(change_history)
 
-                # Get optional fields
-                company_name = str(row.get("company_name", "")).strip() or None
-                email = str(row.get("email", "")).strip() or None
-                website = str(row.get("website", "")).strip() or None
-
-                # Determine final domain (from email/website if provided)
-                final_domain = normalized_domain
-
-                if email:
-                    email_domain = extract_domain_from_email(email)
-                    if email_domain:
-                        final_domain = email_domain
-
-                if website:
-                    website_domain = extract_domain_from_website(website)
-                    if website_domain:
-                        final_domain = website_domain
-
-                final_domain = normalize_domain(final_domain)
-
-                # Upsert company
-                company = upsert_companies(
-                    db=db, domain=final_domain, company_name=company_name
-                )
-
-                # Create raw_lead record
-                raw_lead = RawLead(
-                    source="csv",
-                    company_name=company_name,
-                    email=email,
-                    website=website,
-                    domain=final_domain,
-                    payload={
-                        "original_domain": domain,
-                        "row_index": int(idx),
-                        "email": email,
-                        "website": website,
-                    },
-                )
-                db.add(raw_lead)
-                
-                # Only count unique domains (prevent duplicate counting)
-                is_new_domain = final_domain not in unique_domains
-                if is_new_domain:
-                    unique_domains.add(final_domain)
-                    ingested_count += 1
-                    scanned_domains.append(final_domain)
+                scanned_count += 1
 
                 # Update progress
-                # Note: successful will be updated during scanning phase (only scanned domains become leads)
+                total_processed = ingested_count + scan_index
                 update_job_progress(
                     job_id,
-                    processed=ingested_count,
-                    successful=0,  # Will be updated during scanning
-                    message=f"İşleniyor: {ingested_count} unique domain yüklendi",
+                    processed=total_processed,
+                    successful=scanned_count,  # Only count scanned domains (these become leads)
+                    message=f"Taranıyor: {scan_index}/{len(scanned_domains)} domain scan edildi",
                 )
 
             except Exception as e:
-                error_msg = f"Satır {idx + 1}: {str(e)}"
+                error_msg = f"{domain} için tarama hatası: {str(e)}"
                 errors.append(error_msg)
+                total_processed = ingested_count + scan_index
                 update_job_progress(
                     job_id,
-                    processed=ingested_count + len(errors),
+                    processed=total_processed,
                     failed=len(errors),
                     error=error_msg,
                 )
                 continue
 
-        # Commit all successful ingestions
+        # Commit all scan results
+        upsert_scan_results(db, signal_rows, score_rows)
         db.commit()
-        update_job_progress(
-            job_id,
-            processed=ingested_count,
-            successful=0,  # Will be updated during scanning
-            message=f"Yükleme tamamlandı: {ingested_count} unique domain yüklendi. Scan başlıyor...",
-        )
 
-        # Auto-scan domains if requested
-        if auto_scan and scanned_domains:
-            scan_index = 0
-            for domain in scanned_domains:
-                scan_index += 1
-                try:
-                    # Perform DNS analysis
-                    dns_result = analyze_dns(domain)
-
-                    # Perform WHOIS lookup (optional, graceful fail)
-                    whois_result = get_whois_info(domain)
-
-                    # Determine scan status
-                    scan_status = dns_result.get("status", "success")
-                    if scan_status == "success" and whois_result is None:
-                        scan_status = "whois_failed"
-
-                    # Classify provider based on MX root
-                    mx_root = dns_result.get("mx_root")
-                    provider = classify_provider(mx_root)
-
-                    # Classify local provider (G20: Domain Intelligence)
-                    local_provider = None
-                    if provider == "Local":
-                        from app.core.provider_map import classify_local_provider
-                        local_provider = classify_local_provider(mx_root)
-
-                    # Update company provider if we have new information
-                    company = db.query(Company).filter(Company.domain == domain).first()
-                    previous_provider = company.provider if company else None
-                    provider_changed = False
-
-                    if company and provider and provider != "Unknown":
-                        if previous_provider != provider:
-                            provider_changed = True
-                        company.provider = provider
-
-                    # Prepare signals for scoring
-                    signals = {
-                        "spf": dns_result.get("spf", False),
-                        "dkim": dns_result.get("dkim", False),
-                        "dmarc_policy": dns_result.get("dmarc_policy"),
-                    }
+    # Complete job
+    complete_job(job_id, success=True)
+    update_job_progress(
+        job_id,
+        successful=scanned_count,  # Final count: only scanned domains become leads
+        message=f"Tamamlandı! {ingested_count} unique domain yüklendi, {scanned_count} domain scan edildi ve lead listesine eklendi.",
+    )
 
-                    # Calculate score and determine segment
-                    scoring_result = score_domain(
-                        domain=domain,
-                        provider=provider,
-                        signals=signals,
-                        mx_records=dns_result.get("mx_records", []),
-                    )
+    return {
+        "job_id": job_id,
+        "message": f"CSV ingestion completed",
+        "ingested": ingested_count,
+        "scanned": scanned_count if auto_scan else 0,
+        "total_rows": len(df),
+        "errors": errors if errors else None,
+    }
 
-                    # Delete any existing domain_signals for this domain (prevent duplicates)
-                    db.query(DomainSignal).filter(
-                        DomainSignal.domain == domain
-                    ).delete()
 
-                    # Create new domain_signal
-                    domain_signal = DomainSignal(
-                        domain=domain,
-                        spf=dns_result.get("spf", False),
-                        dkim=dns_result.get("dkim", False),
-                        dmarc_policy=dns_result.get("dmarc_policy"),
-                        dmarc_coverage=dns_result.get("dmarc_coverage"),  # G20: DMARC coverage
-                        mx_root=mx_root,
-                        local_provider=local_provider,  # G20: Local provider name
-                        registrar=(
-                            whois_result.get("registrar") if whois_result else None
-                        ),
-                        expires_at=(
-                            whois_result.get("expires_at") if whois_result else None
-                        ),
-                        nameservers=(
-                            whois_result.get("nameservers") if whois_result else None
-                        ),
-                        scan_status=scan_status,
-                    )
-                    db.add(domain_signal)
+@router.post("/csv", status_code=202)
+async def ingest_csv(
+    file: UploadFile = File(..., description="CSV or Excel file to ingest"),
+    auto_detect_columns: bool = Query(
+        False, description="Auto-detect company/domain columns (for OSB Excel files)"
+    ),
+    auto_scan: bool = Query(
+        True, description="Automatically scan domains after ingestion (creates leads)"
+    ),
+    background_tasks: BackgroundTasks = BackgroundTasks(),
+    db: Session = Depends(get_db),
+):
+    """
+    Ingest domains from a CSV or Excel file.
+
+    Supported formats:
+    - CSV (.csv)
+    - Excel (.xlsx, .xls)
 
-                    # Delete any existing lead_scores for this domain (prevent duplicates)
-                    db.query(LeadScore).filter(LeadScore.domain == domain).delete()
+    Expected columns (when auto_detect_columns=False):
+    - domain (required): Domain name
+    - company_name (optional): Company name
+    - email (optional): Email address
+    - website (optional): Website URL
 
-                    # Create new lead_score
-                    lead_score = LeadScore(
-                        domain=domain,
-                        readiness_score=scoring_result["score"],
-                        segment=scoring_result["segment"],
-                        reason=scoring_result["reason"],
-                        # CSP P-Model fields (Phase 2)
-                        technical_heat=scoring_result.get("technical_heat"),
-                        commercial_segment=scoring_result.get("commercial_segment"),
-                        commercial_heat=scoring_result.get("commercial_heat"),
-                        priority_category=scoring_result.get("priority_category"),
-                        priority_label=scoring_result.get("priority_label"),
-                    )
-                    db.add(lead_score)
-
-                    # Log provider change if detected
-                    if provider_changed and previous_provider:
-                        change_history = ProviderChangeHistory(
-                            domain=domain,
-                            previous_provider=previous_provider,
-                            new_provider=provider,
-                        )
-                        db.add(change_history)
-
-                    scanned_count += 1
-
-                    # Update progress
-                    total_processed = ingested_count + scan_index
-                    update_job_progress(
-                        job_id,
-                        processed=total_processed,
-                        successful=scanned_count,  # Only count scanned domains (these become leads)
-                        message=f"Taranıyor: {scan_index}/{len(scanned_domains)} domain scan edildi",
-                    )
+    When auto_detect_columns=True:
+    - Automatically detects company and domain columns using heuristics
+    - Useful for OSB Excel files with varying column names
 
-                except Exception as e:
-                    error_msg = f"{domain} için tarama hatası: {str(e)}"
-                    errors.append(error_msg)
-                    total_processed = ingested_count + scan_index
-                    update_job_progress(
-                        job_id,
-                        processed=total_processed,
-                        failed=len(errors),
-                        error=error_msg,
-                    )
-                    continue
+    Args:
+        file: CSV or Excel file upload
+        auto_detect_columns: If True, auto-detect company/domain columns
+        db: Database session
 
-            # Commit all scan results
-            db.commit()
+    Returns:
+        Dictionary with ingestion results
+    """
+    # Validate file type
+    filename_lower = file.filename.lower() if file.filename else ""
+    is_excel = filename_lower.endswith((".xlsx", ".xls"))
+    is_csv = filename_lower.endswith(".csv")
 
-        # Complete job
-        complete_job(job_id, success=True)
-        update_job_progress(
-            job_id,
-            successful=scanned_count,  # Final count: only scanned domains become leads
-            message=f"Tamamlandı! {ingested_count} unique domain yüklendi, {scanned_count} domain scan edildi ve lead listesine eklendi.",
+    if not (is_csv or is_excel):
+        raise HTTPException(
+            status_code=400, detail="Dosya CSV (.csv) veya Excel (.xlsx, .xls) formatında olmalı"
         )
 
-        return {
-            "job_id": job_id,
-            "message": f"CSV ingestion completed",
-            "ingested": ingested_count,
-            "scanned": scanned_count if auto_scan else 0,
-            "total_rows": len(df),
-            "errors": errors if errors else None,
-        }
+    try:
+        # Read file
+        contents = await file.read()
+
+        # Parsing, DB writes and the auto-scan are blocking; keep them off the event loop
+        return await run_in_threadpool(
+            _process_ingest_file, contents, is_excel, auto_detect_columns, auto_scan, db
+        )
 
     except pd.errors.EmptyDataError:
         raise HTTPException(status_code=400, detail="CSV dosyası boş")
     except pd.errors.ParserError as e:
         raise HTTPException(status_code=400, detail=f"CSV parsing error: {str(e)}")
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
 
 
@@ -632,6 +595,8 @@ async def ingest_webhook(
                 company.contact_emails = enrichment_data["contact_emails"]
                 company.contact_quality_score = enrichment_data["contact_quality_score"]
                 company.linkedin_pattern = enrichment_data["linkedin_pattern"]
+                db.flush()
+                refresh_lead_read_model(db, [normalized_domain])
                 db.commit()
                 db.refresh(company)
                 enriched = True
@@ -727,3 +692,380 @@ async def ingest_webhook(
         except Exception:
             pass  # Don't fail if retry creation fails
         raise HTTPException(status_code=500, detail=error_msg)
+
+
+# Max leads per /webhook/batch request (JSON array or NDJSON lines)
+WEBHOOK_BATCH_MAX_ITEMS = 10000
+# Max request body size for /webhook/batch (checked before and while reading the body)
+WEBHOOK_BATCH_MAX_BYTES = 16 * 1024 * 1024  # 16 MiB
+# Leads per transaction (one company upsert / enrichment update / raw_lead insert each)
+WEBHOOK_BATCH_CHUNK_SIZE = BULK_UPSERT_CHUNK_SIZE
+# Content types parsed line by line as NDJSON (anything else: JSON array)
+NDJSON_CONTENT_TYPES = (
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+)
+
+
+class WebhookBatchItemResult(BaseModel):
+    """Per-lead result of a batch webhook ingestion."""
+
+    index: int
+    status: str  # 'success', 'invalid', 'failed'
+    domain: Optional[str] = None
+    ingested: bool = False
+    enriched: bool = False
+    error: Optional[str] = None
+
+
+class WebhookBatchResponse(BaseModel):
+    """Response model for batch webhook ingestion."""
+
+    status: str  # 'success', 'partial', 'failed'
+    total: int
+    ingested: int
+    failed: int
+    results: List[WebhookBatchItemResult]
+
+
+def _parse_ndjson_line(line: bytes) -> Tuple[Any, Optional[str]]:
+    """Parse one NDJSON line into (item, error); unparsable lines keep their text."""
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return line.decode("utf-8", errors="replace"), f"Invalid JSON line: {str(e)}"
+
+
+def _body_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Request body too large. Limit: {WEBHOOK_BATCH_MAX_BYTES} bytes",
+    )
+
+
+async def _stream_body_capped(http_request: Request) -> AsyncIterator[bytes]:
+    """
+    Stream the request body, rejecting it once it exceeds WEBHOOK_BATCH_MAX_BYTES.
+
+    A declared Content-Length over the limit is rejected before anything is
+    read; chunked bodies are cut off as soon as the running total is over.
+
+    Raises:
+        HTTPException: 413 if the body is over the limit
+    """
+    content_length = http_request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > WEBHOOK_BATCH_MAX_BYTES:
+        raise _body_too_large()
+
+    received = 0
+    async for chunk in http_request.stream():
+        received += len(chunk)
+        if received > WEBHOOK_BATCH_MAX_BYTES:
+            raise _body_too_large()
+        yield chunk
+
+
+async def _iter_webhook_batch_items(
+    http_request: Request,
+) -> AsyncIterator[Tuple[Any, Optional[str]]]:
+    """
+    Yield (item, parse error) pairs from a JSON array or NDJSON request body.
+
+    NDJSON bodies are parsed incrementally from the request stream. JSON
+    bodies must be an array of leads (or an object with a "leads" array).
+    Either way the body is capped at WEBHOOK_BATCH_MAX_BYTES.
+
+    Raises:
+        HTTPException: 400 if a JSON body is not valid JSON or not an array,
+            413 if the body is too large
+    """
+    content_type = http_request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        buffer = b""
+        async for chunk in _stream_body_capped(http_request):
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield _parse_ndjson_line(line)
+        if buffer.strip():
+            yield _parse_ndjson_line(buffer)
+        return
+
+    raw_body = b"".join([chunk async for chunk in _stream_body_capped(http_request)])
+    try:
+        body = json.loads(raw_body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {str(e)}")
+    if isinstance(body, dict) and isinstance(body.get("leads"), list):
+        body = body["leads"]
+    if not isinstance(body, list):
+        raise HTTPException(
+            status_code=400,
+            detail="Expected a JSON array of leads (or an NDJSON body)",
+        )
+    for item in body:
+        yield item, None
+
+
+def _validation_error_message(error: ValidationError) -> str:
+    """Flatten a pydantic ValidationError into one line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+def _process_webhook_batch(
+    items: List[Tuple[Any, Optional[str]]],
+    api_key_id: int,
+    api_key_name: str,
+    db: Session,
+    request_id: Optional[str] = None,
+    chunk_size: int = WEBHOOK_BATCH_CHUNK_SIZE,
+) -> List[WebhookBatchItemResult]:
+    """
+    Validate, normalize and ingest a batch of webhook leads.
+
+    Each chunk of valid leads is written in one transaction: one company
+    upsert (bulk_upsert_companies), one enrichment update for leads with
+    contact emails, and one raw_lead insert. Invalid leads (max_retries=0,
+    tracking only) and leads of failed chunks are recorded in
+    webhook_retries with one bulk insert at the end.
+
+    Args:
+        items: (item, parse error) pairs from _iter_webhook_batch_items()
+        api_key_id: Verified API key ID
+        api_key_name: Verified API key name
+        db: Database session
+        request_id: Request ID for logging
+        chunk_size: Leads per transaction
+
+    Returns:
+        One result per item, in input order
+    """
+    results: List[Optional[WebhookBatchItemResult]] = [None] * len(items)
+    retries: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, Any, WebhookRequest]] = []
+
+    # Validate and normalize (WebhookRequest normalizes the domain)
+    for index, (item, parse_error) in enumerate(items):
+        error_msg = parse_error
+        if error_msg is None:
+            try:
+                valid.append((index, item, WebhookRequest.model_validate(item)))
+                continue
+            except ValidationError as e:
+                error_msg = _validation_error_message(e)
+
+        raw_domain = item.get("domain") if isinstance(item, dict) else None
+        raw_domain = raw_domain if isinstance(raw_domain, str) else None
+        results[index] = WebhookBatchItemResult(
+            index=index, status="invalid", domain=raw_domain, error=error_msg
+        )
+        retries.append(
+            {
+                "api_key_id": api_key_id,
+                "payload": item if isinstance(item, dict) else {"raw": item},
+                "domain": raw_domain,
+                "error_message": error_msg,
+                "max_retries": 0,  # Don't retry invalid leads
+            }
+        )
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start : start + chunk_size]
+        enriched_indexes = set()
+        try:
+            bulk_upsert_companies(
+                db,
+                [{"domain": lead.domain, "company_name": lead.company_name} for _, _, lead in chunk],
+            )
+
+            enrichments = []
+            for index, _, lead in chunk:
+                if not lead.contact_emails:
+                    continue
+                try:
+                    enrichment_data = enrich_company_data(
+                        emails=lead.contact_emails, domain=lead.domain
+                    )
+                except Exception as e:
+                    # Don't fail the lead if enrichment fails, just log it
+                    logger.error(
+                        "webhook_enrichment_error",
+                        request_id=request_id,
+                        domain=lead.domain,
+                        error=str(e),
+                        api_key_id=api_key_id,
+                    )
+                    continue
+                enrichments.append({"domain": lead.domain, **enrichment_data})
+                enriched_indexes.add(index)
+            bulk_update_company_enrichment(db, enrichments)
+
+            bulk_insert_raw_leads(
+                db,
+                [
+                    {
+                        "source": "webhook",
+                        "company_name": lead.company_name,
+                        "domain": lead.domain,
+                        "payload": {
+                            "original_domain": item.get("domain"),
+                            "contact_emails": lead.contact_emails,
+                            "api_key_id": api_key_id,
+                            "api_key_name": api_key_name,
+                        },
+                    }
+                    for _, item, lead in chunk
+                ],
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            error_msg = f"Failed to ingest batch chunk: {str(e)}"
+            logger.error(
+                "webhook_batch_chunk_error",
+                request_id=request_id,
+                leads=len(chunk),
+                error=error_msg,
+                api_key_id=api_key_id,
+                exc_info=True,
+            )
+            for index, _, lead in chunk:
+                results[index] = WebhookBatchItemResult(
+                    index=index, status="failed", domain=lead.domain, error=error_msg
+                )
+                retries.append(
+                    {
+                        "api_key_id": api_key_id,
+                        "payload": lead.model_dump(),
+                        "domain": lead.domain,
+                        "error_message": error_msg,
+                    }
+                )
+            continue
+
+        for index, _, lead in chunk:
+            results[index] = WebhookBatchItemResult(
+                index=index,
+                status="success",
+                domain=lead.domain,
+                ingested=True,
+                enriched=index in enriched_indexes,
+            )
+
+    if retries:
+        try:
+            create_webhook_retries_bulk(db, retries)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Don't fail the batch if retry creation fails
+            logger.error(
+                "webhook_batch_retry_error",
+                request_id=request_id,
+                retries=len(retries),
+                error=str(e),
+                api_key_id=api_key_id,
+            )
+
+    return results
+
+
+@router.post("/webhook/batch", response_model=WebhookBatchResponse)
+async def ingest_webhook_batch(
+    http_request: Request,
+    api_key: ApiKey = Depends(verify_api_key),
+    db: Session = Depends(get_db),
+):
+    """
+    Ingest a batch of leads from webhook with API key authentication.
+
+    - Requires X-API-Key header for authentication
+    - Body: JSON array of webhook leads (same fields as /ingest/webhook), or
+      NDJSON (Content-Type: application/x-ndjson), one lead per line
+    - Leads are validated and normalized in bulk and written in chunked,
+      set-based statements (companies, enrichment, raw_leads)
+    - Invalid leads and leads of failed chunks are recorded in webhook_retries
+    - Rate limiting counts leads, not requests: the batch is charged one
+      token per lead against the API key's per-minute limit
+
+    Args:
+        http_request: Raw request (JSON array or NDJSON stream)
+        api_key: Verified API key (from dependency)
+        db: Database session
+
+    Returns:
+        WebhookBatchResponse with one result per lead, in input order
+
+    Raises:
+        400: If the body is not a JSON array or NDJSON
+        401: If API key is missing or invalid
+        413: If the batch has more than WEBHOOK_BATCH_MAX_ITEMS leads or the
+            body is larger than WEBHOOK_BATCH_MAX_BYTES
+        429: If rate limit exceeded (one token per lead)
+    """
+    request_id = getattr(http_request.state, "request_id", None)
+
+    items: List[Tuple[Any, Optional[str]]] = []
+    async for item in _iter_webhook_batch_items(http_request):
+        if len(items) >= WEBHOOK_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch too large. Limit: {WEBHOOK_BATCH_MAX_ITEMS} leads per request",
+            )
+        items.append(item)
+
+    # verify_api_key charged one token for the request; charge the other leads
+    if len(items) > 1:
+        limiter = get_api_key_limiter(api_key.id, api_key.rate_limit_per_minute)
+        granted, _ = limiter.acquire_many(len(items) - 1)
+        if granted < len(items) - 1:
+            logger.warning(
+                "webhook_batch_rate_limited",
+                request_id=request_id,
+                api_key_id=api_key.id,
+                total=len(items),
+            )
+            raise HTTPException(
+                status_code=429,
+                detail=(
+                    f"Rate limit exceeded. Limit: {api_key.rate_limit_per_minute} leads per minute "
+                    f"(batch of {len(items)} leads)"
+                ),
+            )
+
+    # Validation and DB writes are blocking; keep them off the event loop
+    results = await run_in_threadpool(
+        _process_webhook_batch, items, api_key.id, api_key.name, db, request_id
+    )
+
+    ingested = sum(1 for result in results if result.ingested)
+    failed = len(results) - ingested
+    if not failed:
+        status = "success"
+    elif ingested:
+        status = "partial"
+    else:
+        status = "failed"
+
+    logger.info(
+        "webhook_batch_ingested",
+        request_id=request_id,
+        api_key_id=api_key.id,
+        total=len(results),
+        ingested=ingested,
+        failed=failed,
+    )
+
+    return WebhookBatchResponse(
+        status=status,
+        total=len(results),
+        ingested=ingested,
+        failed=failed,
+        results=results,
+    )
@@ -1,21 +1,25 @@
 """Leads endpoints for querying analyzed domains."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 from datetime import datetime
 from pydantic import BaseModel, Field
-import pandas as pd
+import base64
+import csv
+import io
+import json
+import tempfile
 import uuid
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db, run_db
 from app.core.normalizer import normalize_domain
-from app.core.priority import calculate_priority_score
 from app.core.enrichment import enrich_company_data
 from app.core.score_breakdown import calculate_score_breakdown
-from app.core.enrichment_service import build_infra_summary
-from app.db.models import Company, Favorite, DomainSignal, LeadScore
+from app.core.lead_read_model import fetch_lead_row, refresh_lead_read_model
+from app.db.models import Company, DomainSignal, LeadScore
 
 
 router = APIRouter(prefix="/leads", tags=["leads"])
@@ -65,6 +69,293 @@ class LeadsListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None  # Keyset cursor for the next page (None if last page)
+
+
+# Columns selected from the lead_read_model table by the list and export endpoints
+# Includes G20 columns (tenant_size, local_provider, dmarc_coverage), CSP P-Model columns,
+# the precomputed priority_score and the IP enrichment summary
+LEADS_LIST_COLUMNS = [
+    "company_id",
+    "canonical_name",
+    "domain",
+    "provider",
+    "tenant_size",
+    "local_provider",
+    "country",
+    "spf",
+    "dkim",
+    "dmarc_policy",
+    "dmarc_coverage",
+    "mx_root",
+    "registrar",
+    "expires_at",
+    "nameservers",
+    "scan_status",
+    "scanned_at",
+    "readiness_score",
+    "segment",
+    "reason",
+    "technical_heat",
+    "commercial_segment",
+    "commercial_heat",
+    "priority_category",
+    "priority_label",
+    "priority_score",
+    "infrastructure_summary",
+]
+
+# sort_by -> (SQL sort expression, SQL type used for keyset cursor values)
+# NULLs are coalesced to the same fallbacks the previous in-Python sort used,
+# so keyset comparisons never see NULL.
+LEADS_SORT_EXPRESSIONS = {
+    "domain": ("domain", "text"),
+    "readiness_score": ("COALESCE(readiness_score, -1)", "integer"),
+    "priority_score": ("priority_score", "integer"),
+    "segment": ("COALESCE(segment, '')", "text"),
+    "provider": ("COALESCE(provider, '')", "text"),
+    "scanned_at": ("COALESCE(scanned_at, TIMESTAMPTZ '1970-01-01 00:00:00+00')", "timestamptz"),
+}
+
+
+def build_leads_query(
+    segment: Optional[str] = None,
+    min_score: Optional[int] = None,
+    provider: Optional[str] = None,
+    search: Optional[str] = None,
+    favorite_user_id: Optional[str] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the filtered leads query (one row per domain).
+
+    Reads the lead_read_model table, which already holds one row per scanned
+    domain with priority_score precomputed, so no join or de-duplication is
+    needed; callers wrap the result as a subquery to add ORDER BY / LIMIT /
+    COUNT(*).
+
+    Args:
+        segment: Filter by segment
+        min_score: Minimum readiness score
+        provider: Filter by provider
+        search: Case-insensitive search in domain, canonical_name, provider
+        favorite_user_id: If set, only return this user's favorite domains
+
+    Returns:
+        Tuple of (SQL string, bind params)
+    """
+    query = f"""
+        SELECT {", ".join(LEADS_LIST_COLUMNS)}
+        FROM lead_read_model
+        WHERE readiness_score IS NOT NULL
+    """
+    params: Dict[str, Any] = {}
+
+    if segment:
+        query += " AND segment = :segment"
+        params["segment"] = segment
+
+    if min_score is not None:
+        query += " AND readiness_score >= :min_score"
+        params["min_score"] = min_score
+
+    if provider:
+        query += " AND provider = :provider"
+        params["provider"] = provider
+
+    # G19: Add search filter (full-text search in domain, canonical_name, provider)
+    if search:
+        query += """ AND (
+            LOWER(domain) LIKE :search 
+            OR LOWER(canonical_name) LIKE :search 
+            OR LOWER(provider) LIKE :search
+        )"""
+        params["search"] = f"%{search.lower()}%"
+
+    if favorite_user_id is not None:
+        query += " AND domain IN (SELECT domain FROM favorites WHERE user_id = :favorite_user_id)"
+        params["favorite_user_id"] = favorite_user_id
+
+    return query, params
+
+
+def get_leads_sort_order(
+    sort_by: Optional[str], sort_order: Optional[str]
+) -> List[Tuple[str, str, str]]:
+    """
+    Resolve sort_by/sort_order into an ORDER BY spec.
+
+    Default (and invalid sort_by): priority_score ASC, then readiness_score DESC.
+    Ties are always broken by domain ASC so that pages are deterministic.
+
+    Returns:
+        List of (SQL expression, "ASC"/"DESC", SQL type)
+    """
+    if sort_by in LEADS_SORT_EXPRESSIONS:
+        expression, sql_type = LEADS_SORT_EXPRESSIONS[sort_by]
+        order = [(expression, "DESC" if sort_order == "desc" else "ASC", sql_type)]
+    else:
+        order = [
+            ("priority_score", "ASC", "integer"),
+            ("COALESCE(readiness_score, 0)", "DESC", "integer"),
+        ]
+
+    if order[0][0] != "domain":
+        order.append(("domain", "ASC", "text"))
+    return order
+
+
+def _keyset_condition(order: List[Tuple[str, str, str]]) -> str:
+    """
+    Build a keyset (seek) predicate for rows strictly after :cursor_0..N.
+
+    Expands (a, b, c) > (x, y, z) per column so mixed ASC/DESC orders work.
+    """
+    clauses = []
+    for i, (expression, direction, sql_type) in enumerate(order):
+        parts = [
+            f"{order[j][0]} = CAST(:cursor_{j} AS {order[j][2]})" for j in range(i)
+        ]
+        operator = ">" if direction == "ASC" else "<"
+        parts.append(f"{expression} {operator} CAST(:cursor_{i} AS {sql_type})")
+        clauses.append("(" + " AND ".join(parts) + ")")
+    return "(" + " OR ".join(clauses) + ")"
+
+
+def encode_leads_cursor(sort_key: str, values: List[Any]) -> str:
+    """Encode the sort values of the last row on a page as an opaque cursor."""
+    payload = {
+        "s": sort_key,
+        "v": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_leads_cursor(cursor: str, sort_key: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_leads_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        values = payload["v"]
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if payload.get("s") != sort_key or not isinstance(values, list) or len(values) != size:
+        raise ValueError("Cursor does not match the requested sort order")
+    return values
+
+
+# Column order of /leads/export files
+EXPORT_COLUMNS = [
+    "domain",
+    "company_name",
+    "provider",
+    "country",
+    "segment",
+    "readiness_score",
+    "priority_score",
+    "spf",
+    "dkim",
+    "dmarc_policy",
+    "mx_root",
+    "registrar",
+    "expires_at",
+    "nameservers",
+    "scan_status",
+    "scanned_at",
+    "reason",
+    "infrastructure_summary",
+]
+
+# Rows fetched per server-side cursor round trip (and per CSV chunk) during export
+EXPORT_CHUNK_SIZE = 1000
+
+# Bytes per chunk when streaming the finished XLSX file
+EXPORT_XLSX_READ_SIZE = 64 * 1024
+
+
+def _export_row(row) -> List[Any]:
+    """Format a leads row as an export line (EXPORT_COLUMNS order)."""
+    return [
+        row.domain,
+        row.canonical_name or "",
+        row.provider or "",
+        row.country or "",
+        row.segment or "",
+        row.readiness_score or 0,
+        row.priority_score or 7,
+        "Yes" if row.spf else "No",
+        "Yes" if row.dkim else "No",
+        row.dmarc_policy or "None",
+        row.mx_root or "",
+        row.registrar or "",
+        str(row.expires_at) if row.expires_at else "",
+        ", ".join(row.nameservers) if row.nameservers else "",
+        row.scan_status or "",
+        str(row.scanned_at) if row.scanned_at else "",
+        row.reason or "",
+        row.infrastructure_summary or "",
+    ]
+
+
+def _iter_export_chunks(result) -> Iterator[List[List[Any]]]:
+    """
+    Yield export lines in chunks from a streamed (server-side cursor) result.
+
+    Memory stays bounded by EXPORT_CHUNK_SIZE regardless of the number of leads.
+    """
+    try:
+        for rows in result.partitions(EXPORT_CHUNK_SIZE):
+            yield [_export_row(row) for row in rows]
+    finally:
+        result.close()
+
+
+def stream_csv(chunks: Iterator[List[List[Any]]]) -> Iterator[bytes]:
+    """
+    Render export chunks as UTF-8 CSV (with BOM for Excel compatibility).
+
+    The header is always emitted, even when there are no rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+
+    for lines in chunks:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(lines)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def stream_xlsx(chunks: Iterator[List[List[Any]]]) -> Iterator[bytes]:
+    """
+    Render export chunks as an XLSX workbook.
+
+    Uses an openpyxl write-only workbook (rows are flushed to disk as they
+    are appended) and streams the finished file from a temporary file.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Leads")
+    sheet.append(EXPORT_COLUMNS)
+    for lines in chunks:
+        for line in lines:
+            sheet.append(line)
+
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            data = output.read(EXPORT_XLSX_READ_SIZE)
+            if not data:
+                break
+            yield data
 
 
 @router.get("/export")
@@ -90,7 +381,8 @@ async def export_leads(
     Export leads to CSV or Excel format.
 
     Uses the same filtering logic as GET /leads endpoint.
-    Returns a downloadable file with lead data.
+    Returns a downloadable file with lead data, streamed in chunks from a
+    server-side cursor so memory stays constant regardless of lead count.
 
     Query parameters:
     - segment: Filter by segment (Migration, Existing, Cold, Skip)
@@ -101,147 +393,27 @@ async def export_leads(
     Returns:
         CSV or Excel file download with lead data
     """
-    # Build query using leads_ready VIEW (same as GET /leads)
-    # Use DISTINCT ON (domain) to prevent duplicates when there are multiple domain_signals or lead_scores
-    query = """
-        SELECT DISTINCT ON (domain)
-            company_id,
-            canonical_name,
-            domain,
-            provider,
-            tenant_size,
-            local_provider,
-            country,
-            spf,
-            dkim,
-            dmarc_policy,
-            dmarc_coverage,
-            mx_root,
-            registrar,
-            expires_at,
-            nameservers,
-            scan_status,
-            scanned_at,
-            readiness_score,
-            segment,
-            reason,
-            technical_heat,
-            commercial_segment,
-            commercial_heat,
-            priority_category,
-            priority_label
-        FROM leads_ready
-        WHERE 1=1
-    """
-
-    params = {}
-
-    # Add filters (same logic as GET /leads)
-    if segment:
-        query += " AND segment = :segment"
-        params["segment"] = segment
-
-    if min_score is not None:
-        query += " AND readiness_score >= :min_score"
-        params["min_score"] = min_score
-
-    if provider:
-        query += " AND provider = :provider"
-        params["provider"] = provider
-
-    # G19: Add search filter (full-text search in domain, canonical_name, provider)
-    if search:
-        search_pattern = f"%{search.lower()}%"
-        query += """ AND (
-            LOWER(domain) LIKE :search 
-            OR LOWER(canonical_name) LIKE :search 
-            OR LOWER(provider) LIKE :search
-        )"""
-        params["search"] = search_pattern
-
-    # Only return leads that have been scanned (have a score)
-    query += " AND readiness_score IS NOT NULL"
+    # Same filtered query as GET /leads
+    base_query, params = build_leads_query(
+        segment=segment,
+        min_score=min_score,
+        provider=provider,
+        search=search,
+    )
 
-    # Note: DISTINCT ON requires domain to be first in ORDER BY
-    # We'll sort by priority_score in Python after calculating it
-    query += " ORDER BY domain, scanned_at DESC NULLS LAST"
+    # Sort by priority_score ASC (1 = highest priority), then readiness_score DESC
+    order_by = ", ".join(
+        f"{expression} {direction}"
+        for expression, direction, _ in get_leads_sort_order(None, None)
+    )
+    query = f"SELECT leads.* FROM ({base_query}) AS leads ORDER BY {order_by}"
 
     try:
-        result = db.execute(text(query), params)
-        rows = result.fetchall()
-
-        # Convert to list of dictionaries
-        leads_data = []
-        for row in rows:
-            # Calculate priority score
-            priority_score = calculate_priority_score(row.segment, row.readiness_score)
-
-            lead_dict = {
-                "domain": row.domain,
-                "company_name": row.canonical_name or "",
-                "provider": row.provider or "",
-                "country": row.country or "",
-                "segment": row.segment or "",
-                "readiness_score": row.readiness_score or 0,
-                "priority_score": priority_score or 7,
-                "spf": "Yes" if row.spf else "No",
-                "dkim": "Yes" if row.dkim else "No",
-                "dmarc_policy": row.dmarc_policy or "None",
-                "mx_root": row.mx_root or "",
-                "registrar": row.registrar or "",
-                "expires_at": str(row.expires_at) if row.expires_at else "",
-                "nameservers": ", ".join(row.nameservers) if row.nameservers else "",
-                "scan_status": row.scan_status or "",
-                "scanned_at": str(row.scanned_at) if row.scanned_at else "",
-                "reason": row.reason or "",
-            }
-            leads_data.append(lead_dict)
-
-        # Sort by priority_score ASC (1 = highest priority), then readiness_score DESC
-        leads_data.sort(
-            key=lambda x: (x.get("priority_score", 999), -x.get("readiness_score", 0))
+        # Server-side cursor: rows are fetched EXPORT_CHUNK_SIZE at a time while streaming.
+        # The session from get_db stays open until the response has been sent.
+        result = db.execute(
+            text(query), params, execution_options={"yield_per": EXPORT_CHUNK_SIZE}
         )
-
-        # Convert to DataFrame
-        df = pd.DataFrame(leads_data)
-
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-
-        if format == "csv":
-            # Generate CSV content with UTF-8 encoding (with BOM for Excel compatibility)
-            csv_content = df.to_csv(index=False)
-            # Add UTF-8 BOM for Excel compatibility
-            csv_bytes = "\ufeff".encode("utf-8") + csv_content.encode("utf-8")
-
-            return Response(
-                content=csv_bytes,
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename=leads_{timestamp}.csv",
-                    "Content-Type": "text/csv; charset=utf-8",
-                },
-            )
-        else:  # xlsx
-            # Generate Excel content
-            from io import BytesIO
-
-            output = BytesIO()
-
-            with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                df.to_excel(writer, index=False, sheet_name="Leads")
-
-            output.seek(0)
-            excel_content = output.read()
-
-            return Response(
-                content=excel_content,
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={
-                    "Content-Disposition": f"attachment; filename=leads_{timestamp}.xlsx"
-                },
-            )
-
     except Exception as e:
         from app.core.logging import logger
         logger.error("export_error", error=str(e), exc_info=True)
@@ -249,6 +421,28 @@ async def export_leads(
             status_code=500, detail=f"An error occurred while exporting leads: {str(e)}"
         )
 
+    # Generate filename with timestamp
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    chunks = _iter_export_chunks(result)
+
+    if format == "csv":
+        return StreamingResponse(
+            stream_csv(chunks),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f"attachment; filename=leads_{timestamp}.csv",
+                "Content-Type": "text/csv; charset=utf-8",
+            },
+        )
+    else:  # xlsx
+        return StreamingResponse(
+            stream_xlsx(chunks),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={
+                "Content-Disposition": f"attachment; filename=leads_{timestamp}.xlsx"
+            },
+        )
+
 
 def get_user_id(request: Request) -> str:
     """
@@ -268,6 +462,30 @@ def get_user_id(request: Request) -> str:
     return session_id
 
 
+def _fetch_leads_page(
+    db: Session,
+    count_query: str,
+    count_params: Dict[str, Any],
+    page_query: str,
+    page_params: Dict[str, Any],
+    page_size: int,
+) -> Tuple[int, List[Any], bool]:
+    """
+    Load one leads page and its total count (sync; via run_db).
+
+    Returns:
+        Tuple of (total, page rows, has_more)
+    """
+    total = db.execute(text(count_query), count_params).scalar() or 0
+
+    # Fetch one extra row to know whether a next page exists
+    rows = db.execute(
+        text(page_query), {**page_params, "limit": page_size + 1}
+    ).fetchall()
+    has_more = len(rows) > page_size
+    return total, rows[:page_size], has_more
+
+
 @router.get("", response_model=LeadsListResponse)
 async def get_leads(
     segment: Optional[str] = Query(
@@ -298,8 +516,12 @@ async def get_leads(
     search: Optional[str] = Query(
         None, description="Full-text search in domain, canonical_name, and provider"
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous response's next_cursor (overrides page)",
+    ),
     request: Request = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get filtered, sorted, and paginated list of leads (G19).
@@ -314,116 +536,89 @@ async def get_leads(
     - page: Page number (1-based, default: 1)
     - page_size: Number of items per page (default: 50, max: 200)
     - search: Full-text search in domain, canonical_name, and provider
+    - cursor: Keyset cursor (next_cursor of the previous page); page is ignored when set
+
+    Filtering, sorting, LIMIT/OFFSET and COUNT(*) all run in Postgres on the
+    lead_read_model table, so only the requested page is loaded.
 
     Returns:
         LeadsListResponse with paginated leads and metadata
     """
-    # Build query using leads_ready VIEW
-    # Use DISTINCT ON (domain) to prevent duplicates when there are multiple domain_signals or lead_scores
-    # View includes G20 columns (tenant_size, local_provider, dmarc_coverage) and CSP P-Model columns
-    query = """
-        SELECT DISTINCT ON (domain)
-            company_id,
-            canonical_name,
-            domain,
-            provider,
-            tenant_size,
-            local_provider,
-            country,
-            spf,
-            dkim,
-            dmarc_policy,
-            dmarc_coverage,
-            mx_root,
-            registrar,
-            expires_at,
-            nameservers,
-            scan_status,
-            scanned_at,
-            readiness_score,
-            segment,
-            reason,
-            technical_heat,
-            commercial_segment,
-            commercial_heat,
-            priority_category,
-            priority_label
-        FROM leads_ready
-        WHERE 1=1
-    """
-
-    params = {}
-
-    # Add filters
-    if segment:
-        query += " AND segment = :segment"
-        params["segment"] = segment
-
-    if min_score is not None:
-        query += " AND readiness_score >= :min_score"
-        params["min_score"] = min_score
-
-    if provider:
-        query += " AND provider = :provider"
-        params["provider"] = provider
-
-    # G19: Add search filter (full-text search in domain, canonical_name, provider)
-    if search:
-        search_pattern = f"%{search.lower()}%"
-        query += """ AND (
-            LOWER(domain) LIKE :search 
-            OR LOWER(canonical_name) LIKE :search 
-            OR LOWER(provider) LIKE :search
-        )"""
-        params["search"] = search_pattern
+    # Favorites are filtered in SQL (subquery on favorites)
+    favorite_user_id = None
+    if favorite is True:
+        # Get user ID from session
+        favorite_user_id = get_user_id(request) if request else "default"
+
+    base_query, params = build_leads_query(
+        segment=segment,
+        min_score=min_score,
+        provider=provider,
+        search=search,
+        favorite_user_id=favorite_user_id,
+    )
 
-    # Only return leads that have been scanned (have a score)
-    query += " AND readiness_score IS NOT NULL"
+    # G19: Sorting, pagination and COUNT(*) run in Postgres
+    order = get_leads_sort_order(sort_by, sort_order)
+    sort_key = f"{sort_by if sort_by in LEADS_SORT_EXPRESSIONS else 'default'}:{sort_order}"
+
+    where_clause = ""
+    if cursor:
+        try:
+            cursor_values = decode_leads_cursor(cursor, sort_key, len(order))
+            # Bind timestamps as datetimes (asyncpg does not coerce strings)
+            cursor_values = [
+                datetime.fromisoformat(value) if sql_type == "timestamptz" else value
+                for value, (_, _, sql_type) in zip(cursor_values, order)
+            ]
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {str(e)}")
+        where_clause = f"WHERE {_keyset_condition(order)}"
+        for i, value in enumerate(cursor_values):
+            params[f"cursor_{i}"] = value
+        offset = 0
+    else:
+        offset = (page - 1) * page_size
 
-    # Note: DISTINCT ON requires domain to be first in ORDER BY
-    # We'll sort by priority_score in Python after calculating it
-    # because priority_score is computed from segment + readiness_score
-    # Default sorting (if sort_by not specified) is by priority_score
-    query += " ORDER BY domain, scanned_at DESC NULLS LAST"
+    sort_columns = ", ".join(
+        f"{expression} AS sort_{i}" for i, (expression, _, _) in enumerate(order)
+    )
+    order_by = ", ".join(f"{expression} {direction}" for expression, direction, _ in order)
+    page_query = f"""
+        SELECT leads.*, {sort_columns}
+        FROM ({base_query}) AS leads
+        {where_clause}
+        ORDER BY {order_by}
+        LIMIT :limit OFFSET :offset
+    """
+    count_query = f"SELECT COUNT(*) FROM ({base_query}) AS leads"
 
     try:
-        result = db.execute(text(query), params)
-        rows = result.fetchall()
-
-        # Filter by favorites if requested
-        if favorite is True:
-            # Get user ID from session
-            user_id = get_user_id(request) if request else "default"
-
-            # Get favorite domains for this user
-            favorite_domains = {
-                fav.domain
-                for fav in db.query(Favorite).filter(Favorite.user_id == user_id).all()
-            }
-
-            # Filter rows to only include favorite domains
-            rows = [row for row in rows if row.domain in favorite_domains]
+        count_params = {k: v for k, v in params.items() if not k.startswith("cursor_")}
+        total, rows, has_more = await run_db(
+            db,
+            _fetch_leads_page,
+            count_query,
+            count_params,
+            page_query,
+            {**params, "offset": offset},
+            page_size,
+        )
 
         leads = []
         for row in rows:
-            # Calculate priority score
-            priority_score = calculate_priority_score(row.segment, row.readiness_score)
-            
-            # Build infrastructure summary (Level 1 - IP enrichment)
-            infrastructure_summary = build_infra_summary(row.domain, db)
-
             lead = LeadResponse(
                 company_id=row.company_id,
                 canonical_name=row.canonical_name,
                 domain=row.domain,
                 provider=row.provider,
-                tenant_size=row.tenant_size,  # G20: Tenant size (now in view)
-                local_provider=row.local_provider,  # G20: Local provider (now in view)
+                tenant_size=row.tenant_size,  # G20: Tenant size
+                local_provider=row.local_provider,  # G20: Local provider
                 country=row.country,
                 spf=row.spf,
                 dkim=row.dkim,
                 dmarc_policy=row.dmarc_policy,
-                dmarc_coverage=row.dmarc_coverage,  # G20: DMARC coverage (now in view)
+                dmarc_coverage=row.dmarc_coverage,  # G20: DMARC coverage
                 mx_root=row.mx_root,
                 registrar=row.registrar,
                 expires_at=str(row.expires_at) if row.expires_at else None,
@@ -433,69 +628,33 @@ async def get_leads(
                 readiness_score=row.readiness_score,
                 segment=row.segment,
                 reason=row.reason,
-                priority_score=priority_score,
+                priority_score=row.priority_score,
                 # CSP P-Model fields (Phase 2)
                 technical_heat=getattr(row, "technical_heat", None),
                 commercial_segment=getattr(row, "commercial_segment", None),
                 commercial_heat=getattr(row, "commercial_heat", None),
                 priority_category=getattr(row, "priority_category", None),
                 priority_label=getattr(row, "priority_label", None),
-                infrastructure_summary=infrastructure_summary,
+                infrastructure_summary=row.infrastructure_summary,
             )
             leads.append(lead)
 
-        # G19: Apply sorting
-        # Default: priority_score ASC (1 = highest priority), then readiness_score DESC
-        if sort_by:
-            # Map sort_by field names to sort keys
-            sort_key_map = {
-                "domain": lambda x: (x.domain or "",),
-                "readiness_score": lambda x: (
-                    x.readiness_score if x.readiness_score is not None else -1,
-                ),
-                "priority_score": lambda x: (
-                    x.priority_score if x.priority_score is not None else 999,
-                ),
-                "segment": lambda x: (x.segment or "",),
-                "provider": lambda x: (x.provider or "",),
-                "scanned_at": lambda x: (
-                    x.scanned_at if x.scanned_at else "",
-                ),
-            }
-
-            if sort_by in sort_key_map:
-                reverse = sort_order == "desc"
-                leads.sort(key=sort_key_map[sort_by], reverse=reverse)
-            else:
-                # Invalid sort_by, use default sorting
-                leads.sort(
-                    key=lambda x: (
-                        x.priority_score if x.priority_score is not None else 999,
-                        -(x.readiness_score if x.readiness_score is not None else 0),
-                    )
-                )
-        else:
-            # Default sorting: priority_score ASC, then readiness_score DESC
-            leads.sort(
-                key=lambda x: (
-                    x.priority_score if x.priority_score is not None else 999,
-                    -(x.readiness_score if x.readiness_score is not None else 0),
-                )
+        next_cursor = None
+        if has_more and rows:
+            last_row = rows[-1]
+            next_cursor = encode_leads_cursor(
+                sort_key, [getattr(last_row, f"sort_{i}") for i in range(len(order))]
             )
 
-        # G19: Apply pagination
-        total = len(leads)
         total_pages = (total + page_size - 1) // page_size  # Ceiling division
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_leads = leads[start_idx:end_idx]
 
         return LeadsListResponse(
-            leads=paginated_leads,
+            leads=leads,
             total=total,
             page=page,
             page_size=page_size,
             total_pages=total_pages,
+            next_cursor=next_cursor,
         )
 
     except Exception as e:
@@ -503,7 +662,7 @@ async def get_leads(
 
 
 @router.get("/{domain}", response_model=LeadResponse)
-async def get_lead(domain: str, db: Session = Depends(get_db)):
+async def get_lead(domain: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get a single lead by domain.
 
@@ -523,66 +682,22 @@ async def get_lead(domain: str, db: Session = Depends(get_db)):
     if not normalized_domain:
         raise HTTPException(status_code=400, detail="Invalid domain format")
 
-    # Query using direct JOIN (more reliable than VIEW)
-    query = """
-        SELECT 
-            c.id AS company_id,
-            c.canonical_name,
-            c.domain,
-            c.provider,
-            c.tenant_size,
-            c.country,
-            c.contact_emails,
-            c.contact_quality_score,
-            c.linkedin_pattern,
-            ds.spf,
-            ds.dkim,
-            ds.dmarc_policy,
-            ds.dmarc_coverage,
-            ds.mx_root,
-            ds.local_provider,
-            ds.registrar,
-            ds.expires_at,
-            ds.nameservers,
-            ds.scan_status,
-            ds.scanned_at,
-            ls.readiness_score,
-            ls.segment,
-            ls.reason,
-            ls.technical_heat,
-            ls.commercial_segment,
-            ls.commercial_heat,
-            ls.priority_category,
-            ls.priority_label
-        FROM companies c
-        LEFT JOIN domain_signals ds ON c.domain = ds.domain
-        LEFT JOIN lead_scores ls ON c.domain = ls.domain
-        WHERE c.domain = :domain
-    """
-
     try:
-        result = db.execute(text(query), {"domain": normalized_domain})
-        row = result.fetchone()
+        row, company_exists = await run_db(db, fetch_lead_row, normalized_domain)
 
-        if not row:
+        if not company_exists:
             raise HTTPException(
                 status_code=404,
                 detail=f"Domain {normalized_domain} not found. Please ingest the domain first using /ingest/domain",
             )
 
-        # Check if domain has been scanned
-        if row.readiness_score is None:
+        # Only scanned domains have a read model row
+        if row is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Domain {normalized_domain} has not been scanned yet. Please use /scan/domain first.",
             )
 
-        # Calculate priority score
-        priority_score = calculate_priority_score(row.segment, row.readiness_score)
-        
-        # Build infrastructure summary (Level 1 - IP enrichment)
-        infrastructure_summary = build_infra_summary(normalized_domain, db)
-
         # Convert contact_emails from JSONB to list if present
         contact_emails = None
         if row.contact_emails:
@@ -618,14 +733,14 @@ async def get_lead(domain: str, db: Session = Depends(get_db)):
             readiness_score=row.readiness_score,
             segment=row.segment,
             reason=row.reason,
-            priority_score=priority_score,
+            priority_score=row.priority_score,
             # CSP P-Model fields (Phase 2)
             technical_heat=getattr(row, "technical_heat", None),
             commercial_segment=getattr(row, "commercial_segment", None),
             commercial_heat=getattr(row, "commercial_heat", None),
             priority_category=getattr(row, "priority_category", None),
             priority_label=getattr(row, "priority_label", None),
-            infrastructure_summary=infrastructure_summary,
+            infrastructure_summary=row.infrastructure_summary,
         )
 
     except HTTPException:
@@ -707,6 +822,8 @@ async def enrich_lead(
         company.contact_emails = enrichment_data["contact_emails"]
         company.contact_quality_score = enrichment_data["contact_quality_score"]
         company.linkedin_pattern = enrichment_data["linkedin_pattern"]
+        db.flush()
+        refresh_lead_read_model(db, [normalized_domain])
         db.commit()
         db.refresh(company)
 
@@ -756,27 +873,13 @@ class ScoreBreakdownResponse(BaseModel):
     priority_label: Optional[str] = None  # Human-readable label (e.g., 'High Potential Greenfield')
 
 
-@router.get("/{domain}/score-breakdown", response_model=ScoreBreakdownResponse)
-async def get_score_breakdown(domain: str, db: Session = Depends(get_db)):
+def _build_score_breakdown(db: Session, normalized_domain: str) -> ScoreBreakdownResponse:
     """
-    Get detailed score breakdown for a domain (G19).
-
-    Args:
-        domain: Domain name (will be normalized)
-        db: Database session
-
-    Returns:
-        ScoreBreakdownResponse with detailed score components
+    Build the score breakdown for a normalized domain (sync; via run_db).
 
     Raises:
         404: If domain not found or not scanned
     """
-    # Normalize domain
-    normalized_domain = normalize_domain(domain)
-
-    if not normalized_domain:
-        raise HTTPException(status_code=400, detail="Geçersiz domain formatı")
-
     # Get domain data
     company = db.query(Company).filter(Company.domain == normalized_domain).first()
     if not company:
@@ -872,3 +975,27 @@ async def get_score_breakdown(domain: str, db: Session = Depends(get_db)):
         breakdown_dict["priority_label"] = scoring_result.get("priority_label")
 
     return ScoreBreakdownResponse(**breakdown_dict)
+
+
+@router.get("/{domain}/score-breakdown", response_model=ScoreBreakdownResponse)
+async def get_score_breakdown(domain: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get detailed score breakdown for a domain (G19).
+
+    Args:
+        domain: Domain name (will be normalized)
+        db: Database session
+
+    Returns:
+        ScoreBreakdownResponse with detailed score components
+
+    Raises:
+        404: If domain not found or not scanned
+    """
+    # Normalize domain
+    normalized_domain = normalize_domain(domain)
+
+    if not normalized_domain:
+        raise HTTPException(status_code=400, detail="Geçersiz domain formatı")
+
+    return await run_db(db, _build_score_breakdown, normalized_domain)
@@ -1,9 +1,9 @@
 """PDF summary endpoint for domain account summaries (G17)."""
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
-from sqlalchemy import text
 from io import BytesIO
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -17,7 +17,7 @@ from datetime import datetime
 from app.db.session import get_db
 from app.db.models import Company, DomainSignal, LeadScore
 from app.core.normalizer import normalize_domain
-from app.core.priority import calculate_priority_score
+from app.core.lead_read_model import fetch_lead_row
 
 
 router = APIRouter(prefix="/leads", tags=["pdf"])
@@ -53,51 +53,25 @@ async def get_pdf_summary(domain: str, db: Session = Depends(get_db)):
     if not normalized_domain:
         raise HTTPException(status_code=400, detail="Invalid domain format")
 
-    # Query domain data
-    query = """
-        SELECT 
-            c.id AS company_id,
-            c.canonical_name,
-            c.domain,
-            c.provider,
-            c.country,
-            ds.spf,
-            ds.dkim,
-            ds.dmarc_policy,
-            ds.mx_root,
-            ds.registrar,
-            ds.expires_at,
-            ds.nameservers,
-            ds.scan_status,
-            ds.scanned_at,
-            ls.readiness_score,
-            ls.segment,
-            ls.reason
-        FROM companies c
-        LEFT JOIN domain_signals ds ON c.domain = ds.domain
-        LEFT JOIN lead_scores ls ON c.domain = ls.domain
-        WHERE c.domain = :domain
-    """
-
     try:
-        result = db.execute(text(query), {"domain": normalized_domain})
-        row = result.fetchone()
+        row, company_exists = await run_in_threadpool(
+            fetch_lead_row, db, normalized_domain
+        )
 
-        if not row:
+        if not company_exists:
             raise HTTPException(
                 status_code=404,
                 detail=f"Domain {normalized_domain} not found. Please ingest the domain first using /ingest/domain",
             )
 
-        # Check if domain has been scanned
-        if row.readiness_score is None:
+        # Only scanned domains have a read model row
+        if row is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Domain {normalized_domain} has not been scanned yet. Please use /scan/domain first.",
             )
 
-        # Calculate priority score
-        priority_score = calculate_priority_score(row.segment, row.readiness_score)
+        priority_score = row.priority_score
 
         # Generate PDF
         buffer = BytesIO()
@@ -284,8 +258,8 @@ async def get_pdf_summary(domain: str, db: Session = Depends(get_db)):
             )
         )
 
-        # Build PDF
-        doc.build(elements)
+        # Build PDF (CPU-bound, kept off the event loop)
+        await run_in_threadpool(doc.build, elements)
         buffer.seek(0)
 
         # Return PDF
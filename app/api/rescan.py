@@ -1,6 +1,7 @@
 """ReScan endpoints for domain re-scanning with change detection (G18)."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
@@ -11,6 +12,7 @@ from app.core.rescan import rescan_domain
 from app.core.progress_tracker import get_progress_tracker
 from app.core.tasks import bulk_scan_task
 from app.core.constants import MAX_BULK_SCAN_DOMAINS
+from app.core.bulk_operations import resolve_bulk_domains, format_missing_domains
 import uuid
 
 
@@ -61,7 +63,9 @@ async def rescan_single_domain(domain: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Invalid domain format")
 
     # Check if domain exists
-    company = db.query(Company).filter(Company.domain == normalized_domain).first()
+    company = await run_in_threadpool(
+        lambda: db.query(Company).filter(Company.domain == normalized_domain).first()
+    )
     if not company:
         raise HTTPException(
             status_code=404,
@@ -69,8 +73,8 @@ async def rescan_single_domain(domain: str, db: Session = Depends(get_db)):
         )
 
     try:
-        # Perform rescan
-        result = rescan_domain(normalized_domain, db)
+        # Perform rescan (blocking DNS/WHOIS + DB work, kept off the event loop)
+        result = await run_in_threadpool(rescan_domain, normalized_domain, db)
 
         if not result.get("success"):
             return RescanDomainResponse(
@@ -139,18 +143,21 @@ async def bulk_rescan(
             detail=f"Maximum {MAX_BULK_SCAN_DOMAINS} domains per bulk rescan",
         )
 
-    # Normalize domains
-    normalized_domains = []
-    for domain in domains:
-        normalized = normalize_domain(domain)
-        if normalized:
-            normalized_domains.append(normalized)
+    # Normalize domains and check they exist (one query per chunk)
+    normalized_domains, missing_domains = await run_in_threadpool(
+        resolve_bulk_domains, db, domains
+    )
 
     if not normalized_domains:
         raise HTTPException(
             status_code=400, detail="No valid domains after normalization"
         )
 
+    if missing_domains:
+        raise HTTPException(
+            status_code=400, detail=format_missing_domains(missing_domains)
+        )
+
     # Initialize progress tracker and create job (creates job_id automatically)
     tracker = get_progress_tracker()
     job_id = tracker.create_job(normalized_domains)
@@ -1,6 +1,7 @@
 """Sales summary endpoint for sales intelligence."""
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import date
@@ -33,6 +34,27 @@ class SalesSummaryResponse(BaseModel):
     metadata: dict
 
 
+def _load_sales_context(db: Session, domain: str):
+    """
+    Load company, signals, score and latest IP enrichment for a domain (sync).
+
+    Returns:
+        Tuple of (company, domain_signal, lead_score, ip_enrichment_record);
+        company is None if the domain is unknown
+    """
+    from app.core.enrichment_service import latest_ip_enrichment
+
+    company = db.query(Company).filter(Company.domain == domain).first()
+    if not company:
+        return None, None, None, None
+
+    domain_signal = (
+        db.query(DomainSignal).filter(DomainSignal.domain == domain).first()
+    )
+    lead_score = db.query(LeadScore).filter(LeadScore.domain == domain).first()
+    return company, domain_signal, lead_score, latest_ip_enrichment(domain, db)
+
+
 @router.get("/{domain}/sales-summary", response_model=SalesSummaryResponse)
 async def get_sales_summary(
     domain: str,
@@ -59,24 +81,16 @@ async def get_sales_summary(
     if not normalized_domain:
         raise HTTPException(status_code=400, detail="Invalid domain format")
 
-    # Query company and related data
-    company = db.query(Company).filter(Company.domain == normalized_domain).first()
+    # Query company and related data (threadpool, keeps the event loop free)
+    company, domain_signal, lead_score, ip_enrichment_record = await run_in_threadpool(
+        _load_sales_context, db, normalized_domain
+    )
 
     if not company:
         raise HTTPException(
             status_code=404, detail=f"Domain not found: {normalized_domain}"
         )
 
-    # Query domain signals
-    domain_signal = (
-        db.query(DomainSignal).filter(DomainSignal.domain == normalized_domain).first()
-    )
-
-    # Query lead score
-    lead_score = (
-        db.query(LeadScore).filter(LeadScore.domain == normalized_domain).first()
-    )
-
     # Extract data
     provider = company.provider
     segment = lead_score.segment if lead_score else None
@@ -92,9 +106,10 @@ async def get_sales_summary(
     contact_quality_score = company.contact_quality_score
     expires_at = domain_signal.expires_at if domain_signal else None
     
-    # Get infrastructure summary (IP enrichment)
-    from app.core.enrichment_service import build_infra_summary
-    infrastructure_summary = build_infra_summary(normalized_domain, db)
+    # IP enrichment loaded once (infrastructure summary + IP context share the record)
+    from app.core.enrichment_service import format_infra_summary
+
+    infrastructure_summary = format_infra_summary(ip_enrichment_record)
 
     # Calculate priority score if needed (import from priority module)
     if segment and readiness_score is not None:
@@ -105,10 +120,7 @@ async def get_sales_summary(
     # Get tuning factor from config
     tuning_factor = settings.sales_engine_opportunity_factor
 
-    # Get IP enrichment (optional)
-    from app.core.enrichment_service import latest_ip_enrichment
-    
-    ip_enrichment_record = latest_ip_enrichment(normalized_domain, db)
+    # IP context (optional)
     ip_context = None
     if ip_enrichment_record:
         ip_context = {
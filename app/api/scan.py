@@ -1,22 +1,30 @@
 """Scan endpoints for domain analysis and scoring."""
 
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from app.db.session import get_db
-from app.db.models import Company, DomainSignal, LeadScore, ProviderChangeHistory
+from app.db.models import Company, ProviderChangeHistory
 from app.core.normalizer import normalize_domain
-from app.core.analyzer_dns import analyze_dns, resolve_domain_ip_candidates
+from app.core.analyzer_dns import analyze_dns_async, resolve_domain_ip_candidates
 from app.core.analyzer_whois import get_whois_info
 from app.core.provider_map import classify_provider
 from app.core.scorer import score_domain
 from app.core.progress_tracker import get_progress_tracker
 from app.core.tasks import bulk_scan_task
 from app.core.auto_tagging import apply_auto_tags
-from app.core.constants import MAX_BULK_SCAN_DOMAINS
+from app.core.constants import MAX_BULK_SCAN_DOMAINS, BULK_SCAN_STATUS_MAX_ERRORS
+from app.core.bulk_operations import resolve_bulk_domains, format_missing_domains
 from app.core.logging import logger
 from app.core.enrichment_service import spawn_enrichment
+from app.core.scan_persistence import (
+    domain_signal_row,
+    lead_score_row,
+    upsert_scan_results,
+)
 
 
 router = APIRouter(prefix="/scan", tags=["scan"])
@@ -77,7 +85,9 @@ async def scan_domain(request: ScanDomainRequest, db: Session = Depends(get_db))
     domain = request.domain
 
     # Check if company exists
-    company = db.query(Company).filter(Company.domain == domain).first()
+    company = await run_in_threadpool(
+        lambda: db.query(Company).filter(Company.domain == domain).first()
+    )
     if not company:
         raise HTTPException(
             status_code=404,
@@ -85,11 +95,13 @@ async def scan_domain(request: ScanDomainRequest, db: Session = Depends(get_db))
         )
 
     try:
-        # Perform DNS analysis (uses DNS cache internally)
-        dns_result = analyze_dns(domain, use_cache=True)
-
-        # Perform WHOIS lookup (optional, graceful fail, uses WHOIS cache internally)
-        whois_result = get_whois_info(domain, use_cache=True)
+        # DNS lookups run on the event loop (uses DNS cache internally); the
+        # blocking WHOIS client runs in the threadpool at the same time
+        # (optional, graceful fail, uses WHOIS cache internally)
+        dns_result, whois_result = await asyncio.gather(
+            analyze_dns_async(domain, use_cache=True),
+            run_in_threadpool(get_whois_info, domain, True),
+        )
 
         # Determine scan status
         # Note: For score breakdown endpoint, we need scan_status = "completed"
@@ -102,9 +114,8 @@ async def scan_domain(request: ScanDomainRequest, db: Session = Depends(get_db))
             # DNS failed - keep the DNS error status
             scan_status = dns_status
 
-        # Classify provider based on MX root (uses provider cache internally)
         mx_root = dns_result.get("mx_root")
-        provider = classify_provider(mx_root, use_cache=True)
+        provider = classify_provider(mx_root)
 
         # G20: Classify local provider (if provider is Local)
         local_provider = None
@@ -118,19 +129,6 @@ async def scan_domain(request: ScanDomainRequest, db: Session = Depends(get_db))
             from app.core.provider_map import estimate_tenant_size
             tenant_size = estimate_tenant_size(provider, mx_root)
 
-        # Track provider changes
-        previous_provider = company.provider
-        provider_changed = False
-
-        # Update company provider and tenant_size if we have new information
-        if provider and provider != "Unknown":
-            if previous_provider != provider:
-                provider_changed = True
-            company.provider = provider
-            if tenant_size:
-                company.tenant_size = tenant_size
-            db.commit()
-
         # Prepare signals for scoring
         signals = {
             "spf": dns_result.get("spf", False),
@@ -139,7 +137,8 @@ async def scan_domain(request: ScanDomainRequest, db: Session = Depends(get_db))
         }
 
         # Calculate score and determine segment (uses scoring cache internally)
-        scoring_result = score_domain(
+        scoring_result = await run_in_threadpool(
+            score_domain,
             domain=domain,
             provider=provider,
             signals=signals,
@@ -147,74 +146,31 @@ async def scan_domain(request: ScanDomainRequest, db: Session = Depends(get_db))
             use_cache=True,
         )
 
-        # Delete any existing domain_signals for this domain (prevent duplicates)
-        db.query(DomainSignal).filter(DomainSignal.domain == domain).delete()
-
-        # Create new domain_signal
-        domain_signal = DomainSignal(
-            domain=domain,
-            spf=dns_result.get("spf", False),
-            dkim=dns_result.get("dkim", False),
-            dmarc_policy=dns_result.get("dmarc_policy"),
-            dmarc_coverage=dns_result.get("dmarc_coverage"),  # G20: DMARC coverage
-            mx_root=mx_root,
-            local_provider=local_provider,  # G20: Local provider name
-            registrar=whois_result.get("registrar") if whois_result else None,
-            expires_at=whois_result.get("expires_at") if whois_result else None,
-            nameservers=whois_result.get("nameservers") if whois_result else None,
-            scan_status=scan_status,
-        )
-        db.add(domain_signal)
-
-        # Delete any existing lead_scores for this domain (prevent duplicates)
-        db.query(LeadScore).filter(LeadScore.domain == domain).delete()
-
-        # Create new lead_score
-        lead_score = LeadScore(
-            domain=domain,
-            readiness_score=scoring_result["score"],
-            segment=scoring_result["segment"],
-            reason=scoring_result["reason"],
-            # CSP P-Model fields (Phase 2)
-            technical_heat=scoring_result.get("technical_heat"),
-            commercial_segment=scoring_result.get("commercial_segment"),
-            commercial_heat=scoring_result.get("commercial_heat"),
-            priority_category=scoring_result.get("priority_category"),
-            priority_label=scoring_result.get("priority_label"),
+        # Database writes (sync session) also stay off the event loop
+        await run_in_threadpool(
+            _save_domain_scan,
+            db,
+            company,
+            dns_result,
+            whois_result,
+            scan_status,
+            provider,
+            local_provider,
+            tenant_size,
+            scoring_result,
         )
-        db.add(lead_score)
-
-        # Log provider change if detected
-        if provider_changed and previous_provider:
-            change_history = ProviderChangeHistory(
-                domain=domain,
-                previous_provider=previous_provider,
-                new_provider=provider,
-            )
-            db.add(change_history)
-
-        # Commit all changes
-        db.commit()
-        db.refresh(domain_signal)
-        db.refresh(lead_score)
-
-        # Apply auto-tagging (G17)
-        try:
-            apply_auto_tags(domain, db)
-            db.commit()
-        except Exception as e:
-            # Log error but don't fail the scan
-            logger.warning("auto_tagging_failed", domain=domain, error=str(e))
 
         # IP Enrichment (fire-and-forget, separate DB session)
         # Resolve IP addresses from MX records and root domain
         mx_records = dns_result.get("mx_records", [])
-        ip_candidates = resolve_domain_ip_candidates(domain, mx_records)
+        ip_candidates = await run_in_threadpool(
+            resolve_domain_ip_candidates, domain, mx_records
+        )
         ip_address = ip_candidates[0] if ip_candidates else None
         
         if ip_address:
-            # Spawn enrichment in background (separate session, won't affect scan)
-            spawn_enrichment(domain, ip_address)
+            # Separate session, won't affect scan; blocking (DB + readers), so in the threadpool
+            await run_in_threadpool(spawn_enrichment, domain, ip_address)
 
         # Return response
         return ScanDomainResponse(
@@ -239,13 +195,81 @@ async def scan_domain(request: ScanDomainRequest, db: Session = Depends(get_db))
         # Validation errors (e.g., invalid domain format)
         raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         raise HTTPException(
             status_code=500,
             detail="An error occurred while scanning the domain. Please try again later.",
         )
 
 
+def _save_domain_scan(
+    db: Session,
+    company: Company,
+    dns_result: dict,
+    whois_result: Optional[dict],
+    scan_status: str,
+    provider: str,
+    local_provider: Optional[str],
+    tenant_size: Optional[str],
+    scoring_result: dict,
+):
+    """
+    Persist a single-domain scan (sync; runs in the threadpool).
+
+    Updates the company provider, upserts domain_signals / lead_scores,
+    records provider changes and applies auto-tags.
+    """
+    domain = company.domain
+
+    # Track provider changes
+    previous_provider = company.provider
+    provider_changed = False
+
+    # Update company provider and tenant_size if we have new information
+    if provider and provider != "Unknown":
+        if previous_provider != provider:
+            provider_changed = True
+        company.provider = provider
+        if tenant_size:
+            company.tenant_size = tenant_size
+        db.commit()
+
+    # Replace domain_signal / lead_score (single-row UPSERT per table)
+    upsert_scan_results(
+        db,
+        [
+            domain_signal_row(
+                domain,
+                dns_result,
+                whois_result,
+                scan_status,
+                local_provider=local_provider,
+            )
+        ],
+        [lead_score_row(domain, scoring_result)],
+    )
+
+    # Log provider change if detected
+    if provider_changed and previous_provider:
+        change_history = ProviderChangeHistory(
+            domain=domain,
+            previous_provider=previous_provider,
+            new_provider=provider,
+        )
+        db.add(change_history)
+
+    # Commit all changes
+    db.commit()
+
+    # Apply auto-tagging (G17)
+    try:
+        apply_auto_tags(domain, db)
+        db.commit()
+    except Exception as e:
+        # Log error but don't fail the scan
+        logger.warning("auto_tagging_failed", domain=domain, error=str(e))
+
+
 class BulkScanRequest(BaseModel):
     """Request model for bulk domain scanning."""
 
@@ -306,27 +330,19 @@ async def scan_bulk(request: BulkScanRequest, db: Session = Depends(get_db)):
     Returns:
         BulkScanResponse with job_id
     """
-    # Validate that all domains exist in database
-    missing_domains = []
-    for domain in request.domain_list:
-        company = db.query(Company).filter(Company.domain == domain).first()
-        if not company:
-            missing_domains.append(domain)
+    # Validate that all domains exist in database (one query per chunk)
+    domains, missing_domains = await run_in_threadpool(
+        resolve_bulk_domains, db, request.domain_list
+    )
 
     if missing_domains:
         raise HTTPException(
-            status_code=400,
-            detail=f"Domains not found. Please ingest first: {', '.join(missing_domains[:5])}"
-            + (
-                f" and {len(missing_domains) - 5} more"
-                if len(missing_domains) > 5
-                else ""
-            ),
+            status_code=400, detail=format_missing_domains(missing_domains)
         )
 
     # Create job in progress tracker
     tracker = get_progress_tracker()
-    job_id = tracker.create_job(request.domain_list)
+    job_id = tracker.create_job(domains)
 
     # Start bulk scan task
     bulk_scan_task.delay(job_id)
@@ -334,7 +350,7 @@ async def scan_bulk(request: BulkScanRequest, db: Session = Depends(get_db)):
     return BulkScanResponse(
         job_id=job_id,
         message="Bulk scan job created successfully",
-        total=len(request.domain_list),
+        total=len(domains),
     )
 
 
@@ -350,7 +366,8 @@ async def get_bulk_scan_status(job_id: str):
         BulkScanStatusResponse with job status and progress
     """
     tracker = get_progress_tracker()
-    job = tracker.get_job(job_id)
+    # Counters + most recent errors only (constant-size read)
+    job = tracker.get_job(job_id, max_errors=BULK_SCAN_STATUS_MAX_ERRORS)
 
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -384,7 +401,7 @@ async def get_bulk_scan_results(job_id: str):
         List of scan results
     """
     tracker = get_progress_tracker()
-    job = tracker.get_job(job_id)
+    job = tracker.get_job(job_id, max_errors=0)
 
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
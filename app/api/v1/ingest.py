@@ -7,10 +7,12 @@ from app.api.ingest import (
     ingest_domain,
     ingest_csv,
     ingest_webhook,
+    ingest_webhook_batch,
     DomainIngestRequest,
     DomainIngestResponse,
     WebhookRequest,
     WebhookResponse,
+    WebhookBatchResponse,
 )
 from app.db.session import get_db
 from app.db.models import ApiKey
@@ -57,3 +59,12 @@ async def ingest_webhook_v1(
         request=request, api_key=api_key, db=db, http_request=http_request
     )
 
+
+@router.post("/webhook/batch", response_model=WebhookBatchResponse)
+async def ingest_webhook_batch_v1(
+    http_request: Request,
+    api_key: ApiKey = Depends(verify_api_key),
+    db: Session = Depends(get_db),
+):
+    """V1 endpoint - Ingest a batch of leads (JSON array or NDJSON) from webhook."""
+    return await ingest_webhook_batch(http_request=http_request, api_key=api_key, db=db)
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.api.leads import (
     get_leads,
@@ -14,7 +15,7 @@ from app.api.leads import (
     EnrichLeadResponse,
     ScoreBreakdownResponse,
 )
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 
 router = APIRouter(prefix="/leads", tags=["leads", "v1"])
 
@@ -48,8 +49,12 @@ async def get_leads_v1(
     search: Optional[str] = Query(
         None, description="Full-text search in domain, canonical_name, and provider"
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous response's next_cursor (overrides page)",
+    ),
     request: Request = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """V1 endpoint - Get filtered, sorted, and paginated list of leads."""
     return await get_leads(
@@ -62,13 +67,14 @@ async def get_leads_v1(
         page=page,
         page_size=page_size,
         search=search,
+        cursor=cursor,
         request=request,
         db=db,
     )
 
 
 @router.get("/{domain}", response_model=LeadResponse)
-async def get_lead_v1(domain: str, db: Session = Depends(get_db)):
+async def get_lead_v1(domain: str, db: AsyncSession = Depends(get_async_db)):
     """V1 endpoint - Get a single lead by domain."""
     return await get_lead(domain=domain, db=db)
 
@@ -84,6 +90,9 @@ async def export_leads_v1(
     provider: Optional[str] = Query(
         None, description="Filter by provider (M365, Google, etc.)"
     ),
+    search: Optional[str] = Query(
+        None, description="Full-text search in domain, canonical_name, and provider"
+    ),
     format: str = Query(
         "csv", pattern="^(csv|xlsx)$", description="Export format (csv or xlsx)"
     ),
@@ -91,7 +100,12 @@ async def export_leads_v1(
 ):
     """V1 endpoint - Export leads to CSV or Excel format."""
     return await export_leads(
-        segment=segment, min_score=min_score, provider=provider, format=format, db=db
+        segment=segment,
+        min_score=min_score,
+        provider=provider,
+        search=search,
+        format=format,
+        db=db,
     )
 
 
@@ -102,7 +116,7 @@ async def enrich_lead_v1(domain: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{domain}/score-breakdown", response_model=ScoreBreakdownResponse)
-async def get_score_breakdown_v1(domain: str, db: Session = Depends(get_db)):
+async def get_score_breakdown_v1(domain: str, db: AsyncSession = Depends(get_async_db)):
     """V1 endpoint - Get detailed score breakdown for a lead."""
     return await get_score_breakdown(domain=domain, db=db)
 
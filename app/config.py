@@ -29,6 +29,9 @@ class Settings(BaseSettings):
     # Error Tracking
     sentry_dsn: Optional[str] = None
     
+    # Daily rescan (G18): max domains rescanned per run (DNS/WHOIS budget)
+    rescan_daily_budget: int = 5000
+
     # Sales Engine (Phase 2)
     sales_engine_opportunity_factor: float = 1.0  # Tuning factor for opportunity potential (0.0-2.0, default: 1.0)
     
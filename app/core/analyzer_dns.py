@@ -1,10 +1,13 @@
 """DNS analysis utilities for domain signals."""
 
+import asyncio
+import concurrent.futures
 import socket
 import re
 import dns.resolver
+import dns.asyncresolver
 import dns.exception
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Iterable, Tuple
 from urllib.parse import urlparse
 from app.core.cache import get_cached_dns, set_cached_dns
 
@@ -15,6 +18,12 @@ DNS_TIMEOUT = 10
 # Public DNS servers as fallback
 PUBLIC_DNS_SERVERS = ["8.8.8.8", "8.8.4.4", "1.1.1.1", "1.0.0.1"]
 
+# DKIM selectors probed when the requested selector has no record
+DKIM_COMMON_SELECTORS = ["default", "google", "selector1", "selector2"]
+
+# Max number of domains analyzed concurrently by analyze_dns_many
+DNS_MAX_CONCURRENT_DOMAINS = 50
+
 
 def _get_resolver():
     """
@@ -33,6 +42,59 @@ def _get_resolver():
     return resolver
 
 
+def _get_async_resolver() -> dns.asyncresolver.Resolver:
+    """
+    Get asyncio DNS resolver with the same configuration as _get_resolver().
+
+    A single resolver is shared by all concurrent lookups of an analysis run.
+    """
+    resolver = dns.asyncresolver.Resolver()
+    resolver.timeout = DNS_TIMEOUT
+    resolver.lifetime = DNS_TIMEOUT
+    resolver.nameservers = PUBLIC_DNS_SERVERS
+
+    return resolver
+
+
+def _txt_to_string(txt) -> str:
+    """Join the character-strings of a TXT rdata into a single string."""
+    return "".join(
+        [s.decode("utf-8") if isinstance(s, bytes) else str(s) for s in txt.strings]
+    )
+
+
+def _is_dkim_record(txt_string: str) -> bool:
+    """Check whether a TXT string looks like a DKIM public key record."""
+    return "v=DKIM1" in txt_string or "k=rsa" in txt_string
+
+
+def _parse_dmarc_record(txt_string: str) -> Dict[str, Any]:
+    """
+    Parse a v=DMARC1 TXT string into policy, coverage and record.
+
+    Coverage defaults to 100 when pct= is not specified (DMARC spec).
+    """
+    if "p=none" in txt_string or "p=NONE" in txt_string:
+        policy = "none"
+    elif "p=quarantine" in txt_string or "p=QUARANTINE" in txt_string:
+        policy = "quarantine"
+    elif "p=reject" in txt_string or "p=REJECT" in txt_string:
+        policy = "reject"
+    else:
+        # Default to "none" if policy not explicitly set
+        policy = "none"
+
+    # DMARC spec: pct=0-100 (default: 100 if not specified)
+    pct_match = re.search(r'pct=(\d+)', txt_string, re.IGNORECASE)
+    if pct_match:
+        # Ensure coverage is in valid range (0-100)
+        coverage = max(0, min(100, int(pct_match.group(1))))
+    else:
+        coverage = 100
+
+    return {"policy": policy, "coverage": coverage, "record": txt_string}
+
+
 def get_mx_records(domain: str) -> List[str]:
     """
     Get MX records for a domain.
@@ -362,30 +424,7 @@ def check_dmarc(domain: str) -> Dict[str, Any]:
                 ]
             )
             if "v=DMARC1" in txt_string:
-                result["record"] = txt_string
-                
-                # Parse policy
-                if "p=none" in txt_string or "p=NONE" in txt_string:
-                    result["policy"] = "none"
-                elif "p=quarantine" in txt_string or "p=QUARANTINE" in txt_string:
-                    result["policy"] = "quarantine"
-                elif "p=reject" in txt_string or "p=REJECT" in txt_string:
-                    result["policy"] = "reject"
-                else:
-                    # Default to "none" if policy not explicitly set
-                    result["policy"] = "none"
-                
-                # Parse coverage (pct=)
-                # DMARC spec: pct=0-100 (default: 100 if not specified)
-                pct_match = re.search(r'pct=(\d+)', txt_string, re.IGNORECASE)
-                if pct_match:
-                    coverage = int(pct_match.group(1))
-                    # Ensure coverage is in valid range (0-100)
-                    result["coverage"] = max(0, min(100, coverage))
-                else:
-                    # DMARC record var ama pct= belirtilmemiş → DMARC spec default: 100
-                    result["coverage"] = 100
-                
+                result.update(_parse_dmarc_record(txt_string))
                 return result
 
         # DMARC record bulunamadı → policy ve coverage None kalır
@@ -402,78 +441,281 @@ def check_dmarc(domain: str) -> Dict[str, Any]:
         return result
 
 
-def analyze_dns(domain: str, use_cache: bool = True) -> Dict[str, Any]:
+def _empty_dns_result() -> Dict[str, Any]:
+    """Default analyze_dns result (no records found)."""
+    return {
+        "mx_records": [],
+        "mx_root": None,
+        "spf": False,
+        "dkim": False,
+        "dmarc_policy": None,
+        "dmarc_coverage": None,  # None if DMARC record not found
+        "dmarc_record": None,
+        "status": "success",
+    }
+
+
+async def _query_async(
+    resolver: dns.asyncresolver.Resolver, qname: str, rdtype: str
+) -> Tuple[Optional[List[Any]], Optional[Exception]]:
     """
-    Perform complete DNS analysis for a domain.
+    Run a single async DNS query, capturing the error instead of raising.
 
-    Analyzes:
-    - MX records (and extracts root domain)
-    - SPF record
-    - DKIM record
-    - DMARC policy and coverage
+    Returns:
+        Tuple of (answer rdata list or None, exception or None)
+    """
+    try:
+        answer = await resolver.resolve(qname, rdtype)
+        return list(answer), None
+    except Exception as e:
+        return None, e
 
-    Uses Redis-based caching (1 hour TTL) to reduce DNS queries.
+
+def _mx_from_answer(answer: Optional[List[Any]]) -> List[str]:
+    """MX hostnames sorted by preference (same semantics as get_mx_records)."""
+    if not answer:
+        return []
+    try:
+        mx_list = [(mx.preference, str(mx.exchange).rstrip(".")) for mx in answer]
+        mx_list.sort(key=lambda x: x[0])
+        return [mx[1] for mx in mx_list]
+    except Exception:
+        return []
+
+
+def _spf_from_answer(answer: Optional[List[Any]]) -> bool:
+    """SPF presence (same semantics as check_spf)."""
+    if not answer:
+        return False
+    try:
+        return any(_txt_to_string(txt).startswith("v=spf1") for txt in answer)
+    except Exception:
+        return False
+
+
+def _dkim_from_answers(
+    primary: Tuple[Optional[List[Any]], Optional[Exception]],
+    alternates: List[Tuple[Optional[List[Any]], Optional[Exception]]],
+) -> bool:
+    """
+    DKIM presence (same semantics as check_dkim).
+
+    Alternate selectors only count when the primary selector has no record
+    (NoAnswer / NXDOMAIN / NoNameservers), exactly like the sequential fallback.
+    """
+    answer, error = primary
+    if error is None:
+        try:
+            return any(_is_dkim_record(_txt_to_string(txt)) for txt in answer)
+        except Exception:
+            return False
+
+    if not isinstance(
+        error, (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers)
+    ):
+        return False
+
+    for alt_answer, alt_error in alternates:
+        if alt_error is not None:
+            continue
+        try:
+            if any(_is_dkim_record(_txt_to_string(txt)) for txt in alt_answer):
+                return True
+        except Exception:
+            continue
+    return False
+
+
+def _dmarc_from_answer(answer: Optional[List[Any]]) -> Dict[str, Any]:
+    """DMARC policy/coverage/record (same semantics as check_dmarc)."""
+    result = {"policy": None, "coverage": None, "record": None}
+    if not answer:
+        return result
+    try:
+        for txt in answer:
+            txt_string = _txt_to_string(txt)
+            if "v=DMARC1" in txt_string:
+                result.update(_parse_dmarc_record(txt_string))
+                return result
+    except Exception:
+        pass
+    return result
+
+
+async def analyze_dns_async(
+    domain: str,
+    use_cache: bool = True,
+    resolver: Optional[dns.asyncresolver.Resolver] = None,
+) -> Dict[str, Any]:
+    """
+    Perform complete DNS analysis for a domain with all lookups in flight at once.
+
+    MX, SPF, DMARC and every DKIM selector are queried concurrently, so the
+    wall time is that of the slowest single lookup instead of their sum.
+    Returns exactly the same dict shape as analyze_dns().
 
     Args:
         domain: Domain name to analyze
         use_cache: Whether to use cache (default: True)
+        resolver: Optional shared async resolver (analyze_dns_many passes one)
 
     Returns:
-        Dictionary with analysis results:
-        - mx_records: List of MX hostnames
-        - mx_root: Root domain of first MX record (or None)
-        - spf: bool (SPF record exists)
-        - dkim: bool (DKIM record exists)
-        - dmarc_policy: str ("none", "quarantine", "reject", or None)
-        - dmarc_coverage: int (0-100 if DMARC record found, None if not found)
-        - dmarc_record: str (Full DMARC record string, or None)
-        - status: str ("success", "dns_timeout", "invalid_domain")
+        Dictionary with analysis results (see analyze_dns)
     """
-    # Check cache first
+    # The cache client is sync Redis: keep it off the event loop
     if use_cache:
-        cached_result = get_cached_dns(domain)
+        cached_result = await asyncio.to_thread(get_cached_dns, domain)
         if cached_result is not None:
             return cached_result
 
-    result = {
-        "mx_records": [],
-        "mx_root": None,
-        "spf": False,
-        "dkim": False,
-        "dmarc_policy": None,
-        "dmarc_coverage": None,  # None if DMARC record not found
-        "dmarc_record": None,
-        "status": "success",
-    }
+    result = _empty_dns_result()
 
     try:
-        # Get MX records
-        mx_records = get_mx_records(domain)
+        if resolver is None:
+            resolver = _get_async_resolver()
+
+        queries = [
+            _query_async(resolver, domain, "MX"),
+            _query_async(resolver, domain, "TXT"),
+            _query_async(resolver, f"_dmarc.{domain}", "TXT"),
+        ]
+        # Primary selector ("default") first, then the alternates
+        queries.extend(
+            _query_async(resolver, f"{selector}._domainkey.{domain}", "TXT")
+            for selector in DKIM_COMMON_SELECTORS
+        )
+
+        mx_answer, spf_answer, dmarc_answer, dkim_primary, *dkim_alternates = (
+            await asyncio.gather(*queries)
+        )
+
+        mx_records = _mx_from_answer(mx_answer[0])
         result["mx_records"] = mx_records
 
         # Extract MX root from first MX record
         if mx_records:
             result["mx_root"] = extract_mx_root(mx_records[0])
 
-        # Check SPF
-        result["spf"] = check_spf(domain)
-
-        # Check DKIM
-        result["dkim"] = check_dkim(domain)
+        result["spf"] = _spf_from_answer(spf_answer[0])
+        result["dkim"] = _dkim_from_answers(dkim_primary, dkim_alternates)
 
-        # Check DMARC (returns dict with policy, coverage, record)
-        dmarc_result = check_dmarc(domain)
+        dmarc_result = _dmarc_from_answer(dmarc_answer[0])
         result["dmarc_policy"] = dmarc_result.get("policy")
         result["dmarc_coverage"] = dmarc_result.get("coverage")  # None if DMARC record not found
         result["dmarc_record"] = dmarc_result.get("record")
 
     except (dns.exception.Timeout, socket.timeout):
         result["status"] = "dns_timeout"
-    except Exception as e:
+    except Exception:
         result["status"] = "invalid_domain"
 
     # Cache result (even if failed, to avoid repeated queries)
     if use_cache:
-        set_cached_dns(domain, result)
+        await asyncio.to_thread(set_cached_dns, domain, result)
 
     return result
+
+
+async def analyze_dns_many_async(
+    domains: Iterable[str],
+    use_cache: bool = True,
+    max_concurrency: int = DNS_MAX_CONCURRENT_DOMAINS,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyze many domains concurrently (bounded by max_concurrency).
+
+    Args:
+        domains: Domain names to analyze (duplicates are analyzed once)
+        use_cache: Whether to use cache (default: True)
+        max_concurrency: Max number of domains in flight at once
+
+    Returns:
+        Dict mapping domain -> analyze_dns result, in input order
+    """
+    unique_domains = list(dict.fromkeys(domains))
+    if not unique_domains:
+        return {}
+
+    resolver = _get_async_resolver()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _analyze(domain: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await analyze_dns_async(domain, use_cache=use_cache, resolver=resolver)
+
+    results = await asyncio.gather(*(_analyze(domain) for domain in unique_domains))
+    return dict(zip(unique_domains, results))
+
+
+def _run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    When called from a thread that already runs an event loop (e.g. an async
+    FastAPI route calling analyze_dns), the coroutine runs on a helper thread
+    with its own loop instead of failing with "event loop already running".
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def analyze_dns(domain: str, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Perform complete DNS analysis for a domain.
+
+    Analyzes:
+    - MX records (and extracts root domain)
+    - SPF record
+    - DKIM record
+    - DMARC policy and coverage
+
+    All lookups run concurrently (see analyze_dns_async).
+    Uses Redis-based caching (1 hour TTL) to reduce DNS queries.
+
+    Args:
+        domain: Domain name to analyze
+        use_cache: Whether to use cache (default: True)
+
+    Returns:
+        Dictionary with analysis results:
+        - mx_records: List of MX hostnames
+        - mx_root: Root domain of first MX record (or None)
+        - spf: bool (SPF record exists)
+        - dkim: bool (DKIM record exists)
+        - dmarc_policy: str ("none", "quarantine", "reject", or None)
+        - dmarc_coverage: int (0-100 if DMARC record found, None if not found)
+        - dmarc_record: str (Full DMARC record string, or None)
+        - status: str ("success", "dns_timeout", "invalid_domain")
+    """
+    return _run_sync(analyze_dns_async(domain, use_cache=use_cache))
+
+
+def analyze_dns_many(
+    domains: Iterable[str],
+    use_cache: bool = True,
+    max_concurrency: int = DNS_MAX_CONCURRENT_DOMAINS,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Perform complete DNS analysis for a batch of domains concurrently.
+
+    Args:
+        domains: Domain names to analyze
+        use_cache: Whether to use cache (default: True)
+        max_concurrency: Max number of domains in flight at once
+
+    Returns:
+        Dict mapping domain -> analyze_dns result
+
+    Examples:
+        >>> results = analyze_dns_many(["example.com", "example.org"])
+        >>> results["example.com"]["status"]
+        'success'
+    """
+    return _run_sync(
+        analyze_dns_many_async(domains, use_cache=use_cache, max_concurrency=max_concurrency)
+    )
@@ -2,11 +2,11 @@
 
 import os
 import threading
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from dataclasses import dataclass, asdict
 from app.config import settings
 from app.core.logging import logger
-from app.core.cache import get_cached_ip_enrichment, set_cached_ip_enrichment
+from app.core.cache import get_cached_ip_enrichments, set_cached_ip_enrichments
 
 
 @dataclass
@@ -50,6 +50,24 @@ _ip2proxy_db = None
 _loader_lock = threading.Lock()  # Thread safety for lazy loading
 
 
+def _maxmind_reader_mode() -> int:
+    """
+    Memory-mapped reader mode for MaxMind databases.
+
+    MODE_MMAP_EXT (libmaxminddb C extension) when available, otherwise the
+    pure-Python MODE_MMAP; databases are never read into process memory.
+    """
+    import maxminddb
+
+    try:
+        from maxminddb import extension
+    except ImportError:
+        extension = None
+    if extension is not None and hasattr(extension, "Reader"):
+        return maxminddb.MODE_MMAP_EXT
+    return maxminddb.MODE_MMAP
+
+
 def _load_maxmind_asn() -> Optional[object]:
     """Load MaxMind GeoLite2 ASN database reader (thread-safe lazy loading)."""
     global _maxmind_asn_reader
@@ -76,7 +94,9 @@ def _load_maxmind_asn() -> Optional[object]:
         
         try:
             import geoip2.database
-            _maxmind_asn_reader = geoip2.database.Reader(settings.enrichment_db_path_maxmind_asn)
+            _maxmind_asn_reader = geoip2.database.Reader(
+                settings.enrichment_db_path_maxmind_asn, mode=_maxmind_reader_mode()
+            )
             logger.info("maxmind_asn_db_loaded", path=settings.enrichment_db_path_maxmind_asn)
             return _maxmind_asn_reader
         except ImportError:
@@ -113,7 +133,9 @@ def _load_maxmind_city() -> Optional[object]:
         
         try:
             import geoip2.database
-            _maxmind_city_reader = geoip2.database.Reader(settings.enrichment_db_path_maxmind_city)
+            _maxmind_city_reader = geoip2.database.Reader(
+                settings.enrichment_db_path_maxmind_city, mode=_maxmind_reader_mode()
+            )
             logger.info("maxmind_city_db_loaded", path=settings.enrichment_db_path_maxmind_city)
             return _maxmind_city_reader
         except ImportError:
@@ -150,7 +172,9 @@ def _load_maxmind_country() -> Optional[object]:
         
         try:
             import geoip2.database
-            _maxmind_country_reader = geoip2.database.Reader(settings.enrichment_db_path_maxmind_country)
+            _maxmind_country_reader = geoip2.database.Reader(
+                settings.enrichment_db_path_maxmind_country, mode=_maxmind_reader_mode()
+            )
             logger.info("maxmind_country_db_loaded", path=settings.enrichment_db_path_maxmind_country)
             return _maxmind_country_reader
         except ImportError:
@@ -236,39 +260,33 @@ def _load_ip2proxy() -> Optional[object]:
             return None
 
 
-def enrich_ip(ip: str, use_cache: bool = True) -> Optional[IpEnrichmentResult]:
+def _enrichment_readers() -> Dict[str, Optional[object]]:
+    """Resolve all enrichment readers once (None for unavailable sources)."""
+    return {
+        "maxmind_asn": _load_maxmind_asn(),
+        "maxmind_city": _load_maxmind_city(),
+        "maxmind_country": _load_maxmind_country(),
+        "ip2location": _load_ip2location(),
+        "ip2proxy": _load_ip2proxy(),
+    }
+
+
+def _lookup_ip(ip: str, readers: Dict[str, Optional[object]]) -> IpEnrichmentResult:
     """
-    Enrich IP address using MaxMind, IP2Location, and IP2Proxy databases.
-    
+    Look up one IP in every available source.
+
     Args:
-        ip: IP address to enrich (IPv4 or IPv6)
-        use_cache: Whether to use cache (default: True)
-        
+        ip: IP address (IPv4 or IPv6)
+        readers: Result of _enrichment_readers()
+
     Returns:
-        IpEnrichmentResult with enrichment data, or None if no data sources available
-        or all lookups fail
-        
-    Examples:
-        >>> result = enrich_ip("8.8.8.8")
-        >>> result.country
-        'US'
-        >>> result.asn
-        15169
+        IpEnrichmentResult (empty if no source has data)
     """
-    if not ip:
-        return None
-    
-    # Check cache first
-    if use_cache:
-        cached_result = get_cached_ip_enrichment(ip)
-        if cached_result:
-            return IpEnrichmentResult(**cached_result)
-    
     result = IpEnrichmentResult()
     
     # MaxMind ASN lookup
     try:
-        asn_reader = _load_maxmind_asn()
+        asn_reader = readers["maxmind_asn"]
         if asn_reader:
             response = asn_reader.asn(ip)
             result.asn = response.autonomous_system_number
@@ -279,7 +297,7 @@ def enrich_ip(ip: str, use_cache: bool = True) -> Optional[IpEnrichmentResult]:
     
     # MaxMind City lookup (includes country data)
     try:
-        city_reader = _load_maxmind_city()
+        city_reader = readers["maxmind_city"]
         if city_reader:
             response = city_reader.city(ip)
             if response.country.iso_code:
@@ -293,7 +311,7 @@ def enrich_ip(ip: str, use_cache: bool = True) -> Optional[IpEnrichmentResult]:
     # MaxMind Country lookup (fallback if City DB not available or country not set)
     if not result.country:
         try:
-            country_reader = _load_maxmind_country()
+            country_reader = readers["maxmind_country"]
             if country_reader:
                 response = country_reader.country(ip)
                 if response.country.iso_code:
@@ -304,7 +322,7 @@ def enrich_ip(ip: str, use_cache: bool = True) -> Optional[IpEnrichmentResult]:
     
     # IP2Location lookup
     try:
-        ip2location_db = _load_ip2location()
+        ip2location_db = readers["ip2location"]
         if ip2location_db:
             rec = ip2location_db.get_all(ip)
             if rec:
@@ -326,7 +344,7 @@ def enrich_ip(ip: str, use_cache: bool = True) -> Optional[IpEnrichmentResult]:
     
     # IP2Proxy lookup
     try:
-        ip2proxy_db = _load_ip2proxy()
+        ip2proxy_db = readers["ip2proxy"]
         if ip2proxy_db:
             rec = ip2proxy_db.get_all(ip)
             if rec:
@@ -339,15 +357,76 @@ def enrich_ip(ip: str, use_cache: bool = True) -> Optional[IpEnrichmentResult]:
         # Graceful fail - log but continue
         logger.debug("ip2proxy_lookup_failed", ip=ip, error=str(e))
     
-    # Return None if no data was collected (all lookups failed or no DBs available)
-    if not result.has_data():
-        return None
-    
-    # Cache the result
+    return result
+
+
+def enrich_ips(
+    ips: Iterable[str], use_cache: bool = True
+) -> Dict[str, Optional[IpEnrichmentResult]]:
+    """
+    Enrich many IP addresses in one pass.
+
+    IPs are deduplicated (domains often share MX IPs), cached results are
+    fetched with one Redis MGET, the readers are resolved once for the
+    batch, and fresh results are cached with one Redis pipeline.
+
+    Args:
+        ips: IP addresses to enrich (IPv4 or IPv6; empty values are skipped)
+        use_cache: Whether to use cache (default: True)
+
+    Returns:
+        Dict mapping IP -> IpEnrichmentResult, or None when no source has
+        data for it, in input order
+    """
+    unique_ips = list(dict.fromkeys(ip for ip in ips if ip))
+    if not unique_ips:
+        return {}
+
+    results: Dict[str, Optional[IpEnrichmentResult]] = {}
     if use_cache:
-        set_cached_ip_enrichment(ip, result.to_dict())
+        for ip, cached_result in get_cached_ip_enrichments(unique_ips).items():
+            results[ip] = IpEnrichmentResult(**cached_result)
+
+    readers = _enrichment_readers()
+    fresh: Dict[str, dict] = {}
+    for ip in unique_ips:
+        if ip in results:
+            continue
+        result = _lookup_ip(ip, readers)
+        # None if no data was collected (all lookups failed or no DBs available)
+        results[ip] = result if result.has_data() else None
+        if results[ip] is not None:
+            fresh[ip] = result.to_dict()
+
+    # Cache the results
+    if use_cache and fresh:
+        set_cached_ip_enrichments(fresh)
+
+    return {ip: results[ip] for ip in unique_ips}
+
+
+def enrich_ip(ip: str, use_cache: bool = True) -> Optional[IpEnrichmentResult]:
+    """
+    Enrich IP address using MaxMind, IP2Location, and IP2Proxy databases.
     
-    return result
+    Args:
+        ip: IP address to enrich (IPv4 or IPv6)
+        use_cache: Whether to use cache (default: True)
+        
+    Returns:
+        IpEnrichmentResult with enrichment data, or None if no data sources available
+        or all lookups fail
+        
+    Examples:
+        >>> result = enrich_ip("8.8.8.8")
+        >>> result.country
+        'US'
+        >>> result.asn
+        15169
+    """
+    if not ip:
+        return None
+    return enrich_ips([ip], use_cache=use_cache)[ip]
 
 
 def check_enrichment_available() -> bool:
@@ -1,14 +1,24 @@
 """WHOIS analysis utilities for domain signals."""
 
+import asyncio
 import socket
+import threading
+import time
 import whois
 import httpx
 import json
-from typing import Dict, Optional, List, Tuple, Any
+from typing import Dict, Iterable, Optional, List, Tuple, Any
 from datetime import datetime
 from pathlib import Path
 from functools import lru_cache
 
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 # WHOIS timeout in seconds
 WHOIS_TIMEOUT = 5
@@ -16,9 +26,18 @@ WHOIS_TIMEOUT = 5
 # RDAP timeout in seconds
 RDAP_TIMEOUT = 3
 
+# Pooled keep-alive connections per RDAP registry (base URL)
+RDAP_MAX_CONNECTIONS_PER_REGISTRY = 10
+# get_whois_info_many: in-flight requests and min seconds between requests per registry
+RDAP_MAX_CONCURRENCY_PER_REGISTRY = 10
+RDAP_MIN_INTERVAL_PER_REGISTRY = 0.05  # <= 20 requests/second per registry
+# get_whois_info_many: max domains in flight (also bounds WHOIS fallback threads)
+WHOIS_MAX_CONCURRENT_DOMAINS = 20
+
 # Cache TTL in seconds (24 hours for WHOIS - data doesn't change)
 # Note: Using Redis cache now, TTL is handled by Redis
 from app.core.cache import get_cached_whois, set_cached_whois
+from app.core.analyzer_dns import _run_sync
 
 
 @lru_cache(maxsize=1)
@@ -42,10 +61,117 @@ def _get_tld(domain: str) -> str:
     return ""
 
 
+def _rdap_target(domain: str) -> Optional[Tuple[str, str]]:
+    """
+    Resolve the RDAP registry for a domain.
+
+    Returns:
+        Tuple of (RDAP base URL, lookup URL) or None if the TLD has no RDAP server
+    """
+    rdap_base = _load_tld_config().get("rdap_servers", {}).get(_get_tld(domain))
+    if not rdap_base:
+        return None
+    return rdap_base, f"{rdap_base}{domain}"
+
+
+def _rdap_client_kwargs() -> Dict[str, Any]:
+    """Shared httpx client settings for RDAP registries."""
+    return {
+        "timeout": RDAP_TIMEOUT,
+        "limits": httpx.Limits(
+            max_connections=RDAP_MAX_CONNECTIONS_PER_REGISTRY,
+            max_keepalive_connections=RDAP_MAX_CONNECTIONS_PER_REGISTRY,
+        ),
+        "http2": HTTP2_AVAILABLE,
+        "follow_redirects": True,
+    }
+
+
+# Long-lived pooled clients per RDAP base URL (thread-safe, shared by scan threads)
+_rdap_clients: Dict[str, httpx.Client] = {}
+_rdap_clients_lock = threading.Lock()
+
+
+def _get_rdap_client(rdap_base: str) -> httpx.Client:
+    """Get (or create) the pooled keep-alive client for an RDAP registry."""
+    client = _rdap_clients.get(rdap_base)
+    if client is None:
+        with _rdap_clients_lock:
+            client = _rdap_clients.get(rdap_base)
+            if client is None:
+                client = httpx.Client(**_rdap_client_kwargs())
+                _rdap_clients[rdap_base] = client
+    return client
+
+
+def close_rdap_clients() -> None:
+    """Close the pooled RDAP clients (e.g. on worker shutdown)."""
+    with _rdap_clients_lock:
+        for client in _rdap_clients.values():
+            client.close()
+        _rdap_clients.clear()
+
+
+def _parse_rdap_response(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Extract registrar, expiry and nameservers from an RDAP domain response.
+
+    Returns:
+        Dictionary with WHOIS information or None if it has no useful fields
+    """
+    result = {"registrar": None, "expires_at": None, "nameservers": None}
+
+    # Extract registrar
+    entities = data.get("entities", [])
+    for entity in entities:
+        roles = entity.get("roles", [])
+        if "registrar" in roles:
+            vcards = entity.get("vcardArray", [])
+            if vcards and len(vcards) > 1:
+                # Extract organization name from vCard
+                for item in vcards[1]:
+                    if isinstance(item, list) and len(item) >= 2:
+                        if item[0] == "fn" or item[0] == "org":
+                            result["registrar"] = (
+                                item[3] if len(item) > 3 else item[1]
+                            )
+                            break
+
+    # Extract expiration date
+    events = data.get("events", [])
+    for event in events:
+        if event.get("eventAction") == "expiration":
+            event_date = event.get("eventDate")
+            if event_date:
+                try:
+                    # Parse ISO 8601 date
+                    result["expires_at"] = datetime.fromisoformat(
+                        event_date.replace("Z", "+00:00")
+                    ).date()
+                except (ValueError, AttributeError):
+                    pass
+
+    # Extract nameservers
+    nameservers = data.get("nameservers", [])
+    if nameservers:
+        result["nameservers"] = [
+            ns.get("ldhName", "").lower().rstrip(".")
+            for ns in nameservers
+            if ns.get("ldhName")
+        ]
+
+    # Return if we got any useful information
+    if result["registrar"] or result["expires_at"] or result["nameservers"]:
+        return result
+    return None
+
+
 def _try_rdap(domain: str) -> Optional[Dict[str, Any]]:
     """
     Try to get WHOIS info via RDAP (modern protocol).
 
+    Uses the pooled keep-alive client of the domain's RDAP registry.
+
     Args:
         domain: Domain name to query
 
@@ -53,69 +179,14 @@ def _try_rdap(domain: str) -> Optional[Dict[str, Any]]:
         Dictionary with WHOIS information or None if fails
     """
     try:
-        config = _load_tld_config()
-        rdap_servers = config.get("rdap_servers", {})
-
-        tld = _get_tld(domain)
-        rdap_base = rdap_servers.get(tld)
-
-        if not rdap_base:
+        target = _rdap_target(domain)
+        if not target:
             return None
+        rdap_base, rdap_url = target
 
-        # Construct RDAP URL
-        rdap_url = f"{rdap_base}{domain}"
-
-        # Try RDAP lookup with timeout
-        with httpx.Client(timeout=RDAP_TIMEOUT) as client:
-            response = client.get(rdap_url, follow_redirects=True)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                result = {"registrar": None, "expires_at": None, "nameservers": None}
-
-                # Extract registrar
-                entities = data.get("entities", [])
-                for entity in entities:
-                    roles = entity.get("roles", [])
-                    if "registrar" in roles:
-                        vcards = entity.get("vcardArray", [])
-                        if vcards and len(vcards) > 1:
-                            # Extract organization name from vCard
-                            for item in vcards[1]:
-                                if isinstance(item, list) and len(item) >= 2:
-                                    if item[0] == "fn" or item[0] == "org":
-                                        result["registrar"] = (
-                                            item[3] if len(item) > 3 else item[1]
-                                        )
-                                        break
-
-                # Extract expiration date
-                events = data.get("events", [])
-                for event in events:
-                    if event.get("eventAction") == "expiration":
-                        event_date = event.get("eventDate")
-                        if event_date:
-                            try:
-                                # Parse ISO 8601 date
-                                result["expires_at"] = datetime.fromisoformat(
-                                    event_date.replace("Z", "+00:00")
-                                ).date()
-                            except (ValueError, AttributeError):
-                                pass
-
-                # Extract nameservers
-                nameservers = data.get("nameservers", [])
-                if nameservers:
-                    result["nameservers"] = [
-                        ns.get("ldhName", "").lower().rstrip(".")
-                        for ns in nameservers
-                        if ns.get("ldhName")
-                    ]
-
-                # Return if we got any useful information
-                if result["registrar"] or result["expires_at"] or result["nameservers"]:
-                    return result
+        response = _get_rdap_client(rdap_base).get(rdap_url)
+        if response.status_code == 200:
+            return _parse_rdap_response(response.json())
 
     except (httpx.TimeoutException, httpx.RequestError, Exception):
         # RDAP failed, will fallback to WHOIS
@@ -124,6 +195,65 @@ def _try_rdap(domain: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+class _RdapRegistryPool:
+    """
+    Async RDAP clients for one get_whois_info_many run.
+
+    One pooled AsyncClient per registry base URL, with a per-registry
+    concurrency cap (semaphore) and request spacing (rate cap).
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._rate_locks: Dict[str, asyncio.Lock] = {}
+        self._next_request_at: Dict[str, float] = {}
+
+    def _registry(self, rdap_base: str) -> httpx.AsyncClient:
+        if rdap_base not in self._clients:
+            self._clients[rdap_base] = httpx.AsyncClient(**_rdap_client_kwargs())
+            self._semaphores[rdap_base] = asyncio.Semaphore(RDAP_MAX_CONCURRENCY_PER_REGISTRY)
+            self._rate_locks[rdap_base] = asyncio.Lock()
+            self._next_request_at[rdap_base] = 0.0
+        return self._clients[rdap_base]
+
+    async def _wait_for_slot(self, rdap_base: str) -> None:
+        """Space requests to a registry by RDAP_MIN_INTERVAL_PER_REGISTRY."""
+        async with self._rate_locks[rdap_base]:
+            now = time.monotonic()
+            slot = max(now, self._next_request_at[rdap_base])
+            self._next_request_at[rdap_base] = slot + RDAP_MIN_INTERVAL_PER_REGISTRY
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def lookup(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Async equivalent of _try_rdap()."""
+        try:
+            target = _rdap_target(domain)
+            if not target:
+                return None
+            rdap_base, rdap_url = target
+
+            client = self._registry(rdap_base)
+            async with self._semaphores[rdap_base]:
+                await self._wait_for_slot(rdap_base)
+                response = await client.get(rdap_url)
+            if response.status_code == 200:
+                return _parse_rdap_response(response.json())
+
+        except (httpx.TimeoutException, httpx.RequestError, Exception):
+            # RDAP failed, will fallback to WHOIS
+            pass
+
+        return None
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
 def _check_cache(domain: str) -> Optional[Dict[str, Any]]:
     """Check if domain is in Redis cache."""
     return get_cached_whois(domain)
@@ -134,48 +264,18 @@ def _set_cache(domain: str, result: Optional[Dict[str, Any]]):
     set_cached_whois(domain, result)
 
 
-def get_whois_info(domain: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+def _try_whois(domain: str) -> Tuple[Optional[Dict[str, Any]], bool]:
     """
-    Get WHOIS information for a domain.
-
-    Strategy: RDAP → WHOIS fallback → graceful fail
-    - Tries RDAP first (modern, faster, JSON)
-    - Falls back to traditional WHOIS if RDAP fails
-    - Uses TLD-specific servers when available
-    - Implements Redis-based distributed caching (24 hour TTL)
-    - Returns None on failure (graceful degrade)
+    Get WHOIS info via traditional WHOIS (blocking, python-whois).
 
     Args:
         domain: Domain name to query
-        use_cache: Whether to use cache (default: True)
 
     Returns:
-        Dictionary with WHOIS information:
-        - registrar: str (registrar name) or None
-        - expires_at: date (expiration date) or None
-        - nameservers: List[str] (nameserver hostnames) or None
-        Returns None if both RDAP and WHOIS fail (graceful fail)
-
-    Examples:
-        >>> get_whois_info("example.com")
-        {'registrar': 'Example Registrar', 'expires_at': date(2025, 12, 31), 'nameservers': [...]}
-        >>> get_whois_info("invalid-domain-xyz-123.com")
-        None
+        Tuple of (WHOIS information or None, whether the result should be cached).
+        Unknown domains are not cached; empty results and failures are cached
+        as None to avoid repeated attempts.
     """
-    # Check cache first
-    if use_cache:
-        cached_result = _check_cache(domain)
-        if cached_result is not None:
-            return cached_result
-
-    # Try RDAP first (modern protocol, faster, JSON format)
-    rdap_result = _try_rdap(domain)
-    if rdap_result:
-        if use_cache:
-            _set_cache(domain, rdap_result)
-        return rdap_result
-
-    # Fallback to traditional WHOIS
     try:
         # Set socket timeout for WHOIS lookup
         socket.setdefaulttimeout(WHOIS_TIMEOUT)
@@ -196,7 +296,7 @@ def get_whois_info(domain: str, use_cache: bool = True) -> Optional[Dict[str, An
 
         # If domain doesn't exist, whois.whois() might return None or empty dict
         if not w or (isinstance(w, dict) and not w.get("domain_name")):
-            return None
+            return None, False
 
         result = {"registrar": None, "expires_at": None, "nameservers": None}
 
@@ -257,20 +357,132 @@ def get_whois_info(domain: str, use_cache: bool = True) -> Optional[Dict[str, An
             and not result["expires_at"]
             and not result["nameservers"]
         ):
-            if use_cache:
-                _set_cache(domain, None)
-            return None
+            return None, True
 
-        # Cache successful result
-        if use_cache:
-            _set_cache(domain, result)
-
-        return result
+        return result, True
 
     except (socket.timeout, Exception):
         # Timeout or parsing error - graceful fail
         # Note: python-whois may raise various exceptions, catch all for graceful fail
         # Cache the failure to avoid repeated attempts
+        return None, True
+
+
+def get_whois_info(domain: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Get WHOIS information for a domain.
+
+    Strategy: RDAP → WHOIS fallback → graceful fail
+    - Tries RDAP first (modern, faster, JSON)
+    - Falls back to traditional WHOIS if RDAP fails
+    - Uses TLD-specific servers when available
+    - Implements Redis-based distributed caching (24 hour TTL)
+    - Returns None on failure (graceful degrade)
+
+    Args:
+        domain: Domain name to query
+        use_cache: Whether to use cache (default: True)
+
+    Returns:
+        Dictionary with WHOIS information:
+        - registrar: str (registrar name) or None
+        - expires_at: date (expiration date) or None
+        - nameservers: List[str] (nameserver hostnames) or None
+        Returns None if both RDAP and WHOIS fail (graceful fail)
+
+    Examples:
+        >>> get_whois_info("example.com")
+        {'registrar': 'Example Registrar', 'expires_at': date(2025, 12, 31), 'nameservers': [...]}
+        >>> get_whois_info("invalid-domain-xyz-123.com")
+        None
+    """
+    # Check cache first
+    if use_cache:
+        cached_result = _check_cache(domain)
+        if cached_result is not None:
+            return cached_result
+
+    # Try RDAP first (modern protocol, faster, JSON format)
+    rdap_result = _try_rdap(domain)
+    if rdap_result:
         if use_cache:
-            _set_cache(domain, None)
-        return None
+            _set_cache(domain, rdap_result)
+        return rdap_result
+
+    # Fallback to traditional WHOIS
+    result, should_cache = _try_whois(domain)
+    if use_cache and should_cache:
+        _set_cache(domain, result)
+    return result
+
+
+async def get_whois_info_many_async(
+    domains: Iterable[str],
+    use_cache: bool = True,
+    max_concurrency: int = WHOIS_MAX_CONCURRENT_DOMAINS,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Get WHOIS information for many domains concurrently.
+
+    Same strategy and caching rules as get_whois_info(). RDAP lookups share
+    one pooled client per registry, capped by RDAP_MAX_CONCURRENCY_PER_REGISTRY
+    and spaced by RDAP_MIN_INTERVAL_PER_REGISTRY; WHOIS fallbacks run in
+    worker threads.
+
+    Args:
+        domains: Domain names to query (duplicates are queried once)
+        use_cache: Whether to use cache (default: True)
+        max_concurrency: Max number of domains in flight at once
+
+    Returns:
+        Dict mapping domain -> get_whois_info result, in input order
+    """
+    unique_domains = list(dict.fromkeys(domains))
+    if not unique_domains:
+        return {}
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    pool = _RdapRegistryPool()
+
+    async def _lookup(domain: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            if use_cache:
+                cached_result = await asyncio.to_thread(_check_cache, domain)
+                if cached_result is not None:
+                    return cached_result
+
+            result = await pool.lookup(domain)
+            should_cache = True
+            if not result:
+                result, should_cache = await asyncio.to_thread(_try_whois, domain)
+
+            if use_cache and should_cache:
+                await asyncio.to_thread(_set_cache, domain, result)
+            return result
+
+    try:
+        results = await asyncio.gather(*(_lookup(domain) for domain in unique_domains))
+    finally:
+        await pool.aclose()
+    return dict(zip(unique_domains, results))
+
+
+def get_whois_info_many(
+    domains: Iterable[str],
+    use_cache: bool = True,
+    max_concurrency: int = WHOIS_MAX_CONCURRENT_DOMAINS,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Get WHOIS information for a batch of domains concurrently.
+
+    Args:
+        domains: Domain names to query
+        use_cache: Whether to use cache (default: True)
+        max_concurrency: Max number of domains in flight at once
+
+    Returns:
+        Dict mapping domain -> get_whois_info result
+    """
+    return _run_sync(
+        get_whois_info_many_async(domains, use_cache=use_cache, max_concurrency=max_concurrency)
+    )
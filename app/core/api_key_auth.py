@@ -1,16 +1,21 @@
 """API Key authentication and rate limiting for webhook endpoints."""
 
 import bcrypt
+import hashlib
+import hmac
+import re
 import secrets
-from datetime import datetime
-from typing import Optional
-from fastapi import HTTPException, Security, Depends, Header
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from fastapi import BackgroundTasks, HTTPException, Security, Depends, Header
 from fastapi.security import APIKeyHeader
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
 from app.db.models import ApiKey
 from app.core.rate_limiter import RateLimiter
 from app.core.distributed_rate_limiter import DistributedRateLimiter
+from app.core.logging import logger
 from collections import defaultdict
 from threading import Lock
 import time
@@ -22,6 +27,34 @@ api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 _api_key_limiters: dict[str, DistributedRateLimiter] = {}
 _rate_limiter_lock = Lock()
 
+# Key format: hk_<lookup id>_<secret>; the lookup id is stored in ApiKey.key_prefix
+API_KEY_SCHEME = "hk"
+API_KEY_LOOKUP_ID_BYTES = 6  # 12 hex chars
+_API_KEY_PATTERN = re.compile(r"^hk_([0-9a-f]{12})_(.+)$")
+
+# Verified-key cache (per process): deactivation takes effect within the TTL
+API_KEY_CACHE_TTL = 60  # seconds
+API_KEY_CACHE_MAX_ENTRIES = 1024
+# last_used_at writes are coalesced and flushed at most this often
+API_KEY_USAGE_FLUSH_SECONDS = 60
+
+# Cache keys are HMACs of the presented key under a per-process secret, so
+# raw keys are never held in memory beyond the request
+_cache_hmac_key = secrets.token_bytes(32)
+_verified_keys: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
+_verified_keys_lock = Lock()
+
+# api_key_id -> latest use, written by flush_api_key_usage()
+_pending_usage: Dict[int, datetime] = {}
+_usage_lock = Lock()
+_last_usage_flush = time.monotonic()
+
+# Columns kept in the verified-key cache (everything except key_hash)
+_CACHED_COLUMNS = (
+    "id", "key_prefix", "name", "rate_limit_per_minute", "is_active",
+    "created_at", "last_used_at", "created_by",
+)
+
 
 def hash_api_key(api_key: str) -> str:
     """Hash an API key using bcrypt (with salt)."""
@@ -39,8 +72,144 @@ def check_api_key_hash(api_key: str, stored_hash: str) -> bool:
 
 
 def generate_api_key() -> str:
-    """Generate a new API key (32 bytes, base64 encoded)."""
-    return secrets.token_urlsafe(32)
+    """Generate a new API key: hk_<lookup id>_<32 random bytes, base64 encoded>."""
+    lookup_id = secrets.token_hex(API_KEY_LOOKUP_ID_BYTES)
+    return f"{API_KEY_SCHEME}_{lookup_id}_{secrets.token_urlsafe(32)}"
+
+
+def api_key_lookup_id(api_key: str) -> Optional[str]:
+    """Extract the non-secret lookup id from an API key (None for legacy keys)."""
+    match = _API_KEY_PATTERN.match(api_key)
+    return match.group(1) if match else None
+
+
+def _cache_key(api_key: str) -> bytes:
+    return hmac.new(_cache_hmac_key, api_key.encode(), hashlib.sha256).digest()
+
+
+def _get_verified_key(api_key: str) -> Optional[ApiKey]:
+    """Return a detached ApiKey for a recently verified key, or None."""
+    cache_key = _cache_key(api_key)
+    with _verified_keys_lock:
+        entry = _verified_keys.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, columns = entry
+        if expires_at <= time.monotonic():
+            del _verified_keys[cache_key]
+            return None
+    return ApiKey(**columns)
+
+
+def _set_verified_key(api_key: str, record: ApiKey):
+    """Cache a verified key (column snapshot, no key_hash)."""
+    columns = {name: getattr(record, name) for name in _CACHED_COLUMNS}
+    with _verified_keys_lock:
+        if len(_verified_keys) >= API_KEY_CACHE_MAX_ENTRIES:
+            # Drop the oldest entry (dicts keep insertion order)
+            _verified_keys.pop(next(iter(_verified_keys)))
+        _verified_keys[_cache_key(api_key)] = (time.monotonic() + API_KEY_CACHE_TTL, columns)
+
+
+def invalidate_api_key_cache(api_key_id: Optional[int] = None):
+    """
+    Drop verified keys from this process's cache.
+
+    Args:
+        api_key_id: Only drop entries of this key (default: drop all)
+    """
+    with _verified_keys_lock:
+        if api_key_id is None:
+            _verified_keys.clear()
+            return
+        for cache_key in [k for k, (_, columns) in _verified_keys.items() if columns["id"] == api_key_id]:
+            del _verified_keys[cache_key]
+
+
+def _find_api_key(api_key: str, db: Session) -> Optional[ApiKey]:
+    """
+    Look up and bcrypt-verify an API key.
+
+    Keys with a lookup id fetch exactly one row; legacy keys (no lookup id)
+    are checked against the active legacy rows only.
+    """
+    lookup_id = api_key_lookup_id(api_key)
+    if lookup_id is not None:
+        record = (
+            db.query(ApiKey)
+            .filter(ApiKey.key_prefix == lookup_id, ApiKey.is_active == True)
+            .first()
+        )
+        if record and check_api_key_hash(api_key, record.key_hash):
+            return record
+        return None
+
+    # Legacy keys: with bcrypt, we can't hash and compare directly, so we need to check each key
+    legacy_keys = (
+        db.query(ApiKey)
+        .filter(ApiKey.key_prefix.is_(None), ApiKey.is_active == True)
+        .all()
+    )
+    for record in legacy_keys:
+        if check_api_key_hash(api_key, record.key_hash):
+            return record
+    return None
+
+
+def _record_usage(api_key_id: int) -> bool:
+    """
+    Record a key use in memory.
+
+    Returns:
+        True if a flush is due (at most once per API_KEY_USAGE_FLUSH_SECONDS)
+    """
+    global _last_usage_flush
+    now = time.monotonic()
+    with _usage_lock:
+        _pending_usage[api_key_id] = datetime.now(timezone.utc)
+        if now - _last_usage_flush < API_KEY_USAGE_FLUSH_SECONDS:
+            return False
+        _last_usage_flush = now
+        return True
+
+
+def flush_api_key_usage(db: Optional[Session] = None) -> int:
+    """
+    Write coalesced last_used_at values (one bulk UPDATE by primary key).
+
+    Args:
+        db: Database session (default: a new session, closed afterwards)
+
+    Returns:
+        Number of API keys updated
+    """
+    with _usage_lock:
+        pending = dict(_pending_usage)
+        _pending_usage.clear()
+    if not pending:
+        return 0
+
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
+    try:
+        db.execute(
+            update(ApiKey),
+            [{"id": key_id, "last_used_at": used_at} for key_id, used_at in sorted(pending.items())],
+        )
+        db.commit()
+        return len(pending)
+    except Exception as e:
+        db.rollback()
+        # Keep the newest timestamps for the next flush
+        with _usage_lock:
+            for key_id, used_at in pending.items():
+                _pending_usage.setdefault(key_id, used_at)
+        logger.warning("api_key_usage_flush_failed", keys=len(pending), error=str(e))
+        return 0
+    finally:
+        if own_session:
+            db.close()
 
 
 def get_api_key_limiter(api_key_id: int, rate_limit_per_minute: int) -> DistributedRateLimiter:
@@ -72,17 +241,25 @@ def get_api_key_limiter(api_key_id: int, rate_limit_per_minute: int) -> Distribu
 
 
 async def verify_api_key(
-    x_api_key: Optional[str] = Security(api_key_header), db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    x_api_key: Optional[str] = Security(api_key_header),
+    db: Session = Depends(get_db),
 ) -> ApiKey:
     """
     Verify API key from header and return ApiKey model.
 
+    Recently verified keys are served from an in-process cache (no database
+    access, no bcrypt); otherwise one row is fetched by the key's lookup id
+    and verified. last_used_at is coalesced in memory and flushed in a
+    background task at most every API_KEY_USAGE_FLUSH_SECONDS.
+
     Args:
+        background_tasks: Request background tasks (usage flush)
         x_api_key: API key from X-API-Key header
         db: Database session
 
     Returns:
-        ApiKey model instance
+        ApiKey model instance (detached when served from the cache)
 
     Raises:
         HTTPException: If API key is missing, invalid, or inactive
@@ -92,22 +269,16 @@ async def verify_api_key(
             status_code=401, detail="API key required. Please provide X-API-Key header."
         )
 
-    # Look up API key in database (check all active keys)
-    # Note: With bcrypt, we can't hash and compare directly, so we need to check each key
-    api_keys = db.query(ApiKey).filter(ApiKey.is_active == True).all()
-    
-    api_key = None
-    for key in api_keys:
-        if check_api_key_hash(x_api_key, key.key_hash):
-            api_key = key
-            break
-
-    if not api_key:
-        raise HTTPException(status_code=401, detail="Invalid or inactive API key")
-
-    # Update last_used_at
-    api_key.last_used_at = datetime.utcnow()
-    db.commit()
+    api_key = _get_verified_key(x_api_key)
+    if api_key is None:
+        api_key = _find_api_key(x_api_key, db)
+        if not api_key:
+            raise HTTPException(status_code=401, detail="Invalid or inactive API key")
+        _set_verified_key(x_api_key, api_key)
+
+    # Update last_used_at (coalesced, written after the response)
+    if _record_usage(api_key.id):
+        background_tasks.add_task(flush_api_key_usage)
 
     # Check rate limit
     limiter = get_api_key_limiter(api_key.id, api_key.rate_limit_per_minute)
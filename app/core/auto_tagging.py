@@ -1,103 +1,146 @@
 """Auto-tagging logic for domains based on signals and scores (G17)."""
 
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from app.db.models import Tag, DomainSignal, LeadScore, Company
+from sqlalchemy.dialects.postgresql import insert
+from datetime import date, datetime
+from app.db.models import Tag
 from app.core.constants import MIGRATION_READY_SCORE, EXPIRE_SOON_DAYS
 
+# Domains per signal/score SELECT and tag INSERT
+AUTO_TAG_CHUNK_SIZE = 1000
 
-def apply_auto_tags(domain: str, db: Session) -> List[str]:
+# Signals, score and provider per domain (domains without signals or score are skipped)
+AUTO_TAG_INPUTS_QUERY = """
+    SELECT ds.domain, ds.spf, ds.dkim, ds.dmarc_policy, ds.expires_at,
+           ls.segment, ls.readiness_score, c.provider
+    FROM domain_signals ds
+    JOIN lead_scores ls ON ls.domain = ds.domain
+    LEFT JOIN companies c ON c.domain = ds.domain
+    WHERE ds.domain = ANY(:domains)
+"""
+
+
+def evaluate_auto_tags(row: Any, today: Optional[date] = None) -> List[str]:
     """
-    Apply auto-tags to a domain based on its signals and scores.
+    Evaluate the auto-tagging rules for one domain.
 
     Auto-tagging rules:
     - "security-risk": no SPF + no DKIM
-    - "migration-ready": Migration segment + score >= 70
+    - "migration-ready": Migration segment + score >= MIGRATION_READY_SCORE
     - "expire-soon": expires_at < 30 days
     - "weak-spf": SPF exists but weak (DMARC policy is 'none')
     - "google-workspace": provider = Google
     - "local-mx": provider = Local
 
     Args:
-        domain: Domain name
-        db: Database session
+        row: Row with spf, dkim, dmarc_policy, expires_at, segment,
+             readiness_score and provider attributes
+        today: Reference date for expire-soon (default: today)
 
     Returns:
-        List of tags that were applied
+        Matching tag names (in rule order)
     """
-    applied_tags = []
-
-    # Get domain signals
-    domain_signal = db.query(DomainSignal).filter(DomainSignal.domain == domain).first()
-
-    # Get lead score
-    lead_score = db.query(LeadScore).filter(LeadScore.domain == domain).first()
-
-    # Get company
-    company = db.query(Company).filter(Company.domain == domain).first()
-
-    if not domain_signal or not lead_score:
-        # Can't auto-tag without signals and scores
-        return applied_tags
+    tags = []
 
     # Check for security-risk: no SPF + no DKIM
-    if domain_signal.spf is False and domain_signal.dkim is False:
-        tag_name = "security-risk"
-        if not _tag_exists(domain, tag_name, db):
-            tag = Tag(domain=domain, tag=tag_name)
-            db.add(tag)
-            applied_tags.append(tag_name)
-
-    # Check for migration-ready: Migration segment + score >= 70
-    if (
-        lead_score.segment == "Migration"
-        and lead_score.readiness_score >= MIGRATION_READY_SCORE
-    ):
-        tag_name = "migration-ready"
-        if not _tag_exists(domain, tag_name, db):
-            tag = Tag(domain=domain, tag=tag_name)
-            db.add(tag)
-            applied_tags.append(tag_name)
+    if row.spf is False and row.dkim is False:
+        tags.append("security-risk")
+
+    # Check for migration-ready: Migration segment + high score
+    if row.segment == "Migration" and row.readiness_score >= MIGRATION_READY_SCORE:
+        tags.append("migration-ready")
 
     # Check for expire-soon: expires_at < 30 days
-    if domain_signal.expires_at:
-        days_until_expiry = (domain_signal.expires_at - datetime.now().date()).days
+    if row.expires_at:
+        days_until_expiry = (row.expires_at - (today or datetime.now().date())).days
         if 0 < days_until_expiry < EXPIRE_SOON_DAYS:
-            tag_name = "expire-soon"
-            if not _tag_exists(domain, tag_name, db):
-                tag = Tag(domain=domain, tag=tag_name)
-                db.add(tag)
-                applied_tags.append(tag_name)
+            tags.append("expire-soon")
 
     # Check for weak-spf: SPF exists but DMARC policy is 'none'
-    if domain_signal.spf is True and domain_signal.dmarc_policy == "none":
-        tag_name = "weak-spf"
-        if not _tag_exists(domain, tag_name, db):
-            tag = Tag(domain=domain, tag=tag_name)
-            db.add(tag)
-            applied_tags.append(tag_name)
-
-    # Check for google-workspace: provider = Google
-    if company and company.provider == "Google":
-        tag_name = "google-workspace"
-        if not _tag_exists(domain, tag_name, db):
-            tag = Tag(domain=domain, tag=tag_name)
-            db.add(tag)
-            applied_tags.append(tag_name)
-
-    # Check for local-mx: provider = Local
-    if company and company.provider == "Local":
-        tag_name = "local-mx"
-        if not _tag_exists(domain, tag_name, db):
-            tag = Tag(domain=domain, tag=tag_name)
-            db.add(tag)
-            applied_tags.append(tag_name)
-
-    return applied_tags
-
-
-def _tag_exists(domain: str, tag_name: str, db: Session) -> bool:
-    """Check if a tag already exists for a domain."""
-    existing = db.query(Tag).filter(Tag.domain == domain, Tag.tag == tag_name).first()
-    return existing is not None
+    if row.spf is True and row.dmarc_policy == "none":
+        tags.append("weak-spf")
+
+    # Check for google-workspace / local-mx: provider = Google / Local
+    if row.provider == "Google":
+        tags.append("google-workspace")
+    if row.provider == "Local":
+        tags.append("local-mx")
+
+    return tags
+
+
+def apply_auto_tags_bulk(
+    domains: Iterable[str],
+    db: Session,
+    chunk_size: int = AUTO_TAG_CHUNK_SIZE,
+) -> Dict[str, List[str]]:
+    """
+    Apply auto-tags to a batch of domains.
+
+    Per chunk: one SELECT for signals, scores and providers, then one
+    INSERT ... ON CONFLICT (domain, tag) DO NOTHING RETURNING for every
+    matching tag. Existing tags are skipped by the unique key, so the
+    RETURNING rows are exactly the newly applied tags.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        domains: Normalized domains
+        db: Database session
+        chunk_size: Domains per query
+
+    Returns:
+        Dict mapping domain -> list of tags that were applied (domains
+        without new tags are omitted)
+    """
+    unique_domains = sorted({d for d in domains if d})
+    today = datetime.now().date()
+    applied: Dict[str, List[str]] = {}
+
+    for start in range(0, len(unique_domains), chunk_size):
+        rows = db.execute(
+            text(AUTO_TAG_INPUTS_QUERY),
+            {"domains": unique_domains[start : start + chunk_size]},
+        ).fetchall()
+
+        candidates = {row.domain: evaluate_auto_tags(row, today) for row in rows}
+        values = [
+            {"domain": domain, "tag": tag}
+            for domain in sorted(candidates)
+            for tag in candidates[domain]
+        ]
+        if not values:
+            continue
+
+        stmt = (
+            insert(Tag)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=["domain", "tag"])
+            .returning(Tag.domain, Tag.tag)
+        )
+        inserted = {(row.domain, row.tag) for row in db.execute(stmt).fetchall()}
+
+        for domain in sorted(candidates):
+            new_tags = [tag for tag in candidates[domain] if (domain, tag) in inserted]
+            if new_tags:
+                applied[domain] = new_tags
+
+    return applied
+
+
+def apply_auto_tags(domain: str, db: Session) -> List[str]:
+    """
+    Apply auto-tags to a domain based on its signals and scores.
+
+    See evaluate_auto_tags() for the rules.
+
+    Args:
+        domain: Domain name
+        db: Database session
+
+    Returns:
+        List of tags that were applied
+    """
+    return apply_auto_tags_bulk([domain], db).get(domain, [])
@@ -1,12 +1,17 @@
 """Bulk operations optimization utilities (P1-4)."""
 
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Tuple
 from datetime import datetime
 import json
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.core.logging import logger
+from app.core.normalizer import normalize_domain
 from app.core.redis_client import get_redis_client, is_redis_available
 
+# Domains per "= ANY(:domains)" existence query
+BULK_DOMAIN_LOOKUP_CHUNK_SIZE = 1000
+
 
 def calculate_optimal_batch_size(
     dns_rate_limit: float = 10.0,  # req/s
@@ -140,3 +145,57 @@ def get_bulk_log_context(
         "batch_size": batch_size,
     }
 
+
+
+def resolve_bulk_domains(
+    db: Session,
+    domains: Iterable[str],
+    chunk_size: int = BULK_DOMAIN_LOOKUP_CHUNK_SIZE,
+) -> Tuple[List[str], List[str]]:
+    """
+    Normalize a bulk domain list and check it against companies in bulk.
+
+    Runs one ``domain = ANY(:domains)`` query per chunk instead of one
+    query per domain. Invalid domains are dropped and duplicates collapsed
+    (first occurrence wins).
+
+    Args:
+        db: Database session
+        domains: Raw or normalized domain names
+        chunk_size: Domains per existence query
+
+    Returns:
+        Tuple of (normalized domains in input order, domains missing from companies)
+    """
+    normalized_domains = list(
+        dict.fromkeys(
+            normalized
+            for normalized in (normalize_domain(domain) for domain in domains)
+            if normalized
+        )
+    )
+
+    existing = set()
+    query = text("SELECT domain FROM companies WHERE domain = ANY(:domains)")
+    for start in range(0, len(normalized_domains), chunk_size):
+        chunk = normalized_domains[start : start + chunk_size]
+        existing.update(db.execute(query, {"domains": chunk}).scalars())
+
+    missing = [domain for domain in normalized_domains if domain not in existing]
+    return normalized_domains, missing
+
+
+def format_missing_domains(missing: List[str], limit: int = 5) -> str:
+    """
+    Build the 400 error detail for bulk requests with unknown domains.
+
+    Args:
+        missing: Domains not found in companies
+        limit: How many domains to list by name
+
+    Returns:
+        Error message
+    """
+    return f"Domains not found. Please ingest first: {', '.join(missing[:limit])}" + (
+        f" and {len(missing) - limit} more" if len(missing) > limit else ""
+    )
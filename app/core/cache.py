@@ -1,9 +1,14 @@
-"""Redis-based distributed caching utilities."""
+"""Redis-based distributed caching utilities (with a process-local L1 tier)."""
 
 import json
+import time
 import hashlib
-from typing import Optional, Dict, Any
-from app.core.redis_client import get_redis_client, is_redis_available
+from collections import OrderedDict
+from threading import Lock
+from datetime import date
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from app.core.cache_codec import encode_cache_value, decode_cache_value
+from app.core.redis_client import get_redis_client, is_redis_available, mark_redis_unavailable
 from app.core.logging import logger, mask_pii
 
 # Cache metrics tracking (in-memory counters)
@@ -15,14 +20,107 @@ _cache_metrics = {
     "ttl_expirations": 0,
 }
 
+# Per-tier hit/miss counters (l1 = process-local, redis = shared)
+_tier_metrics = {
+    "l1": {"hits": 0, "misses": 0, "evictions": 0},
+    "redis": {"hits": 0, "misses": 0},
+}
+
 # Cache TTL constants (in seconds)
 DNS_CACHE_TTL = 3600  # 1 hour
 WHOIS_CACHE_TTL = 86400  # 24 hours
-PROVIDER_CACHE_TTL = 86400  # 24 hours
 SCORING_CACHE_TTL = 3600  # 1 hour
 SCAN_CACHE_TTL = 3600  # 1 hour
 IP_ENRICHMENT_CACHE_TTL = 86400  # 24 hours (IPs rarely change)
 
+# L1 (process-local) cache limits
+L1_CACHE_MAX_ENTRIES = 10000  # LRU bound across all prefixes
+# L1 TTL per key prefix (seconds). Kept short for results that rescans
+# invalidate from other processes; 0 (or missing prefix) disables L1.
+L1_CACHE_TTLS = {
+    "dns": 60,
+    "whois": 300,
+    "scoring": 60,
+    "ip_enrichment": 300,
+    "scan": 0,  # Full scan results stay Redis-only (rescan invalidation)
+}
+
+
+class _L1Cache:
+    """
+    Thread-safe, bounded LRU cache with per-entry expiry.
+
+    Immutable scalars (e.g. strings, dates, None) are stored as-is; containers
+    are stored as their encoded payload and decoded on hit, so callers never
+    share (and mutate) the same object.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bool, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, is_payload, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                _cache_metrics["ttl_expirations"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+        return True, (decode_cache_value(value) if is_payload else value)
+
+    def set(self, key: str, value: Any, ttl: float, payload: Optional[bytes] = None):
+        """Store a value (payload = its encode_cache_value() bytes, used for containers)."""
+        if isinstance(value, (str, int, float, bool, date)) or value is None:
+            entry = (time.monotonic() + ttl, False, value)
+        else:
+            entry = (time.monotonic() + ttl, True, payload if payload is not None else encode_cache_value(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                _tier_metrics["l1"]["evictions"] += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_l1_cache = _L1Cache(L1_CACHE_MAX_ENTRIES)
+
+
+def _l1_ttl(key: str) -> int:
+    """L1 TTL for a full cache key (cache:{prefix}:...)."""
+    parts = key.split(":", 2)
+    if len(parts) < 3:
+        return 0
+    return L1_CACHE_TTLS.get(parts[1], 0)
+
+
+def clear_l1_cache():
+    """Drop all process-local cache entries (for testing)."""
+    _l1_cache.clear()
+
 
 def _get_cache_key(prefix: str, key: str) -> str:
     """Generate cache key with prefix."""
@@ -67,14 +165,25 @@ def _mask_cache_key(key: str) -> str:
 
 def get_cached_value(key: str) -> Optional[Any]:
     """
-    Get cached value from Redis.
-    
+    Get cached value (process-local L1 first, then Redis).
+
+    Redis hits are promoted into L1 for the key prefix's L1 TTL.
+
     Args:
         key: Cache key
-        
+
     Returns:
-        Cached value (deserialized from JSON) or None if not found/expired
+        Cached value (decoded by decode_cache_value()) or None if not found/expired
     """
+    l1_ttl = _l1_ttl(key)
+    if l1_ttl > 0:
+        found, value = _l1_cache.get(key)
+        if found:
+            _tier_metrics["l1"]["hits"] += 1
+            _cache_metrics["hits"] += 1
+            return value
+        _tier_metrics["l1"]["misses"] += 1
+
     if not is_redis_available():
         _cache_metrics["misses"] += 1
         return None
@@ -86,27 +195,43 @@ def get_cached_value(key: str) -> Optional[Any]:
     
     try:
         cached = redis_client.get(key)
-        if cached:
-            _cache_metrics["hits"] += 1
-            return json.loads(cached.decode())
-        else:
-            _cache_metrics["misses"] += 1
     except Exception as e:
         # Use debug level for cache failures (common, not critical)
         # Mask key to prevent PII leakage
         logger.debug("cache_get_failed", key=_mask_cache_key(key), operation="get", error=str(e))
+        mark_redis_unavailable()
         _cache_metrics["misses"] += 1
-    
-    return None
+        return None
+
+    if not cached:
+        _tier_metrics["redis"]["misses"] += 1
+        _cache_metrics["misses"] += 1
+        return None
+
+    try:
+        value = decode_cache_value(cached)
+    except ValueError as e:
+        # Corrupt entry or unknown codec version: treat as a miss (Redis is fine)
+        logger.debug("cache_decode_failed", key=_mask_cache_key(key), error=str(e))
+        _tier_metrics["redis"]["misses"] += 1
+        _cache_metrics["misses"] += 1
+        return None
+
+    _tier_metrics["redis"]["hits"] += 1
+    _cache_metrics["hits"] += 1
+    if l1_ttl > 0:
+        _l1_cache.set(key, value, l1_ttl, cached)
+    return value
 
 
 def set_cached_value(key: str, value: Any, ttl: int) -> bool:
     """
-    Set cached value in Redis with TTL.
+    Set cached value in Redis with TTL (and in L1 with the prefix's L1 TTL).
     
     Args:
         key: Cache key
-        value: Value to cache (will be serialized to JSON)
+        value: Value to cache (encoded by encode_cache_value(): JSON types,
+            date, datetime and set)
         ttl: Time to live in seconds
         
     Returns:
@@ -120,16 +245,128 @@ def set_cached_value(key: str, value: Any, ttl: int) -> bool:
         return False
     
     try:
-        serialized = json.dumps(value)
+        serialized = encode_cache_value(value)
+    except (TypeError, ValueError) as e:
+        # Unsupported type: a caller bug, not a Redis failure
+        logger.warning("cache_encode_failed", key=_mask_cache_key(key), error=str(e))
+        return False
+
+    try:
         redis_client.setex(key, ttl, serialized)
         _cache_metrics["sets"] += 1
-        return True
     except Exception as e:
         # Use debug level for cache failures (common, not critical)
         # Mask key to prevent PII leakage
         logger.debug("cache_set_failed", key=_mask_cache_key(key), operation="set", error=str(e))
+        mark_redis_unavailable()
         return False
 
+    l1_ttl = min(_l1_ttl(key), ttl)
+    if l1_ttl > 0:
+        _l1_cache.set(key, value, l1_ttl, serialized)
+    return True
+
+
+def get_cached_values(keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Get many cached values (L1 first, then one Redis MGET for the rest).
+
+    Args:
+        keys: Cache keys
+
+    Returns:
+        Dict mapping key -> cached value (keys not found are omitted)
+    """
+    found: Dict[str, Any] = {}
+    remaining: List[str] = []
+    for key in dict.fromkeys(keys):
+        if _l1_ttl(key) > 0:
+            hit, value = _l1_cache.get(key)
+            if hit:
+                _tier_metrics["l1"]["hits"] += 1
+                _cache_metrics["hits"] += 1
+                found[key] = value
+                continue
+            _tier_metrics["l1"]["misses"] += 1
+        remaining.append(key)
+
+    if not remaining:
+        return found
+
+    redis_client = get_redis_client() if is_redis_available() else None
+    if redis_client is None:
+        _cache_metrics["misses"] += len(remaining)
+        return found
+
+    try:
+        payloads = redis_client.mget(remaining)
+    except Exception as e:
+        logger.debug("cache_get_failed", keys=len(remaining), operation="mget", error=str(e))
+        mark_redis_unavailable()
+        _cache_metrics["misses"] += len(remaining)
+        return found
+
+    for key, cached in zip(remaining, payloads):
+        try:
+            value = decode_cache_value(cached) if cached else None
+        except ValueError as e:
+            logger.debug("cache_decode_failed", key=_mask_cache_key(key), error=str(e))
+            cached = None
+        if not cached:
+            _tier_metrics["redis"]["misses"] += 1
+            _cache_metrics["misses"] += 1
+            continue
+        _tier_metrics["redis"]["hits"] += 1
+        _cache_metrics["hits"] += 1
+        l1_ttl = _l1_ttl(key)
+        if l1_ttl > 0:
+            _l1_cache.set(key, value, l1_ttl, cached)
+        found[key] = value
+    return found
+
+
+def set_cached_values(values: Dict[str, Any], ttl: int) -> int:
+    """
+    Set many cached values with one Redis pipeline (and in L1).
+
+    Args:
+        values: Dict mapping key -> value to cache
+        ttl: Time to live in seconds
+
+    Returns:
+        Number of values written
+    """
+    if not values or not is_redis_available():
+        return 0
+
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return 0
+
+    encoded: Dict[str, bytes] = {}
+    for key, value in values.items():
+        try:
+            encoded[key] = encode_cache_value(value)
+        except (TypeError, ValueError) as e:
+            logger.warning("cache_encode_failed", key=_mask_cache_key(key), error=str(e))
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key, payload in encoded.items():
+            pipe.setex(key, ttl, payload)
+        pipe.execute()
+        _cache_metrics["sets"] += len(encoded)
+    except Exception as e:
+        logger.debug("cache_set_failed", keys=len(encoded), operation="pipeline", error=str(e))
+        mark_redis_unavailable()
+        return 0
+
+    for key, payload in encoded.items():
+        l1_ttl = min(_l1_ttl(key), ttl)
+        if l1_ttl > 0:
+            _l1_cache.set(key, values[key], l1_ttl, payload)
+    return len(encoded)
+
 
 def delete_cached_value(key: str) -> bool:
     """
@@ -141,6 +378,9 @@ def delete_cached_value(key: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
+    # Always drop the local copy, even if Redis is down
+    _l1_cache.delete(key)
+
     if not is_redis_available():
         return False
     
@@ -180,19 +420,24 @@ def get_cache_metrics() -> Dict[str, Any]:
         "sets": _cache_metrics["sets"],
         "deletes": _cache_metrics["deletes"],
         "ttl_expirations": _cache_metrics["ttl_expirations"],
+        "tiers": {
+            "l1": {**_tier_metrics["l1"], "size": len(_l1_cache)},
+            "redis": dict(_tier_metrics["redis"]),
+        },
     }
 
 
 def reset_cache_metrics():
     """Reset cache metrics (for testing)."""
-    global _cache_metrics
-    _cache_metrics = {
-        "hits": 0,
-        "misses": 0,
-        "sets": 0,
-        "deletes": 0,
-        "ttl_expirations": 0,
-    }
+    _cache_metrics.update(
+        hits=0,
+        misses=0,
+        sets=0,
+        deletes=0,
+        ttl_expirations=0,
+    )
+    _tier_metrics["l1"].update(hits=0, misses=0, evictions=0)
+    _tier_metrics["redis"].update(hits=0, misses=0)
 
 
 # DNS Cache Functions
@@ -227,19 +472,6 @@ def set_cached_whois(domain: str, result: Optional[Dict[str, Any]]) -> bool:
     return set_cached_value(key, result, WHOIS_CACHE_TTL)
 
 
-# Provider Mapping Cache Functions
-def get_cached_provider(mx_root: str) -> Optional[str]:
-    """Get cached provider mapping."""
-    key = _get_cache_key("provider", mx_root)
-    return get_cached_value(key)
-
-
-def set_cached_provider(mx_root: str, provider: str) -> bool:
-    """Cache provider mapping."""
-    key = _get_cache_key("provider", mx_root)
-    return set_cached_value(key, provider, PROVIDER_CACHE_TTL)
-
-
 # Scoring Cache Functions
 def _generate_signals_hash(signals: Dict[str, Any]) -> str:
     """
@@ -284,6 +516,8 @@ def invalidate_scoring_cache(domain: str) -> int:
     Returns:
         Number of cache keys deleted
     """
+    _l1_cache.delete_prefix(_get_cache_key("scoring", f"{domain}:"))
+
     if not is_redis_available():
         return 0
     
@@ -346,3 +580,16 @@ def set_cached_ip_enrichment(ip: str, result: Dict[str, Any]) -> bool:
     key = _get_cache_key("ip_enrichment", ip)
     return set_cached_value(key, result, IP_ENRICHMENT_CACHE_TTL)
 
+
+def get_cached_ip_enrichments(ips: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Get cached IP enrichment results for many IPs (missing IPs are omitted)."""
+    keys = {_get_cache_key("ip_enrichment", ip): ip for ip in ips}
+    return {keys[key]: value for key, value in get_cached_values(keys).items() if value}
+
+
+def set_cached_ip_enrichments(results: Dict[str, Dict[str, Any]]) -> int:
+    """Cache IP enrichment results for many IPs (one Redis pipeline)."""
+    return set_cached_values(
+        {_get_cache_key("ip_enrichment", ip): result for ip, result in results.items()},
+        IP_ENRICHMENT_CACHE_TTL,
+    )
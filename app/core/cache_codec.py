@@ -0,0 +1,140 @@
+"""Typed binary codec for cache values (versioned envelopes)."""
+
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Tuple
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Envelope: MAGIC + version byte + body. JSON text never starts with NUL, so
+# entries written before the codec existed (plain JSON) are still readable.
+CACHE_ENVELOPE_MAGIC = b"\x00"
+# Version written by encode_cache_value(); older versions stay decodable
+CACHE_CODEC_VERSION = 1
+
+# Extension types (v1): encoded as single-key objects {tag: value}
+_TAG_DATE = "$date"
+_TAG_DATETIME = "$datetime"
+_TAG_SET = "$set"
+
+
+def _encode_ext(obj: Any) -> Any:
+    """JSON `default` hook for types JSON has no representation for."""
+    # datetime is a date subclass, check it first
+    if isinstance(obj, datetime):
+        return {_TAG_DATETIME: obj.isoformat()}
+    if isinstance(obj, date):
+        return {_TAG_DATE: obj.isoformat()}
+    if isinstance(obj, (set, frozenset)):
+        return {_TAG_SET: list(obj)}
+    raise TypeError(f"Type is not cache-serializable: {type(obj).__name__}")
+
+
+_EXT_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    _TAG_DATE: date.fromisoformat,
+    _TAG_DATETIME: datetime.fromisoformat,
+    _TAG_SET: set,
+}
+
+
+def _restore_ext(obj: Any) -> Any:
+    """Rebuild extension types from their {tag: value} objects."""
+    if isinstance(obj, list):
+        return [_restore_ext(item) for item in obj]
+    if isinstance(obj, dict):
+        if len(obj) == 1:
+            tag, value = next(iter(obj.items()))
+            decoder = _EXT_DECODERS.get(tag)
+            if decoder is not None:
+                return decoder(_restore_ext(value))
+        return {key: _restore_ext(value) for key, value in obj.items()}
+    return obj
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_encode_ext, option=_ORJSON_OPTIONS)
+
+    _loads = orjson.loads
+else:
+
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, default=_encode_ext, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+
+def _encode_v1(value: Any) -> bytes:
+    return _dumps(value)
+
+
+def _decode_v1(body: bytes) -> Any:
+    value = _loads(body)
+    # Fast path: no extension tags anywhere in the payload
+    if b'"$' not in body:
+        return value
+    return _restore_ext(value)
+
+
+# Codec per envelope version: (encode, decode)
+_CODECS: Dict[int, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    1: (_encode_v1, _decode_v1),
+}
+
+
+def encode_cache_value(value: Any) -> bytes:
+    """
+    Encode a cache value into a versioned envelope.
+
+    Supports JSON types plus date, datetime and set/frozenset.
+
+    Args:
+        value: Value to cache
+
+    Returns:
+        Envelope bytes (MAGIC + version + body)
+
+    Raises:
+        TypeError: If the value contains a type the codec cannot encode
+    """
+    encode, _ = _CODECS[CACHE_CODEC_VERSION]
+    return CACHE_ENVELOPE_MAGIC + bytes([CACHE_CODEC_VERSION]) + encode(value)
+
+
+def decode_cache_value(payload: bytes) -> Any:
+    """
+    Decode a cache payload written by encode_cache_value().
+
+    Payloads without an envelope are decoded as plain JSON (entries written
+    before the codec existed).
+
+    Args:
+        payload: Raw cache bytes
+
+    Returns:
+        Decoded value
+
+    Raises:
+        ValueError: If the payload is corrupt or its codec version is unknown
+    """
+    if isinstance(payload, str):
+        payload = payload.encode()
+
+    if not payload.startswith(CACHE_ENVELOPE_MAGIC):
+        return _loads(payload)
+
+    if len(payload) < 2:
+        raise ValueError("Truncated cache envelope")
+    codec = _CODECS.get(payload[1])
+    if codec is None:
+        raise ValueError(f"Unsupported cache codec version: {payload[1]}")
+    _, decode = codec
+    return decode(payload[2:])
@@ -32,13 +32,18 @@ celery_app.conf.update(
     beat_schedule={
         "daily-rescan": {
             "task": "app.core.tasks.daily_rescan_task",
-            "schedule": 86400.0,  # Run daily (24 hours in seconds)
-            "options": {"expires": 3600},  # Task expires after 1 hour if not picked up
+            "schedule": 3600.0,  # Run hourly: starts one run per day, resumes crashed runs
+            "options": {"expires": 600},  # Task expires after 10 minutes if not picked up
         },
         "process-pending-alerts": {
             "task": "app.core.tasks.process_pending_alerts_task",
             "schedule": 300.0,  # Run every 5 minutes
             "options": {"expires": 60},  # Task expires after 1 minute if not picked up
         },
+        "reconcile-dashboard-stats": {
+            "task": "app.core.tasks.reconcile_dashboard_stats_task",
+            "schedule": 3600.0,  # Run hourly
+            "options": {"expires": 600},  # Task expires after 10 minutes if not picked up
+        },
     },
 )
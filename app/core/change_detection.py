@@ -1,52 +1,82 @@
 """Change detection logic for domain signals and scores (G18)."""
 
-from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert
 from app.db.models import (
     DomainSignal,
     LeadScore,
-    Company,
     SignalChangeHistory,
     ScoreChangeHistory,
     Alert,
 )
 from app.core.constants import EXPIRE_SOON_DAYS
 
-
-def detect_signal_changes(
-    domain: str,
-    old_signal: Optional[DomainSignal],
-    new_signal: DomainSignal,
-    db: Session,
-) -> List[Dict]:
+# Domains per snapshot SELECT / rows per history and alert INSERT
+CHANGE_DETECTION_CHUNK_SIZE = 500
+
+# Change type -> alert type (changes of other types are recorded but not alerted)
+ALERT_TYPE_MAP = {
+    "mx_changed": "mx_changed",
+    "dmarc_added": "dmarc_added",
+    "expire_soon": "expire_soon",
+    "priority_score_changed": "score_changed",
+    "segment_changed": "score_changed",
+}
+
+# Signal and score columns compared between scans, per domain
+SNAPSHOT_QUERY = """
+    SELECT d.domain,
+           ds.domain IS NOT NULL AS has_signal,
+           ds.spf, ds.dkim, ds.dmarc_policy, ds.mx_root, ds.expires_at,
+           ls.domain IS NOT NULL AS has_score,
+           ls.readiness_score, ls.segment
+    FROM unnest(CAST(:domains AS text[])) AS d(domain)
+    LEFT JOIN domain_signals ds ON ds.domain = d.domain
+    LEFT JOIN lead_scores ls ON ls.domain = d.domain
+"""
+
+
+def _str_or_none(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def diff_signals(
+    domain: str, old_signal: Any, new_signal: Any, today: Optional[date] = None
+) -> Tuple[List[Dict], List[Dict]]:
     """
-    Detect changes in domain signals and create history records.
+    Compare two signal snapshots (no database access).
 
     Args:
         domain: Domain name
-        old_signal: Previous domain signal (None if first scan)
-        new_signal: New domain signal
-        db: Database session
+        old_signal: Previous signal (DomainSignal or snapshot row; None if first scan)
+        new_signal: New signal (DomainSignal or snapshot row)
+        today: Reference date for expiry checks (default: today)
 
     Returns:
-        List of detected changes with alert information
+        Tuple of (signal_change_history rows, detected changes)
     """
-    changes = []
+    history: List[Dict] = []
+    changes: List[Dict] = []
 
     if not old_signal:
         # First scan, no changes to detect
-        return changes
+        return history, changes
+
+    today = today or datetime.now().date()
 
     # Detect SPF changes
     if old_signal.spf != new_signal.spf:
-        change = SignalChangeHistory(
-            domain=domain,
-            signal_type="spf",
-            old_value=str(old_signal.spf) if old_signal.spf is not None else None,
-            new_value=str(new_signal.spf) if new_signal.spf is not None else None,
+        history.append(
+            {
+                "domain": domain,
+                "signal_type": "spf",
+                "old_value": _str_or_none(old_signal.spf),
+                "new_value": _str_or_none(new_signal.spf),
+            }
         )
-        db.add(change)
         changes.append(
             {
                 "type": "spf_changed",
@@ -57,13 +87,14 @@ def detect_signal_changes(
 
     # Detect DKIM changes
     if old_signal.dkim != new_signal.dkim:
-        change = SignalChangeHistory(
-            domain=domain,
-            signal_type="dkim",
-            old_value=str(old_signal.dkim) if old_signal.dkim is not None else None,
-            new_value=str(new_signal.dkim) if new_signal.dkim is not None else None,
+        history.append(
+            {
+                "domain": domain,
+                "signal_type": "dkim",
+                "old_value": _str_or_none(old_signal.dkim),
+                "new_value": _str_or_none(new_signal.dkim),
+            }
         )
-        db.add(change)
         changes.append(
             {
                 "type": "dkim_changed",
@@ -74,44 +105,41 @@ def detect_signal_changes(
 
     # Detect DMARC changes
     if old_signal.dmarc_policy != new_signal.dmarc_policy:
-        change = SignalChangeHistory(
-            domain=domain,
-            signal_type="dmarc",
-            old_value=old_signal.dmarc_policy,
-            new_value=new_signal.dmarc_policy,
+        history.append(
+            {
+                "domain": domain,
+                "signal_type": "dmarc",
+                "old_value": old_signal.dmarc_policy,
+                "new_value": new_signal.dmarc_policy,
+            }
         )
-        db.add(change)
 
         # Check if DMARC was added (none -> quarantine/reject)
         if old_signal.dmarc_policy in (None, "none") and new_signal.dmarc_policy in (
             "quarantine",
             "reject",
         ):
-            changes.append(
-                {
-                    "type": "dmarc_added",
-                    "old_value": old_signal.dmarc_policy,
-                    "new_value": new_signal.dmarc_policy,
-                }
-            )
+            change_type = "dmarc_added"
         else:
-            changes.append(
-                {
-                    "type": "dmarc_changed",
-                    "old_value": old_signal.dmarc_policy,
-                    "new_value": new_signal.dmarc_policy,
-                }
-            )
+            change_type = "dmarc_changed"
+        changes.append(
+            {
+                "type": change_type,
+                "old_value": old_signal.dmarc_policy,
+                "new_value": new_signal.dmarc_policy,
+            }
+        )
 
     # Detect MX root changes
     if old_signal.mx_root != new_signal.mx_root:
-        change = SignalChangeHistory(
-            domain=domain,
-            signal_type="mx",
-            old_value=old_signal.mx_root,
-            new_value=new_signal.mx_root,
+        history.append(
+            {
+                "domain": domain,
+                "signal_type": "mx",
+                "old_value": old_signal.mx_root,
+                "new_value": new_signal.mx_root,
+            }
         )
-        db.add(change)
         changes.append(
             {
                 "type": "mx_changed",
@@ -122,13 +150,12 @@ def detect_signal_changes(
 
     # Detect expiry changes (expire soon)
     if new_signal.expires_at:
-        days_until_expiry = (new_signal.expires_at - datetime.now().date()).days
+        days_until_expiry = (new_signal.expires_at - today).days
         if 0 < days_until_expiry < EXPIRE_SOON_DAYS:
             # Check if this is a new expiry warning
             if (
                 not old_signal.expires_at
-                or (old_signal.expires_at - datetime.now().date()).days
-                >= EXPIRE_SOON_DAYS
+                or (old_signal.expires_at - today).days >= EXPIRE_SOON_DAYS
             ):
                 changes.append(
                     {
@@ -138,43 +165,44 @@ def detect_signal_changes(
                     }
                 )
 
-    return changes
+    return history, changes
 
 
-def detect_score_changes(
-    domain: str, old_score: Optional[LeadScore], new_score: LeadScore, db: Session
-) -> List[Dict]:
+def diff_scores(
+    domain: str, old_score: Any, new_score: Any
+) -> Tuple[List[Dict], List[Dict]]:
     """
-    Detect changes in scores and segments and create history records.
+    Compare two score snapshots (no database access).
 
     Args:
         domain: Domain name
-        old_score: Previous lead score (None if first scan)
-        new_score: New lead score
-        db: Database session
+        old_score: Previous score (LeadScore or snapshot row; None if first scan)
+        new_score: New score (LeadScore or snapshot row)
 
     Returns:
-        List of detected changes with alert information
+        Tuple of (score_change_history rows, detected changes)
     """
-    changes = []
+    history: List[Dict] = []
+    changes: List[Dict] = []
 
     if not old_score:
         # First scan, no changes to detect
-        return changes
+        return history, changes
 
     # Detect score or segment changes
     score_changed = old_score.readiness_score != new_score.readiness_score
     segment_changed = old_score.segment != new_score.segment
 
     if score_changed or segment_changed:
-        change = ScoreChangeHistory(
-            domain=domain,
-            old_score=old_score.readiness_score,
-            new_score=new_score.readiness_score,
-            old_segment=old_score.segment,
-            new_segment=new_score.segment,
+        history.append(
+            {
+                "domain": domain,
+                "old_score": old_score.readiness_score,
+                "new_score": new_score.readiness_score,
+                "old_segment": old_score.segment,
+                "new_segment": new_score.segment,
+            }
         )
-        db.add(change)
 
         # Calculate priority score change (if applicable)
         from app.core.priority import calculate_priority_score
@@ -209,6 +237,91 @@ def detect_score_changes(
                 }
             )
 
+    return history, changes
+
+
+def alert_message(change: Dict) -> str:
+    """Build the alert message for a detected change."""
+    change_type = change.get("type")
+    if change_type == "mx_changed":
+        return f"MX root changed from {change.get('old_value')} to {change.get('new_value')}"
+    if change_type == "dmarc_added":
+        return f"DMARC policy added: {change.get('new_value')}"
+    if change_type == "expire_soon":
+        days = change.get("days_until_expiry", 0)
+        return f"Domain expires in {days} days"
+    if change_type == "priority_score_changed":
+        return f"Priority score changed from {change.get('old_priority')} to {change.get('new_priority')}"
+    if change_type == "segment_changed":
+        return f"Segment changed from {change.get('old_segment')} to {change.get('new_segment')}"
+    return f"Change detected: {change_type}"
+
+
+def alert_rows(domain: str, changes: Iterable[Dict]) -> List[Dict]:
+    """
+    Build pending alert rows for the alertable changes of a domain.
+
+    Args:
+        domain: Domain name
+        changes: Detected changes
+
+    Returns:
+        List of Alert column dicts
+    """
+    return [
+        {
+            "domain": domain,
+            "alert_type": ALERT_TYPE_MAP[change.get("type")],
+            "alert_message": alert_message(change),
+            "status": "pending",
+        }
+        for change in changes
+        if change.get("type") in ALERT_TYPE_MAP
+    ]
+
+
+def detect_signal_changes(
+    domain: str,
+    old_signal: Optional[DomainSignal],
+    new_signal: DomainSignal,
+    db: Session,
+) -> List[Dict]:
+    """
+    Detect changes in domain signals and create history records.
+
+    Args:
+        domain: Domain name
+        old_signal: Previous domain signal (None if first scan)
+        new_signal: New domain signal
+        db: Database session
+
+    Returns:
+        List of detected changes with alert information
+    """
+    history, changes = diff_signals(domain, old_signal, new_signal)
+    for row in history:
+        db.add(SignalChangeHistory(**row))
+    return changes
+
+
+def detect_score_changes(
+    domain: str, old_score: Optional[LeadScore], new_score: LeadScore, db: Session
+) -> List[Dict]:
+    """
+    Detect changes in scores and segments and create history records.
+
+    Args:
+        domain: Domain name
+        old_score: Previous lead score (None if first scan)
+        new_score: New lead score
+        db: Database session
+
+    Returns:
+        List of detected changes with alert information
+    """
+    history, changes = diff_scores(domain, old_score, new_score)
+    for row in history:
+        db.add(ScoreChangeHistory(**row))
     return changes
 
 
@@ -224,45 +337,105 @@ def create_alerts(domain: str, changes: List[Dict], db: Session) -> List[Alert]:
     Returns:
         List of created Alert objects
     """
-    alerts = []
-
-    alert_type_map = {
-        "mx_changed": "mx_changed",
-        "dmarc_added": "dmarc_added",
-        "expire_soon": "expire_soon",
-        "priority_score_changed": "score_changed",
-        "segment_changed": "score_changed",
-    }
-
-    for change in changes:
-        change_type = change.get("type")
-        if change_type not in alert_type_map:
-            continue
-
-        alert_type = alert_type_map[change_type]
-
-        # Create alert message
-        if change_type == "mx_changed":
-            message = f"MX root changed from {change.get('old_value')} to {change.get('new_value')}"
-        elif change_type == "dmarc_added":
-            message = f"DMARC policy added: {change.get('new_value')}"
-        elif change_type == "expire_soon":
-            days = change.get("days_until_expiry", 0)
-            message = f"Domain expires in {days} days"
-        elif change_type == "priority_score_changed":
-            message = f"Priority score changed from {change.get('old_priority')} to {change.get('new_priority')}"
-        elif change_type == "segment_changed":
-            message = f"Segment changed from {change.get('old_segment')} to {change.get('new_segment')}"
-        else:
-            message = f"Change detected: {change_type}"
-
-        alert = Alert(
-            domain=domain,
-            alert_type=alert_type,
-            alert_message=message,
-            status="pending",
-        )
+    alerts = [Alert(**row) for row in alert_rows(domain, changes)]
+    for alert in alerts:
         db.add(alert)
-        alerts.append(alert)
-
     return alerts
+
+
+def load_change_snapshots(
+    db: Session,
+    domains: Iterable[str],
+    chunk_size: int = CHANGE_DETECTION_CHUNK_SIZE,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Load the compared signal and score columns for a batch of domains.
+
+    Args:
+        db: Database session
+        domains: Normalized domains
+        chunk_size: Domains per query
+
+    Returns:
+        Tuple of (domain -> signal row, domain -> score row); domains without
+        a signal / score are omitted from the respective dict
+    """
+    unique_domains = sorted({d for d in domains if d})
+    signals: Dict[str, Any] = {}
+    scores: Dict[str, Any] = {}
+    for start in range(0, len(unique_domains), chunk_size):
+        rows = db.execute(
+            text(SNAPSHOT_QUERY), {"domains": unique_domains[start : start + chunk_size]}
+        ).fetchall()
+        for row in rows:
+            if row.has_signal:
+                signals[row.domain] = row
+            if row.has_score:
+                scores[row.domain] = row
+    return signals, scores
+
+
+def _insert_rows(db: Session, model, rows: List[Dict], chunk_size: int) -> None:
+    """Multi-row INSERT of history/alert rows."""
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(model).values(rows[start : start + chunk_size]))
+
+
+def record_changes_bulk(
+    db: Session,
+    old_snapshots: Tuple[Dict[str, Any], Dict[str, Any]],
+    new_snapshots: Tuple[Dict[str, Any], Dict[str, Any]],
+    chunk_size: int = CHANGE_DETECTION_CHUNK_SIZE,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Diff a batch of snapshots and write history and alert rows in bulk.
+
+    Changes are computed in memory; signal_change_history,
+    score_change_history and alerts each get one multi-row INSERT per chunk,
+    so the cost grows with the number of changes rather than with domains.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        old_snapshots: load_change_snapshots() result taken before the rescan
+        new_snapshots: load_change_snapshots() result taken after the rescan
+        chunk_size: Rows per INSERT statement
+
+    Returns:
+        Dict mapping every domain with a new signal and score -> {"changes",
+        "signal_changes", "score_changes", "alerts_created"}
+    """
+    old_signals, old_scores = old_snapshots
+    new_signals, new_scores = new_snapshots
+    today = datetime.now().date()
+
+    signal_history: List[Dict] = []
+    score_history: List[Dict] = []
+    alerts: List[Dict] = []
+    summary: Dict[str, Dict[str, Any]] = {}
+
+    for domain in sorted(set(new_signals) & set(new_scores)):
+        signal_rows, signal_changes = diff_signals(
+            domain, old_signals.get(domain), new_signals[domain], today
+        )
+        score_rows, score_changes = diff_scores(
+            domain, old_scores.get(domain), new_scores[domain]
+        )
+        changes = signal_changes + score_changes
+        domain_alerts = alert_rows(domain, changes)
+
+        signal_history.extend(signal_rows)
+        score_history.extend(score_rows)
+        alerts.extend(domain_alerts)
+        summary[domain] = {
+            "changes": changes,
+            "signal_changes": len(signal_changes),
+            "score_changes": len(score_changes),
+            "alerts_created": len(domain_alerts),
+        }
+
+    _insert_rows(db, SignalChangeHistory, signal_history, chunk_size)
+    _insert_rows(db, ScoreChangeHistory, score_history, chunk_size)
+    _insert_rows(db, Alert, alerts, chunk_size)
+    return summary
@@ -20,3 +20,4 @@ EXPIRE_SOON_DAYS = 30  # Domain expires in < 30 days
 
 # Bulk Operations Limits
 MAX_BULK_SCAN_DOMAINS = 1000  # Maximum domains per bulk scan/rescan
+BULK_SCAN_STATUS_MAX_ERRORS = 100  # Most recent errors returned by GET /scan/bulk/{job_id}
@@ -0,0 +1,129 @@
+"""Pre-aggregated dashboard statistics (lead counts per segment and score)."""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from app.db.models import DashboardScoreBucket
+
+# Domains per SELECT ... FOR UPDATE when loading previous scores
+DASHBOARD_STATS_CHUNK_SIZE = 1000
+
+# (segment, readiness_score) -> lead count delta
+BucketDeltas = Dict[Tuple[str, int], int]
+
+
+def load_score_buckets(
+    db: Session,
+    domains: Iterable[str],
+    chunk_size: int = DASHBOARD_STATS_CHUNK_SIZE,
+) -> Dict[str, Tuple[str, int]]:
+    """
+    Load the current (segment, readiness_score) of existing lead_scores rows.
+
+    Rows are locked (FOR UPDATE, in domain order) so concurrent batches cannot
+    both apply a delta for the same previous score.
+
+    Args:
+        db: Database session
+        domains: Domains about to be rescored
+        chunk_size: Domains per query
+
+    Returns:
+        Dict mapping domain -> (segment, readiness_score); unscored domains are omitted
+    """
+    unique_domains = sorted(set(domains))
+    buckets: Dict[str, Tuple[str, int]] = {}
+    for start in range(0, len(unique_domains), chunk_size):
+        rows = db.execute(
+            text(
+                "SELECT domain, segment, readiness_score FROM lead_scores "
+                "WHERE domain = ANY(:domains) ORDER BY domain FOR UPDATE"
+            ),
+            {"domains": unique_domains[start : start + chunk_size]},
+        ).fetchall()
+        for row in rows:
+            buckets[row.domain] = (row.segment, row.readiness_score)
+    return buckets
+
+
+def score_bucket_deltas(
+    previous: Dict[str, Tuple[str, int]], score_rows: Iterable[Dict[str, Any]]
+) -> BucketDeltas:
+    """
+    Compute bucket count deltas for a batch of lead_scores UPSERT rows.
+
+    Args:
+        previous: Result of load_score_buckets() for the same domains
+        score_rows: De-duplicated lead_scores rows (domain, segment, readiness_score)
+
+    Returns:
+        Non-zero deltas per (segment, readiness_score) bucket
+    """
+    deltas: Counter = Counter()
+    for row in score_rows:
+        old = previous.get(row["domain"])
+        new = (row["segment"], row["readiness_score"])
+        if old == new:
+            continue
+        if old is not None:
+            deltas[old] -= 1
+        deltas[new] += 1
+    return {bucket: delta for bucket, delta in deltas.items() if delta}
+
+
+def apply_score_bucket_deltas(db: Session, deltas: BucketDeltas) -> None:
+    """
+    Add deltas to dashboard_score_buckets with one INSERT ... ON CONFLICT.
+
+    Buckets are written in key order (stable lock order across batches).
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        deltas: Result of score_bucket_deltas()
+    """
+    if not deltas:
+        return
+    rows: List[Dict[str, Any]] = [
+        {"segment": segment, "readiness_score": score, "lead_count": delta}
+        for (segment, score), delta in sorted(deltas.items())
+    ]
+    stmt = insert(DashboardScoreBucket).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["segment", "readiness_score"],
+        set_={"lead_count": DashboardScoreBucket.lead_count + stmt.excluded.lead_count},
+    )
+    db.execute(stmt)
+
+
+def reconcile_dashboard_stats(db: Session) -> int:
+    """
+    Rebuild dashboard_score_buckets from lead_scores.
+
+    Corrects drift from writes that bypass the scan path (e.g. company
+    deletes cascading to lead_scores). The table lock makes concurrent scan
+    batches wait, so their deltas apply on top of the rebuilt counts.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of non-empty buckets
+    """
+    db.execute(text("LOCK TABLE dashboard_score_buckets IN EXCLUSIVE MODE"))
+    db.execute(text("DELETE FROM dashboard_score_buckets"))
+    result = db.execute(
+        text(
+            """
+            INSERT INTO dashboard_score_buckets (segment, readiness_score, lead_count)
+            SELECT segment, readiness_score, COUNT(*)
+            FROM lead_scores
+            GROUP BY segment, readiness_score
+            """
+        )
+    )
+    return result.rowcount
@@ -1,8 +1,9 @@
 """Distributed rate limiting using Redis with fallback to in-memory limiter."""
 
+import math
 import time
 import sentry_sdk
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import Optional, Dict, Any, Tuple, TYPE_CHECKING
 from collections import defaultdict
 
 if TYPE_CHECKING:
@@ -21,6 +22,60 @@ _rate_limit_metrics = {
     "per_key": defaultdict(lambda: {"hits": 0, "acquired": 0}),  # Per-key metrics
 }
 
+# Token bucket as a server-side script: one EVALSHA per acquire, atomic across workers.
+# Uses Redis TIME so every worker refills against the same clock.
+# ARGV: rate, burst, requested tokens, key TTL (ms), mode
+#   mode "all":     grant all requested tokens or none
+#   mode "reserve": always grant; tokens may go negative, wait = time until they are covered
+#   mode "partial": grant up to the requested amount (whole tokens only)
+# Returns: {granted, remaining tokens, wait seconds}
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local mode = ARGV[5]
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local granted = 0
+local wait = 0
+if mode == 'partial' then
+  granted = math.max(0, math.min(requested, math.floor(tokens)))
+  tokens = tokens - granted
+  if granted < requested then
+    wait = (1 - tokens) / rate
+  end
+elseif tokens >= requested then
+  granted = requested
+  tokens = tokens - requested
+else
+  wait = (requested - tokens) / rate
+  if mode == 'reserve' then
+    granted = requested
+    tokens = tokens - requested
+  end
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return {granted, tostring(tokens), tostring(wait)}
+"""
+
+# Registered script objects per Redis client (EVALSHA with automatic EVAL on NOSCRIPT)
+_token_bucket_scripts: Dict[int, Any] = {}
+
+
+def _get_token_bucket_script(redis_client):
+    """Get (or register) the token bucket script for a Redis client."""
+    script = _token_bucket_scripts.get(id(redis_client))
+    if script is None:
+        script = redis_client.register_script(TOKEN_BUCKET_LUA)
+        _token_bucket_scripts[id(redis_client)] = script
+    return script
+
+
 # Import RateLimiter locally to avoid circular import
 def _get_rate_limiter_class():
     """Get RateLimiter class to avoid circular import."""
@@ -131,70 +186,40 @@ class DistributedRateLimiter:
         self.fallback = fallback or RateLimiter(rate=rate, burst=burst)
         self.circuit_breaker = CircuitBreaker()
         
-        # Redis keys
-        self.tokens_key = f"rate_limit:{redis_key}:tokens"
-        self.last_update_key = f"rate_limit:{redis_key}:last_update"
+        # Redis key (hash with "tokens" and "ts" fields)
+        self.bucket_key = f"rate_limit:{redis_key}:bucket"
+        # Idle buckets expire once they would have refilled completely anyway
+        self.bucket_ttl_ms = int(math.ceil(self.burst / self.rate * 1000)) + 1000
     
-    def _acquire_redis(self, tokens: int = 1) -> Optional[bool]:
+    def _eval_bucket(self, tokens: int, mode: str) -> Optional[Tuple[int, float]]:
         """
-        Try to acquire tokens from Redis.
+        Run the token bucket script in Redis.
         
         Args:
-            tokens: Number of tokens to acquire
+            tokens: Number of tokens requested
+            mode: Script mode ("all", "reserve" or "partial")
             
         Returns:
-            True if tokens acquired, False if rate limited, None if Redis unavailable
+            (granted tokens, wait seconds), or None if Redis unavailable
         """
         redis_client = get_redis_client()
         if redis_client is None:
             return None
         
         try:
-            now = time.time()
-            
-            # Use Redis pipeline for atomic operations
-            pipe = redis_client.pipeline()
-            
-            # Get current state
-            pipe.get(self.tokens_key)
-            pipe.get(self.last_update_key)
-            results = pipe.execute()
-            
-            # Parse results (Redis returns bytes, decode to float)
-            current_tokens = float(results[0].decode()) if results[0] else self.burst
-            last_update = float(results[1].decode()) if results[1] else now
-            
-            # Calculate new token count
-            elapsed = now - last_update
-            new_tokens = min(self.burst, current_tokens + elapsed * self.rate)
-            
-            # Check if we have enough tokens
-            if new_tokens >= tokens:
-                new_tokens -= tokens
-                
-                # Update Redis atomically (store as strings for compatibility)
-                pipe = redis_client.pipeline()
-                pipe.set(self.tokens_key, str(new_tokens))
-                pipe.set(self.last_update_key, str(now))
-                pipe.execute()
-                
-                self.circuit_breaker.record_success()
-                return True
-            else:
-                # Update last_update even if we can't acquire tokens
-                pipe = redis_client.pipeline()
-                pipe.set(self.tokens_key, str(new_tokens))  # Update tokens even if not enough
-                pipe.set(self.last_update_key, str(now))
-                pipe.execute()
-                
-                self.circuit_breaker.record_success()
-                return False
+            script = _get_token_bucket_script(redis_client)
+            granted, _remaining, wait = script(
+                keys=[self.bucket_key],
+                args=[self.rate, self.burst, tokens, self.bucket_ttl_ms, mode],
+            )
+            self.circuit_breaker.record_success()
+            return int(granted), max(0.0, float(wait))
         
         except Exception as e:
             logger.warning(
                 "redis_rate_limit_operation_failed",
                 redis_key=self.redis_key,
-                operation="acquire",
+                operation=mode,
                 error=str(e),
                 reason="redis_operation_failed",
                 exc_info=True
@@ -202,6 +227,54 @@ class DistributedRateLimiter:
             self.circuit_breaker.record_failure()
             return None
     
+    def _acquire_redis(self, tokens: int = 1) -> Optional[bool]:
+        """
+        Try to acquire tokens from Redis (single atomic script call).
+        
+        Args:
+            tokens: Number of tokens to acquire
+            
+        Returns:
+            True if tokens acquired, False if rate limited, None if Redis unavailable
+        """
+        result = self._eval_bucket(tokens, "all")
+        if result is None:
+            return None
+        return result[0] >= tokens
+    
+    def _use_redis(self) -> bool:
+        """Check whether the Redis path should be attempted."""
+        return self.circuit_breaker.should_attempt() and is_redis_available()
+    
+    def _record(self, acquired: bool):
+        """Track acquire/hit metrics for this limiter."""
+        if acquired:
+            _rate_limit_metrics["acquired"] += 1
+            _rate_limit_metrics["per_key"][self.redis_key]["acquired"] += 1
+        else:
+            _rate_limit_metrics["hits"] += 1
+            _rate_limit_metrics["per_key"][self.redis_key]["hits"] += 1
+    
+    def _log_fallback(self, track_metric: bool = True):
+        """Log and tag fallback to the in-memory limiter."""
+        if self.circuit_breaker.circuit_open:
+            return
+        logger.warning(
+            "rate_limiter_fallback",
+            redis_key=self.redis_key,
+            rate=self.rate,
+            reason="redis_unavailable"
+        )
+        # Tag Sentry event for monitoring
+        sentry_sdk.set_tag("rate_limiter_fallback", self.redis_key)
+        sentry_sdk.set_context("rate_limiter", {
+            "redis_key": self.redis_key,
+            "rate": self.rate,
+            "fallback_mode": True
+        })
+        if track_metric:
+            _rate_limit_metrics["fallback_used"] += 1
+    
     def acquire(self, tokens: int = 1) -> bool:
         """
         Try to acquire tokens. Returns True if successful, False if rate limited.
@@ -218,16 +291,10 @@ class DistributedRateLimiter:
         was_open = self.circuit_breaker.circuit_open
         
         # Try Redis if circuit breaker allows
-        if self.circuit_breaker.should_attempt() and is_redis_available():
+        if self._use_redis():
             result = self._acquire_redis(tokens)
             if result is not None:
-                # Track metrics
-                if result:
-                    _rate_limit_metrics["acquired"] += 1
-                    _rate_limit_metrics["per_key"][self.redis_key]["acquired"] += 1
-                else:
-                    _rate_limit_metrics["hits"] += 1
-                    _rate_limit_metrics["per_key"][self.redis_key]["hits"] += 1
+                self._record(result)
                 
                 # Track circuit breaker state change
                 if was_open and not self.circuit_breaker.circuit_open:
@@ -236,40 +303,50 @@ class DistributedRateLimiter:
                 return result
         
         # Fallback to in-memory limiter
-        if not self.circuit_breaker.circuit_open:
-            logger.warning(
-                "rate_limiter_fallback",
-                redis_key=self.redis_key,
-                rate=self.rate,
-                reason="redis_unavailable"
-            )
-            # Tag Sentry event for monitoring
-            sentry_sdk.set_tag("rate_limiter_fallback", self.redis_key)
-            sentry_sdk.set_context("rate_limiter", {
-                "redis_key": self.redis_key,
-                "rate": self.rate,
-                "fallback_mode": True
-            })
-            _rate_limit_metrics["fallback_used"] += 1
+        self._log_fallback()
         
         # Track circuit breaker state change
         if not was_open and self.circuit_breaker.circuit_open:
             _rate_limit_metrics["circuit_breaker_open"] += 1
         
         result = self.fallback.acquire(tokens)
-        if result:
-            _rate_limit_metrics["acquired"] += 1
-            _rate_limit_metrics["per_key"][self.redis_key]["acquired"] += 1
-        else:
-            _rate_limit_metrics["hits"] += 1
-            _rate_limit_metrics["per_key"][self.redis_key]["hits"] += 1
+        self._record(result)
+        return result
+    
+    def acquire_many(self, tokens: int) -> Tuple[int, float]:
+        """
+        Acquire up to ``tokens`` tokens in one call (partial grants allowed).
+        
+        Lets batch callers take whatever budget is available in a single
+        round trip instead of calling acquire() once per item.
+        
+        Args:
+            tokens: Maximum number of tokens to acquire
+            
+        Returns:
+            Tuple of (granted tokens, seconds until the next token is available;
+            0.0 when everything was granted)
+        """
+        if tokens <= 0:
+            return 0, 0.0
         
+        if self._use_redis():
+            result = self._eval_bucket(tokens, "partial")
+            if result is not None:
+                self._record(result[0] > 0)
+                return result
+        
+        self._log_fallback()
+        result = self.fallback.acquire_many(tokens)
+        self._record(result[0] > 0)
         return result
     
     def wait(self, tokens: int = 1) -> float:
         """
-        Wait until tokens are available. Returns wait time in seconds.
+        Reserve tokens and return how long to wait before using them.
         
+        The reservation is made atomically in Redis, so the returned wait time
+        is exact: sleeping for it and proceeding never overdraws the shared budget.
         Falls back to in-memory limiter if Redis is unavailable.
         
         Args:
@@ -279,32 +356,13 @@ class DistributedRateLimiter:
             Wait time in seconds
         """
         # Try Redis if circuit breaker allows
-        if self.circuit_breaker.should_attempt() and is_redis_available():
-            result = self._acquire_redis(tokens)
+        if self._use_redis():
+            result = self._eval_bucket(tokens, "reserve")
             if result is not None:
-                if result:
-                    return 0.0
-                else:
-                    # Calculate wait time based on rate
-                    # This is approximate - for exact wait time, we'd need to check Redis again
-                    return tokens / self.rate
+                return result[1]
         
         # Fallback to in-memory limiter
-        if not self.circuit_breaker.circuit_open:
-            logger.warning(
-                "rate_limiter_fallback",
-                redis_key=self.redis_key,
-                rate=self.rate,
-                reason="redis_unavailable"
-            )
-            # Tag Sentry event for monitoring
-            sentry_sdk.set_tag("rate_limiter_fallback", self.redis_key)
-            sentry_sdk.set_context("rate_limiter", {
-                "redis_key": self.redis_key,
-                "rate": self.rate,
-                "fallback_mode": True
-            })
-        
+        self._log_fallback(track_metric=False)
         return self.fallback.wait(tokens)
 
 
@@ -1,7 +1,8 @@
 """Email validation utilities (syntax, MX, optional SMTP)."""
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Literal, Dict, Optional, Any
+from typing import Literal, Dict, Optional, Any, List, Tuple
 import re
 import smtplib
 from app.core.analyzer_dns import get_mx_records
@@ -12,6 +13,12 @@ ConfidenceLevel = Literal["high", "medium", "low"]
 # Email syntax regex (RFC 5322 simplified)
 EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 
+# Domains validated concurrently by validate_emails (one MX lookup + SMTP session each)
+EMAIL_VALIDATION_MAX_WORKERS = 8
+
+# Envelope sender used for RCPT TO probes
+SMTP_PROBE_SENDER = "test@example.com"
+
 
 @dataclass
 class EmailValidationResult:
@@ -49,11 +56,42 @@ def validate_email_mx(domain: str) -> tuple[bool, Optional[str]]:
         - has_mx: True if MX records exist, False otherwise
         - error_message: Error message if check failed, None otherwise
     """
+    mx_records, error = _resolve_mx(domain)
+    return (len(mx_records) > 0, error)
+
+
+def _resolve_mx(domain: str) -> Tuple[List[str], Optional[str]]:
+    """Resolve MX hosts for a domain as (records, error_message)."""
     try:
-        mx_records = get_mx_records(domain)
-        return (len(mx_records) > 0, None)
+        return (get_mx_records(domain), None)
     except Exception as e:
-        return (False, str(e))
+        return ([], str(e))
+
+
+def _rcpt_status(code: int) -> tuple[EmailStatus, str]:
+    """Map an SMTP RCPT TO reply code to a validation status."""
+    # 200-299: Accepted
+    if 200 <= code < 300:
+        return ("valid", f"SMTP {code}")
+
+    # 500-599: Rejected (invalid)
+    if 500 <= code < 600:
+        return ("invalid", f"SMTP {code}")
+
+    # Other codes: Unknown (catch-all or greylisting)
+    return ("unknown", f"SMTP {code}")
+
+
+def _smtp_error_status(error: Exception) -> tuple[EmailStatus, str]:
+    """Map an SMTP/connection exception to an "unknown" validation status."""
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return ("unknown", "SMTP connection closed")
+    if isinstance(error, smtplib.SMTPConnectError):
+        return ("unknown", "SMTP connection failed")
+    if isinstance(error, (smtplib.SMTPException, TimeoutError, OSError)):
+        # Handle timeout and other connection errors
+        return ("unknown", f"SMTP error: {str(error)}")
+    return ("unknown", str(error))
 
 
 def validate_email_smtp(email: str, timeout: float = 3.0) -> tuple[EmailStatus, str]:
@@ -84,30 +122,52 @@ def validate_email_smtp(email: str, timeout: float = 3.0) -> tuple[EmailStatus,
     try:
         server = smtplib.SMTP(host=host, timeout=timeout)
         server.helo()
-        server.mail("test@example.com")
+        server.mail(SMTP_PROBE_SENDER)
         code, msg = server.rcpt(email)
         server.quit()
+        return _rcpt_status(code)
+    except Exception as e:
+        return _smtp_error_status(e)
 
-        # 200-299: Accepted
-        if 200 <= code < 300:
-            return ("valid", f"SMTP {code}")
 
-        # 500-599: Rejected (invalid)
-        if 500 <= code < 600:
-            return ("invalid", f"SMTP {code}")
+def validate_emails_smtp(
+    host: str, emails: List[str], timeout: float = 3.0
+) -> Dict[str, tuple[EmailStatus, str]]:
+    """
+    Validate many addresses against one MX host in a single SMTP session.
 
-        # Other codes: Unknown (catch-all or greylisting)
-        return ("unknown", f"SMTP {code}")
+    Opens one connection (one HELO + MAIL FROM) and sends RCPT TO for every
+    address in the same transaction, instead of one connection per address.
+    If the session fails, addresses not yet checked get the error status.
 
-    except smtplib.SMTPServerDisconnected:
-        return ("unknown", "SMTP connection closed")
-    except smtplib.SMTPConnectError:
-        return ("unknown", "SMTP connection failed")
-    except (smtplib.SMTPException, TimeoutError, OSError) as e:
-        # Handle timeout and other connection errors
-        return ("unknown", f"SMTP error: {str(e)}")
+    Args:
+        host: MX host to connect to
+        emails: Email addresses (all on domains served by ``host``)
+        timeout: SMTP connection timeout in seconds (default: 3.0)
+
+    Returns:
+        Dict mapping email -> (status, reason)
+    """
+    results: Dict[str, tuple[EmailStatus, str]] = {}
+    server = None
+    try:
+        server = smtplib.SMTP(host=host, timeout=timeout)
+        server.helo()
+        server.mail(SMTP_PROBE_SENDER)
+        for email in emails:
+            code, msg = server.rcpt(email)
+            results[email] = _rcpt_status(code)
     except Exception as e:
-        return ("unknown", str(e))
+        error_status = _smtp_error_status(e)
+        for email in emails:
+            results.setdefault(email, error_status)
+    finally:
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                pass
+    return results
 
 
 def validate_email(
@@ -153,7 +213,34 @@ def validate_email(
 
     # 2) MX check
     has_mx, mx_error = validate_email_mx(domain)
-    checks["mx"] = has_mx
+
+    # 3) SMTP check (optional)
+    smtp_result = None
+    if has_mx and use_smtp:
+        smtp_result = validate_email_smtp(email, timeout=smtp_timeout)
+
+    return _validation_result(email, has_mx, mx_error, smtp_result)
+
+
+def _validation_result(
+    email: str,
+    has_mx: bool,
+    mx_error: Optional[str],
+    smtp_result: Optional[tuple[EmailStatus, str]],
+) -> EmailValidationResult:
+    """
+    Build the result for a syntactically valid address from MX/SMTP checks.
+
+    Args:
+        email: Email address
+        has_mx: Whether the domain has MX records
+        mx_error: MX lookup error message (if any)
+        smtp_result: (status, reason) of the SMTP check, None if skipped
+
+    Returns:
+        EmailValidationResult
+    """
+    checks: Dict[str, Any] = {"syntax": True, "mx": has_mx, "smtp": "skipped"}
 
     if not has_mx:
         return EmailValidationResult(
@@ -164,9 +251,8 @@ def validate_email(
             reason=f"No MX records: {mx_error}" if mx_error else "No MX records",
         )
 
-    # 3) SMTP check (optional)
-    if use_smtp:
-        smtp_status, smtp_reason = validate_email_smtp(email, timeout=smtp_timeout)
+    if smtp_result is not None:
+        smtp_status, smtp_reason = smtp_result
         checks["smtp"] = smtp_status
 
         # Determine confidence based on SMTP result
@@ -193,3 +279,75 @@ def validate_email(
             checks=checks,
             reason="Valid syntax and MX records (SMTP not checked)",
         )
+
+
+def _validate_domain_emails(
+    domain: str, emails: List[str], use_smtp: bool, smtp_timeout: float
+) -> Dict[str, EmailValidationResult]:
+    """Validate all addresses of one domain with one MX lookup and one SMTP session."""
+    mx_records, mx_error = _resolve_mx(domain)
+    has_mx = len(mx_records) > 0
+
+    smtp_results: Dict[str, tuple[EmailStatus, str]] = {}
+    if has_mx and use_smtp:
+        # Try first MX server (same as validate_email_smtp)
+        smtp_results = validate_emails_smtp(mx_records[0], emails, timeout=smtp_timeout)
+
+    return {
+        email: _validation_result(email, has_mx, mx_error, smtp_results.get(email))
+        for email in emails
+    }
+
+
+def validate_emails(
+    emails: List[str],
+    use_smtp: bool = False,
+    smtp_timeout: float = 3.0,
+    max_workers: int = EMAIL_VALIDATION_MAX_WORKERS,
+) -> List[EmailValidationResult]:
+    """
+    Validate many email addresses (syntax + MX + optional SMTP) in one batch.
+
+    Batch counterpart of validate_email(): addresses are grouped by domain,
+    MX is resolved once per domain and, with ``use_smtp``, every address of a
+    domain is checked over a single SMTP session. Domains are validated
+    concurrently in a bounded thread pool.
+
+    Args:
+        emails: Email addresses to validate
+        use_smtp: If True, perform SMTP check (default: False)
+        smtp_timeout: SMTP connection timeout in seconds (default: 3.0)
+        max_workers: Maximum number of domains validated concurrently
+
+    Returns:
+        EmailValidationResult list in input order
+    """
+    results: Dict[str, EmailValidationResult] = {}
+    by_domain: Dict[str, List[str]] = {}
+
+    for email in dict.fromkeys(emails):
+        # 1) Syntax check (per address, no I/O)
+        if not validate_email_syntax(email):
+            results[email] = EmailValidationResult(
+                email=email,
+                status="invalid",
+                confidence="high",
+                checks={"syntax": False, "mx": False, "smtp": "skipped"},
+                reason="Invalid email syntax",
+            )
+            continue
+        by_domain.setdefault(email.split("@", 1)[1].lower(), []).append(email)
+
+    if by_domain:
+        workers = max(1, min(max_workers, len(by_domain)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _validate_domain_emails, domain, domain_emails, use_smtp, smtp_timeout
+                )
+                for domain, domain_emails in by_domain.items()
+            ]
+            for future in futures:
+                results.update(future.result())
+
+    return [results[email] for email in emails]
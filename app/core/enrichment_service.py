@@ -1,30 +1,24 @@
-"""IP enrichment service with separate DB session for safe fire-and-forget operations."""
+"""IP enrichment service with a separate DB session, isolated from the caller's transaction."""
 
-from typing import Optional
+from typing import Any, Optional, Dict, Iterable, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy import desc
 from app.db.session import SessionLocal
 from app.db.models import IpEnrichment
 from app.config import settings
-from app.core.analyzer_enrichment import enrich_ip, IpEnrichmentResult, check_enrichment_available
+from app.core.analyzer_enrichment import enrich_ips, IpEnrichmentResult, check_enrichment_available
 from app.core.logging import logger
 
+# Max domains per IN (...) list when batch-loading enrichment records
+INFRA_SUMMARY_CHUNK_SIZE = 1000
+# Rows per multi-row INSERT ... ON CONFLICT into ip_enrichment
+IP_ENRICHMENT_CHUNK_SIZE = 1000
 
-def save_ip_enrichment(domain: str, ip: str, result: IpEnrichmentResult, db: Session) -> None:
-    """
-    Save IP enrichment result to database (UPSERT).
-    
-    Uses PostgreSQL's INSERT ... ON CONFLICT DO UPDATE for atomic UPSERT.
-    
-    Args:
-        domain: Domain name
-        ip: IP address
-        result: Enrichment result
-        db: Database session
-    """
-    # Prepare data for insert
-    enrichment_data = {
+
+def ip_enrichment_row(domain: str, ip: str, result: IpEnrichmentResult) -> Dict[str, Any]:
+    """Build an ip_enrichment row from an enrichment result."""
+    return {
         "domain": domain,
         "ip_address": ip,
         "asn": result.asn,
@@ -36,28 +30,140 @@ def save_ip_enrichment(domain: str, ip: str, result: IpEnrichmentResult, db: Ses
         "is_proxy": result.is_proxy,
         "proxy_type": result.proxy_type,
     }
+
+
+def save_ip_enrichments(
+    db: Session,
+    rows: Iterable[Dict[str, Any]],
+    chunk_size: int = IP_ENRICHMENT_CHUNK_SIZE,
+) -> int:
+    """
+    Upsert many IP enrichment rows with one INSERT ... ON CONFLICT per chunk.
+
+    Duplicate (domain, ip_address) pairs are collapsed first (last row wins)
+    because Postgres rejects ON CONFLICT DO UPDATE touching the same row
+    twice in a statement. lead_read_model rows of the domains are refreshed.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        rows: Dicts from ip_enrichment_row()
+        chunk_size: Rows per INSERT statement
+
+    Returns:
+        Number of distinct (domain, ip_address) rows upserted
+    """
+    latest = {(row["domain"], row["ip_address"]): row for row in rows}
+    if not latest:
+        return 0
+
+    values = [latest[key] for key in sorted(latest)]
+    for start in range(0, len(values), chunk_size):
+        # PostgreSQL UPSERT using INSERT ... ON CONFLICT
+        stmt = insert(IpEnrichment).values(values[start : start + chunk_size])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["domain", "ip_address"],
+            set_={
+                "asn": stmt.excluded.asn,
+                "asn_org": stmt.excluded.asn_org,
+                "isp": stmt.excluded.isp,
+                "country": stmt.excluded.country,
+                "city": stmt.excluded.city,
+                "usage_type": stmt.excluded.usage_type,
+                "is_proxy": stmt.excluded.is_proxy,
+                "proxy_type": stmt.excluded.proxy_type,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        db.execute(stmt)
+
+    # Keep lead_read_model.infrastructure_summary in sync (local import: circular dependency)
+    from app.core.lead_read_model import refresh_lead_read_model
+    refresh_lead_read_model(db, sorted({domain for domain, _ in latest}))
+    return len(latest)
+
+
+def save_ip_enrichment(domain: str, ip: str, result: IpEnrichmentResult, db: Session) -> None:
+    """
+    Save IP enrichment result to database (UPSERT).
     
-    # PostgreSQL UPSERT using INSERT ... ON CONFLICT
-    stmt = insert(IpEnrichment).values(**enrichment_data)
-    stmt = stmt.on_conflict_do_update(
-        index_elements=["domain", "ip_address"],
-        set_={
-            "asn": stmt.excluded.asn,
-            "asn_org": stmt.excluded.asn_org,
-            "isp": stmt.excluded.isp,
-            "country": stmt.excluded.country,
-            "city": stmt.excluded.city,
-            "usage_type": stmt.excluded.usage_type,
-            "is_proxy": stmt.excluded.is_proxy,
-            "proxy_type": stmt.excluded.proxy_type,
-            "updated_at": stmt.excluded.updated_at,
-        }
-    )
+    Uses PostgreSQL's INSERT ... ON CONFLICT DO UPDATE for atomic UPSERT.
     
-    db.execute(stmt)
+    Args:
+        domain: Domain name
+        ip: IP address
+        result: Enrichment result
+        db: Database session
+    """
+    save_ip_enrichments(db, [ip_enrichment_row(domain, ip, result)])
     db.commit()
 
 
+def _tag_enrichment_error() -> None:
+    """Tag the Sentry scope for enrichment errors."""
+    try:
+        import sentry_sdk
+        sentry_sdk.set_tag("hunter_enrichment_error", "true")
+    except ImportError:
+        pass  # Sentry not available
+
+
+def enrich_domains_if_enabled(
+    targets: Iterable[Tuple[str, str]], db: Session
+) -> Dict[str, IpEnrichmentResult]:
+    """
+    Enrich many (domain, IP) pairs if enrichment is enabled.
+
+    IPs are deduplicated and resolved in one enrich_ips() pass; results are
+    written with save_ip_enrichments() and committed once.
+
+    Args:
+        targets: (domain, IP address) pairs (pairs without an IP are skipped)
+        db: Database session
+
+    Returns:
+        Dict mapping domain -> enrichment result (domains without data are omitted)
+    """
+    if not settings.enrichment_enabled:
+        return {}
+
+    pairs = [(domain, ip) for domain, ip in targets if domain and ip]
+    if not pairs:
+        return {}
+
+    # Safety check: ensure at least one DB is available
+    if not check_enrichment_available():
+        logger.warning(
+            "ip_enrichment_skipped",
+            domains=len(pairs),
+            reason="no_db_files_available",
+            hint="Check HUNTER_ENRICHMENT_DB_PATH_* environment variables"
+        )
+        return {}
+
+    # Perform enrichment (cache is handled inside enrich_ips)
+    results = enrich_ips([ip for _, ip in pairs], use_cache=True)
+    enriched = {domain: results[ip] for domain, ip in pairs if results.get(ip)}
+    if not enriched:
+        logger.debug("ip_enrichment_no_data", domains=len(pairs))
+        return {}
+
+    # Save to database
+    try:
+        saved = save_ip_enrichments(
+            db, [ip_enrichment_row(domain, ip, results[ip]) for domain, ip in pairs if results.get(ip)]
+        )
+        db.commit()
+        logger.info("ip_enrichment_saved", domains=len(enriched), rows=saved, ips=len(results))
+    except Exception as e:
+        logger.error("ip_enrichment_save_failed", domains=len(enriched), error=str(e), exc_info=True)
+        _tag_enrichment_error()
+        raise
+
+    return enriched
+
+
 def enrich_domain_if_enabled(domain: str, ip: str, db: Session) -> Optional[IpEnrichmentResult]:
     """
     Enrich domain IP if enrichment is enabled and IP is available.
@@ -77,87 +183,60 @@ def enrich_domain_if_enabled(domain: str, ip: str, db: Session) -> Optional[IpEn
     Returns:
         Enrichment result if successful, None otherwise
     """
-    if not settings.enrichment_enabled:
-        return None
-    
-    if not ip:
+    if settings.enrichment_enabled and not ip:
         logger.debug("ip_enrichment_skipped", domain=domain, reason="no_ip")
         return None
-    
-    # Safety check: ensure at least one DB is available
-    if not check_enrichment_available():
-        logger.warning(
-            "ip_enrichment_skipped",
-            domain=domain,
-            reason="no_db_files_available",
-            hint="Check HUNTER_ENRICHMENT_DB_PATH_* environment variables"
-        )
-        return None
-    
-    # Perform enrichment (cache is handled inside enrich_ip)
-    result = enrich_ip(ip, use_cache=True)
-    if not result:
-        logger.debug("ip_enrichment_no_data", domain=domain, ip=ip)
-        return None
-    
-    # Save to database
-    try:
-        save_ip_enrichment(domain, ip, result, db)
-        logger.info("ip_enrichment_saved", domain=domain, ip=ip)
-    except Exception as e:
-        logger.error("ip_enrichment_save_failed", domain=domain, ip=ip, error=str(e), exc_info=True)
-        # Tag Sentry event for enrichment errors
-        try:
-            import sentry_sdk
-            sentry_sdk.set_tag("hunter_enrichment_error", "true")
-        except ImportError:
-            pass  # Sentry not available
-        raise
-    
-    return result
+    return enrich_domains_if_enabled([(domain, ip)], db).get(domain)
 
 
-def spawn_enrichment(domain: str, ip: str) -> None:
+def spawn_enrichments(targets: Iterable[Tuple[str, str]]) -> None:
     """
-    Spawn IP enrichment in a separate DB session (fire-and-forget).
+    Run IP enrichment for many domains in a separate DB session.
     
-    This function creates a new database session to ensure enrichment
-    failures don't affect the main scan transaction.
+    Runs synchronously in the calling thread (one enrich_ips() pass, one
+    upsert, one commit). It uses its own session and logs errors instead of
+    raising them, so enrichment failures don't affect the main scan
+    transaction.
     
     Args:
-        domain: Domain name
-        ip: IP address to enrich
+        targets: (domain, IP address) pairs
     """
     if not settings.enrichment_enabled:
         return
-    
-    if not ip:
+
+    pairs = [(domain, ip) for domain, ip in targets if domain and ip]
+    if not pairs:
         return
     
     # Create new session for enrichment
     db = SessionLocal()
     try:
-        enrich_domain_if_enabled(domain, ip, db)
+        enrich_domains_if_enabled(pairs, db)
     except Exception as e:
-        # Log error but don't raise - this is fire-and-forget
+        # Log error but don't raise - enrichment must not fail the scan
         logger.warning(
             "ip_enrichment_failed",
-            domain=domain,
-            ip=ip,
+            domains=len(pairs),
             error=str(e),
             exc_info=True
         )
-        # Tag Sentry event for enrichment errors
-        try:
-            import sentry_sdk
-            sentry_sdk.set_tag("hunter_enrichment_error", "true")
-        except ImportError:
-            pass  # Sentry not available
+        _tag_enrichment_error()
         db.rollback()
     finally:
         db.close()
 
 
+def spawn_enrichment(domain: str, ip: str) -> None:
+    """
+    Run IP enrichment for one domain in a separate DB session (see spawn_enrichments).
+    
+    Args:
+        domain: Domain name
+        ip: IP address to enrich
+    """
+    spawn_enrichments([(domain, ip)])
+
+
 def latest_ip_enrichment(domain: str, db: Session) -> Optional[IpEnrichment]:
     """
     Get the most recent IP enrichment record for a domain.
@@ -177,20 +256,49 @@ def latest_ip_enrichment(domain: str, db: Session) -> Optional[IpEnrichment]:
     )
 
 
-def build_infra_summary(domain: str, db: Session) -> Optional[str]:
+def latest_ip_enrichments(domains: Iterable[str], db: Session) -> Dict[str, IpEnrichment]:
     """
-    Build a human-readable infrastructure summary from IP enrichment data.
+    Get the most recent IP enrichment record for each of many domains.
     
-    Format: "Hosted on {UsageType}, ISP: {ISP}, Country: {Country}"
+    Uses one DISTINCT ON (domain) query per chunk instead of one query per domain.
     
     Args:
-        domain: Domain name
+        domains: Domain names
         db: Database session
         
+    Returns:
+        Dict mapping domain -> most recent IpEnrichment record (domains without data are omitted)
+    """
+    unique_domains = list(dict.fromkeys(d for d in domains if d))
+    records: Dict[str, IpEnrichment] = {}
+    
+    for i in range(0, len(unique_domains), INFRA_SUMMARY_CHUNK_SIZE):
+        chunk = unique_domains[i : i + INFRA_SUMMARY_CHUNK_SIZE]
+        rows = (
+            db.query(IpEnrichment)
+            .filter(IpEnrichment.domain.in_(chunk))
+            .distinct(IpEnrichment.domain)
+            .order_by(IpEnrichment.domain, desc(IpEnrichment.updated_at))
+            .all()
+        )
+        for record in rows:
+            records[record.domain] = record
+    
+    return records
+
+
+def format_infra_summary(record: Optional[IpEnrichment]) -> Optional[str]:
+    """
+    Format an IP enrichment record as a human-readable infrastructure summary.
+    
+    Format: "Hosted on {UsageType}, ISP: {ISP}, Country: {Country}"
+    
+    Args:
+        record: IpEnrichment record (or None)
+        
     Returns:
         Infrastructure summary string, or None if no enrichment data available
     """
-    record = latest_ip_enrichment(domain, db)
     if not record:
         return None
     
@@ -223,3 +331,37 @@ def build_infra_summary(domain: str, db: Session) -> Optional[str]:
     
     return ", ".join(parts)
 
+
+def build_infra_summary(domain: str, db: Session) -> Optional[str]:
+    """
+    Build a human-readable infrastructure summary from IP enrichment data.
+    
+    Format: "Hosted on {UsageType}, ISP: {ISP}, Country: {Country}"
+    
+    Args:
+        domain: Domain name
+        db: Database session
+        
+    Returns:
+        Infrastructure summary string, or None if no enrichment data available
+    """
+    return format_infra_summary(latest_ip_enrichment(domain, db))
+
+
+def build_infra_summaries(domains: Iterable[str], db: Session) -> Dict[str, Optional[str]]:
+    """
+    Build infrastructure summaries for many domains with batched queries.
+    
+    Bulk counterpart of build_infra_summary() for list/export endpoints
+    (avoids one latest_ip_enrichment query per row).
+    
+    Args:
+        domains: Domain names
+        db: Database session
+        
+    Returns:
+        Dict mapping every requested domain -> summary string (or None)
+    """
+    domain_list = list(domains)
+    records = latest_ip_enrichments(domain_list, db)
+    return {domain: format_infra_summary(records.get(domain)) for domain in domain_list}
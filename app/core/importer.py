@@ -1,8 +1,13 @@
-"""Column detection utilities for Excel/CSV import."""
+"""Column detection and row preparation utilities for Excel/CSV import."""
 
-from typing import Optional
+from typing import Optional, List, Tuple
 import pandas as pd
 import re
+from app.core.normalizer import (
+    normalize_domain,
+    extract_domain_from_email,
+    extract_domain_from_website,
+)
 
 
 COMPANY_HINTS = ["firma", "ünvan", "unvan", "company", "name", "title", "şirket"]
@@ -89,3 +94,72 @@ def guess_domain_column(df: pd.DataFrame) -> Optional[str]:
             continue
 
     return best_col
+
+
+def _map_unique(series: pd.Series, func) -> pd.Series:
+    """
+    Apply a scalar string function once per distinct value of a Series.
+
+    OSB lists repeat the same website/e-mail domain many times, so normalizing
+    the unique values and mapping them back is much cheaper than per-row calls.
+    """
+    uniques = pd.unique(series)
+    mapping = {value: (func(value) if value else "") for value in uniques}
+    return series.map(mapping)
+
+
+def prepare_ingest_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Normalize and validate an ingest DataFrame in one vectorised pass.
+
+    Resolves the final domain per row with the same precedence as single
+    domain ingestion (website > email > domain column). Rows with an empty or
+    invalid domain column are dropped and reported.
+
+    Args:
+        df: DataFrame with lowercase column names; must contain ``domain``
+            (``company_name``, ``email`` and ``website`` are optional)
+
+    Returns:
+        Tuple of (prepared DataFrame, error messages). The prepared frame has
+        columns ``domain``, ``original_domain``, ``company_name``, ``email``,
+        ``website`` and ``row_index``; optional fields are None when empty.
+    """
+    def _text_column(name: str) -> pd.Series:
+        if name not in df.columns:
+            return pd.Series("", index=df.index, dtype=object)
+        return df[name].fillna("").astype(str).str.strip()
+
+    original = _text_column("domain")
+    company_name = _text_column("company_name")
+    email = _text_column("email")
+    website = _text_column("website")
+
+    normalized = _map_unique(original, normalize_domain)
+
+    errors: List[str] = []
+    valid = normalized != ""
+    for idx, value in zip(df.index[~valid], original[~valid]):
+        if not value:
+            errors.append(f"Satır {idx + 1}: Boş domain")
+        else:
+            errors.append(f"Satır {idx + 1}: Geçersiz domain formatı '{value}'")
+
+    # Final domain precedence: website > email > domain column
+    final = normalized
+    email_domain = _map_unique(email, extract_domain_from_email)
+    final = final.where(email_domain == "", email_domain)
+    website_domain = _map_unique(website, extract_domain_from_website)
+    final = final.where(website_domain == "", website_domain)
+
+    prepared = pd.DataFrame(
+        {
+            "domain": final[valid],
+            "original_domain": original[valid],
+            "company_name": company_name[valid].replace("", None),
+            "email": email[valid].replace("", None),
+            "website": website[valid].replace("", None),
+            "row_index": df.index[valid],
+        }
+    )
+    return prepared, errors
@@ -0,0 +1,159 @@
+"""Materialised lead read model (one denormalised row per scanned domain)."""
+
+from typing import Any, Iterable, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.priority import priority_score_sql
+from app.core.enrichment_service import build_infra_summaries
+
+# Domains per INSERT ... SELECT refresh statement
+LEAD_READ_MODEL_CHUNK_SIZE = 1000
+
+# lead_read_model column -> source expression (companies c, domain_signals ds, lead_scores ls)
+LEAD_READ_MODEL_SOURCES = {
+    "domain": "c.domain",
+    "company_id": "c.id",
+    "canonical_name": "c.canonical_name",
+    "provider": "c.provider",
+    "tenant_size": "c.tenant_size",
+    "country": "c.country",
+    "contact_emails": "c.contact_emails",
+    "contact_quality_score": "c.contact_quality_score",
+    "linkedin_pattern": "c.linkedin_pattern",
+    "spf": "ds.spf",
+    "dkim": "ds.dkim",
+    "dmarc_policy": "ds.dmarc_policy",
+    "dmarc_coverage": "ds.dmarc_coverage",
+    "mx_root": "ds.mx_root",
+    "local_provider": "ds.local_provider",
+    "registrar": "ds.registrar",
+    "expires_at": "ds.expires_at",
+    "nameservers": "ds.nameservers",
+    "scan_status": "ds.scan_status",
+    "scanned_at": "ds.scanned_at",
+    "readiness_score": "ls.readiness_score",
+    "segment": "ls.segment",
+    "reason": "ls.reason",
+    "technical_heat": "ls.technical_heat",
+    "commercial_segment": "ls.commercial_segment",
+    "commercial_heat": "ls.commercial_heat",
+    "priority_category": "ls.priority_category",
+    "priority_label": "ls.priority_label",
+    "priority_score": priority_score_sql("ls.segment", "ls.readiness_score"),
+    "infrastructure_summary": "infra.summary",
+}
+
+
+def build_refresh_query() -> str:
+    """
+    Build the set-based refresh statement for a list of domains.
+
+    Re-reads companies / lead_scores / domain_signals for :domains and
+    UPSERTs them into lead_read_model. Infrastructure summaries are passed in
+    as parallel arrays (:infra_domains / :infra_summaries) because they are
+    formatted in Python (format_infra_summary).
+
+    Returns:
+        SQL string
+    """
+    columns = list(LEAD_READ_MODEL_SOURCES)
+    updates = ",\n            ".join(
+        f"{column} = EXCLUDED.{column}" for column in columns if column != "domain"
+    )
+    return f"""
+        INSERT INTO lead_read_model ({", ".join(columns)}, updated_at)
+        SELECT
+            {", ".join(LEAD_READ_MODEL_SOURCES.values())},
+            NOW()
+        FROM companies c
+        JOIN lead_scores ls ON ls.domain = c.domain
+        LEFT JOIN domain_signals ds ON ds.domain = c.domain
+        LEFT JOIN unnest(
+            CAST(:infra_domains AS text[]), CAST(:infra_summaries AS text[])
+        ) AS infra(domain, summary) ON infra.domain = c.domain
+        WHERE c.domain = ANY(:domains)
+        ON CONFLICT (domain) DO UPDATE SET
+            {updates},
+            updated_at = NOW()
+    """
+
+
+# Rows for domains that lost their lead score (read model only holds scanned leads)
+DELETE_UNSCORED_QUERY = """
+    DELETE FROM lead_read_model
+    WHERE domain = ANY(:domains)
+      AND NOT EXISTS (
+          SELECT 1 FROM lead_scores ls WHERE ls.domain = lead_read_model.domain
+      )
+"""
+
+
+def refresh_lead_read_model(
+    db: Session,
+    domains: Iterable[str],
+    chunk_size: int = LEAD_READ_MODEL_CHUNK_SIZE,
+) -> int:
+    """
+    Re-materialise lead_read_model rows for the given domains.
+
+    Called by the write paths (scan/rescan persistence, company updates, IP
+    enrichment) so read endpoints can select from one indexed table instead of
+    joining and de-duplicating companies / domain_signals / lead_scores.
+    Domains without a lead score are skipped (and removed if present).
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        domains: Normalized domains to refresh
+        chunk_size: Domains per refresh statement
+
+    Returns:
+        Number of distinct domains refreshed
+    """
+    unique_domains = sorted({d for d in domains if d})
+    if not unique_domains:
+        return 0
+
+    query = text(build_refresh_query())
+    for start in range(0, len(unique_domains), chunk_size):
+        chunk = unique_domains[start : start + chunk_size]
+        summaries = build_infra_summaries(chunk, db)
+        infra_domains = [d for d in chunk if summaries.get(d)]
+        db.execute(
+            query,
+            {
+                "domains": chunk,
+                "infra_domains": infra_domains,
+                "infra_summaries": [summaries[d] for d in infra_domains],
+            },
+        )
+        db.execute(text(DELETE_UNSCORED_QUERY), {"domains": chunk})
+
+    return len(unique_domains)
+
+
+def fetch_lead_row(db: Session, domain: str) -> Tuple[Optional[Any], bool]:
+    """
+    Load one lead from lead_read_model.
+
+    Args:
+        db: Database session
+        domain: Normalized domain
+
+    Returns:
+        Tuple of (read model row or None, whether the company exists); a
+        missing row for an existing company means it has not been scanned yet
+    """
+    row = db.execute(
+        text("SELECT * FROM lead_read_model WHERE domain = :domain"),
+        {"domain": domain},
+    ).fetchone()
+    if row is not None:
+        return row, True
+
+    company_exists = db.execute(
+        text("SELECT 1 FROM companies WHERE domain = :domain"),
+        {"domain": domain},
+    ).first() is not None
+    return None, company_exists
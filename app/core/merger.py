@@ -1,10 +1,16 @@
 """Company data merger utilities for upserting company records."""
 
-from typing import Optional
+from typing import Optional, Iterable, Dict, Any, List
+from sqlalchemy import bindparam, func, insert as sa_insert, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert
 from app.db.models import Company, RawLead
 from app.core.normalizer import normalize_domain
+from app.core.lead_read_model import refresh_lead_read_model
+
+# Rows per multi-row INSERT statement in bulk ingestion
+BULK_UPSERT_CHUNK_SIZE = 1000
 
 
 def upsert_companies(
@@ -66,6 +72,8 @@ def upsert_companies(
         db.add(company)
 
     try:
+        db.flush()
+        refresh_lead_read_model(db, [normalized_domain])
         db.commit()
         db.refresh(company)
         return company
@@ -82,9 +90,160 @@ def upsert_companies(
                 company.provider = provider
             if country is not None:
                 company.country = country
+            db.flush()
+            refresh_lead_read_model(db, [normalized_domain])
             db.commit()
             db.refresh(company)
             return company
         else:
             # Re-raise if we can't recover
             raise
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    """Yield successive fixed-size slices of a list."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def bulk_upsert_companies(
+    db: Session,
+    companies: Iterable[Dict[str, Any]],
+    chunk_size: int = BULK_UPSERT_CHUNK_SIZE,
+) -> int:
+    """
+    Upsert many company records with one INSERT ... ON CONFLICT per chunk.
+
+    Same semantics as calling upsert_companies() once per row, in order:
+    canonical_name is only overwritten when a company_name is given, and new
+    companies without a name fall back to the domain. Duplicate domains are
+    collapsed first (last non-empty company_name wins) because Postgres
+    rejects ON CONFLICT DO UPDATE touching the same row twice in a statement.
+    Renamed companies that are already scanned get their lead_read_model
+    rows refreshed.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: SQLAlchemy database session
+        companies: Iterable of dicts with ``domain`` (already normalized) and
+            optional ``company_name``
+        chunk_size: Rows per INSERT statement
+
+    Returns:
+        Number of distinct domains upserted
+    """
+    names: Dict[str, Optional[str]] = {}
+    for row in companies:
+        domain = row["domain"]
+        company_name = row.get("company_name")
+        if company_name or domain not in names:
+            names[domain] = company_name or names.get(domain)
+
+    named = [
+        {"domain": domain, "canonical_name": name}
+        for domain, name in names.items()
+        if name
+    ]
+    unnamed = [
+        {"domain": domain, "canonical_name": domain}
+        for domain, name in names.items()
+        if not name
+    ]
+
+    for chunk in _chunks(named, chunk_size):
+        stmt = insert(Company).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["domain"],
+            set_={
+                "canonical_name": stmt.excluded.canonical_name,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+
+    # Rows without a name never change an existing company
+    for chunk in _chunks(unnamed, chunk_size):
+        stmt = insert(Company).values(chunk)
+        stmt = stmt.on_conflict_do_nothing(index_elements=["domain"])
+        db.execute(stmt)
+
+    refresh_lead_read_model(db, [row["domain"] for row in named], chunk_size)
+    return len(names)
+
+
+def bulk_insert_raw_leads(
+    db: Session,
+    raw_leads: List[Dict[str, Any]],
+    chunk_size: int = BULK_UPSERT_CHUNK_SIZE,
+) -> int:
+    """
+    Insert many raw_lead rows using executemany (batched multi-row VALUES).
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: SQLAlchemy database session
+        raw_leads: List of dicts with RawLead column values
+        chunk_size: Rows per executemany call
+
+    Returns:
+        Number of rows inserted
+    """
+    for chunk in _chunks(raw_leads, chunk_size):
+        db.execute(sa_insert(RawLead), chunk)
+    return len(raw_leads)
+
+
+def bulk_update_company_enrichment(
+    db: Session,
+    enrichments: Iterable[Dict[str, Any]],
+    chunk_size: int = BULK_UPSERT_CHUNK_SIZE,
+) -> int:
+    """
+    Write contact enrichment for many existing companies (executemany UPDATE).
+
+    Duplicate domains are collapsed first (last row wins, as with per-row
+    updates in order). Updated companies get their lead_read_model rows
+    refreshed.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: SQLAlchemy database session
+        enrichments: Dicts with ``domain`` plus the enrich_company_data()
+            fields (contact_emails, contact_quality_score, linkedin_pattern)
+        chunk_size: Rows per executemany call
+
+    Returns:
+        Number of distinct domains updated
+    """
+    latest = {row["domain"]: row for row in enrichments}
+    if not latest:
+        return 0
+
+    params = [
+        {
+            "b_domain": domain,
+            "b_contact_emails": row["contact_emails"],
+            "b_contact_quality_score": row["contact_quality_score"],
+            "b_linkedin_pattern": row["linkedin_pattern"],
+        }
+        for domain, row in latest.items()
+    ]
+    companies = Company.__table__
+    stmt = (
+        update(companies)
+        .where(companies.c.domain == bindparam("b_domain"))
+        .values(
+            contact_emails=bindparam("b_contact_emails"),
+            contact_quality_score=bindparam("b_contact_quality_score"),
+            linkedin_pattern=bindparam("b_linkedin_pattern"),
+            updated_at=func.now(),
+        )
+    )
+    for chunk in _chunks(params, chunk_size):
+        db.execute(stmt, chunk)
+
+    refresh_lead_read_model(db, list(latest), chunk_size)
+    return len(latest)
@@ -1,21 +1,37 @@
 """Notification engine for alerts (G18)."""
 
-from typing import List, Optional
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 import httpx
-from datetime import datetime
 from app.db.models import Alert, AlertConfig
 from app.config import settings
 from app.core.logging import logger
 
+# Pending alerts loaded and dispatched per page
+NOTIFICATION_CHUNK_SIZE = 500
+# Shared HTTP client pool for webhook notifications
+NOTIFICATION_MAX_CONNECTIONS = 100
+NOTIFICATION_TIMEOUT = 10.0  # seconds per webhook request
+# In-flight notifications per target (webhook URL / email address)
+NOTIFICATION_PER_TARGET_CONCURRENCY = 5
 
-async def send_webhook_notification(webhook_url: str, alert: Alert) -> bool:
+# Dispatch outcome for alerts without an enabled config (marked sent, no notification)
+NO_NOTIFICATION = ""
+
+
+async def send_webhook_notification(
+    webhook_url: str, alert: Alert, client: Optional[httpx.AsyncClient] = None
+) -> bool:
     """
     Send webhook notification for an alert.
 
     Args:
         webhook_url: Webhook URL to send notification to
-        alert: Alert object
+        alert: Alert object (or row with the same attributes)
+        client: Shared HTTP client (default: a one-off client for this call)
 
     Returns:
         True if successful, False otherwise
@@ -29,7 +45,12 @@ async def send_webhook_notification(webhook_url: str, alert: Alert) -> bool:
             "created_at": alert.created_at.isoformat() if alert.created_at else None,
         }
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        if client is not None:
+            response = await client.post(webhook_url, json=payload)
+            response.raise_for_status()
+            return True
+
+        async with httpx.AsyncClient(timeout=NOTIFICATION_TIMEOUT) as client:
             response = await client.post(webhook_url, json=payload)
             response.raise_for_status()
             return True
@@ -68,61 +89,176 @@ async def send_email_notification(email_address: str, alert: Alert) -> bool:
         return False
 
 
-async def process_pending_alerts(db: Session) -> int:
+def load_alert_configs(db: Session) -> Dict[str, List[AlertConfig]]:
     """
-    Process pending alerts and send notifications.
+    Load enabled alert configs once per dispatch run.
 
     Args:
         db: Database session
 
     Returns:
-        Number of alerts processed
+        Dict mapping alert_type -> configs (in creation order)
     """
-    # Get pending alerts
-    pending_alerts = db.query(Alert).filter(Alert.status == "pending").all()
+    configs: Dict[str, List[AlertConfig]] = defaultdict(list)
+    rows = (
+        db.query(AlertConfig)
+        .filter(AlertConfig.enabled == True)
+        .order_by(AlertConfig.id)
+        .all()
+    )
+    for config in rows:
+        configs[config.alert_type].append(config)
+    return dict(configs)
 
-    if not pending_alerts:
-        return 0
 
-    processed = 0
+async def _send_to_target(
+    alert: Any,
+    config: AlertConfig,
+    client: httpx.AsyncClient,
+    target_limits: Dict[str, asyncio.Semaphore],
+) -> bool:
+    """Send one alert through one config, capped per target."""
+    if config.notification_method == "webhook" and config.webhook_url:
+        async with target_limits[config.webhook_url]:
+            return await send_webhook_notification(config.webhook_url, alert, client=client)
+    if config.notification_method == "email" and config.email_address:
+        async with target_limits[config.email_address]:
+            return await send_email_notification(config.email_address, alert)
+    return False
 
-    for alert in pending_alerts:
-        # Get alert config for this alert type
-        configs = (
-            db.query(AlertConfig)
-            .filter(
-                AlertConfig.alert_type == alert.alert_type, AlertConfig.enabled == True
-            )
-            .all()
+
+async def dispatch_alerts(
+    alerts: List[Any],
+    configs: Dict[str, List[AlertConfig]],
+    client: httpx.AsyncClient,
+    target_limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+) -> Dict[int, Optional[str]]:
+    """
+    Send notifications for a page of alerts concurrently.
+
+    Every enabled config of an alert's type is notified: configs belong to
+    different users, so one user's successful delivery must not keep the
+    alert from anyone else's targets. All sends of the page run at once;
+    the per-target semaphores cap in-flight requests to any single webhook
+    URL or email address.
+
+    Args:
+        alerts: Pending alerts (Alert objects or rows with the same attributes)
+        configs: Result of load_alert_configs()
+        client: Shared HTTP client
+        target_limits: Per-target semaphores (shared across pages of one run)
+
+    Returns:
+        Dict mapping alert id -> notification method of the last config (in
+        order) that succeeded, NO_NOTIFICATION if no config applies, or None
+        if every config failed
+    """
+    if target_limits is None:
+        target_limits = defaultdict(
+            lambda: asyncio.Semaphore(NOTIFICATION_PER_TARGET_CONCURRENCY)
         )
 
-        if not configs:
+    outcomes: Dict[int, Optional[str]] = {}
+    sends = []
+    for alert in alerts:
+        alert_configs = configs.get(alert.alert_type)
+        if alert_configs:
+            sends.extend((alert, config) for config in alert_configs)
+        else:
             # No config, mark as sent (no notification needed)
-            alert.status = "sent"
-            alert.sent_at = datetime.now()
-            processed += 1
-            continue
-
-        # Send notifications based on config
-        success = False
-        for config in configs:
-            if config.notification_method == "webhook" and config.webhook_url:
-                success = await send_webhook_notification(config.webhook_url, alert)
-                if success:
-                    alert.notification_method = "webhook"
-            elif config.notification_method == "email" and config.email_address:
-                success = await send_email_notification(config.email_address, alert)
-                if success:
-                    alert.notification_method = "email"
-
-        # Update alert status
+            outcomes[alert.id] = NO_NOTIFICATION
+
+    results = await asyncio.gather(
+        *(_send_to_target(alert, config, client, target_limits) for alert, config in sends)
+    )
+    for (alert, config), success in zip(sends, results):
         if success:
-            alert.status = "sent"
-            alert.sent_at = datetime.now()
+            outcomes[alert.id] = config.notification_method
+        else:
+            outcomes.setdefault(alert.id, None)
+
+    return outcomes
+
+
+def update_alert_statuses(db: Session, outcomes: Dict[int, Optional[str]]) -> None:
+    """
+    Write dispatch outcomes with one UPDATE per (status, method) group.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        outcomes: Result of dispatch_alerts()
+    """
+    groups: Dict[Optional[str], List[int]] = defaultdict(list)
+    for alert_id, method in outcomes.items():
+        groups[method].append(alert_id)
+
+    for method, alert_ids in sorted(groups.items(), key=lambda item: str(item[0])):
+        if method is None:
+            values: Dict[str, Any] = {"status": "failed"}
         else:
-            alert.status = "failed"
+            values = {"status": "sent", "sent_at": func.now()}
+            if method != NO_NOTIFICATION:
+                values["notification_method"] = method
+        db.execute(
+            update(Alert)
+            .where(Alert.id.in_(sorted(alert_ids)))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def process_pending_alerts(db: Session, chunk_size: int = NOTIFICATION_CHUNK_SIZE) -> int:
+    """
+    Process pending alerts and send notifications.
+
+    Alert configs are loaded once; pending alerts are paged by id and each
+    page is dispatched concurrently over one pooled HTTP client, then its
+    statuses are written in bulk and committed.
+
+    Args:
+        db: Database session
+        chunk_size: Alerts per page
+
+    Returns:
+        Number of alerts processed
+    """
+    configs = load_alert_configs(db)
+    target_limits: Dict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(NOTIFICATION_PER_TARGET_CONCURRENCY)
+    )
+    limits = httpx.Limits(
+        max_connections=NOTIFICATION_MAX_CONNECTIONS,
+        max_keepalive_connections=NOTIFICATION_MAX_CONNECTIONS,
+    )
+
+    processed = 0
+    last_id = 0
+    async with httpx.AsyncClient(timeout=NOTIFICATION_TIMEOUT, limits=limits) as client:
+        while True:
+            alerts = (
+                db.query(
+                    Alert.id,
+                    Alert.domain,
+                    Alert.alert_type,
+                    Alert.alert_message,
+                    Alert.created_at,
+                )
+                .filter(Alert.status == "pending", Alert.id > last_id)
+                .order_by(Alert.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not alerts:
+                break
+            last_id = alerts[-1].id
 
-        processed += 1
+            outcomes = await dispatch_alerts(alerts, configs, client, target_limits)
+            update_alert_statuses(db, outcomes)
+            db.commit()
+            processed += len(alerts)
 
-    db.commit()
+    if processed:
+        logger.info("pending_alerts_dispatched", processed=processed)
     return processed
@@ -84,3 +84,41 @@ def calculate_priority_score(segment: Optional[str], score: Optional[int]) -> in
     # Skip segment or any other segment (lowest priority)
     else:
         return 7
+
+
+def priority_score_sql(
+    segment_column: str = "segment", score_column: str = "readiness_score"
+) -> str:
+    """
+    Build a SQL CASE expression equivalent to calculate_priority_score().
+
+    Lets Postgres compute priority_score so that ORDER BY, LIMIT/OFFSET and
+    keyset pagination run in the database. Thresholds come from the same
+    constants as the Python implementation.
+
+    Args:
+        segment_column: SQL expression for the segment
+        score_column: SQL expression for the readiness score
+
+    Returns:
+        SQL expression evaluating to an integer priority (1-7)
+    """
+    segment = f"TRIM({segment_column})"
+    score = score_column
+    return f"""(CASE
+        WHEN {segment_column} IS NULL OR {score} IS NULL THEN 7
+        WHEN {segment} = 'Migration' THEN (CASE
+            WHEN {score} >= {PRIORITY_1_SCORE} THEN 1
+            WHEN {score} >= {PRIORITY_2_SCORE} THEN 2
+            WHEN {score} >= {PRIORITY_3_MIGRATION_SCORE} THEN 3
+            ELSE 4 END)
+        WHEN {segment} = 'Existing' THEN (CASE
+            WHEN {score} >= {PRIORITY_3_EXISTING_SCORE} THEN 3
+            WHEN {score} >= {PRIORITY_4_EXISTING_SCORE} THEN 4
+            WHEN {score} >= {PRIORITY_5_EXISTING_SCORE} THEN 5
+            ELSE 6 END)
+        WHEN {segment} = 'Cold' THEN (CASE
+            WHEN {score} >= {PRIORITY_5_COLD_SCORE} THEN 5
+            WHEN {score} >= {PRIORITY_6_COLD_SCORE} THEN 6
+            ELSE 7 END)
+        ELSE 7 END)"""
@@ -7,14 +7,34 @@ from datetime import datetime, timedelta
 import redis
 from app.config import settings
 
+# Integer counters stored in the job state hash
+JOB_COUNTER_FIELDS = ("total", "processed", "succeeded", "failed")
+# Most recent errors kept per job (capped list; "failed" keeps the exact count)
+JOB_MAX_ERRORS = 1000
+
 
 class ProgressTracker:
-    """Track progress of bulk scan jobs in Redis."""
+    """
+    Track progress of bulk scan jobs in Redis.
+
+    Job state lives in a hash (``bulk_scan:job:{id}:state``) with integer
+    counters updated via HINCRBY, and errors in a capped list
+    (``bulk_scan:job:{id}:errors``). Every update is a single pipelined round
+    trip whose cost does not depend on how many errors a job has, and
+    concurrent writers never overwrite each other's counts.
+    """
 
     def __init__(self):
         self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
         self.job_prefix = "bulk_scan:job:"
         self.job_ttl = 3600  # 1 hour TTL
+        self.max_errors = JOB_MAX_ERRORS
+
+    def _state_key(self, job_id: str) -> str:
+        return f"{self.job_prefix}{job_id}:state"
+
+    def _errors_key(self, job_id: str) -> str:
+        return f"{self.job_prefix}{job_id}:errors"
 
     def create_job(self, domain_list: List[str]) -> str:
         """
@@ -28,6 +48,7 @@ class ProgressTracker:
         """
         job_id = str(uuid.uuid4())
         job_key = f"{self.job_prefix}{job_id}"
+        now = datetime.utcnow().isoformat()
 
         job_data = {
             "job_id": job_id,
@@ -36,36 +57,66 @@ class ProgressTracker:
             "processed": 0,
             "succeeded": 0,
             "failed": 0,
-            "errors": [],
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
+            "created_at": now,
+            "updated_at": now,
         }
 
-        self.redis_client.setex(job_key, self.job_ttl, json.dumps(job_data))
-
+        pipe = self.redis_client.pipeline()
+        pipe.hset(self._state_key(job_id), mapping=job_data)
+        pipe.expire(self._state_key(job_id), self.job_ttl)
         # Store domain list separately
-        domain_list_key = f"{job_key}:domains"
-        self.redis_client.setex(domain_list_key, self.job_ttl, json.dumps(domain_list))
+        pipe.setex(f"{job_key}:domains", self.job_ttl, json.dumps(domain_list))
+        pipe.execute()
 
         return job_id
 
-    def get_job(self, job_id: str) -> Optional[Dict]:
+    def get_job(self, job_id: str, max_errors: Optional[int] = None) -> Optional[Dict]:
         """
         Get job status.
 
         Args:
             job_id: Job ID
+            max_errors: Most recent errors to include (None = all stored, 0 = none;
+                counters are always included)
 
         Returns:
             Job data or None if not found
         """
-        job_key = f"{self.job_prefix}{job_id}"
-        job_data = self.redis_client.get(job_key)
-
-        if not job_data:
+        pipe = self.redis_client.pipeline()
+        pipe.hgetall(self._state_key(job_id))
+        if max_errors != 0:
+            start = -max_errors if max_errors else 0
+            pipe.lrange(self._errors_key(job_id), start, -1)
+        results = pipe.execute()
+
+        state = results[0]
+        if not state or "job_id" not in state:
             return None
 
-        return json.loads(job_data)
+        job: Dict = dict(state)
+        for field in JOB_COUNTER_FIELDS:
+            job[field] = int(job.get(field, 0))
+        job["progress"] = (
+            int((job["processed"] / job["total"]) * 100) if job["total"] > 0 else 0
+        )
+        job["errors"] = [json.loads(error) for error in results[1]] if max_errors != 0 else []
+        return job
+
+    def _queue_errors(self, pipe, job_id: str, errors: List[Dict]):
+        """Append errors to the capped error list (within a pipeline)."""
+        if not errors:
+            return
+        now = datetime.utcnow().isoformat()
+        payload = []
+        for error in errors:
+            # Add timestamp if not present
+            if "timestamp" not in error or error["timestamp"] is None:
+                error["timestamp"] = now
+            payload.append(json.dumps(error))
+        errors_key = self._errors_key(job_id)
+        pipe.rpush(errors_key, *payload)
+        pipe.ltrim(errors_key, -self.max_errors, -1)
+        pipe.expire(errors_key, self.job_ttl)
 
     def update_progress(
         self,
@@ -76,7 +127,7 @@ class ProgressTracker:
         error: Optional[Dict] = None,
     ):
         """
-        Update job progress.
+        Update job progress (absolute counter values).
 
         Args:
             job_id: Job ID
@@ -85,31 +136,52 @@ class ProgressTracker:
             failed: Number of domains failed
             error: Error details (if any)
         """
-        job_key = f"{self.job_prefix}{job_id}"
-        job_data = self.redis_client.get(job_key)
-
-        if not job_data:
-            return
-
-        job = json.loads(job_data)
-        job["processed"] = processed
-        job["succeeded"] = succeeded
-        job["failed"] = failed
-        job["updated_at"] = datetime.utcnow().isoformat()
-
-        if error:
-            # Add timestamp if not present
-            if "timestamp" not in error or error["timestamp"] is None:
-                error["timestamp"] = datetime.utcnow().isoformat()
-            job["errors"].append(error)
+        pipe = self.redis_client.pipeline()
+        pipe.hset(
+            self._state_key(job_id),
+            mapping={
+                "processed": processed,
+                "succeeded": succeeded,
+                "failed": failed,
+                "updated_at": datetime.utcnow().isoformat(),
+            },
+        )
+        pipe.expire(self._state_key(job_id), self.job_ttl)
+        self._queue_errors(pipe, job_id, [error] if error else [])
+        pipe.execute()
+
+    def increment_progress(
+        self,
+        job_id: str,
+        processed: int = 0,
+        succeeded: int = 0,
+        failed: int = 0,
+        errors: Optional[List[Dict]] = None,
+    ):
+        """
+        Atomically add to job counters and append errors (one round trip).
 
-        # Calculate progress percentage
-        if job["total"] > 0:
-            job["progress"] = int((processed / job["total"]) * 100)
-        else:
-            job["progress"] = 0
+        Safe for several tasks writing the same job concurrently.
 
-        self.redis_client.setex(job_key, self.job_ttl, json.dumps(job))
+        Args:
+            job_id: Job ID
+            processed: Domains processed since last update
+            succeeded: Domains succeeded since last update
+            failed: Domains failed since last update
+            errors: Error details to append (list is capped at max_errors)
+        """
+        state_key = self._state_key(job_id)
+        pipe = self.redis_client.pipeline()
+        if processed:
+            pipe.hincrby(state_key, "processed", processed)
+        if succeeded:
+            pipe.hincrby(state_key, "succeeded", succeeded)
+        if failed:
+            pipe.hincrby(state_key, "failed", failed)
+        pipe.hset(state_key, "updated_at", datetime.utcnow().isoformat())
+        pipe.expire(state_key, self.job_ttl)
+        self._queue_errors(pipe, job_id, errors or [])
+        pipe.execute()
 
     def set_status(self, job_id: str, status: str):
         """
@@ -119,17 +191,14 @@ class ProgressTracker:
             job_id: Job ID
             status: Status (pending, running, completed, failed)
         """
-        job_key = f"{self.job_prefix}{job_id}"
-        job_data = self.redis_client.get(job_key)
-
-        if not job_data:
+        state_key = self._state_key(job_id)
+        if not self.redis_client.exists(state_key):
             return
 
-        job = json.loads(job_data)
-        job["status"] = status
-        job["updated_at"] = datetime.utcnow().isoformat()
-
-        self.redis_client.setex(job_key, self.job_ttl, json.dumps(job))
+        self.redis_client.hset(
+            state_key,
+            mapping={"status": status, "updated_at": datetime.utcnow().isoformat()},
+        )
 
     def store_result(self, job_id: str, domain: str, result: Dict):
         """
@@ -144,6 +213,25 @@ class ProgressTracker:
         self.redis_client.hset(results_key, domain, json.dumps(result))
         self.redis_client.expire(results_key, self.job_ttl)
 
+    def store_results(self, job_id: str, results: Dict[str, Dict]):
+        """
+        Store scan results for many domains (single HSET).
+
+        Args:
+            job_id: Job ID
+            results: Mapping of domain -> scan result
+        """
+        if not results:
+            return
+        results_key = f"{self.job_prefix}{job_id}:results"
+        pipe = self.redis_client.pipeline()
+        pipe.hset(
+            results_key,
+            mapping={domain: json.dumps(result) for domain, result in results.items()},
+        )
+        pipe.expire(results_key, self.job_ttl)
+        pipe.execute()
+
     def get_results(self, job_id: str) -> List[Dict]:
         """
         Get all scan results for a job.
@@ -3,13 +3,15 @@
 import json
 import os
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
-from app.core.cache import get_cached_provider, set_cached_provider
 
 
 _PROVIDERS_CACHE: Optional[Dict] = None
 
+# M365 regional pattern: {region}{number}.protection.outlook.com (eur05, us01, etc.)
+_M365_REGIONAL_MX = re.compile(r'[a-z]{3}\d{2}\.protection\.outlook\.com')
+
 
 def load_providers() -> Dict:
     """
@@ -41,16 +43,77 @@ def load_providers() -> Dict:
     return _PROVIDERS_CACHE
 
 
-def classify_provider(mx_root: Optional[str], use_cache: bool = True) -> str:
+class _LabelMatcher:
+    """
+    Domain pattern matcher compiled from (pattern, value) pairs.
+
+    Patterns are stored in a hash keyed by their dotted labels, so a host is
+    matched by looking up its label windows (exact, subdomain and
+    ``*.pattern.*`` matches) in O(labels x max pattern labels) dict lookups
+    instead of scanning every pattern. When several patterns match, the one
+    listed first wins (same precedence as a linear scan in file order).
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]):
+        self._index: Dict[str, Tuple[int, str]] = {}
+        self._max_labels = 0
+        for rank, (pattern, value) in enumerate(patterns):
+            key = pattern.lower().strip().strip(".")
+            if key and key not in self._index:
+                self._index[key] = (rank, value)
+                self._max_labels = max(self._max_labels, key.count(".") + 1)
+
+    def match(self, host: str) -> Optional[str]:
+        """Return the value of the first-listed pattern matching ``host`` (or None)."""
+        labels = host.split(".")
+        best: Optional[Tuple[int, str]] = None
+        for start in range(len(labels)):
+            stop = min(len(labels), start + self._max_labels)
+            for end in range(start + 1, stop + 1):
+                hit = self._index.get(".".join(labels[start:end]))
+                if hit is not None and (best is None or hit[0] < best[0]):
+                    best = hit
+        return best[1] if best else None
+
+
+_MATCHERS_CACHE: Optional[Dict[str, _LabelMatcher]] = None
+
+
+def _get_matchers() -> Dict[str, _LabelMatcher]:
+    """Compile providers.json into label matchers (once per process)."""
+    global _MATCHERS_CACHE
+
+    if _MATCHERS_CACHE is not None:
+        return _MATCHERS_CACHE
+
+    providers = load_providers().get("providers", [])
+    _MATCHERS_CACHE = {
+        "provider": _LabelMatcher(
+            (root, provider.get("name", ""))
+            for provider in providers
+            for root in provider.get("mx_roots", [])
+        ),
+        "local": _LabelMatcher(
+            (provider_domain, provider_name)
+            for provider in providers
+            if provider.get("name") == "Local"
+            for provider_domain, provider_name in provider.get("local_providers", {}).items()
+        ),
+    }
+    return _MATCHERS_CACHE
+
+
+def classify_provider(mx_root: Optional[str]) -> str:
     """
     Classify a mail provider based on MX root domain.
 
-    Uses Redis-based caching (24 hour TTL) to reduce repeated lookups.
+    Matches against the compiled providers.json index (in-process, no Redis
+    round trip): exact roots, subdomains of a root and hosts containing a
+    root as whole labels all match; the provider listed first wins.
 
     Args:
         mx_root: Root domain of MX record (e.g., "outlook.com", "aspmx.l.google.com")
                 If None or empty, returns "Unknown"
-        use_cache: Whether to use cache (default: True)
 
     Returns:
         Provider name: "M365", "Google", "Yandex", "Zoho", "Amazon",
@@ -69,63 +132,22 @@ def classify_provider(mx_root: Optional[str], use_cache: bool = True) -> str:
     if not mx_root:
         return "Unknown"
 
-    mx_root = mx_root.lower().strip()
-
-    # Check cache first
-    if use_cache:
-        cached_provider = get_cached_provider(mx_root)
-        if cached_provider is not None:
-            return cached_provider
-
-    # Load providers
-    providers_data = load_providers()
-    providers = providers_data.get("providers", [])
-
-    # Check each provider's MX roots
-    for provider in providers:
-        provider_name = provider.get("name", "")
-        mx_roots = provider.get("mx_roots", [])
-
-        # Check if mx_root matches any of the provider's MX roots
-        for root in mx_roots:
-            # Exact match
-            if mx_root == root.lower():
-                provider = provider_name
-                # Cache result
-                if use_cache:
-                    set_cached_provider(mx_root, provider)
-                return provider
-
-            # Check if mx_root ends with the provider root (for subdomains)
-            # e.g., "outlook-com.olc.protection.outlook.com" should match "protection.outlook.com"
-            if mx_root.endswith("." + root.lower()):
-                provider = provider_name
-                # Cache result
-                if use_cache:
-                    set_cached_provider(mx_root, provider)
-                return provider
-
-            # Check if provider root is contained in mx_root
-            # e.g., "mail.outlook.com" should match "outlook.com"
-            if "." + root.lower() in mx_root or mx_root.startswith(root.lower() + "."):
-                provider = provider_name
-                # Cache result
-                if use_cache:
-                    set_cached_provider(mx_root, provider)
-                return provider
-
-    # If no match found, check if it's a local/custom mail server
-    # Local mail servers typically have the domain itself or mail.{domain}
-    # We'll classify as "Local" if it doesn't match any known provider
-    # Otherwise, return "Unknown"
-
-    # For now, if it doesn't match any provider, return "Local"
+    # If it doesn't match any known provider, treat it as a local/custom mail server
     # (This can be refined later based on actual patterns)
-    provider = "Local"
-    # Cache result
-    if use_cache:
-        set_cached_provider(mx_root, provider)
-    return provider
+    return _get_matchers()["provider"].match(mx_root.lower().strip()) or "Local"
+
+
+def classify_many(mx_roots: Iterable[Optional[str]]) -> Dict[Optional[str], str]:
+    """
+    Classify many MX roots at once.
+
+    Args:
+        mx_roots: MX root domains (None/empty values classify as "Unknown")
+
+    Returns:
+        Dict mapping each distinct input value -> provider name
+    """
+    return {mx_root: classify_provider(mx_root) for mx_root in dict.fromkeys(mx_roots)}
 
 
 def classify_local_provider(mx_root: Optional[str]) -> Optional[str]:
@@ -133,6 +155,9 @@ def classify_local_provider(mx_root: Optional[str]) -> Optional[str]:
     Classify local provider from MX root domain.
     
     This function identifies Turkish/local hosting providers from MX records.
+    Provider domains match whole DNS labels only (exact host, subdomain or
+    ``*.domain.*``); a host merely containing the domain as a substring,
+    such as "mail.mynatro.com", does not match.
     
     Args:
         mx_root: Root domain of MX record (e.g., "mail.turkhost.com.tr")
@@ -151,23 +176,7 @@ def classify_local_provider(mx_root: Optional[str]) -> Optional[str]:
     if not mx_root:
         return None
     
-    mx_lower = mx_root.lower().strip()
-    
-    # Load providers and get local provider mappings
-    providers_data = load_providers()
-    providers = providers_data.get("providers", [])
-    
-    # Find Local provider entry
-    for provider in providers:
-        if provider.get("name") == "Local":
-            local_providers = provider.get("local_providers", {})
-            
-            # Check if mx_root contains any local provider domain
-            for provider_domain, provider_name in local_providers.items():
-                if provider_domain in mx_lower:
-                    return provider_name
-    
-    return None
+    return _get_matchers()["local"].match(mx_root.lower().strip())
 
 
 def estimate_tenant_size(provider: str, mx_root: Optional[str]) -> Optional[str]:
@@ -203,7 +212,7 @@ def estimate_tenant_size(provider: str, mx_root: Optional[str]) -> Optional[str]
         
         # Regional pattern (eur05, us01, etc.)
         # Pattern: {region}{number}.protection.outlook.com
-        if re.search(r'[a-z]{3}\d{2}\.protection\.outlook\.com', mx_lower):
+        if _M365_REGIONAL_MX.search(mx_lower):
             return "small"
         
         # OLC pattern (Office 365 Cloud)
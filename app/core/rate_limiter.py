@@ -2,7 +2,7 @@
 
 import time
 import asyncio
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from collections import defaultdict
 from threading import Lock
 from app.core.distributed_rate_limiter import DistributedRateLimiter
@@ -48,6 +48,31 @@ class RateLimiter:
                 return True
             return False
 
+    def acquire_many(self, tokens: int) -> Tuple[int, float]:
+        """
+        Acquire up to ``tokens`` whole tokens (partial grants allowed).
+
+        Args:
+            tokens: Maximum number of tokens to acquire
+
+        Returns:
+            Tuple of (granted tokens, seconds until the next token is available;
+            0.0 when everything was granted)
+        """
+        with self.lock:
+            now = time.time()
+            elapsed = now - self.last_update
+
+            # Add tokens based on elapsed time
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.last_update = now
+
+            granted = max(0, min(tokens, int(self.tokens)))
+            self.tokens -= granted
+            if granted < tokens:
+                return granted, (1 - self.tokens) / self.rate
+            return granted, 0.0
+
     def wait(self, tokens: int = 1) -> float:
         """
         Wait until tokens are available. Returns wait time in seconds.
@@ -1,5 +1,6 @@
 """Redis client wrapper with connection pooling and circuit breaker support."""
 
+import time
 import redis
 from typing import Optional
 from app.config import settings
@@ -9,6 +10,10 @@ from app.core.logging import logger
 _redis_pool: Optional[redis.ConnectionPool] = None
 _redis_client: Optional[redis.Redis] = None
 
+# Cached health flag: is_redis_available() PINGs at most once per interval
+REDIS_HEALTH_CHECK_INTERVAL = 5.0  # seconds
+_redis_health = {"available": False, "checked_at": None}
+
 
 def get_redis_client() -> Optional[redis.Redis]:
     """
@@ -47,19 +52,38 @@ def get_redis_client() -> Optional[redis.Redis]:
 def is_redis_available() -> bool:
     """
     Check if Redis is available.
-    
+
+    The result is cached for REDIS_HEALTH_CHECK_INTERVAL seconds, so hot paths
+    (cache lookups, rate limiting) do not pay a PING round trip per call.
+    Callers that hit a Redis error can call mark_redis_unavailable() to flip
+    the flag before the next check.
+
     Returns:
         True if Redis is available, False otherwise
     """
+    now = time.monotonic()
+    checked_at = _redis_health["checked_at"]
+    if checked_at is not None and now - checked_at < REDIS_HEALTH_CHECK_INTERVAL:
+        return _redis_health["available"]
+
+    available = False
     client = get_redis_client()
-    if client is None:
-        return False
-    
-    try:
-        client.ping()
-        return True
-    except Exception:
-        return False
+    if client is not None:
+        try:
+            client.ping()
+            available = True
+        except Exception:
+            available = False
+
+    _redis_health["available"] = available
+    _redis_health["checked_at"] = now
+    return available
+
+
+def mark_redis_unavailable():
+    """Mark Redis unavailable until the next health check interval."""
+    _redis_health["available"] = False
+    _redis_health["checked_at"] = time.monotonic()
 
 
 def reset_redis_client():
@@ -74,4 +98,6 @@ def reset_redis_client():
     
     _redis_pool = None
     _redis_client = None
+    _redis_health["available"] = False
+    _redis_health["checked_at"] = None
 
@@ -12,6 +12,7 @@ from app.core.normalizer import (
     extract_domain_from_website,
 )
 from app.core.merger import upsert_companies
+from app.core.lead_read_model import refresh_lead_read_model
 from app.core.tasks import scan_single_domain
 from app.config import settings
 from app.core.logging import logger, mask_pii
@@ -104,6 +105,8 @@ def apply_azure_tenant_signal(
     """
     if azure_tenant_id:
         company.provider = "M365"
+        db.flush()
+        refresh_lead_read_model(db, [company.domain])
         db.commit()
         db.refresh(company)
         logger.debug(
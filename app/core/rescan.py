@@ -1,111 +1,112 @@
 """ReScan engine for domain re-scanning with change detection (G18)."""
 
-from typing import Dict, Optional
+from typing import Dict, List
 from sqlalchemy.orm import Session
-from app.db.models import DomainSignal, LeadScore, Company
-from app.core.tasks import scan_single_domain
-from app.core.change_detection import (
-    detect_signal_changes,
-    detect_score_changes,
-    create_alerts,
-)
-from app.core.auto_tagging import apply_auto_tags
+from app.core.normalizer import normalize_domain
+from app.core.tasks import scan_domains_concurrent
+from app.core.change_detection import load_change_snapshots, record_changes_bulk
+from app.core.auto_tagging import apply_auto_tags_bulk
 from app.core.logging import logger
 from app.core.cache import invalidate_scan_cache, invalidate_scoring_cache, invalidate_dns_cache
-import copy
 
 
-def rescan_domain(domain: str, db: Session) -> Dict:
+def rescan_domains(domains: List[str], db: Session) -> List[Dict]:
     """
-    Re-scan a domain and detect changes.
+    Re-scan a batch of domains and detect changes.
 
-    Invalidates cache before rescanning to ensure fresh results.
+    Invalidates cache before rescanning to ensure fresh results. Old signals
+    and scores are snapshotted for the whole batch in one query, the batch is
+    rescanned concurrently, and changes are diffed in memory and written with
+    one multi-row INSERT per history/alert table (see record_changes_bulk()).
+    Commits once for the batch.
 
     Args:
-        domain: Domain name (normalized)
+        domains: Domain names
         db: Database session
 
     Returns:
-        Dictionary with scan result and detected changes
+        List of rescan_domain-shaped results, in input order
     """
-    # Invalidate cache before rescan (force fresh scan)
-    invalidate_scan_cache(domain)
-    invalidate_scoring_cache(domain)  # Also invalidate scoring cache (fixes DMARC coverage bug)
-    invalidate_dns_cache(domain)  # Also invalidate DNS cache (ensures fresh DMARC data)
-    
-    # Get old signal and score for comparison (before scan)
-    old_signal = db.query(DomainSignal).filter(DomainSignal.domain == domain).first()
-    old_score = db.query(LeadScore).filter(LeadScore.domain == domain).first()
-
-    # Create copies for comparison (since scan will delete and recreate)
-    old_signal_copy = None
-    old_score_copy = None
-    if old_signal:
-        old_signal_copy = DomainSignal(
-            domain=old_signal.domain,
-            spf=old_signal.spf,
-            dkim=old_signal.dkim,
-            dmarc_policy=old_signal.dmarc_policy,
-            mx_root=old_signal.mx_root,
-            expires_at=old_signal.expires_at,
-        )
-    if old_score:
-        old_score_copy = LeadScore(
-            domain=old_score.domain,
-            readiness_score=old_score.readiness_score,
-            segment=old_score.segment,
-        )
-
-    # Perform scan (use_cache=False to ensure fresh DNS data after cache invalidation)
-    scan_result = scan_single_domain(domain, db, use_cache=False)
-
-    if not scan_result.get("success"):
-        return scan_result
+    normalized = list(dict.fromkeys(n for n in (normalize_domain(d) for d in domains) if n))
 
-    # Get new signal and score (after scan)
-    new_signal = db.query(DomainSignal).filter(DomainSignal.domain == domain).first()
-    new_score = db.query(LeadScore).filter(LeadScore.domain == domain).first()
+    for domain in normalized:
+        # Invalidate cache before rescan (force fresh scan)
+        invalidate_scan_cache(domain)
+        invalidate_scoring_cache(domain)  # Also invalidate scoring cache (fixes DMARC coverage bug)
+        invalidate_dns_cache(domain)  # Also invalidate DNS cache (ensures fresh DMARC data)
 
-    if not new_signal or not new_score:
-        return {"success": False, "error": "Failed to retrieve scan results"}
+    # Get old signals and scores for comparison (before scan)
+    old_snapshots = load_change_snapshots(db, normalized)
 
-    # Detect changes (use copies since originals were deleted)
-    signal_changes = detect_signal_changes(domain, old_signal_copy, new_signal, db)
-    score_changes = detect_score_changes(domain, old_score_copy, new_score, db)
+    # Perform scan (use_cache=False to ensure fresh DNS data after cache invalidation)
+    scan_results = scan_domains_concurrent(domains, db, use_cache=False)
 
-    # Create alerts for changes
-    all_changes = signal_changes + score_changes
-    alerts = create_alerts(domain, all_changes, db)
+    # Get new signals and scores (after scan) and record changes + alerts
+    scanned = [result["domain"] for result in scan_results if result.get("success")]
+    new_snapshots = load_change_snapshots(db, scanned)
+    summaries = record_changes_bulk(db, old_snapshots, new_snapshots)
 
     # Apply auto-tagging (may create new tags based on new signals)
-    try:
-        apply_auto_tags(domain, db)
-    except Exception as e:
-        # Log but don't fail
-        logger.warning("auto_tagging_failed", domain=domain, error=str(e))
+    if summaries:
+        try:
+            with db.begin_nested():
+                apply_auto_tags_bulk(list(summaries), db)
+        except Exception as e:
+            # Log but don't fail
+            logger.warning("auto_tagging_failed", domains=len(summaries), error=str(e))
 
     # Commit all changes
     db.commit()
 
-    # Trigger alert notification processing (async, non-blocking)
-    # Alerts will be processed by the scheduled task, but we can also trigger it immediately
-    # for faster notification delivery
-    try:
-        from app.core.tasks import process_pending_alerts_task
-
-        # Trigger async task to process alerts (non-blocking)
-        process_pending_alerts_task.delay()
-    except Exception as e:
-        # Log but don't fail - alerts will be processed by scheduled task
-        logger.warning("alert_processing_trigger_failed", error=str(e))
-
-    return {
-        "success": True,
-        "domain": domain,
-        "result": scan_result.get("result", {}),
-        "changes_detected": len(all_changes) > 0,
-        "signal_changes": len(signal_changes),
-        "score_changes": len(score_changes),
-        "alerts_created": len(alerts),
-        "changes": all_changes,
-    }
+    alerts_created = sum(summary["alerts_created"] for summary in summaries.values())
+    if alerts_created:
+        # Trigger alert notification processing (async, non-blocking)
+        # Alerts will be processed by the scheduled task, but we can also trigger it immediately
+        # for faster notification delivery
+        try:
+            from app.core.tasks import process_pending_alerts_task
+
+            # Trigger async task to process alerts (non-blocking)
+            process_pending_alerts_task.delay()
+        except Exception as e:
+            # Log but don't fail - alerts will be processed by scheduled task
+            logger.warning("alert_processing_trigger_failed", error=str(e))
+
+    results: List[Dict] = []
+    for scan_result in scan_results:
+        domain = scan_result["domain"]
+        if not scan_result.get("success"):
+            results.append(scan_result)
+        elif domain not in summaries:
+            results.append({"success": False, "error": "Failed to retrieve scan results"})
+        else:
+            summary = summaries[domain]
+            results.append(
+                {
+                    "success": True,
+                    "domain": domain,
+                    "result": scan_result.get("result", {}),
+                    "changes_detected": len(summary["changes"]) > 0,
+                    "signal_changes": summary["signal_changes"],
+                    "score_changes": summary["score_changes"],
+                    "alerts_created": summary["alerts_created"],
+                    "changes": summary["changes"],
+                }
+            )
+    return results
+
+
+def rescan_domain(domain: str, db: Session) -> Dict:
+    """
+    Re-scan a domain and detect changes.
+
+    Invalidates cache before rescanning to ensure fresh results.
+
+    Args:
+        domain: Domain name (normalized)
+        db: Database session
+
+    Returns:
+        Dictionary with scan result and detected changes
+    """
+    return rescan_domains([domain], db)[0]
@@ -0,0 +1,263 @@
+"""Resumable daily rescan scheduler with staleness ranking (G18)."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.db.models import RescanRun
+from app.core.constants import EXPIRE_SOON_DAYS
+
+# Domains per rescan_chunk_task (one rescan_domains() batch)
+RESCAN_CHUNK_SIZE = 100
+# A new run is started at most this often
+RESCAN_RUN_INTERVAL_HOURS = 24
+# Domains scanned more recently than this are not rescanned
+RESCAN_MIN_AGE_HOURS = 20
+# A running run without a checkpoint for this long is considered crashed and resumed.
+# updated_at doubles as the run's lease: whoever moves it (compare-and-set) owns the run.
+RESCAN_RUN_STALL_SECONDS = 1800
+
+# Staleness = hours since last scan + bonuses (higher is rescanned first)
+RESCAN_EXPIRY_BONUS_HOURS = 72.0  # Registration expires within EXPIRE_SOON_DAYS
+RESCAN_RECENT_CHANGE_DAYS = 7
+RESCAN_RECENT_CHANGE_BONUS_HOURS = 48.0  # Signals changed within RESCAN_RECENT_CHANGE_DAYS
+
+# Ranking of every stale domain; evaluated once per run (snapshot below)
+RESCAN_CANDIDATES_QUERY = """
+    SELECT domain, staleness FROM (
+        SELECT ds.domain,
+               CAST(
+                   EXTRACT(EPOCH FROM (:as_of - ds.scanned_at)) / 3600.0
+                   + CASE WHEN ds.expires_at >= CAST(:as_of AS date)
+                               AND ds.expires_at < :expiry_until
+                          THEN :expiry_bonus ELSE 0 END
+                   + CASE WHEN lc.changed_at >= :changed_since
+                          THEN :change_bonus ELSE 0 END
+               AS double precision) AS staleness
+        FROM domain_signals ds
+        LEFT JOIN LATERAL (
+            SELECT MAX(h.changed_at) AS changed_at
+            FROM signal_change_history h
+            WHERE h.domain = ds.domain
+        ) lc ON TRUE
+        WHERE ds.scanned_at < :stale_before
+    ) ranked
+    ORDER BY staleness DESC, domain
+    LIMIT :limit
+"""
+
+RESCAN_SNAPSHOT_QUERY = """
+    INSERT INTO rescan_run_candidates (run_id, domain, staleness)
+    SELECT :run_id, domain, staleness FROM ({candidates}) candidates
+"""
+
+# Chunks page the run's snapshot; domains scanned elsewhere since as_of are skipped
+RESCAN_CHUNK_QUERY = """
+    SELECT c.domain, c.staleness
+    FROM rescan_run_candidates c
+    JOIN domain_signals ds ON ds.domain = c.domain
+    WHERE c.run_id = :run_id
+      AND ds.scanned_at < :as_of
+    {cursor_clause}
+    ORDER BY c.staleness DESC, c.domain
+    LIMIT :limit
+"""
+
+RESCAN_CURSOR_CLAUSE = """
+      AND (c.staleness < :cursor_staleness
+           OR (c.staleness = :cursor_staleness AND c.domain > :cursor_domain))
+"""
+
+
+def build_snapshot_query() -> str:
+    """Build the INSERT ... SELECT that snapshots a run's ranking."""
+    return RESCAN_SNAPSHOT_QUERY.format(candidates=RESCAN_CANDIDATES_QUERY)
+
+
+def build_chunk_query(with_cursor: bool) -> str:
+    """Build the snapshot page query (keyset-paged after the run cursor)."""
+    return RESCAN_CHUNK_QUERY.format(
+        cursor_clause=RESCAN_CURSOR_CLAUSE if with_cursor else ""
+    )
+
+
+def snapshot_rescan_candidates(db: Session, run: RescanRun) -> int:
+    """
+    Rank the stale domains once for a new run and store the run.budget most stale.
+
+    Staleness is computed against the run's as_of time; chunks then page the
+    snapshot by (staleness DESC, domain) instead of re-ranking domain_signals.
+    Snapshots of earlier (finished) runs are dropped. Does not commit; the
+    caller owns the transaction.
+
+    Args:
+        db: Database session
+        run: Newly started rescan run (flushed, has an id)
+
+    Returns:
+        Number of candidates stored
+    """
+    db.execute(
+        text("DELETE FROM rescan_run_candidates WHERE run_id <> :run_id"),
+        {"run_id": run.id},
+    )
+    params: Dict[str, Any] = {
+        "run_id": run.id,
+        "as_of": run.as_of,
+        "stale_before": run.as_of - timedelta(hours=RESCAN_MIN_AGE_HOURS),
+        "expiry_until": run.as_of.date() + timedelta(days=EXPIRE_SOON_DAYS),
+        "expiry_bonus": RESCAN_EXPIRY_BONUS_HOURS,
+        "changed_since": run.as_of - timedelta(days=RESCAN_RECENT_CHANGE_DAYS),
+        "change_bonus": RESCAN_RECENT_CHANGE_BONUS_HOURS,
+        "limit": run.budget,
+    }
+    return db.execute(text(build_snapshot_query()), params).rowcount
+
+
+def next_rescan_chunk(db: Session, run: RescanRun, limit: int) -> List[Any]:
+    """
+    Fetch the next most stale domains of a run, after its checkpoint.
+
+    Reads the run's snapshot (snapshot_rescan_candidates()), so each chunk is
+    an index range scan rather than a ranking of every domain.
+
+    Args:
+        db: Database session
+        run: Running rescan run
+        limit: Max domains to return
+
+    Returns:
+        Rows with domain and staleness, most stale first
+    """
+    params: Dict[str, Any] = {"run_id": run.id, "as_of": run.as_of, "limit": limit}
+    with_cursor = run.cursor_domain is not None
+    if with_cursor:
+        params["cursor_staleness"] = run.cursor_staleness
+        params["cursor_domain"] = run.cursor_domain
+    return db.execute(text(build_chunk_query(with_cursor)), params).fetchall()
+
+
+def record_rescan_chunk(run: RescanRun, rows: List[Any]) -> None:
+    """
+    Advance a run's checkpoint past a rescanned chunk (caller commits).
+
+    Args:
+        run: Running rescan run
+        rows: Rows returned by next_rescan_chunk()
+    """
+    run.processed += len(rows)
+    run.cursor_staleness = rows[-1].staleness
+    run.cursor_domain = rows[-1].domain
+    run.updated_at = datetime.now(timezone.utc)
+    if run.processed >= run.budget:
+        complete_rescan_run(run)
+
+
+def complete_rescan_run(run: RescanRun, status: str = "completed") -> None:
+    """Mark a run as finished (caller commits)."""
+    run.status = status
+    run.completed_at = datetime.now(timezone.utc)
+    run.updated_at = run.completed_at
+
+
+def claim_rescan_run(db: Session, run: RescanRun, now: Optional[datetime] = None) -> bool:
+    """
+    Take over a running run by moving its updated_at (compare-and-set).
+
+    Succeeds only if nobody touched the run since it was loaded, so two
+    schedulers or chunk tasks cannot both claim the same checkpoint.
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        run: Running rescan run (as loaded)
+        now: New lease time (default: now, UTC)
+
+    Returns:
+        True if the claim won (run.updated_at is the new lease)
+    """
+    now = now or datetime.now(timezone.utc)
+    result = db.execute(
+        update(RescanRun)
+        .where(
+            RescanRun.id == run.id,
+            RescanRun.status == "running",
+            RescanRun.updated_at == run.updated_at,
+        )
+        .values(updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+    set_committed_value(run, "updated_at", now)
+    return True
+
+
+def holds_rescan_run(db: Session, run: RescanRun, lease: datetime) -> bool:
+    """
+    Lock a run row and check the caller's lease is still current.
+
+    Call before checkpointing: if the run was resumed (or finished) by
+    someone else in the meantime, the caller must not write its checkpoint.
+    The row lock is held until the caller commits or rolls back.
+
+    Args:
+        db: Database session
+        run: Rescan run
+        lease: updated_at the caller claimed
+
+    Returns:
+        True if the run is still running under this lease
+    """
+    db.refresh(run, with_for_update=True)
+    return run.status == "running" and run.updated_at == lease
+
+
+def _latest_run(db: Session) -> Optional[RescanRun]:
+    """Most recent rescan run (by as_of)."""
+    return db.query(RescanRun).order_by(RescanRun.as_of.desc()).first()
+
+
+def start_or_resume_run(
+    db: Session, budget: int, now: Optional[datetime] = None
+) -> Tuple[Optional[RescanRun], str]:
+    """
+    Decide what the scheduler should do for the latest rescan run.
+
+    - No run in the last RESCAN_RUN_INTERVAL_HOURS: start one and snapshot
+      its candidate ranking ("started"), abandoning an unfinished older run
+    - Running run without a checkpoint for RESCAN_RUN_STALL_SECONDS: claim
+      it (claim_rescan_run) and resume it from its cursor ("resumed"); the
+      old chain, if merely slow, loses its lease and stops at its next
+      checkpoint
+    - Otherwise: nothing to do ("running" or "done")
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        budget: Max domains for a new run
+        now: Current time (default: now, UTC)
+
+    Returns:
+        Tuple of (run, action)
+    """
+    now = now or datetime.now(timezone.utc)
+    latest = _latest_run(db)
+
+    if latest is None or now - latest.as_of >= timedelta(hours=RESCAN_RUN_INTERVAL_HOURS):
+        if latest is not None and latest.status == "running":
+            complete_rescan_run(latest, status="abandoned")
+        run = RescanRun(as_of=now, status="running", budget=budget, processed=0, updated_at=now)
+        db.add(run)
+        db.flush()
+        snapshot_rescan_candidates(db, run)
+        return run, "started"
+
+    if latest.status != "running":
+        return latest, "done"
+    if now - latest.updated_at >= timedelta(seconds=RESCAN_RUN_STALL_SECONDS):
+        if claim_rescan_run(db, latest, now):
+            return latest, "resumed"
+    return latest, "running"
@@ -0,0 +1,172 @@
+"""Batched persistence of scan results (domain_signals / lead_scores UPSERT)."""
+
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from app.db.models import DomainSignal, LeadScore
+from app.core.lead_read_model import refresh_lead_read_model
+from app.core.dashboard_stats import (
+    apply_score_bucket_deltas,
+    load_score_buckets,
+    score_bucket_deltas,
+)
+
+# Rows per multi-row INSERT ... ON CONFLICT statement
+SCAN_UPSERT_CHUNK_SIZE = 500
+
+# Columns overwritten on conflict (everything except id/domain)
+DOMAIN_SIGNAL_UPDATE_COLUMNS = [
+    "spf",
+    "dkim",
+    "dmarc_policy",
+    "dmarc_coverage",
+    "mx_root",
+    "local_provider",
+    "registrar",
+    "expires_at",
+    "nameservers",
+    "scan_status",
+]
+LEAD_SCORE_UPDATE_COLUMNS = [
+    "readiness_score",
+    "segment",
+    "reason",
+    "technical_heat",
+    "commercial_segment",
+    "commercial_heat",
+    "priority_category",
+    "priority_label",
+]
+
+
+def domain_signal_row(
+    domain: str,
+    dns_result: Dict[str, Any],
+    whois_result: Optional[Dict[str, Any]],
+    scan_status: str,
+    local_provider: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build a domain_signals row from DNS/WHOIS analysis results.
+
+    Args:
+        domain: Normalized domain
+        dns_result: Result of analyze_dns()
+        whois_result: Result of get_whois_info() (None if WHOIS failed)
+        scan_status: Scan status to store
+        local_provider: Local provider name (G20)
+
+    Returns:
+        Dict of DomainSignal column values
+    """
+    return {
+        "domain": domain,
+        "spf": dns_result.get("spf", False),
+        "dkim": dns_result.get("dkim", False),
+        "dmarc_policy": dns_result.get("dmarc_policy"),
+        "dmarc_coverage": dns_result.get("dmarc_coverage"),  # G20: DMARC coverage
+        "mx_root": dns_result.get("mx_root"),
+        "local_provider": local_provider,  # G20: Local provider name
+        "registrar": whois_result.get("registrar") if whois_result else None,
+        "expires_at": whois_result.get("expires_at") if whois_result else None,
+        "nameservers": whois_result.get("nameservers") if whois_result else None,
+        "scan_status": scan_status,
+    }
+
+
+def lead_score_row(domain: str, scoring_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a lead_scores row from a score_domain() result.
+
+    Args:
+        domain: Normalized domain
+        scoring_result: Result of score_domain()
+
+    Returns:
+        Dict of LeadScore column values
+    """
+    return {
+        "domain": domain,
+        "readiness_score": scoring_result["score"],
+        "segment": scoring_result["segment"],
+        "reason": scoring_result["reason"],
+        # CSP P-Model fields (Phase 2)
+        "technical_heat": scoring_result.get("technical_heat"),
+        "commercial_segment": scoring_result.get("commercial_segment"),
+        "commercial_heat": scoring_result.get("commercial_heat"),
+        "priority_category": scoring_result.get("priority_category"),
+        "priority_label": scoring_result.get("priority_label"),
+    }
+
+
+def _dedupe_by_domain(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep the last row per domain, sorted by domain (stable lock order)."""
+    by_domain = {row["domain"]: row for row in rows}
+    return [by_domain[domain] for domain in sorted(by_domain)]
+
+
+def _upsert(
+    db: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    update_columns: List[str],
+    timestamp_column: str,
+    chunk_size: int,
+) -> None:
+    """Run chunked INSERT ... ON CONFLICT (domain) DO UPDATE for a model."""
+    for start in range(0, len(rows), chunk_size):
+        stmt = insert(model).values(rows[start : start + chunk_size])
+        set_ = {column: stmt.excluded[column] for column in update_columns}
+        set_[timestamp_column] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=["domain"], set_=set_)
+        db.execute(stmt)
+
+
+def _expire_cached_rows(db: Session, domains: set) -> None:
+    """Expire identity-mapped signal/score objects overwritten by Core UPSERTs."""
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, (DomainSignal, LeadScore)) and obj.__dict__.get("domain") in domains:
+            db.expire(obj)
+
+
+def upsert_scan_results(
+    db: Session,
+    signal_rows: Iterable[Dict[str, Any]],
+    score_rows: Iterable[Dict[str, Any]],
+    chunk_size: int = SCAN_UPSERT_CHUNK_SIZE,
+) -> int:
+    """
+    Write a batch of scan results with one UPSERT per table per chunk.
+
+    Replaces the per-domain DELETE + INSERT pattern: one row per domain is
+    kept in domain_signals / lead_scores (unique on domain), and rows are
+    written in domain order so concurrent batches lock rows in the same order.
+    The lead_read_model rows of the written domains are refreshed and the
+    dashboard score buckets are adjusted by deltas in the same transaction.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        signal_rows: Rows built with domain_signal_row()
+        score_rows: Rows built with lead_score_row()
+        chunk_size: Rows per INSERT statement
+
+    Returns:
+        Number of distinct domains written
+    """
+    signals = _dedupe_by_domain(signal_rows)
+    scores = _dedupe_by_domain(score_rows)
+
+    # Pending ORM changes (e.g. company provider updates) go first
+    db.flush()
+    _upsert(db, DomainSignal, signals, DOMAIN_SIGNAL_UPDATE_COLUMNS, "scanned_at", chunk_size)
+    previous_scores = load_score_buckets(db, [row["domain"] for row in scores], chunk_size)
+    _upsert(db, LeadScore, scores, LEAD_SCORE_UPDATE_COLUMNS, "updated_at", chunk_size)
+    apply_score_bucket_deltas(db, score_bucket_deltas(previous_scores, scores))
+
+    domains = {row["domain"] for row in signals} | {row["domain"] for row in scores}
+    refresh_lead_read_model(db, domains, chunk_size)
+    _expire_cached_rows(db, domains)
+    return len(domains)
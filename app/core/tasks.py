@@ -1,6 +1,7 @@
 """Celery tasks for async domain scanning."""
 
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from app.core.logging import logger
 from typing import Dict, List, Optional, Tuple, Any
 from sqlalchemy.orm import Session
@@ -14,10 +15,15 @@ from app.core.analyzer_dns import analyze_dns, resolve_domain_ip_candidates
 from app.core.analyzer_whois import get_whois_info
 from app.core.provider_map import classify_provider
 from app.core.scorer import score_domain
-from app.core.auto_tagging import apply_auto_tags
-from app.core.enrichment_service import spawn_enrichment
+from app.core.auto_tagging import apply_auto_tags, apply_auto_tags_bulk
+from app.core.enrichment_service import spawn_enrichment, spawn_enrichments
+from app.core.scan_persistence import (
+    domain_signal_row,
+    lead_score_row,
+    upsert_scan_results,
+)
 from app.db.session import SessionLocal
-from app.db.models import Company, DomainSignal, LeadScore, ProviderChangeHistory
+from app.db.models import Company, ProviderChangeHistory, RescanRun
 from app.core.bulk_operations import (
     calculate_optimal_batch_size,
     store_partial_commit_log,
@@ -39,6 +45,180 @@ _bulk_metrics = {
     "total_domains_failed": 0,
 }
 
+# Concurrent network analyses per bulk scan batch (1 = sequential analysis)
+# DNS/WHOIS rate limiters still bound the global request rate
+BULK_SCAN_MAX_WORKERS = 10
+
+
+def _analyze_domain(normalized_domain: str, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Network/CPU phase of a domain scan (no database access).
+
+    Runs rate-limited DNS and WHOIS lookups, provider classification and
+    scoring. Safe to call from worker threads: the rate limiters are shared
+    (Redis reservations), so concurrent callers still respect the global budget.
+
+    Args:
+        normalized_domain: Normalized domain name
+        use_cache: Whether to use cache (default: True)
+
+    Returns:
+        Dict with dns_result, whois_result, provider, local_provider,
+        tenant_size, scoring_result, scan_status, mx_root and ip_address
+    """
+    # Rate limiting: DNS (10 req/s)
+    wait_for_dns_rate_limit()
+
+    # Perform DNS analysis (uses DNS cache internally)
+    dns_result = analyze_dns(normalized_domain, use_cache=use_cache)
+
+    # Rate limiting: WHOIS (5 req/s)
+    wait_for_whois_rate_limit()
+
+    # Perform WHOIS lookup (optional, graceful fail, uses WHOIS cache internally)
+    whois_result = get_whois_info(normalized_domain, use_cache=use_cache)
+
+    # Determine scan status
+    scan_status = dns_result.get("status", "success")
+    if scan_status == "success" and whois_result is None:
+        scan_status = "whois_failed"
+
+    # Classify provider based on MX root (in-process label index)
+    mx_root = dns_result.get("mx_root")
+    provider = classify_provider(mx_root)
+
+    # G20: Classify local provider (if provider is Local)
+    local_provider = None
+    if provider == "Local" and mx_root:
+        from app.core.provider_map import classify_local_provider
+        local_provider = classify_local_provider(mx_root)
+
+    # G20: Estimate tenant size (for M365 and Google)
+    tenant_size = None
+    if provider in ["M365", "Google"] and mx_root:
+        from app.core.provider_map import estimate_tenant_size
+        tenant_size = estimate_tenant_size(provider, mx_root)
+
+    # Prepare signals for scoring
+    signals = {
+        "spf": dns_result.get("spf", False),
+        "dkim": dns_result.get("dkim", False),
+        "dmarc_policy": dns_result.get("dmarc_policy"),
+    }
+
+    # Calculate score and determine segment (uses scoring cache internally)
+    scoring_result = score_domain(
+        domain=normalized_domain,
+        provider=provider,
+        signals=signals,
+        mx_records=dns_result.get("mx_records", []),
+        use_cache=use_cache,
+    )
+
+    # Cache full scan result (for future reference, but DB is source of truth)
+    if use_cache:
+        scan_cache_data = {
+            "dns_result": dns_result,
+            "whois_result": whois_result,
+            "provider": provider,
+            "local_provider": local_provider,
+            "tenant_size": tenant_size,
+            "scoring_result": scoring_result,
+            "scan_status": scan_status,
+            "mx_root": mx_root,
+        }
+        set_cached_scan(normalized_domain, scan_cache_data)
+
+    # Resolve IP addresses from MX records and root domain (for IP enrichment)
+    mx_records = dns_result.get("mx_records", [])
+    ip_candidates = resolve_domain_ip_candidates(normalized_domain, mx_records)
+
+    return {
+        "dns_result": dns_result,
+        "whois_result": whois_result,
+        "provider": provider,
+        "local_provider": local_provider,
+        "tenant_size": tenant_size,
+        "scoring_result": scoring_result,
+        "scan_status": scan_status,
+        "mx_root": mx_root,
+        "ip_address": ip_candidates[0] if ip_candidates else None,
+    }
+
+
+def _apply_scan_analysis(
+    company: Company, analysis: Dict[str, Any], db: Session
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Database phase of a domain scan (does not commit).
+
+    Updates the company provider and logs provider changes. The new
+    domain_signal / lead_score rows are returned for upsert_scan_results()
+    so a whole batch can be written with one UPSERT per table.
+
+    Args:
+        company: Company being scanned
+        analysis: Result of _analyze_domain()
+        db: Database session
+
+    Returns:
+        Tuple of (result payload, domain_signal row, lead_score row)
+    """
+    normalized_domain = company.domain
+    dns_result = analysis["dns_result"]
+    provider = analysis["provider"]
+    local_provider = analysis["local_provider"]
+    tenant_size = analysis["tenant_size"]
+    scoring_result = analysis["scoring_result"]
+    scan_status = analysis["scan_status"]
+    mx_root = analysis["mx_root"]
+
+    # Track provider changes
+    previous_provider = company.provider
+    provider_changed = False
+
+    # Update company provider and tenant_size if we have new information
+    if provider and provider != "Unknown":
+        if previous_provider != provider:
+            provider_changed = True
+        company.provider = provider
+        if tenant_size:
+            company.tenant_size = tenant_size
+
+    signal_row = domain_signal_row(
+        normalized_domain,
+        dns_result,
+        analysis["whois_result"],
+        scan_status,
+        local_provider=local_provider,
+    )
+    score_row = lead_score_row(normalized_domain, scoring_result)
+
+    # Log provider change if detected
+    if provider_changed and previous_provider:
+        change_history = ProviderChangeHistory(
+            domain=normalized_domain,
+            previous_provider=previous_provider,
+            new_provider=provider,
+        )
+        db.add(change_history)
+
+    result = {
+        "domain": normalized_domain,
+        "score": scoring_result["score"],
+        "segment": scoring_result["segment"],
+        "reason": scoring_result["reason"],
+        "provider": provider,
+        "local_provider": local_provider,  # G20: Local provider name
+        "tenant_size": tenant_size,  # G20: Tenant size estimate
+        "mx_root": mx_root,
+        "spf": dns_result.get("spf", False),
+        "dkim": dns_result.get("dkim", False),
+        "dmarc_policy": dns_result.get("dmarc_policy"),
+        "dmarc_coverage": dns_result.get("dmarc_coverage"),  # G20: DMARC coverage
+        "scan_status": scan_status,
+    }
+    return result, signal_row, score_row
 
 
 def scan_single_domain(
@@ -58,6 +238,9 @@ def scan_single_domain(
         db: Database session
         use_cache: Whether to use cache (default: True)
         commit: Whether to commit transaction (default: True). Set to False for batch processing.
+            IP enrichment is then not spawned: its read-model refresh would wait on the row
+            this uncommitted transaction holds. The IP is returned as "ip_address" so the
+            caller can spawn_enrichments() after committing.
 
     Returns:
         Dict with scan result or error
@@ -81,134 +264,14 @@ def scan_single_domain(
                 "success": False,
             }
 
-        # Rate limiting: DNS (10 req/s)
-        wait_for_dns_rate_limit()
-
-        # Perform DNS analysis (uses DNS cache internally)
-        dns_result = analyze_dns(normalized_domain, use_cache=use_cache)
-
-        # Rate limiting: WHOIS (5 req/s)
-        wait_for_whois_rate_limit()
-
-        # Perform WHOIS lookup (optional, graceful fail, uses WHOIS cache internally)
-        whois_result = get_whois_info(normalized_domain, use_cache=use_cache)
-
-        # Determine scan status
-        scan_status = dns_result.get("status", "success")
-        if scan_status == "success" and whois_result is None:
-            scan_status = "whois_failed"
-
-        # Classify provider based on MX root (uses provider cache internally)
-        mx_root = dns_result.get("mx_root")
-        provider = classify_provider(mx_root, use_cache=use_cache)
-
-        # G20: Classify local provider (if provider is Local)
-        local_provider = None
-        if provider == "Local" and mx_root:
-            from app.core.provider_map import classify_local_provider
-            local_provider = classify_local_provider(mx_root)
-
-        # G20: Estimate tenant size (for M365 and Google)
-        tenant_size = None
-        if provider in ["M365", "Google"] and mx_root:
-            from app.core.provider_map import estimate_tenant_size
-            tenant_size = estimate_tenant_size(provider, mx_root)
-
-        # Track provider changes
-        previous_provider = company.provider
-        provider_changed = False
-
-        # Update company provider and tenant_size if we have new information
-        if provider and provider != "Unknown":
-            if previous_provider != provider:
-                provider_changed = True
-            company.provider = provider
-            if tenant_size:
-                company.tenant_size = tenant_size
-            if commit:
-                db.commit()
-
-        # Prepare signals for scoring
-        signals = {
-            "spf": dns_result.get("spf", False),
-            "dkim": dns_result.get("dkim", False),
-            "dmarc_policy": dns_result.get("dmarc_policy"),
-        }
-
-        # Calculate score and determine segment (uses scoring cache internally)
-        scoring_result = score_domain(
-            domain=normalized_domain,
-            provider=provider,
-            signals=signals,
-            mx_records=dns_result.get("mx_records", []),
-            use_cache=use_cache,
-        )
-
-        # Cache full scan result (for future reference, but DB is source of truth)
-        if use_cache:
-            scan_cache_data = {
-                "dns_result": dns_result,
-                "whois_result": whois_result,
-                "provider": provider,
-                "local_provider": local_provider,
-                "tenant_size": tenant_size,
-                "scoring_result": scoring_result,
-                "scan_status": scan_status,
-                "mx_root": mx_root,
-            }
-            set_cached_scan(normalized_domain, scan_cache_data)
-
-        # Delete any existing domain_signals for this domain (prevent duplicates)
-        db.query(DomainSignal).filter(DomainSignal.domain == normalized_domain).delete()
+        analysis = _analyze_domain(normalized_domain, use_cache=use_cache)
 
-        # Create new domain_signal
-        domain_signal = DomainSignal(
-            domain=normalized_domain,
-            spf=dns_result.get("spf", False),
-            dkim=dns_result.get("dkim", False),
-            dmarc_policy=dns_result.get("dmarc_policy"),
-            dmarc_coverage=dns_result.get("dmarc_coverage"),  # G20: DMARC coverage
-            mx_root=mx_root,
-            local_provider=local_provider,  # G20: Local provider name
-            registrar=whois_result.get("registrar") if whois_result else None,
-            expires_at=whois_result.get("expires_at") if whois_result else None,
-            nameservers=whois_result.get("nameservers") if whois_result else None,
-            scan_status=scan_status,
-        )
-        db.add(domain_signal)
-
-        # Delete any existing lead_scores for this domain (prevent duplicates)
-        db.query(LeadScore).filter(LeadScore.domain == normalized_domain).delete()
-
-        # Create new lead_score
-        lead_score = LeadScore(
-            domain=normalized_domain,
-            readiness_score=scoring_result["score"],
-            segment=scoring_result["segment"],
-            reason=scoring_result["reason"],
-            # CSP P-Model fields (Phase 2)
-            technical_heat=scoring_result.get("technical_heat"),
-            commercial_segment=scoring_result.get("commercial_segment"),
-            commercial_heat=scoring_result.get("commercial_heat"),
-            priority_category=scoring_result.get("priority_category"),
-            priority_label=scoring_result.get("priority_label"),
-        )
-        db.add(lead_score)
-
-        # Log provider change if detected
-        if provider_changed and previous_provider:
-            change_history = ProviderChangeHistory(
-                domain=normalized_domain,
-                previous_provider=previous_provider,
-                new_provider=provider,
-            )
-            db.add(change_history)
+        result, signal_row, score_row = _apply_scan_analysis(company, analysis, db)
+        upsert_scan_results(db, [signal_row], [score_row])
 
         # Commit all changes (if commit=True)
         if commit:
             db.commit()
-            db.refresh(domain_signal)
-            db.refresh(lead_score)
 
             # Apply auto-tagging (G17) - only if committing
             try:
@@ -218,35 +281,22 @@ def scan_single_domain(
                 # Log error but don't fail the scan
                 logger.warning("auto_tagging_failed", domain=normalized_domain, error=str(e))
 
-        # IP Enrichment (fire-and-forget, separate DB session)
-        # Resolve IP addresses from MX records and root domain
-        mx_records = dns_result.get("mx_records", [])
-        ip_candidates = resolve_domain_ip_candidates(normalized_domain, mx_records)
-        ip_address = ip_candidates[0] if ip_candidates else None
-        
-        if ip_address:
-            # Spawn enrichment in background (separate session, won't affect scan)
-            spawn_enrichment(normalized_domain, ip_address)
+        # IP Enrichment (separate DB session, won't affect scan)
+        if not commit:
+            return {
+                "domain": normalized_domain,
+                "success": True,
+                "result": result,
+                "ip_address": analysis["ip_address"],
+            }
+        if analysis["ip_address"]:
+            spawn_enrichment(normalized_domain, analysis["ip_address"])
 
         # Return success result
         return {
             "domain": normalized_domain,
             "success": True,
-            "result": {
-                "domain": normalized_domain,
-                "score": scoring_result["score"],
-                "segment": scoring_result["segment"],
-                "reason": scoring_result["reason"],
-                "provider": provider,
-                "local_provider": local_provider,  # G20: Local provider name
-                "tenant_size": tenant_size,  # G20: Tenant size estimate
-                "mx_root": mx_root,
-                "spf": dns_result.get("spf", False),
-                "dkim": dns_result.get("dkim", False),
-                "dmarc_policy": dns_result.get("dmarc_policy"),
-                "dmarc_coverage": dns_result.get("dmarc_coverage"),  # G20: DMARC coverage
-                "scan_status": scan_status,
-            },
+            "result": result,
         }
 
     except Exception as e:
@@ -255,6 +305,111 @@ def scan_single_domain(
         return {"domain": domain, "error": str(e), "success": False}
 
 
+def scan_domains_concurrent(
+    domains: List[str],
+    db: Session,
+    use_cache: bool = True,
+    max_workers: int = BULK_SCAN_MAX_WORKERS,
+) -> List[Dict]:
+    """
+    Scan a batch of domains with concurrent network analysis (does not commit).
+
+    DNS/WHOIS analysis for all domains runs in a thread pool (bounded by the
+    shared DNS/WHOIS rate limiters); database writes are then applied in the
+    calling thread within the caller's transaction: one company query and
+    one UPSERT per table for the whole batch. IP enrichment runs once for
+    the batch (deduplicated IPs) in its own session, synchronously in the
+    calling thread between the two phases, so it never waits on rows this
+    transaction locks.
+
+    Args:
+        domains: Domains to scan
+        db: Database session (only used from the calling thread)
+        use_cache: Whether to use cache (default: True)
+        max_workers: Maximum concurrent analyses
+
+    Returns:
+        List of scan_single_domain-shaped results, in input order
+    """
+    normalized = [normalize_domain(domain) for domain in domains]
+    unique_domains = list(dict.fromkeys(n for n in normalized if n))
+
+    companies: Dict[str, Company] = {}
+    if unique_domains:
+        companies = {
+            company.domain: company
+            for company in db.query(Company).filter(Company.domain.in_(unique_domains))
+        }
+    to_scan = [domain for domain in unique_domains if domain in companies]
+
+    # Network phase (parallel)
+    analyses: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    if to_scan:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_scan)))) as pool:
+            futures = {
+                pool.submit(_analyze_domain, domain, use_cache): domain
+                for domain in to_scan
+            }
+            for future in as_completed(futures):
+                domain = futures[future]
+                try:
+                    analyses[domain] = future.result()
+                except Exception as e:
+                    logger.error("scan_error", domain=domain, error=str(e), exc_info=True)
+                    errors[domain] = str(e)
+
+    # IP Enrichment for the whole batch, in this thread before the database
+    # phase (separate DB session, errors logged; IPs shared by several domains
+    # are looked up once)
+    spawn_enrichments(
+        (domain, analysis["ip_address"])
+        for domain, analysis in analyses.items()
+        if analysis["ip_address"]
+    )
+
+    # Database phase (calling thread, caller commits)
+    payloads: Dict[str, Dict[str, Any]] = {}
+    signal_rows: List[Dict[str, Any]] = []
+    score_rows: List[Dict[str, Any]] = []
+    for domain in to_scan:
+        if domain in analyses:
+            payloads[domain], signal_row, score_row = _apply_scan_analysis(
+                companies[domain], analyses[domain], db
+            )
+            signal_rows.append(signal_row)
+            score_rows.append(score_row)
+    upsert_scan_results(db, signal_rows, score_rows)
+
+    results: List[Dict] = []
+    for domain, normalized_domain in zip(domains, normalized):
+        if not normalized_domain:
+            results.append(
+                {"domain": domain, "error": "Invalid domain format", "success": False}
+            )
+        elif normalized_domain not in companies:
+            results.append(
+                {
+                    "domain": normalized_domain,
+                    "error": "Domain not found. Please ingest first.",
+                    "success": False,
+                }
+            )
+        elif normalized_domain in errors:
+            results.append(
+                {"domain": domain, "error": errors[normalized_domain], "success": False}
+            )
+        else:
+            results.append(
+                {
+                    "domain": normalized_domain,
+                    "success": True,
+                    "result": dict(payloads[normalized_domain]),
+                }
+            )
+    return results
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=1, max=4),
@@ -277,13 +432,13 @@ def process_batch_with_retry(
         job_id: Bulk scan job ID
         batch_no: Batch number
         total_batches: Total number of batches
-        is_rescan: If True, use rescan_domain, else use scan_single_domain
+        is_rescan: If True, use rescan_domains, else use scan_domains_concurrent
         db: Database session
 
     Returns:
         Tuple of (succeeded_count, failed_count, committed_results, failed_results)
     """
-    from app.core.rescan import rescan_domain
+    from app.core.rescan import rescan_domains
     from datetime import datetime
 
     tracker = get_progress_tracker()
@@ -297,14 +452,20 @@ def process_batch_with_retry(
 
     batch_start_time = time.time()
     try:
+        # Scan: analyze the whole batch concurrently, DB writes in this transaction
+        if is_rescan:
+            # Rescan: batch snapshot + change detection, commits the batch itself
+            scan_results = rescan_domains(batch, db)
+        else:
+            # Also with BULK_SCAN_MAX_WORKERS = 1: IP enrichment runs before this
+            # transaction locks any lead_read_model row (see scan_domains_concurrent)
+            scan_results = scan_domains_concurrent(batch, db, max_workers=BULK_SCAN_MAX_WORKERS)
+
         # Process each domain in batch (with commit=False for batch commit)
-        for domain in batch:
+        for index, domain in enumerate(batch):
             try:
                 if is_rescan:
-                    # For rescan, we need to handle it differently since rescan_domain
-                    # doesn't support commit=False yet. For now, we'll use commit=True
-                    # but batch the auto-tagging separately.
-                    result = rescan_domain(domain, db)
+                    result = scan_results[index]
                     if result.get("success"):
                         result_dict = result.get("result", {})
                         result_dict["changes_detected"] = result.get(
@@ -316,8 +477,7 @@ def process_batch_with_retry(
                         # Update result with enhanced data
                         result["result"] = result_dict
                 else:
-                    # Use commit=False for batch processing
-                    result = scan_single_domain(domain, db, commit=False)
+                    result = scan_results[index]
 
                 if result["success"]:
                     succeeded += 1
@@ -359,18 +519,19 @@ def process_batch_with_retry(
                     }
                 )
 
-        # Batch commit (only if not rescan, since rescan commits individually)
+        # Batch commit (only if not rescan, since rescan_domains commits the batch)
         if not is_rescan:
-            db.commit()
-
-            # Apply auto-tagging for all succeeded domains in batch
-            for committed_item in committed:
+            # Apply auto-tagging for all succeeded domains in batch (savepoint:
+            # a tagging error must not roll back the scan results)
+            if committed:
                 try:
-                    apply_auto_tags(committed_item["domain"], db)
+                    with db.begin_nested():
+                        apply_auto_tags_bulk([item["domain"] for item in committed], db)
                 except Exception as e:
                     logger.warning(
                         "auto_tagging_failed",
-                        domain=committed_item["domain"],
+                        job_id=job_id,
+                        batch_no=batch_no,
                         error=str(e),
                     )
             db.commit()
@@ -431,7 +592,7 @@ def bulk_scan_task(self, job_id: str, is_rescan: bool = False):
 
     try:
         # Get job and domain list
-        job = tracker.get_job(job_id)
+        job = tracker.get_job(job_id, max_errors=0)
         if not job:
             logger.error("job_not_found", job_id=job_id)
             return
@@ -513,23 +674,30 @@ def bulk_scan_task(self, job_id: str, is_rescan: bool = False):
                 _bulk_metrics["total_domains_succeeded"] += succeeded
                 _bulk_metrics["total_domains_failed"] += failed
 
-                # Store results for succeeded domains
-                for committed_item in committed:
-                    domain = committed_item["domain"]
-                    result_data = committed_item.get("result", {})
-                    # Store the actual scan result
-                    tracker.store_result(job_id, domain, result_data)
-
-                # Store errors for failed domains
-                for failed_item in failed_results:
-                    error = {
-                        "domain": failed_item["domain"],
-                        "error": failed_item.get("error", "Unknown error"),
-                        "timestamp": failed_item.get("timestamp"),
-                    }
-                    tracker.update_progress(
-                        job_id, processed, total_succeeded, total_failed, error
-                    )
+                # Store results for succeeded domains (one HSET per batch)
+                tracker.store_results(
+                    job_id,
+                    {
+                        committed_item["domain"]: committed_item.get("result", {})
+                        for committed_item in committed
+                    },
+                )
+
+                # Add batch counters and errors for failed domains (one round trip)
+                tracker.increment_progress(
+                    job_id,
+                    processed=len(batch),
+                    succeeded=succeeded,
+                    failed=failed,
+                    errors=[
+                        {
+                            "domain": failed_item["domain"],
+                            "error": failed_item.get("error", "Unknown error"),
+                            "timestamp": failed_item.get("timestamp"),
+                        }
+                        for failed_item in failed_results
+                    ],
+                )
 
                 logger.info(
                     "bulk_scan_batch_completed",
@@ -547,17 +715,21 @@ def bulk_scan_task(self, job_id: str, is_rescan: bool = False):
                     exc_info=True,
                 )
                 # Mark all domains in batch as failed
-                for domain in batch:
-                    error = {
-                        "domain": domain,
-                        "error": f"Batch processing failed: {str(e)}",
-                        "timestamp": None,
-                    }
-                    processed += 1
-                    total_failed += 1
-                    tracker.update_progress(
-                        job_id, processed, total_succeeded, total_failed, error
-                    )
+                processed += len(batch)
+                total_failed += len(batch)
+                tracker.increment_progress(
+                    job_id,
+                    processed=len(batch),
+                    failed=len(batch),
+                    errors=[
+                        {
+                            "domain": domain,
+                            "error": f"Batch processing failed: {str(e)}",
+                            "timestamp": None,
+                        }
+                        for domain in batch
+                    ],
+                )
 
         # Set status to completed
         tracker.set_status(job_id, "completed")
@@ -616,73 +788,147 @@ def process_pending_alerts_task(self):
         db.close()
 
 
+@celery_app.task(bind=True)
+def reconcile_dashboard_stats_task(self):
+    """
+    Rebuild the dashboard score buckets from lead_scores.
+
+    Scan/rescan batches keep the buckets up to date with deltas; this
+    periodic job corrects drift from writes outside the scan path.
+    """
+    from app.core.dashboard_stats import reconcile_dashboard_stats
+
+    db = SessionLocal()
+
+    try:
+        buckets = reconcile_dashboard_stats(db)
+        db.commit()
+        logger.info("dashboard_stats_reconciled", buckets=buckets)
+        return {"status": "completed", "buckets": buckets}
+
+    except Exception as e:
+        db.rollback()
+        logger.error("dashboard_stats_reconcile_error", error=str(e), exc_info=True)
+        raise
+
+    finally:
+        db.close()
+
+
 @celery_app.task(bind=True)
 def daily_rescan_task(self):
     """
-    Daily rescan task for all domains (G18: Scheduler).
+    Daily rescan scheduler (G18: Scheduler).
 
-    This task:
-    - Gets all domains that have been scanned
-    - Creates bulk rescan jobs for them
-    - Processes changes and creates alerts
+    Runs hourly and is idempotent:
+    - Starts a rescan run at most once per RESCAN_RUN_INTERVAL_HOURS
+    - Resumes a crashed run from its checkpoint
+    - Hands the run to rescan_chunk_task, which rescans the most stale
+      domains first until the run's budget is spent
     """
-    from app.db.models import Company, DomainSignal
+    from app.config import settings
+    from app.core.rescan_scheduler import start_or_resume_run
 
     logger.info("daily_rescan_task_started")
 
     db = SessionLocal()
 
     try:
-        # Get all domains that have been scanned (have domain_signals)
-        domains_with_signals = db.query(DomainSignal.domain).distinct().all()
-        domain_list = [row[0] for row in domains_with_signals]
+        run, action = start_or_resume_run(db, settings.rescan_daily_budget)
+        db.commit()
 
-        if not domain_list:
-            logger.info("daily_rescan_no_domains")
-            return {
-                "status": "completed",
-                "total": 0,
-                "message": "No domains to rescan",
-            }
+        if action in ("started", "resumed"):
+            rescan_chunk_task.delay(run.id)
 
-        logger.info("daily_rescan_domains_found", count=len(domain_list))
+        logger.info(
+            "daily_rescan_scheduled",
+            action=action,
+            run_id=run.id,
+            processed=run.processed,
+            budget=run.budget,
+        )
+        return {"status": action, "run_id": run.id, "processed": run.processed}
 
-        # Process in batches of 100 to avoid overwhelming the system
-        batch_size = 100
-        total_processed = 0
+    except Exception as e:
+        db.rollback()
+        logger.error("daily_rescan_error", error=str(e), exc_info=True)
+        raise
 
-        for i in range(0, len(domain_list), batch_size):
-            batch = domain_list[i : i + batch_size]
+    finally:
+        db.close()
 
-            # Create bulk rescan job for this batch (creates job_id automatically)
-            tracker = get_progress_tracker()
-            job_id = tracker.create_job(batch)
 
-            # Start async rescan task (with is_rescan=True for change detection)
-            bulk_scan_task.delay(job_id, is_rescan=True)
+@celery_app.task(bind=True)
+def rescan_chunk_task(self, run_id: int):
+    """
+    Rescan the next chunk of a rescan run and checkpoint it (G18: Scheduler).
 
-            total_processed += len(batch)
-            logger.info(
-                "rescan_job_created",
-                job_id=job_id,
-                batch_size=len(batch),
-                batch_number=i//batch_size + 1,
-            )
+    Re-enqueues itself until the run's budget is spent or no stale domains
+    are left. If the chain dies, daily_rescan_task resumes it from the last
+    checkpoint. Each chunk claims the run's lease first and checkpoints only
+    while it still holds it, so a resumed run is never processed by two
+    chains.
+
+    Args:
+        run_id: RescanRun id
+    """
+    from app.core.rescan import rescan_domains
+    from app.core.rescan_scheduler import (
+        RESCAN_CHUNK_SIZE,
+        claim_rescan_run,
+        complete_rescan_run,
+        holds_rescan_run,
+        next_rescan_chunk,
+        record_rescan_chunk,
+    )
+
+    db = SessionLocal()
+
+    try:
+        run = db.get(RescanRun, run_id)
+        if run is None or run.status != "running" or not claim_rescan_run(db, run):
+            db.rollback()
+            return {"status": "skipped", "run_id": run_id}
+        lease = run.updated_at
+        db.commit()
+
+        limit = min(RESCAN_CHUNK_SIZE, run.budget - run.processed)
+        rows = next_rescan_chunk(db, run, limit) if limit > 0 else []
+
+        # Rescan commits the batch; domains it wrote drop out of the ranking
+        results = rescan_domains([row.domain for row in rows], db) if rows else []
+
+        if not holds_rescan_run(db, run, lease):
+            # Resumed by the scheduler while this chunk ran: the new chain owns the run
+            db.rollback()
+            logger.warning("rescan_chunk_superseded", run_id=run_id, domains=len(rows))
+            return {"status": "superseded", "run_id": run_id}
+
+        if not rows:
+            complete_rescan_run(run)
+            db.commit()
+            logger.info("daily_rescan_completed", run_id=run_id, processed=run.processed)
+            return {"status": "completed", "run_id": run_id, "processed": run.processed}
+
+        record_rescan_chunk(run, rows)
+        db.commit()
 
         logger.info(
-            "daily_rescan_completed",
-            total_processed=total_processed,
+            "rescan_chunk_completed",
+            run_id=run_id,
+            domains=len(rows),
+            succeeded=sum(1 for result in results if result.get("success")),
+            processed=run.processed,
+            budget=run.budget,
         )
 
-        return {
-            "status": "completed",
-            "total": total_processed,
-            "batches": (len(domain_list) + batch_size - 1) // batch_size,
-            "message": f"Queued {total_processed} domains for rescan",
-        }
+        if run.status == "running":
+            rescan_chunk_task.delay(run_id)
+        return {"status": run.status, "run_id": run_id, "processed": run.processed}
 
     except Exception as e:
-        logger.error("daily_rescan_error", error=str(e), exc_info=True)
+        db.rollback()
+        logger.error("rescan_chunk_error", run_id=run_id, error=str(e), exc_info=True)
         raise
 
     finally:
@@ -1,10 +1,14 @@
 """Webhook retry logic with exponential backoff."""
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.db.models import WebhookRetry
 
+# Rows per executemany call in create_webhook_retries_bulk()
+WEBHOOK_RETRY_CHUNK_SIZE = 1000
+
 
 def calculate_next_retry_time(
     retry_count: int, base_delay_seconds: int = 60
@@ -66,6 +70,45 @@ def create_webhook_retry(
     return retry
 
 
+def create_webhook_retries_bulk(
+    db: Session,
+    retries: List[Dict[str, Any]],
+    chunk_size: int = WEBHOOK_RETRY_CHUNK_SIZE,
+) -> int:
+    """
+    Create many webhook retry records (executemany INSERT).
+
+    Same defaults as create_webhook_retry(). Does not commit; the caller
+    owns the transaction.
+
+    Args:
+        db: Database session
+        retries: Dicts with api_key_id, payload, domain and optional
+            error_message / max_retries (default: 3)
+        chunk_size: Rows per executemany call
+
+    Returns:
+        Number of retry records created
+    """
+    next_retry_at = calculate_next_retry_time(0)
+    rows = [
+        {
+            "api_key_id": retry.get("api_key_id"),
+            "payload": retry["payload"],
+            "domain": retry.get("domain"),
+            "retry_count": 0,
+            "max_retries": retry.get("max_retries", 3),
+            "next_retry_at": next_retry_at,
+            "status": "pending",
+            "error_message": retry.get("error_message"),
+        }
+        for retry in retries
+    ]
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(WebhookRetry), rows[start : start + chunk_size])
+    return len(rows)
+
+
 def retry_webhook(
     db: Session, retry: WebhookRetry, error_message: Optional[str] = None
 ) -> bool:
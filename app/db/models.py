@@ -9,6 +9,7 @@ from sqlalchemy import (
     Boolean,
     Date,
     Text,
+    Float,
     TIMESTAMP,
     ForeignKey,
     JSON,
@@ -16,7 +17,7 @@ from sqlalchemy import (
     UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.db.session import Base
 
 
@@ -128,6 +129,13 @@ class DomainSignal(Base):
         TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True
     )
 
+    __table_args__ = (
+        # One signal row per domain: enables batched UPSERT (INSERT ... ON CONFLICT (domain))
+        UniqueConstraint("domain", name="uq_domain_signals_domain"),
+        # Latest scan per domain (DISTINCT ON (domain) ORDER BY domain, scanned_at DESC)
+        Index("idx_domain_signals_domain_scanned_at", "domain", text("scanned_at DESC")),
+    )
+
 
 class LeadScore(Base):
     """Calculated readiness scores and segments for domains."""
@@ -170,6 +178,78 @@ class LeadScore(Base):
         index=True,
     )
 
+    __table_args__ = (
+        # One score row per domain: enables batched UPSERT (INSERT ... ON CONFLICT (domain))
+        UniqueConstraint("domain", name="uq_lead_scores_domain"),
+    )
+
+
+class LeadReadModel(Base):
+    """Denormalised lead row per scanned domain (maintained by app/core/lead_read_model.py)."""
+
+    __tablename__ = "lead_read_model"
+
+    domain = Column(
+        String(255),
+        ForeignKey("companies.domain", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    company_id = Column(Integer, nullable=False)
+    canonical_name = Column(String(255), nullable=False)
+    provider = Column(String(50), nullable=True)
+    tenant_size = Column(String(50), nullable=True)
+    country = Column(String(2), nullable=True)
+    contact_emails = Column(JSONB, nullable=True)
+    contact_quality_score = Column(Integer, nullable=True)
+    linkedin_pattern = Column(String(255), nullable=True)
+    spf = Column(Boolean, nullable=True)
+    dkim = Column(Boolean, nullable=True)
+    dmarc_policy = Column(String(50), nullable=True)
+    dmarc_coverage = Column(Integer, nullable=True)
+    mx_root = Column(String(255), nullable=True)
+    local_provider = Column(String(255), nullable=True)
+    registrar = Column(String(255), nullable=True)
+    expires_at = Column(Date, nullable=True)
+    nameservers = Column(ARRAY(Text), nullable=True)
+    scan_status = Column(String(50), nullable=True)
+    scanned_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    readiness_score = Column(Integer, nullable=False)
+    segment = Column(String(50), nullable=False)
+    reason = Column(Text, nullable=True)
+    technical_heat = Column(String(20), nullable=True)
+    commercial_segment = Column(String(50), nullable=True)
+    commercial_heat = Column(String(20), nullable=True)
+    priority_category = Column(String(10), nullable=True)
+    priority_label = Column(String(100), nullable=True)
+    priority_score = Column(Integer, nullable=False)  # 1-7, same as calculate_priority_score()
+    infrastructure_summary = Column(Text, nullable=True)  # IP enrichment summary (Level 1)
+    updated_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        # Default /leads order: priority_score ASC, readiness_score DESC, domain ASC
+        Index(
+            "idx_lead_read_model_priority",
+            "priority_score",
+            text("readiness_score DESC"),
+            "domain",
+        ),
+        Index("idx_lead_read_model_segment_score", "segment", "readiness_score"),
+        Index("idx_lead_read_model_provider", "provider"),
+        Index("idx_lead_read_model_scanned_at", "scanned_at"),
+    )
+
+
+class DashboardScoreBucket(Base):
+    """Lead count per (segment, readiness_score); backs the dashboard aggregates."""
+
+    __tablename__ = "dashboard_score_buckets"
+
+    segment = Column(String(50), primary_key=True)  # 'Migration', 'Existing', 'Cold', 'Skip'
+    readiness_score = Column(Integer, primary_key=True)  # 0-100
+    lead_count = Column(Integer, nullable=False, default=0)
+
 
 class ApiKey(Base):
     """API keys for webhook authentication (G16: Webhook infrastructure)."""
@@ -180,6 +260,9 @@ class ApiKey(Base):
     key_hash = Column(
         String(255), nullable=False, unique=True, index=True
     )  # Hashed API key (SHA-256)
+    key_prefix = Column(
+        String(32), nullable=True, unique=True, index=True
+    )  # Non-secret lookup ID embedded in the key (NULL for legacy keys)
     name = Column(String(255), nullable=False)  # Human-readable name for the key
     rate_limit_per_minute = Column(
         Integer, nullable=False, default=60
@@ -270,6 +353,11 @@ class Tag(Base):
         TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
     )
 
+    __table_args__ = (
+        # One row per domain+tag: enables batched auto-tagging (INSERT ... ON CONFLICT DO NOTHING)
+        UniqueConstraint("domain", "tag", name="uq_tags_domain_tag"),
+    )
+
 
 class Favorite(Base):
     """User favorites for domains, session-based (G17: CRM-lite)."""
@@ -290,6 +378,10 @@ class Favorite(Base):
         TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
     )
 
+    __table_args__ = (
+        Index("idx_favorites_user_id_domain", "user_id", "domain"),  # Favorites filter in GET /leads
+    )
+
 
 class SignalChangeHistory(Base):
     """History of signal changes (SPF, DKIM, DMARC, MX) (G18)."""
@@ -362,6 +454,59 @@ class Alert(Base):
     )
 
 
+class RescanRun(Base):
+    """Checkpoint of a daily rescan run (resumable scheduler, G18)."""
+
+    __tablename__ = "rescan_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Ranking reference time: domains scanned after it are done for this run
+    as_of = Column(TIMESTAMP(timezone=True), nullable=False)
+    status = Column(
+        String(20), nullable=False, default="running"
+    )  # 'running', 'completed', 'abandoned'
+    budget = Column(Integer, nullable=False)  # Max domains rescanned by this run
+    processed = Column(Integer, nullable=False, default=0)
+    # Keyset cursor: last (staleness, domain) handed to a rescan chunk
+    cursor_staleness = Column(Float, nullable=True)
+    cursor_domain = Column(String(255), nullable=True)
+    started_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )  # Checkpoint heartbeat
+    completed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("idx_rescan_runs_as_of", "as_of"),  # Latest run lookup
+    )
+
+
+class RescanRunCandidate(Base):
+    """Staleness ranking of a rescan run, snapshotted once when the run starts (G18)."""
+
+    __tablename__ = "rescan_run_candidates"
+
+    run_id = Column(
+        Integer,
+        ForeignKey("rescan_runs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    domain = Column(String(255), primary_key=True)
+    staleness = Column(Float, nullable=False)  # Hours, as of the run's as_of
+
+    __table_args__ = (
+        # Keyset paging: staleness DESC, domain ASC within a run
+        Index(
+            "idx_rescan_run_candidates_rank",
+            "run_id",
+            text("staleness DESC"),
+            "domain",
+        ),
+    )
+
+
 class AlertConfig(Base):
     """Alert configuration preferences (G18)."""
 
@@ -1,9 +1,25 @@
 """Database session management."""
 
+from typing import Any, Callable, Optional
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
 
+try:
+    import asyncpg  # noqa: F401
+
+    ASYNC_DB_AVAILABLE = True
+except ImportError:  # asyncpg not installed: async routes fall back to the sync pool
+    ASYNC_DB_AVAILABLE = False
+
 # Create SQLAlchemy engine with connection pooling
 engine = create_engine(
     settings.database_url,
@@ -34,3 +50,81 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async engine (asyncpg) for read-heavy async routes, created on first use
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+
+def async_database_url(url: str) -> str:
+    """Return the asyncpg variant of a postgresql:// database URL."""
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(
+        hide_password=False
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async SQLAlchemy engine (same pool settings as the sync engine).
+
+    Returns:
+        AsyncEngine bound to settings.database_url via asyncpg
+    """
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            async_database_url(settings.database_url),
+            pool_pre_ping=True,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_recycle=3600,
+            pool_timeout=30,
+            echo=False,
+        )
+        _AsyncSessionLocal = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def get_async_db():
+    """
+    Dependency function for FastAPI to get an async database session.
+
+    Yields an AsyncSession when asyncpg is installed; otherwise a sync Session
+    (use run_db() so route code works with either).
+
+    Yields:
+        AsyncSession (or Session as fallback)
+    """
+    if not ASYNC_DB_AVAILABLE:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+        return
+
+    get_async_engine()
+    async with _AsyncSessionLocal() as session:
+        yield session
+
+
+async def run_db(db, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run synchronous ORM code without blocking the event loop.
+
+    With an AsyncSession, fn runs via AsyncSession.run_sync (asyncpg I/O is
+    awaited); with a sync Session, fn runs in the threadpool.
+
+    Args:
+        db: AsyncSession or Session
+        fn: Callable taking a sync Session as first argument
+
+    Returns:
+        Return value of fn
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -12,6 +12,8 @@ from app.db.session import get_db, engine
 from app.core.middleware import RequestIDMiddleware
 from app.core.error_tracking import *  # Initialize Sentry
 from app.core.analyzer_enrichment import check_enrichment_available
+from app.core.analyzer_whois import close_rdap_clients
+from app.core.api_key_auth import flush_api_key_usage
 from app.core.logging import logger
 from app.api import (
     ingest,
@@ -99,7 +101,9 @@ async def lifespan(app: FastAPI):
     # Startup
     validate_enrichment_config()
     yield
-    # Shutdown (if needed in future)
+    # Shutdown
+    close_rdap_clients()
+    flush_api_key_usage()
 
 
 # Create FastAPI app with custom JSON encoder and lifespan
@@ -81,6 +81,19 @@ def db_session():
         engine.dispose()
 
 
+def override_db_dependencies(app, override_get_db):
+    """Serve both the sync and async database dependencies from one override.
+
+    Args:
+        app: FastAPI application
+        override_get_db: Dependency override yielding the test session
+    """
+    from app.db.session import get_db, get_async_db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_db
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with isolated database session.
@@ -97,15 +110,13 @@ def client(db_session):
     """
     # Import app here to avoid import-time database connection
     from app.main import app
-    from app.db.session import get_db
-
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
-    app.dependency_overrides[get_db] = override_get_db
+    override_db_dependencies(app, override_get_db)
     test_client = TestClient(app)
     yield test_client
     app.dependency_overrides.clear()
@@ -10,6 +10,7 @@ from sqlalchemy.exc import OperationalError
 
 # Import app after setting up test environment
 from app.db.models import Base
+from tests.conftest import override_db_dependencies
 
 # Test database URL - use PostgreSQL from environment or fallback to test DB
 # In Docker container: use 'postgres' (service name)
@@ -67,15 +68,13 @@ def client(db_session):
     """Create a test client with test database."""
     # Import app here to avoid import-time database connection
     from app.main import app
-    from app.db.session import get_db
-
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
-    app.dependency_overrides[get_db] = override_get_db
+    override_db_dependencies(app, override_get_db)
     test_client = TestClient(app)
     yield test_client
     app.dependency_overrides.clear()
@@ -1,8 +1,23 @@
 """Tests for API key authentication and rate limiting."""
 
+import asyncio
 import pytest
 import time
-from app.core.api_key_auth import hash_api_key, check_api_key_hash, generate_api_key, get_api_key_limiter
+from fastapi import BackgroundTasks, HTTPException
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from app.core import api_key_auth
+from app.core.api_key_auth import (
+    hash_api_key,
+    check_api_key_hash,
+    generate_api_key,
+    get_api_key_limiter,
+    api_key_lookup_id,
+    flush_api_key_usage,
+    invalidate_api_key_cache,
+    verify_api_key,
+)
+from app.db.models import ApiKey
 
 
 def test_hash_api_key():
@@ -82,3 +97,133 @@ def test_rate_limiter_exhaustion():
     time.sleep(0.1)  # Small delay
     # With very low rate, might be limited
     # This is more of a smoke test
+
+
+@pytest.fixture
+def clean_key_state():
+    """Reset the verified-key cache and pending usage around a test."""
+    invalidate_api_key_cache()
+    api_key_auth._pending_usage.clear()
+    yield
+    invalidate_api_key_cache()
+    api_key_auth._pending_usage.clear()
+
+
+def _stored_key(key_id, api_key_value):
+    return ApiKey(
+        id=key_id,
+        key_hash=hash_api_key(api_key_value),
+        key_prefix=api_key_lookup_id(api_key_value),
+        name=f"key-{key_id}",
+        rate_limit_per_minute=600,
+        is_active=True,
+    )
+
+
+def _verify(api_key_value, db):
+    background_tasks = BackgroundTasks()
+    api_key = asyncio.run(verify_api_key(background_tasks, x_api_key=api_key_value, db=db))
+    return api_key, background_tasks
+
+
+def test_api_key_lookup_id():
+    """Test new keys carry a non-secret lookup id; legacy keys have none."""
+    key = generate_api_key()
+    lookup_id = api_key_lookup_id(key)
+
+    assert key.startswith(f"hk_{lookup_id}_")
+    assert len(lookup_id) == 12
+    assert api_key_lookup_id("test-key-123") is None
+    assert api_key_lookup_id("hk_NOTHEX000000_secret") is None
+
+
+def test_verify_api_key_fetches_one_row(clean_key_state):
+    """Test a new-format key costs one row lookup and one bcrypt check."""
+    api_key_value = generate_api_key()
+    record = _stored_key(9001, api_key_value)
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = record
+
+    with patch("app.core.api_key_auth.check_api_key_hash", wraps=check_api_key_hash) as mock_check:
+        api_key, _ = _verify(api_key_value, db)
+
+    assert api_key is record
+    mock_check.assert_called_once()
+    db.query.return_value.filter.return_value.all.assert_not_called()
+    db.commit.assert_not_called()
+
+
+def test_verify_api_key_cache_hit(clean_key_state):
+    """Test repeated requests with a verified key skip the database and bcrypt."""
+    api_key_value = generate_api_key()
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = _stored_key(9002, api_key_value)
+    _verify(api_key_value, db)
+
+    db.reset_mock()
+    with patch("app.core.api_key_auth.check_api_key_hash") as mock_check:
+        api_key, _ = _verify(api_key_value, db)
+
+    assert api_key.id == 9002
+    assert api_key.name == "key-9002"
+    mock_check.assert_not_called()
+    db.query.assert_not_called()
+
+    # Invalidation forces a fresh lookup
+    invalidate_api_key_cache(9002)
+    db.query.return_value.filter.return_value.first.return_value = None
+    with pytest.raises(HTTPException) as exc_info:
+        _verify(api_key_value, db)
+    assert exc_info.value.status_code == 401
+
+
+def test_verify_api_key_wrong_secret(clean_key_state):
+    """Test a known lookup id with the wrong secret is rejected."""
+    api_key_value = generate_api_key()
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = _stored_key(9003, api_key_value)
+
+    with pytest.raises(HTTPException) as exc_info:
+        _verify(api_key_value[:-4] + "xxxx", db)
+
+    assert exc_info.value.status_code == 401
+
+
+def test_verify_api_key_legacy_key(clean_key_state):
+    """Test keys without a lookup id are checked against legacy rows only."""
+    legacy_value = "legacy-key-123"
+    record = ApiKey(id=9004, key_hash=hash_api_key(legacy_value), name="legacy", rate_limit_per_minute=600)
+    db = MagicMock()
+    db.query.return_value.filter.return_value.all.return_value = [record]
+
+    api_key, _ = _verify(legacy_value, db)
+
+    assert api_key is record
+    criteria = str(db.query.return_value.filter.call_args.args[0])
+    assert "key_prefix IS NULL" in criteria
+
+
+def test_last_used_at_coalesced(clean_key_state):
+    """Test uses are buffered and flushed with one bulk UPDATE."""
+    api_key_value = generate_api_key()
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = _stored_key(9005, api_key_value)
+
+    with patch("app.core.api_key_auth._last_usage_flush", 0):
+        _, first_tasks = _verify(api_key_value, db)
+    _, second_tasks = _verify(api_key_value, db)
+
+    # Only the first request (flush due) schedules a background flush
+    assert [task.func for task in first_tasks.tasks] == [flush_api_key_usage]
+    assert second_tasks.tasks == []
+    assert list(api_key_auth._pending_usage) == [9005]
+
+    flush_db = MagicMock()
+    assert flush_api_key_usage(flush_db) == 1
+
+    stmt, params = flush_db.execute.call_args.args
+    assert "UPDATE api_keys" in str(stmt.compile(dialect=postgresql.dialect()))
+    assert [row["id"] for row in params] == [9005]
+    flush_db.commit.assert_called_once()
+    assert api_key_auth._pending_usage == {}
+    assert flush_api_key_usage(flush_db) == 0
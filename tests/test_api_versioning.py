@@ -8,6 +8,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
 
 from app.db.models import Base
+from tests.conftest import override_db_dependencies
 
 # Test database URL
 TEST_DATABASE_URL = os.getenv(
@@ -59,15 +60,13 @@ def db_session():
 def client(db_session):
     """Create a test client with test database."""
     from app.main import app
-    from app.db.session import get_db
-
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
-    app.dependency_overrides[get_db] = override_get_db
+    override_db_dependencies(app, override_get_db)
     test_client = TestClient(app)
     
     yield test_client
@@ -0,0 +1,114 @@
+"""Tests for the async DB path (async engine helpers, off-loop route work)."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import async_database_url, run_db
+
+
+class TestAsyncDatabaseUrl:
+    """Test asyncpg URL conversion."""
+
+    def test_plain_postgresql_url(self):
+        """Test postgresql:// URLs get the asyncpg driver (password kept)."""
+        url = async_database_url("postgresql://user:secret@db:5432/hunter")
+
+        assert url == "postgresql+asyncpg://user:secret@db:5432/hunter"
+
+    def test_explicit_driver_replaced(self):
+        """Test an explicit psycopg2 driver is replaced."""
+        url = async_database_url("postgresql+psycopg2://user:secret@db/hunter")
+
+        assert url == "postgresql+asyncpg://user:secret@db/hunter"
+
+
+class TestRunDb:
+    """Test run_db dispatch for async and sync sessions."""
+
+    def test_sync_session_runs_in_threadpool(self):
+        """Test sync session work runs outside the event loop thread."""
+        loop_thread = None
+        seen = {}
+
+        def work(db, value):
+            seen["db"] = db
+            seen["thread"] = threading.current_thread()
+            return value * 2
+
+        async def main():
+            nonlocal loop_thread
+            loop_thread = threading.current_thread()
+            return await run_db(sync_session, work, 21)
+
+        sync_session = MagicMock()
+        assert asyncio.run(main()) == 42
+        assert seen["db"] is sync_session
+        assert seen["thread"] is not loop_thread
+
+    def test_async_session_uses_run_sync(self):
+        """Test AsyncSession work goes through run_sync (asyncpg I/O awaited)."""
+        async_session = MagicMock(spec=AsyncSession)
+
+        async def run_sync(fn, *args, **kwargs):
+            return fn("sync-view", *args, **kwargs)
+
+        async_session.run_sync.side_effect = run_sync
+
+        result = asyncio.run(run_db(async_session, lambda db, x: (db, x), 1))
+
+        assert result == ("sync-view", 1)
+        async_session.run_sync.assert_called_once()
+
+
+class TestScanDomainOffLoop:
+    """Test /scan/domain keeps blocking work off the event loop."""
+
+    def test_whois_and_db_work_off_loop(self):
+        """Test WHOIS and DB writes run in worker threads, DNS on the loop."""
+        from app.api.scan import scan_domain, ScanDomainRequest
+
+        threads = {}
+
+        async def fake_dns(domain, use_cache=True):
+            threads["dns"] = threading.current_thread()
+            return {
+                "status": "success",
+                "mx_root": "outlook.com",
+                "mx_records": ["example-com.mail.protection.outlook.com"],
+                "spf": True,
+                "dkim": True,
+                "dmarc_policy": "reject",
+                "dmarc_coverage": 100,
+            }
+
+        def fake_whois(domain, use_cache=True):
+            threads["whois"] = threading.current_thread()
+            return None
+
+        def fake_save(db, company, *args):
+            threads["save"] = threading.current_thread()
+
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = MagicMock(
+            domain="example.com", provider=None
+        )
+
+        async def main():
+            threads["loop"] = threading.current_thread()
+            return await scan_domain(ScanDomainRequest(domain="example.com"), db=db)
+
+        with patch("app.api.scan.analyze_dns_async", side_effect=fake_dns), \
+                patch("app.api.scan.get_whois_info", side_effect=fake_whois), \
+                patch("app.api.scan._save_domain_scan", side_effect=fake_save), \
+                patch("app.api.scan.resolve_domain_ip_candidates", return_value=[]), \
+                patch("app.api.scan.score_domain", return_value={"score": 80, "segment": "Existing", "reason": "M365"}):
+            response = asyncio.run(main())
+
+        assert response.provider == "M365"
+        assert response.scan_status == "completed"
+        assert threads["dns"] is threads["loop"]
+        assert threads["whois"] is not threads["loop"]
+        assert threads["save"] is not threads["loop"]
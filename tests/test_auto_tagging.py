@@ -0,0 +1,119 @@
+"""Tests for batched auto-tagging (G17)."""
+
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+
+from app.core.auto_tagging import apply_auto_tags, apply_auto_tags_bulk, evaluate_auto_tags
+
+TODAY = date(2026, 10, 17)
+
+
+def _row(domain="example.com", **overrides):
+    values = {
+        "domain": domain,
+        "spf": True,
+        "dkim": True,
+        "dmarc_policy": "reject",
+        "expires_at": None,
+        "segment": "Existing",
+        "readiness_score": 50,
+        "provider": "M365",
+    }
+    values.update(overrides)
+    return MagicMock(**values)
+
+
+def _db(input_rows, inserted):
+    """Session stub: first execute returns the inputs, the INSERT returns `inserted`."""
+    db = MagicMock()
+    select_result = MagicMock()
+    select_result.fetchall.return_value = input_rows
+    insert_result = MagicMock()
+    insert_result.fetchall.return_value = [MagicMock(domain=d, tag=t) for d, t in inserted]
+    db.execute.side_effect = [select_result, insert_result]
+    return db
+
+
+class TestEvaluateAutoTags:
+    """Test the in-memory rule evaluation."""
+
+    def test_no_tags(self):
+        """Test a healthy M365 domain gets no tags."""
+        assert evaluate_auto_tags(_row(), TODAY) == []
+
+    def test_all_rules(self):
+        """Test every rule fires in rule order."""
+        row = _row(
+            spf=False,
+            dkim=False,
+            segment="Migration",
+            readiness_score=90,
+            expires_at=TODAY + timedelta(days=10),
+            provider="Google",
+        )
+
+        assert evaluate_auto_tags(row, TODAY) == [
+            "security-risk",
+            "migration-ready",
+            "expire-soon",
+            "google-workspace",
+        ]
+
+    def test_weak_spf_and_local_mx(self):
+        """Test weak-spf and local-mx tags."""
+        row = _row(dmarc_policy="none", provider="Local")
+
+        assert evaluate_auto_tags(row, TODAY) == ["weak-spf", "local-mx"]
+
+    def test_expired_domain_not_expire_soon(self):
+        """Test already expired domains are not tagged expire-soon."""
+        assert evaluate_auto_tags(_row(expires_at=TODAY - timedelta(days=1)), TODAY) == []
+
+
+class TestApplyAutoTagsBulk:
+    """Test the set-based tagging statements."""
+
+    def test_single_select_and_insert(self):
+        """Test a batch costs one SELECT and one INSERT ... ON CONFLICT DO NOTHING."""
+        rows = [
+            _row("b.com", provider="Google"),
+            _row("a.com", spf=False, dkim=False, provider="Local"),
+            _row("c.com"),
+        ]
+        # a.com already had local-mx -> not returned by the INSERT
+        db = _db(rows, [("a.com", "security-risk"), ("b.com", "google-workspace")])
+
+        applied = apply_auto_tags_bulk(["c.com", "b.com", "a.com", "a.com"], db)
+
+        assert applied == {"a.com": ["security-risk"], "b.com": ["google-workspace"]}
+        assert db.execute.call_count == 2
+        assert db.execute.call_args_list[0].args[1] == {"domains": ["a.com", "b.com", "c.com"]}
+        compiled = db.execute.call_args_list[1].args[0].compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert "INSERT INTO tags" in sql
+        assert "ON CONFLICT (domain, tag) DO NOTHING" in sql
+        assert "RETURNING tags.domain, tags.tag" in sql
+        assert compiled.params["domain_m0"] == "a.com"
+        assert compiled.params["tag_m0"] == "security-risk"
+        db.commit.assert_not_called()
+
+    def test_no_matching_tags_skips_insert(self):
+        """Test no INSERT is issued when no rule matches."""
+        db = _db([_row("a.com")], [])
+
+        assert apply_auto_tags_bulk(["a.com"], db) == {}
+        assert db.execute.call_count == 1
+
+    def test_empty(self):
+        """Test nothing is executed without domains."""
+        db = MagicMock()
+
+        assert apply_auto_tags_bulk([], db) == {}
+        db.execute.assert_not_called()
+
+    def test_single_domain_wrapper(self):
+        """Test apply_auto_tags returns the applied tags for one domain."""
+        db = _db([_row("a.com", provider="Local")], [("a.com", "local-mx")])
+
+        assert apply_auto_tags("a.com", db) == ["local-mx"]
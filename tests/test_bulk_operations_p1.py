@@ -14,6 +14,8 @@ from app.core.bulk_operations import (
     get_partial_commit_log,
     store_partial_commit_log,
     get_bulk_log_context,
+    resolve_bulk_domains,
+    format_missing_domains,
 )
 from app.core.tasks import scan_single_domain, process_batch_with_retry
 
@@ -162,7 +164,9 @@ class TestScanSingleDomainCommitFalse:
         with patch("app.core.tasks.analyze_dns") as mock_dns, \
              patch("app.core.tasks.get_whois_info") as mock_whois, \
              patch("app.core.tasks.classify_provider") as mock_provider, \
-             patch("app.core.tasks.score_domain") as mock_score:
+             patch("app.core.tasks.score_domain") as mock_score, \
+             patch("app.core.tasks.resolve_domain_ip_candidates", return_value=["192.0.2.1"]), \
+             patch("app.core.tasks.spawn_enrichment") as mock_spawn:
             
             mock_dns.return_value = {
                 "mx_root": "outlook.com",
@@ -190,6 +194,10 @@ class TestScanSingleDomainCommitFalse:
             # Should succeed but not commit
             assert result["success"] is True
             assert result["domain"] == domain
+            # Enrichment is left to the caller (after its commit): spawning it here
+            # would wait on the read-model row this open transaction holds
+            mock_spawn.assert_not_called()
+            assert result["ip_address"] == "192.0.2.1"
             
             # Check that objects are added but not committed
             # (We can't easily test this without checking DB state, but the function should work)
@@ -295,6 +303,46 @@ class TestBulkLogContext:
         assert context["batch_size"] == 50
 
 
+class TestResolveBulkDomains:
+    """Test set-based bulk domain validation."""
+
+    def test_one_query_per_chunk(self):
+        """Test existence is checked with one ANY() query per chunk."""
+        db = MagicMock()
+        existing = {"a.com", "c.com", "e.com"}
+        db.execute.side_effect = lambda query, params: MagicMock(
+            scalars=lambda: [d for d in params["domains"] if d in existing]
+        )
+
+        domains, missing = resolve_bulk_domains(
+            db,
+            ["A.com", "https://www.b.com/", "c.com", "a.com", "not a domain", "d.com", "e.com"],
+            chunk_size=2,
+        )
+
+        assert domains == ["a.com", "b.com", "c.com", "d.com", "e.com"]
+        assert missing == ["b.com", "d.com"]
+        assert db.execute.call_count == 3
+        assert "= ANY(:domains)" in str(db.execute.call_args_list[0][0][0])
+        assert db.execute.call_args_list[0][0][1] == {"domains": ["a.com", "b.com"]}
+
+    def test_empty_list_skips_query(self):
+        """Test no query is run when nothing valid remains."""
+        db = MagicMock()
+
+        assert resolve_bulk_domains(db, ["", "not a domain"]) == ([], [])
+        db.execute.assert_not_called()
+
+    def test_format_missing_domains(self):
+        """Test the missing-domain error lists five names and a remainder."""
+        missing = [f"d{i}.com" for i in range(7)]
+
+        assert format_missing_domains(missing[:2]) == (
+            "Domains not found. Please ingest first: d0.com, d1.com"
+        )
+        assert format_missing_domains(missing).endswith("d4.com and 2 more")
+
+
 class TestBatchProcessingWithRetry:
     """Test batch processing with retry logic (deadlock prevention)."""
 
@@ -380,3 +428,98 @@ class TestBatchIsolation:
         # Requires full bulk_scan_task integration test
         pass
 
+
+
+class TestConcurrentBatchScan:
+    """Test concurrent intra-batch scanning (network phase in a thread pool)."""
+
+    def _mock_db(self, domains):
+        db = MagicMock()
+        companies = [Company(domain=d, canonical_name=d, provider=None) for d in domains]
+        db.query.return_value.filter.return_value.__iter__.return_value = iter(companies)
+        return db
+
+    def test_scan_domains_concurrent_results_in_order(self):
+        """Test analyses run in parallel and results keep input order."""
+        import threading
+        from app.core.tasks import scan_domains_concurrent
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_dns(domain, use_cache=True):
+            barrier.wait()  # Deadlocks unless all 3 analyses run concurrently
+            if domain == "c.com":
+                raise RuntimeError("dns exploded")
+            return {"mx_root": "outlook.com", "spf": True, "dkim": False,
+                    "dmarc_policy": None, "status": "success", "mx_records": []}
+
+        db = self._mock_db(["a.com", "b.com", "c.com"])
+        with patch("app.core.tasks.wait_for_dns_rate_limit"), \
+             patch("app.core.tasks.wait_for_whois_rate_limit"), \
+             patch("app.core.tasks.analyze_dns", side_effect=fake_dns), \
+             patch("app.core.tasks.get_whois_info", return_value=None), \
+             patch("app.core.tasks.classify_provider", return_value="M365"), \
+             patch("app.core.tasks.score_domain",
+                   return_value={"score": 60, "segment": "Migration", "reason": "r"}), \
+             patch("app.core.tasks.resolve_domain_ip_candidates", return_value=[]), \
+             patch("app.core.tasks.set_cached_scan"), \
+             patch("app.core.scan_persistence.refresh_lead_read_model") as mock_refresh, \
+             patch("app.core.scan_persistence.load_score_buckets", return_value={}), \
+             patch("app.core.scan_persistence.apply_score_bucket_deltas"):
+            results = scan_domains_concurrent(
+                ["b.com", "not a domain", "c.com", "a.com", "missing.com"], db, max_workers=3
+            )
+
+        assert [r["success"] for r in results] == [True, False, False, True, False]
+        assert results[0]["result"]["provider"] == "M365"
+        assert results[0]["result"]["scan_status"] == "whois_failed"
+        assert results[1]["error"] == "Invalid domain format"
+        assert results[2]["error"] == "dns exploded"
+        assert results[4]["error"] == "Domain not found. Please ingest first."
+        # 1 company lookup + 1 UPSERT per table for the whole batch
+        assert db.query.call_count == 1
+        assert db.execute.call_count == 2
+        # 1 read model refresh for the whole batch
+        mock_refresh.assert_called_once()
+        db.commit.assert_not_called()
+
+    def test_process_batch_uses_concurrent_scan(self):
+        """Test process_batch_with_retry scans the batch with one concurrent call."""
+        db = MagicMock()
+        results = [
+            {"domain": "a.com", "success": True, "result": {"score": 70}},
+            {"domain": "b.com", "success": False, "error": "Domain not found. Please ingest first."},
+        ]
+        with patch("app.core.tasks.scan_domains_concurrent", return_value=results) as mock_scan, \
+             patch("app.core.tasks.scan_single_domain") as mock_single, \
+             patch("app.core.tasks.apply_auto_tags_bulk") as mock_tags:
+            succeeded, failed, committed, failed_results = process_batch_with_retry(
+                batch=["a.com", "b.com"],
+                job_id="job",
+                batch_no=1,
+                total_batches=1,
+                is_rescan=False,
+                db=db,
+            )
+
+        mock_scan.assert_called_once_with(["a.com", "b.com"], db, max_workers=10)
+        mock_single.assert_not_called()
+        assert (succeeded, failed) == (1, 1)
+        assert committed[0]["domain"] == "a.com"
+        assert failed_results[0]["domain"] == "b.com"
+        # Auto-tagging: one bulk call for the succeeded domains, one commit per batch
+        mock_tags.assert_called_once_with(["a.com"], db)
+        db.commit.assert_called_once()
+
+    def test_process_batch_sequential_uses_batch_scan(self):
+        """Test one worker still scans through the batch path, never scan_single_domain(commit=False)."""
+        db = MagicMock()
+        with patch("app.core.tasks.BULK_SCAN_MAX_WORKERS", 1), \
+             patch("app.core.tasks.scan_domains_concurrent", return_value=[]) as mock_scan, \
+             patch("app.core.tasks.scan_single_domain") as mock_single:
+            process_batch_with_retry(
+                batch=[], job_id="job", batch_no=1, total_batches=1, is_rescan=False, db=db
+            )
+
+        mock_scan.assert_called_once_with([], db, max_workers=1)
+        mock_single.assert_not_called()
@@ -11,6 +11,7 @@ from unittest.mock import patch, Mock
 
 from app.db.models import Base, Company
 from app.main import app
+from tests.conftest import override_db_dependencies
 
 # Test database URL
 # Priority: TEST_DATABASE_URL > HUNTER_DATABASE_URL > DATABASE_URL > default
@@ -74,9 +75,7 @@ def test_client(db_session):
             pass
 
     app.dependency_overrides = {}
-    from app.db.session import get_db
-
-    app.dependency_overrides[get_db] = override_get_db
+    override_db_dependencies(app, override_get_db)
 
     client = TestClient(app)
     yield client
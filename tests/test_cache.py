@@ -8,17 +8,18 @@ from app.core.cache import (
     set_cached_dns,
     get_cached_whois,
     set_cached_whois,
-    get_cached_provider,
-    set_cached_provider,
     get_cached_scoring,
     set_cached_scoring,
     get_cached_scan,
     set_cached_scan,
     invalidate_scan_cache,
     _generate_signals_hash,
+    clear_l1_cache,
+    get_cache_metrics,
+    reset_cache_metrics,
+    invalidate_scoring_cache,
     DNS_CACHE_TTL,
     WHOIS_CACHE_TTL,
-    PROVIDER_CACHE_TTL,
     SCORING_CACHE_TTL,
     SCAN_CACHE_TTL,
 )
@@ -119,30 +120,14 @@ class TestWHOISCache:
             # Result may be None if WHOIS fails, that's OK
 
 
-class TestProviderCache:
-    """Test provider mapping cache functionality."""
+class TestProviderClassification:
+    """Test provider classification needs no cache."""
 
-    def test_provider_cache_set_get(self):
-        """Test provider cache set and get."""
-        mx_root = "outlook.com"
-        provider = "M365"
-        
-        # Set cache
-        set_success = set_cached_provider(mx_root, provider)
-        # May fail if Redis unavailable, that's OK for tests
-        if set_success:
-            # Get cache
-            cached = get_cached_provider(mx_root)
-            if cached is not None:
-                assert cached == provider
-
-    def test_classify_provider_uses_cache(self):
-        """Test that classify_provider uses cache when available."""
-        # Mock Redis as unavailable to test fallback
-        with patch("app.core.cache.is_redis_available", return_value=False):
-            # Should still work (fallback to no cache)
-            result = classify_provider("outlook.com", use_cache=True)
-            assert result in ["M365", "Local", "Unknown"]
+    def test_classify_provider_without_redis(self):
+        """Test that classify_provider never touches Redis."""
+        with patch("app.core.cache.get_redis_client") as mock_client:
+            assert classify_provider("outlook.com") == "M365"
+            mock_client.assert_not_called()
 
 
 class TestScoringCache:
@@ -228,7 +213,6 @@ class TestCacheTTL:
         """Test that cache TTL constants are defined correctly."""
         assert DNS_CACHE_TTL == 3600  # 1 hour
         assert WHOIS_CACHE_TTL == 86400  # 24 hours
-        assert PROVIDER_CACHE_TTL == 86400  # 24 hours
         assert SCORING_CACHE_TTL == 3600  # 1 hour
         assert SCAN_CACHE_TTL == 3600  # 1 hour
 
@@ -244,7 +228,161 @@ class TestCacheRedisUnavailable:
             assert get_cached_dns("example.com") is None
             assert set_cached_dns("example.com", {}) is False
             assert get_cached_whois("example.com") is None
-            assert get_cached_provider("outlook.com") is None
             assert get_cached_scoring("example.com", "M365", {}) is None
             assert get_cached_scan("example.com") is None
 
+
+
+class TestL1Cache:
+    """Test the process-local L1 tier in front of Redis."""
+
+    @pytest.fixture(autouse=True)
+    def fake_redis(self):
+        """Redis stub backed by a dict; L1 and metrics cleared around each test."""
+        store = {}
+        client = MagicMock()
+        client.get.side_effect = lambda key: store.get(key)
+        client.setex.side_effect = lambda key, ttl, value: store.__setitem__(
+            key, value.encode() if isinstance(value, str) else value
+        )
+        client.delete.side_effect = lambda key: store.pop(key, None) is not None
+        client.mget.side_effect = lambda keys: [store.get(key) for key in keys]
+        client.pipeline.return_value = client  # setex calls apply immediately
+        client.scan_iter.side_effect = lambda match: [k for k in list(store) if k.startswith(match.rstrip("*"))]
+        clear_l1_cache()
+        reset_cache_metrics()
+        with patch("app.core.cache.is_redis_available", return_value=True), \
+                patch("app.core.cache.get_redis_client", return_value=client):
+            yield client
+        clear_l1_cache()
+        reset_cache_metrics()
+
+    def test_repeated_lookups_served_from_l1(self, fake_redis):
+        """Test a hot key costs one Redis GET, then L1 hits."""
+        fake_redis.setex("cache:whois:outlook.com", 60, '{"registrar": "MarkMonitor"}')
+
+        results = [get_cached_whois("outlook.com") for _ in range(100)]
+
+        assert results == [{"registrar": "MarkMonitor"}] * 100
+        assert fake_redis.get.call_count == 1
+        tiers = get_cache_metrics()["tiers"]
+        assert tiers["redis"]["hits"] == 1
+        assert tiers["l1"]["hits"] == 99
+        assert tiers["l1"]["misses"] == 1
+
+    def test_set_populates_l1(self, fake_redis):
+        """Test values written through the cache are served locally."""
+        set_cached_dns("example.com", {"mx_root": "example.com", "spf": True})
+
+        first = get_cached_dns("example.com")
+        first["spf"] = False  # Callers get their own copy
+        second = get_cached_dns("example.com")
+
+        assert second == {"mx_root": "example.com", "spf": True}
+        fake_redis.get.assert_not_called()
+
+    def test_l1_entry_expires(self, fake_redis):
+        """Test L1 entries expire after the prefix TTL and fall back to Redis."""
+        set_cached_whois("outlook.com", {"registrar": "MarkMonitor"})
+
+        with patch("app.core.cache.time.monotonic", return_value=time.monotonic() + WHOIS_CACHE_TTL):
+            assert get_cached_whois("outlook.com") == {"registrar": "MarkMonitor"}
+
+        assert fake_redis.get.call_count == 1
+        assert get_cache_metrics()["ttl_expirations"] == 1
+
+    def test_scan_results_bypass_l1(self, fake_redis):
+        """Test full scan results are always read from Redis."""
+        set_cached_scan("example.com", {"provider": "M365"})
+
+        assert get_cached_scan("example.com") == {"provider": "M365"}
+        with patch("app.core.cache.is_redis_available", return_value=False):
+            assert get_cached_scan("example.com") is None
+
+    def test_invalidation_clears_l1(self, fake_redis):
+        """Test invalidation removes local copies as well as Redis keys."""
+        signals = {"spf": True}
+        set_cached_dns("example.com", {"mx_root": "example.com"})
+        set_cached_scoring("example.com", "M365", signals, {"score": 75})
+
+        from app.core.cache import invalidate_dns_cache
+
+        invalidate_dns_cache("example.com")
+        invalidate_scoring_cache("example.com")
+
+        assert get_cached_dns("example.com") is None
+        assert get_cached_scoring("example.com", "M365", signals) is None
+
+    def test_whois_dates_round_trip(self, fake_redis):
+        """Test WHOIS results with dates are cached and decoded (L1 and Redis)."""
+        from datetime import date
+
+        result = {"registrar": "MarkMonitor", "expires_at": date(2027, 3, 1), "nameservers": ["ns1.a.com"]}
+
+        assert set_cached_whois("outlook.com", result) is True
+        assert get_cached_whois("outlook.com") == result
+        clear_l1_cache()
+        assert get_cached_whois("outlook.com") == result
+        assert fake_redis.get.call_count == 1
+
+    def test_unsupported_type_not_cached(self, fake_redis):
+        """Test encode failures skip the write without marking Redis down."""
+        with patch("app.core.cache.mark_redis_unavailable") as mock_mark:
+            assert set_cached_dns("example.com", {"bad": object()}) is False
+
+        mock_mark.assert_not_called()
+        fake_redis.setex.assert_not_called()
+
+    def test_bulk_ip_enrichment_cache(self, fake_redis):
+        """Test many IPs are written with one pipeline and read with one MGET."""
+        from app.core.cache import get_cached_ip_enrichments, set_cached_ip_enrichments
+
+        assert set_cached_ip_enrichments({"1.1.1.1": {"asn": 1}, "2.2.2.2": {"asn": 2}}) == 2
+        fake_redis.execute.assert_called_once()
+        clear_l1_cache()
+
+        cached = get_cached_ip_enrichments(["1.1.1.1", "2.2.2.2", "3.3.3.3"])
+
+        assert cached == {"1.1.1.1": {"asn": 1}, "2.2.2.2": {"asn": 2}}
+        fake_redis.mget.assert_called_once()
+        # Promoted into L1: no further Redis reads
+        assert get_cached_ip_enrichments(["1.1.1.1"]) == {"1.1.1.1": {"asn": 1}}
+        fake_redis.mget.assert_called_once()
+
+    def test_l1_is_bounded(self, fake_redis):
+        """Test the LRU bound evicts the least recently used entries."""
+        with patch("app.core.cache._l1_cache.max_entries", 2):
+            set_cached_whois("a.com", {"registrar": "A"})
+            set_cached_whois("b.com", {"registrar": "B"})
+            get_cached_whois("a.com")
+            set_cached_whois("c.com", {"registrar": "C"})
+
+            assert get_cache_metrics()["tiers"]["l1"] == {
+                "hits": 1, "misses": 0, "evictions": 1, "size": 2,
+            }
+            fake_redis.get.reset_mock()
+            get_cached_whois("b.com")  # Evicted -> Redis
+            assert fake_redis.get.call_count == 1
+
+
+class TestRedisHealthFlag:
+    """Test the cached Redis availability flag."""
+
+    def test_ping_cached_between_checks(self):
+        """Test is_redis_available() PINGs at most once per interval."""
+        from app.core import redis_client as rc
+
+        client = MagicMock()
+        with patch.object(rc, "get_redis_client", return_value=client):
+            rc.reset_redis_client()
+            assert all(rc.is_redis_available() for _ in range(50))
+            assert client.ping.call_count == 1
+
+            rc.mark_redis_unavailable()
+            assert rc.is_redis_available() is False
+            assert client.ping.call_count == 1
+
+            with patch.object(rc.time, "monotonic", return_value=time.monotonic() + rc.REDIS_HEALTH_CHECK_INTERVAL + 1):
+                assert rc.is_redis_available() is True
+            assert client.ping.call_count == 2
+        rc.reset_redis_client()
@@ -0,0 +1,102 @@
+"""Tests for the typed cache codec (versioned envelopes)."""
+
+import json
+import pytest
+from datetime import date, datetime, timezone
+
+from app.core.analyzer_enrichment import IpEnrichmentResult
+from app.core.cache_codec import (
+    CACHE_CODEC_VERSION,
+    CACHE_ENVELOPE_MAGIC,
+    decode_cache_value,
+    encode_cache_value,
+)
+
+
+DNS_RESULT = {
+    "mx_records": ["outlook-com.olc.protection.outlook.com"],
+    "mx_root": "outlook.com",
+    "spf": True,
+    "dkim": False,
+    "dmarc_policy": "reject",
+    "dmarc_coverage": 100,
+    "status": "success",
+}
+WHOIS_RESULT = {
+    "registrar": "MarkMonitor Inc.",
+    "expires_at": date(2027, 3, 1),
+    "nameservers": ["ns1.msft.net", "ns2.msft.net"],
+}
+SCORING_RESULT = {
+    "score": 75,
+    "segment": "Migration",
+    "reason": "M365 + SPF + DMARC reject",
+    "priority_score": 2,
+    "hard_stop": False,
+}
+SCAN_RESULT = {
+    "dns_result": DNS_RESULT,
+    "whois_result": WHOIS_RESULT,
+    "provider": "M365",
+    "local_provider": None,
+    "tenant_size": "large",
+    "scoring_result": SCORING_RESULT,
+    "scan_status": "success",
+    "mx_root": "outlook.com",
+}
+IP_ENRICHMENT_RESULT = IpEnrichmentResult(
+    asn=8075, asn_org="MICROSOFT-CORP", country="US", city="Redmond",
+    usage_type="DCH", is_proxy=False,
+).to_dict()
+
+
+class TestRoundTrip:
+    """Test every cached result type decodes to an equal value."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [DNS_RESULT, WHOIS_RESULT, SCORING_RESULT, SCAN_RESULT, IP_ENRICHMENT_RESULT, None],
+        ids=["dns", "whois", "scoring", "scan", "ip_enrichment", "none"],
+    )
+    def test_cached_result_types(self, value):
+        """Test cached results round-trip with their Python types intact."""
+        assert decode_cache_value(encode_cache_value(value)) == value
+
+    def test_extension_types(self):
+        """Test date, datetime and set survive nested in lists and dicts."""
+        value = {
+            "dates": [date(2026, 1, 2), datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)],
+            "tags": {"security-risk", "weak-spf"},
+            "nested": {"naive": datetime(2026, 1, 2, 3, 4, 5)},
+        }
+
+        decoded = decode_cache_value(encode_cache_value(value))
+
+        assert decoded == value
+        assert type(decoded["dates"][0]) is date
+        assert decoded["dates"][1].tzinfo is not None
+
+    def test_unsupported_type(self):
+        """Test unknown types fail loudly instead of being stringified."""
+        with pytest.raises(TypeError):
+            encode_cache_value({"value": object()})
+
+
+class TestEnvelope:
+    """Test envelope versioning and legacy entries."""
+
+    def test_envelope_header(self):
+        """Test payloads carry the magic byte and current version."""
+        payload = encode_cache_value({"a": 1})
+
+        assert payload[:1] == CACHE_ENVELOPE_MAGIC
+        assert payload[1] == CACHE_CODEC_VERSION
+
+    def test_legacy_json_entries(self):
+        """Test plain JSON written before the codec still decodes."""
+        assert decode_cache_value(json.dumps(DNS_RESULT).encode()) == DNS_RESULT
+
+    def test_unknown_version(self):
+        """Test entries from an unknown codec version are rejected."""
+        with pytest.raises(ValueError):
+            decode_cache_value(CACHE_ENVELOPE_MAGIC + bytes([255]) + b"{}")
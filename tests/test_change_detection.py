@@ -0,0 +1,135 @@
+"""Tests for batched change detection and rescans (G18)."""
+
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from app.core.change_detection import (
+    alert_rows,
+    diff_scores,
+    diff_signals,
+    load_change_snapshots,
+    record_changes_bulk,
+)
+from app.core.rescan import rescan_domains
+
+TODAY = date(2026, 10, 17)
+
+
+def _signal(**overrides):
+    values = {"spf": True, "dkim": True, "dmarc_policy": "none", "mx_root": "outlook.com", "expires_at": None}
+    values.update(overrides)
+    return MagicMock(**values)
+
+
+def _score(readiness_score=50, segment="Existing"):
+    return MagicMock(readiness_score=readiness_score, segment=segment)
+
+
+class TestDiffs:
+    """Test in-memory signal and score diffs."""
+
+    def test_first_scan_has_no_changes(self):
+        """Test a domain without a previous snapshot yields nothing."""
+        assert diff_signals("a.com", None, _signal(), TODAY) == ([], [])
+        assert diff_scores("a.com", None, _score()) == ([], [])
+
+    def test_signal_changes(self):
+        """Test MX/DMARC changes produce history rows and alertable changes."""
+        old = _signal()
+        new = _signal(mx_root="google.com", dmarc_policy="reject", expires_at=TODAY + timedelta(days=10))
+
+        history, changes = diff_signals("a.com", old, new, TODAY)
+
+        assert [row["signal_type"] for row in history] == ["dmarc", "mx"]
+        assert [change["type"] for change in changes] == ["dmarc_added", "mx_changed", "expire_soon"]
+        assert [row["alert_type"] for row in alert_rows("a.com", changes)] == [
+            "dmarc_added",
+            "mx_changed",
+            "expire_soon",
+        ]
+
+    def test_spf_change_not_alerted(self):
+        """Test SPF changes are recorded but do not create alerts."""
+        history, changes = diff_signals("a.com", _signal(), _signal(spf=False), TODAY)
+
+        assert history[0] == {"domain": "a.com", "signal_type": "spf", "old_value": "True", "new_value": "False"}
+        assert alert_rows("a.com", changes) == []
+
+    def test_score_change(self):
+        """Test segment changes produce a history row and a score alert."""
+        history, changes = diff_scores("a.com", _score(40, "Cold"), _score(80, "Migration"))
+
+        assert history[0]["new_segment"] == "Migration"
+        assert alert_rows("a.com", changes)[0]["alert_type"] == "score_changed"
+
+
+class TestRecordChangesBulk:
+    """Test the set-based snapshot and insert statements."""
+
+    def test_snapshot_single_query(self):
+        """Test old state for a batch is loaded in one query."""
+        db = MagicMock()
+        db.execute.return_value.fetchall.return_value = [
+            MagicMock(domain="a.com", has_signal=True, has_score=True),
+            MagicMock(domain="b.com", has_signal=False, has_score=False),
+        ]
+
+        signals, scores = load_change_snapshots(db, ["b.com", "a.com", "a.com"])
+
+        assert list(signals) == ["a.com"] and list(scores) == ["a.com"]
+        assert db.execute.call_count == 1
+        assert db.execute.call_args.args[1] == {"domains": ["a.com", "b.com"]}
+
+    def test_only_changed_domains_written(self):
+        """Test one multi-row INSERT per table, none for unchanged domains."""
+        db = MagicMock()
+        old = ({"a.com": _signal(), "b.com": _signal()}, {"a.com": _score(), "b.com": _score()})
+        new = (
+            {"a.com": _signal(mx_root="google.com"), "b.com": _signal()},
+            {"a.com": _score(), "b.com": _score()},
+        )
+
+        summary = record_changes_bulk(db, old, new)
+
+        assert summary["a.com"]["signal_changes"] == 1
+        assert summary["a.com"]["alerts_created"] == 1
+        assert summary["b.com"] == {"changes": [], "signal_changes": 0, "score_changes": 0, "alerts_created": 0}
+        statements = [str(call.args[0].compile(dialect=postgresql.dialect())) for call in db.execute.call_args_list]
+        assert len(statements) == 2
+        assert "INSERT INTO signal_change_history" in statements[0]
+        assert "INSERT INTO alerts" in statements[1]
+        db.commit.assert_not_called()
+
+
+class TestRescanDomains:
+    """Test the batched rescan pipeline."""
+
+    @patch("app.core.rescan.invalidate_dns_cache")
+    @patch("app.core.rescan.invalidate_scoring_cache")
+    @patch("app.core.rescan.invalidate_scan_cache")
+    @patch("app.core.rescan.apply_auto_tags_bulk")
+    @patch("app.core.rescan.record_changes_bulk")
+    @patch("app.core.rescan.load_change_snapshots")
+    @patch("app.core.rescan.scan_domains_concurrent")
+    def test_batch_pipeline(self, mock_scan, mock_snapshots, mock_record, mock_tags, *_):
+        """Test one snapshot before/after, one change write and one commit per batch."""
+        db = MagicMock()
+        mock_scan.return_value = [
+            {"domain": "a.com", "success": True, "result": {"score": 80}},
+            {"domain": "b.com", "success": False, "error": "Domain not found. Please ingest first."},
+        ]
+        mock_snapshots.side_effect = [({}, {}), ({}, {})]
+        mock_record.return_value = {
+            "a.com": {"changes": [], "signal_changes": 0, "score_changes": 0, "alerts_created": 0}
+        }
+
+        results = rescan_domains(["a.com", "b.com"], db)
+
+        assert mock_scan.call_args.kwargs == {"use_cache": False}
+        assert mock_snapshots.call_args_list[0].args[1] == ["a.com", "b.com"]
+        assert mock_snapshots.call_args_list[1].args[1] == ["a.com"]
+        mock_tags.assert_called_once_with(["a.com"], db)
+        db.commit.assert_called_once()
+        assert results[0]["success"] is True and results[0]["changes_detected"] is False
+        assert results[1]["success"] is False
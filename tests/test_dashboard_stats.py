@@ -0,0 +1,96 @@
+"""Tests for pre-aggregated dashboard statistics (dashboard_score_buckets)."""
+
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+
+from app.core.dashboard_stats import (
+    apply_score_bucket_deltas,
+    load_score_buckets,
+    reconcile_dashboard_stats,
+    score_bucket_deltas,
+)
+
+
+def _score_row(domain, segment, score):
+    return {"domain": domain, "segment": segment, "readiness_score": score}
+
+
+class TestScoreBucketDeltas:
+    """Test delta computation for rescored domains."""
+
+    def test_new_and_moved_domains(self):
+        """Test new domains add 1 and moved domains shift between buckets."""
+        previous = {"a.com": ("Cold", 20)}
+        rows = [_score_row("a.com", "Migration", 80), _score_row("b.com", "Migration", 80)]
+
+        assert score_bucket_deltas(previous, rows) == {
+            ("Cold", 20): -1,
+            ("Migration", 80): 2,
+        }
+
+    def test_unchanged_domains_ignored(self):
+        """Test rescans with the same segment and score produce no delta."""
+        previous = {"a.com": ("Existing", 50)}
+
+        assert score_bucket_deltas(previous, [_score_row("a.com", "Existing", 50)]) == {}
+
+    def test_swaps_cancel_out(self):
+        """Test two domains swapping buckets net to zero."""
+        previous = {"a.com": ("Cold", 10), "b.com": ("Skip", 0)}
+        rows = [_score_row("a.com", "Skip", 0), _score_row("b.com", "Cold", 10)]
+
+        assert score_bucket_deltas(previous, rows) == {}
+
+
+class TestBucketStatements:
+    """Test the SQL issued against dashboard_score_buckets."""
+
+    def test_apply_deltas_single_upsert(self):
+        """Test deltas are added with one INSERT ... ON CONFLICT in key order."""
+        db = MagicMock()
+
+        apply_score_bucket_deltas(db, {("Migration", 80): 2, ("Cold", 20): -1})
+
+        assert db.execute.call_count == 1
+        compiled = db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert "INSERT INTO dashboard_score_buckets" in sql
+        assert "ON CONFLICT (segment, readiness_score) DO UPDATE" in sql
+        assert "dashboard_score_buckets.lead_count + excluded.lead_count" in sql
+        assert compiled.params["segment_m0"] == "Cold"
+        assert compiled.params["lead_count_m0"] == -1
+        db.commit.assert_not_called()
+
+    def test_apply_no_deltas(self):
+        """Test nothing is executed when no bucket changed."""
+        db = MagicMock()
+
+        apply_score_bucket_deltas(db, {})
+
+        db.execute.assert_not_called()
+
+    def test_load_locks_rows(self):
+        """Test previous scores are read FOR UPDATE in domain order."""
+        db = MagicMock()
+        db.execute.return_value.fetchall.return_value = [
+            MagicMock(domain="a.com", segment="Cold", readiness_score=20)
+        ]
+
+        buckets = load_score_buckets(db, ["b.com", "a.com", "a.com"])
+
+        assert buckets == {"a.com": ("Cold", 20)}
+        sql = str(db.execute.call_args.args[0])
+        assert "FOR UPDATE" in sql
+        assert db.execute.call_args.args[1] == {"domains": ["a.com", "b.com"]}
+
+    def test_reconcile_rebuilds_from_lead_scores(self):
+        """Test reconciliation locks, clears and re-aggregates lead_scores."""
+        db = MagicMock()
+        db.execute.return_value.rowcount = 5
+
+        assert reconcile_dashboard_stats(db) == 5
+        statements = [str(call.args[0]) for call in db.execute.call_args_list]
+        assert "LOCK TABLE dashboard_score_buckets" in statements[0]
+        assert "DELETE FROM dashboard_score_buckets" in statements[1]
+        assert "GROUP BY segment, readiness_score" in statements[2]
+        db.commit.assert_not_called()
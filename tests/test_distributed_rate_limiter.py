@@ -276,3 +276,89 @@ class TestConcurrentAccess:
         assert successful <= limiter.burst, \
             f"Concurrent acquisitions ({successful}) exceeded burst ({limiter.burst})"
 
+
+
+class TestAtomicTokenBucket:
+    """Test the Redis script token bucket (one EVALSHA per acquire)."""
+    
+    def _mock_redis(self, script_result):
+        mock_redis = MagicMock()
+        mock_script = MagicMock(return_value=script_result)
+        mock_redis.register_script.return_value = mock_script
+        return mock_redis, mock_script
+    
+    def test_acquire_single_script_call(self):
+        """Test acquire runs the bucket script once and no pipelines."""
+        limiter = DistributedRateLimiter(redis_key="test_script", rate=10.0, burst=10.0)
+        mock_redis, mock_script = self._mock_redis([1, b"9", b"0"])
+        
+        with patch.dict("app.core.distributed_rate_limiter._token_bucket_scripts", clear=True), \
+                patch("app.core.distributed_rate_limiter.get_redis_client", return_value=mock_redis), \
+                patch("app.core.distributed_rate_limiter.is_redis_available", return_value=True):
+            assert limiter.acquire() is True
+        
+        mock_script.assert_called_once_with(
+            keys=["rate_limit:test_script:bucket"],
+            args=[10.0, 10.0, 1, limiter.bucket_ttl_ms, "all"],
+        )
+        mock_redis.pipeline.assert_not_called()
+    
+    def test_acquire_rate_limited(self):
+        """Test acquire returns False when the script grants nothing."""
+        limiter = DistributedRateLimiter(redis_key="test_script_denied", rate=2.0, burst=2.0)
+        mock_redis, _ = self._mock_redis([0, b"0.5", b"0.25"])
+        
+        with patch.dict("app.core.distributed_rate_limiter._token_bucket_scripts", clear=True), \
+                patch("app.core.distributed_rate_limiter.get_redis_client", return_value=mock_redis), \
+                patch("app.core.distributed_rate_limiter.is_redis_available", return_value=True):
+            assert limiter.acquire() is False
+    
+    def test_wait_returns_exact_reservation(self):
+        """Test wait() reserves tokens and returns the script's wait time."""
+        limiter = DistributedRateLimiter(redis_key="test_script_wait", rate=10.0, burst=10.0)
+        mock_redis, mock_script = self._mock_redis([1, b"-0.5", b"0.15"])
+        
+        with patch.dict("app.core.distributed_rate_limiter._token_bucket_scripts", clear=True), \
+                patch("app.core.distributed_rate_limiter.get_redis_client", return_value=mock_redis), \
+                patch("app.core.distributed_rate_limiter.is_redis_available", return_value=True):
+            assert limiter.wait() == pytest.approx(0.15)
+        
+        assert mock_script.call_args.kwargs["args"][-1] == "reserve"
+    
+    def test_acquire_many_partial_grant(self):
+        """Test acquire_many returns granted count and next-token wait hint."""
+        limiter = DistributedRateLimiter(redis_key="test_script_many", rate=10.0, burst=10.0)
+        mock_redis, mock_script = self._mock_redis([3, b"0.2", b"0.08"])
+        
+        with patch.dict("app.core.distributed_rate_limiter._token_bucket_scripts", clear=True), \
+                patch("app.core.distributed_rate_limiter.get_redis_client", return_value=mock_redis), \
+                patch("app.core.distributed_rate_limiter.is_redis_available", return_value=True):
+            granted, wait = limiter.acquire_many(5)
+        
+        assert granted == 3
+        assert wait == pytest.approx(0.08)
+        assert mock_script.call_args.kwargs["args"][2:] == [5, limiter.bucket_ttl_ms, "partial"]
+    
+    def test_acquire_many_fallback(self):
+        """Test acquire_many uses the in-memory limiter when Redis is unavailable."""
+        limiter = DistributedRateLimiter(redis_key="test_many_fallback", rate=10.0, burst=4.0)
+        
+        with patch("app.core.distributed_rate_limiter.is_redis_available", return_value=False):
+            granted, wait = limiter.acquire_many(6)
+        
+        assert granted == 4
+        assert wait == pytest.approx(0.1, abs=0.01)
+        assert limiter.acquire_many(0) == (0, 0.0)
+    
+    def test_script_against_redis(self):
+        """Test the Lua script itself (requires a running Redis)."""
+        if not is_redis_available():
+            pytest.skip("Redis not available")
+        
+        limiter = DistributedRateLimiter(redis_key="test_script_live", rate=1.0, burst=3.0)
+        get_redis_client().delete(limiter.bucket_key)
+        
+        assert limiter.acquire_many(5)[0] == 3
+        assert limiter.acquire() is False
+        wait = limiter.wait()
+        assert 0.0 < wait <= 1.0
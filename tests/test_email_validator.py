@@ -8,6 +8,7 @@ from app.core.email_validator import (
     validate_email_mx,
     validate_email_smtp,
     validate_email,
+    validate_emails,
     EmailValidationResult,
 )
 
@@ -261,3 +262,61 @@ class TestEmailValidation:
         assert result.status == "invalid"
         assert result.confidence == "high"
         assert "Invalid email syntax" in result.reason  # Syntax check happens first
+
+
+class TestBatchEmailValidation:
+    """Test batch validation (one MX lookup and SMTP session per domain)."""
+
+    @patch("app.core.email_validator.get_mx_records")
+    @patch("smtplib.SMTP")
+    def test_validate_emails_reuses_mx_and_smtp_session(self, mock_smtp_class, mock_get_mx):
+        """Test 3 addresses cost one DNS lookup and one SMTP handshake."""
+        mock_get_mx.return_value = ["mail.example.com"]
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+        mock_server.rcpt.side_effect = [(250, "OK"), (550, "User unknown"), (451, "Later")]
+
+        results = validate_emails(
+            ["info@example.com", "sales@example.com", "admin@example.com"], use_smtp=True
+        )
+
+        assert [r.status for r in results] == ["valid", "invalid", "unknown"]
+        assert [r.email for r in results] == [
+            "info@example.com", "sales@example.com", "admin@example.com"
+        ]
+        assert results[2].confidence == "medium"
+        mock_get_mx.assert_called_once_with("example.com")
+        mock_smtp_class.assert_called_once()
+        mock_server.helo.assert_called_once()
+        mock_server.mail.assert_called_once()
+        assert mock_server.rcpt.call_count == 3
+        mock_server.quit.assert_called_once()
+
+    @patch("app.core.email_validator.get_mx_records")
+    @patch("smtplib.SMTP")
+    def test_validate_emails_session_error(self, mock_smtp_class, mock_get_mx):
+        """Test addresses not yet checked get the session error as unknown."""
+        mock_get_mx.return_value = ["mail.example.com"]
+        mock_server = MagicMock()
+        mock_smtp_class.return_value = mock_server
+        mock_server.rcpt.side_effect = [(250, "OK"), smtplib.SMTPServerDisconnected()]
+
+        results = validate_emails(["a@example.com", "b@example.com", "c@example.com"], use_smtp=True)
+
+        assert [r.status for r in results] == ["valid", "unknown", "unknown"]
+        assert results[2].reason == "SMTP connection closed"
+
+    @patch("app.core.email_validator.get_mx_records")
+    def test_validate_emails_groups_domains(self, mock_get_mx):
+        """Test syntax errors, missing MX and multiple domains in one batch."""
+        mock_get_mx.side_effect = lambda domain: ["mx.a.com"] if domain == "a.com" else []
+
+        results = validate_emails(
+            ["x@a.com", "bad-email", "y@b.com", "z@a.com"], use_smtp=False
+        )
+
+        assert [r.status for r in results] == ["valid", "invalid", "invalid", "valid"]
+        assert results[1].reason == "Invalid email syntax"
+        assert results[2].reason == "No MX records"
+        assert results[0].checks == {"syntax": True, "mx": True, "smtp": "skipped"}
+        assert mock_get_mx.call_count == 2
@@ -0,0 +1,195 @@
+"""Tests for IP enrichment service helpers (infrastructure summaries, batched enrichment)."""
+
+import maxminddb
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from app.core.analyzer_enrichment import (
+    IpEnrichmentResult,
+    _maxmind_reader_mode,
+    enrich_ip,
+    enrich_ips,
+)
+from app.core.enrichment_service import (
+    build_infra_summaries,
+    enrich_domains_if_enabled,
+    format_infra_summary,
+    ip_enrichment_row,
+    save_ip_enrichments,
+    INFRA_SUMMARY_CHUNK_SIZE,
+)
+
+
+def _record(domain, usage_type=None, isp=None, country=None):
+    """Build a fake IpEnrichment row."""
+    return MagicMock(domain=domain, usage_type=usage_type, isp=isp, country=country)
+
+
+def _mock_db(records):
+    """Mock Session whose query(...).filter(...).distinct(...).order_by(...).all() returns records."""
+    db = MagicMock()
+    chain = db.query.return_value.filter.return_value.distinct.return_value.order_by.return_value
+    chain.all.return_value = records
+    return db
+
+
+class TestFormatInfraSummary:
+    """Test infrastructure summary formatting."""
+
+    def test_full_summary(self):
+        record = _record("example.com", usage_type="DCH", isp="Hetzner", country="DE")
+        assert format_infra_summary(record) == "Hosted on DataCenter, ISP: Hetzner, Country: DE"
+
+    def test_unknown_usage_type_passthrough(self):
+        record = _record("example.com", usage_type="EDU")
+        assert format_infra_summary(record) == "Hosted on EDU"
+
+    def test_empty_record(self):
+        assert format_infra_summary(_record("example.com")) is None
+        assert format_infra_summary(None) is None
+
+
+class TestBuildInfraSummaries:
+    """Test batched infrastructure summary loading."""
+
+    def test_single_query_for_page(self):
+        """A page of domains costs one query, not one per domain."""
+        db = _mock_db([_record("a.com", usage_type="COM", country="TR")])
+
+        summaries = build_infra_summaries(["a.com", "b.com", "a.com"], db)
+
+        assert summaries == {"a.com": "Hosted on Commercial, Country: TR", "b.com": None}
+        assert db.query.call_count == 1
+
+    def test_chunks_large_domain_lists(self):
+        """Large domain lists are split into IN (...) chunks."""
+        db = _mock_db([])
+        domains = [f"d{i}.com" for i in range(INFRA_SUMMARY_CHUNK_SIZE + 1)]
+
+        summaries = build_infra_summaries(domains, db)
+
+        assert len(summaries) == len(domains)
+        assert db.query.call_count == 2
+
+    def test_no_domains_no_query(self):
+        db = _mock_db([])
+        assert build_infra_summaries([], db) == {}
+        db.query.assert_not_called()
+
+
+def _readers(asn_reader=None):
+    """Enrichment readers with only a MaxMind ASN source."""
+    return {
+        "maxmind_asn": asn_reader,
+        "maxmind_city": None,
+        "maxmind_country": None,
+        "ip2location": None,
+        "ip2proxy": None,
+    }
+
+
+def _asn_reader(known):
+    """Fake MaxMind ASN reader: known maps IP -> ASN, others raise (address not found)."""
+    reader = MagicMock()
+
+    def asn(ip):
+        if ip not in known:
+            raise ValueError(f"{ip} not found")
+        return MagicMock(autonomous_system_number=known[ip], autonomous_system_organization=f"AS{known[ip]}")
+
+    reader.asn.side_effect = asn
+    return reader
+
+
+class TestEnrichIps:
+    """Test batched IP enrichment."""
+
+    def test_maxmind_readers_memory_mapped(self):
+        """MaxMind databases are opened memory-mapped."""
+        assert _maxmind_reader_mode() in (maxminddb.MODE_MMAP, maxminddb.MODE_MMAP_EXT)
+
+    @patch("app.core.analyzer_enrichment.set_cached_ip_enrichments")
+    @patch("app.core.analyzer_enrichment.get_cached_ip_enrichments")
+    def test_dedupes_and_uses_cache(self, mock_get, mock_set):
+        """Shared IPs are looked up once; cached IPs are not looked up at all."""
+        mock_get.return_value = {"3.3.3.3": IpEnrichmentResult(asn=3).to_dict()}
+        reader = _asn_reader({"1.1.1.1": 13335})
+
+        with patch("app.core.analyzer_enrichment._enrichment_readers", return_value=_readers(reader)) as mock_readers:
+            results = enrich_ips(["1.1.1.1", "2.2.2.2", "1.1.1.1", "3.3.3.3", None])
+
+        assert list(results) == ["1.1.1.1", "2.2.2.2", "3.3.3.3"]
+        assert results["1.1.1.1"].asn_org == "AS13335"
+        assert results["2.2.2.2"] is None
+        assert results["3.3.3.3"].asn == 3
+        assert sorted(call.args[0] for call in reader.asn.call_args_list) == ["1.1.1.1", "2.2.2.2"]
+        mock_readers.assert_called_once()
+        mock_get.assert_called_once_with(["1.1.1.1", "2.2.2.2", "3.3.3.3"])
+        # Only fresh results with data are cached, in one call
+        assert list(mock_set.call_args.args[0]) == ["1.1.1.1"]
+
+    @patch("app.core.analyzer_enrichment.get_cached_ip_enrichments")
+    def test_enrich_ip_without_cache(self, mock_get):
+        """Single-IP enrichment delegates to the batch path."""
+        with patch("app.core.analyzer_enrichment._enrichment_readers", return_value=_readers(_asn_reader({"1.1.1.1": 1}))):
+            assert enrich_ip("1.1.1.1", use_cache=False).asn == 1
+            assert enrich_ip("") is None
+
+        mock_get.assert_not_called()
+
+
+class TestSaveIpEnrichments:
+    """Test batched enrichment writes."""
+
+    def test_single_upsert_per_chunk(self):
+        """Rows are written with one multi-row INSERT ... ON CONFLICT, last row per pair wins."""
+        db = MagicMock()
+        rows = [
+            ip_enrichment_row("a.com", "1.1.1.1", IpEnrichmentResult(asn=1)),
+            ip_enrichment_row("b.com", "1.1.1.1", IpEnrichmentResult(asn=1)),
+            ip_enrichment_row("a.com", "1.1.1.1", IpEnrichmentResult(asn=2)),
+        ]
+
+        with patch("app.core.lead_read_model.refresh_lead_read_model") as mock_refresh:
+            assert save_ip_enrichments(db, rows) == 2
+
+        assert db.execute.call_count == 1
+        compiled = db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (domain, ip_address) DO UPDATE" in str(compiled)
+        assert compiled.params["asn_m0"] == 2
+        assert compiled.params["domain_m1"] == "b.com"
+        assert mock_refresh.call_args.args[1] == ["a.com", "b.com"]
+        db.commit.assert_not_called()
+
+    def test_no_rows(self):
+        db = MagicMock()
+        assert save_ip_enrichments(db, []) == 0
+        db.execute.assert_not_called()
+
+
+class TestEnrichDomainsIfEnabled:
+    """Test batch enrichment for scanned domains."""
+
+    @patch("app.core.enrichment_service.save_ip_enrichments", return_value=2)
+    @patch("app.core.enrichment_service.check_enrichment_available", return_value=True)
+    @patch("app.core.enrichment_service.enrich_ips")
+    def test_one_pass_one_commit(self, mock_enrich, mock_available, mock_save):
+        """Domains sharing an IP cost one lookup; rows are saved and committed once."""
+        mock_enrich.return_value = {"1.1.1.1": IpEnrichmentResult(asn=1), "2.2.2.2": None}
+        db = MagicMock()
+
+        with patch("app.core.enrichment_service.settings.enrichment_enabled", True):
+            enriched = enrich_domains_if_enabled(
+                [("a.com", "1.1.1.1"), ("b.com", "1.1.1.1"), ("c.com", "2.2.2.2"), ("d.com", None)], db
+            )
+
+        assert sorted(enriched) == ["a.com", "b.com"]
+        assert mock_enrich.call_args.args[0] == ["1.1.1.1", "1.1.1.1", "2.2.2.2"]
+        assert [row["domain"] for row in mock_save.call_args.args[1]] == ["a.com", "b.com"]
+        db.commit.assert_called_once()
+
+    @patch("app.core.enrichment_service.enrich_ips")
+    def test_disabled(self, mock_enrich):
+        with patch("app.core.enrichment_service.settings.enrichment_enabled", False):
+            assert enrich_domains_if_enabled([("a.com", "1.1.1.1")], MagicMock()) == {}
+        mock_enrich.assert_not_called()
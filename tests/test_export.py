@@ -7,7 +7,9 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.db.models import Base, Company, DomainSignal, LeadScore
+from app.core.lead_read_model import refresh_lead_read_model
 from datetime import datetime
+from tests.conftest import override_db_dependencies
 
 # Test database URL
 # Priority: TEST_DATABASE_URL > HUNTER_DATABASE_URL > DATABASE_URL > default
@@ -60,15 +62,13 @@ def db_session():
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with test database."""
-    from app.db.session import get_db
-
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
-    app.dependency_overrides[get_db] = override_get_db
+    override_db_dependencies(app, override_get_db)
     test_client = TestClient(app)
     yield test_client
     app.dependency_overrides.clear()
@@ -137,6 +137,8 @@ def sample_leads(db_session):
     db_session.add(score1)
     db_session.add(score2)
     db_session.commit()
+    refresh_lead_read_model(db_session, ["example.com", "test.com"])
+    db_session.commit()
 
     yield
 
@@ -254,3 +256,41 @@ def test_export_leads_invalid_min_score(client, db_session):
     response = client.get("/leads/export?format=csv&min_score=150")
 
     assert response.status_code == 422  # Validation error (ge=0, le=100)
+
+
+def test_stream_csv_chunks():
+    """CSV streaming emits BOM + header first, then one block per chunk."""
+    from app.api.leads import stream_csv, EXPORT_COLUMNS
+
+    row = ["example.com", "Example, Inc"] + [""] * (len(EXPORT_COLUMNS) - 2)
+    blocks = list(stream_csv(iter([[row], [row, row]])))
+
+    assert len(blocks) == 3
+    assert blocks[0].startswith("\ufeff".encode("utf-8"))
+    assert blocks[0].decode("utf-8").lstrip("\ufeff").strip() == ",".join(EXPORT_COLUMNS)
+    content = b"".join(blocks).decode("utf-8")
+    assert content.count('"Example, Inc"') == 3
+
+
+def test_stream_csv_header_only_when_empty():
+    """CSV streaming still emits the header when there are no leads."""
+    from app.api.leads import stream_csv
+
+    content = b"".join(stream_csv(iter([]))).decode("utf-8")
+    assert content.lstrip("\ufeff").startswith("domain,")
+
+
+def test_stream_xlsx_workbook():
+    """XLSX streaming produces a workbook with header and all rows."""
+    from io import BytesIO
+    from openpyxl import load_workbook
+    from app.api.leads import stream_xlsx, EXPORT_COLUMNS
+
+    row = ["example.com"] + [""] * (len(EXPORT_COLUMNS) - 1)
+    content = b"".join(stream_xlsx(iter([[row], [row]])))
+
+    assert content[:2] == b"PK"
+    sheet = load_workbook(BytesIO(content))["Leads"]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert len(rows) == 3
@@ -224,3 +224,78 @@ class TestExcelSupport:
         for filename in csv_files:
             assert filename.lower().endswith(".csv")
             assert not filename.lower().endswith((".xlsx", ".xls"))
+
+
+class TestBulkIngestPipeline:
+    """Test vectorised CSV preparation and bulk company upsert."""
+
+    def test_prepare_ingest_frame_resolves_and_validates(self):
+        """Test domain precedence (website > email > domain) and row errors."""
+        from app.core.importer import prepare_ingest_frame
+
+        df = pd.DataFrame(
+            {
+                "domain": ["WWW.Example.com", None, "not a domain", "a.com"],
+                "company_name": ["Example", "Empty", "Bad", None],
+                "email": ["user@mail.example.com", None, None, "x@b.com"],
+                "website": [None, None, None, "https://www.c.com/path"],
+            }
+        )
+
+        prepared, errors = prepare_ingest_frame(df)
+
+        assert list(prepared["domain"]) == ["mail.example.com", "c.com"]
+        assert list(prepared["original_domain"]) == ["WWW.Example.com", "a.com"]
+        assert list(prepared["row_index"]) == [0, 3]
+        assert prepared["company_name"].iloc[1] is None
+        assert errors == [
+            "Satır 2: Boş domain",
+            "Satır 3: Geçersiz domain formatı 'not a domain'",
+        ]
+
+    def test_prepare_ingest_frame_without_optional_columns(self):
+        """Test preparation with only the domain column."""
+        from app.core.importer import prepare_ingest_frame
+
+        prepared, errors = prepare_ingest_frame(
+            pd.DataFrame({"domain": ["example.com", "example.com"]})
+        )
+
+        assert list(prepared["domain"]) == ["example.com", "example.com"]
+        assert prepared["email"].isna().all()
+        assert errors == []
+
+    def test_bulk_upsert_companies_dedupes_and_chunks(self):
+        """Test one statement per chunk and last non-empty name wins."""
+        from unittest.mock import MagicMock, patch
+        from sqlalchemy.dialects import postgresql
+        from app.core.merger import bulk_upsert_companies
+
+        db = MagicMock()
+        rows = [
+            {"domain": "a.com", "company_name": "A v1"},
+            {"domain": "b.com", "company_name": None},
+            {"domain": "a.com", "company_name": None},
+            {"domain": "c.com", "company_name": "C"},
+            {"domain": "a.com", "company_name": "A v2"},
+        ]
+
+        with patch("app.core.merger.refresh_lead_read_model") as mock_refresh:
+            count = bulk_upsert_companies(db, rows, chunk_size=1)
+
+        assert count == 3
+        # Only renamed companies can change existing read model rows
+        assert mock_refresh.call_args.args[:2] == (db, ["a.com", "c.com"])
+        statements = [
+            str(call.args[0].compile(dialect=postgresql.dialect()))
+            for call in db.execute.call_args_list
+        ]
+        # 2 named rows (DO UPDATE) + 1 unnamed row (DO NOTHING), 1 row per chunk
+        assert len(statements) == 3
+        assert sum("DO UPDATE" in sql for sql in statements) == 2
+        assert sum("DO NOTHING" in sql for sql in statements) == 1
+        params = db.execute.call_args_list[0].args[0].compile(
+            dialect=postgresql.dialect()
+        ).params
+        assert params["canonical_name_m0"] == "A v2"
+        db.commit.assert_not_called()
@@ -8,8 +8,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
 
 from app.db.models import Base, Company, DomainSignal, LeadScore
+from app.core.lead_read_model import refresh_lead_read_model
 from app.main import app
-from app.db.session import get_db
+from tests.conftest import override_db_dependencies
 
 # Test database URL
 TEST_DATABASE_URL = os.getenv(
@@ -90,7 +91,7 @@ def client(db_session):
         finally:
             pass
 
-    app.dependency_overrides[get_db] = override_get_db
+    override_db_dependencies(app, override_get_db)
     test_client = TestClient(app)
     yield test_client
     app.dependency_overrides.clear()
@@ -136,6 +137,8 @@ def test_leads(db_session):
         )
         db_session.add(lead_score)
 
+    db_session.commit()
+    refresh_lead_read_model(db_session, [domain for domain, *_ in test_domains])
     db_session.commit()
     return test_domains
 
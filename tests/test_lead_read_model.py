@@ -0,0 +1,89 @@
+"""Tests for the materialised lead read model (lead_read_model table)."""
+
+from unittest.mock import MagicMock, patch
+
+from app.core.lead_read_model import (
+    build_refresh_query,
+    fetch_lead_row,
+    refresh_lead_read_model,
+)
+
+
+class TestRefreshLeadReadModel:
+    """Test the set-based refresh of lead_read_model rows."""
+
+    def test_refresh_query_shape(self):
+        """Test refresh is one INSERT ... SELECT ... ON CONFLICT over the source tables."""
+        sql = build_refresh_query()
+
+        assert "INSERT INTO lead_read_model" in sql
+        assert "JOIN lead_scores ls ON ls.domain = c.domain" in sql
+        assert "LEFT JOIN domain_signals ds ON ds.domain = c.domain" in sql
+        assert "c.domain = ANY(:domains)" in sql
+        assert "ON CONFLICT (domain) DO UPDATE" in sql
+        assert "priority_score = EXCLUDED.priority_score" in sql
+        assert "DISTINCT ON" not in sql
+
+    @patch("app.core.lead_read_model.build_infra_summaries")
+    def test_refresh_passes_infra_summaries(self, mock_summaries):
+        """Test infra summaries are bound as parallel arrays (domains without data omitted)."""
+        mock_summaries.return_value = {"a.com": "Hosted on DataCenter", "b.com": None}
+        db = MagicMock()
+
+        count = refresh_lead_read_model(db, ["b.com", "a.com", "a.com", ""])
+
+        assert count == 2
+        # One UPSERT + one cleanup DELETE
+        assert db.execute.call_count == 2
+        params = db.execute.call_args_list[0].args[1]
+        assert params["domains"] == ["a.com", "b.com"]
+        assert params["infra_domains"] == ["a.com"]
+        assert params["infra_summaries"] == ["Hosted on DataCenter"]
+        assert "DELETE FROM lead_read_model" in str(db.execute.call_args_list[1].args[0])
+        db.commit.assert_not_called()
+
+    @patch("app.core.lead_read_model.build_infra_summaries", return_value={})
+    def test_refresh_chunked(self, mock_summaries):
+        """Test one statement pair per chunk."""
+        db = MagicMock()
+
+        refresh_lead_read_model(db, ["a.com", "b.com", "c.com"], chunk_size=2)
+
+        assert db.execute.call_count == 4
+        assert db.execute.call_args_list[2].args[1]["domains"] == ["c.com"]
+
+    def test_refresh_empty(self):
+        """Test nothing is executed without domains."""
+        db = MagicMock()
+
+        assert refresh_lead_read_model(db, []) == 0
+        db.execute.assert_not_called()
+
+
+class TestFetchLeadRow:
+    """Test single-lead lookups."""
+
+    def test_row_found(self):
+        """Test a read model hit needs no companies lookup."""
+        db = MagicMock()
+        row = MagicMock()
+        db.execute.return_value.fetchone.return_value = row
+
+        assert fetch_lead_row(db, "example.com") == (row, True)
+        assert db.execute.call_count == 1
+
+    def test_not_scanned(self):
+        """Test an existing company without a read model row is reported as not scanned."""
+        db = MagicMock()
+        db.execute.return_value.fetchone.return_value = None
+        db.execute.return_value.first.return_value = (1,)
+
+        assert fetch_lead_row(db, "example.com") == (None, True)
+
+    def test_not_found(self):
+        """Test unknown domains."""
+        db = MagicMock()
+        db.execute.return_value.fetchone.return_value = None
+        db.execute.return_value.first.return_value = None
+
+        assert fetch_lead_row(db, "example.com") == (None, False)
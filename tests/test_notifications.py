@@ -9,9 +9,12 @@ from datetime import datetime
 from app.db.models import Alert, AlertConfig, Company
 from app.db.session import SessionLocal
 from app.core.notifications import (
+    NO_NOTIFICATION,
+    dispatch_alerts,
     send_webhook_notification,
     send_email_notification,
     process_pending_alerts,
+    update_alert_statuses,
 )
 
 
@@ -415,3 +418,103 @@ class TestProcessPendingAlerts:
             assert alert1.status == "sent"  # Has config
             assert alert2.status == "sent"  # No config, marked as sent
             mock_webhook.assert_called_once()  # Only for alert1
+
+
+def _alert(alert_id, alert_type="mx_changed"):
+    return MagicMock(id=alert_id, alert_type=alert_type, domain=f"d{alert_id}.com")
+
+
+def _config(method, target, user_id="default"):
+    if method == "webhook":
+        return AlertConfig(
+            user_id=user_id, alert_type="mx_changed", notification_method="webhook", webhook_url=target
+        )
+    return AlertConfig(
+        user_id=user_id, alert_type="mx_changed", notification_method="email", email_address=target
+    )
+
+
+class TestDispatchAlerts:
+    """Tests for the batched dispatcher (no database)."""
+
+    def test_no_config_marks_sent(self):
+        """Test alerts without an enabled config need no notification."""
+        outcomes = asyncio.run(dispatch_alerts([_alert(1, "dmarc_added")], {}, MagicMock()))
+
+        assert outcomes == {1: NO_NOTIFICATION}
+
+    def test_every_users_config_notified(self):
+        """Test one user's successful delivery does not stop another user's notification."""
+        configs = {
+            "mx_changed": [
+                _config("webhook", "https://hooks/alice", user_id="alice"),
+                _config("email", "bob@example.com", user_id="bob"),
+            ]
+        }
+        client = MagicMock()
+
+        async def fake_webhook(url, alert, client=None):
+            return alert.id == 1
+
+        with patch("app.core.notifications.send_webhook_notification", side_effect=fake_webhook) as mock_webhook, \
+             patch("app.core.notifications.send_email_notification", AsyncMock(return_value=True)) as mock_email:
+            outcomes = asyncio.run(dispatch_alerts([_alert(1), _alert(2)], configs, client))
+
+        # Both users are notified of both alerts
+        assert sorted(call.args[1].id for call in mock_webhook.call_args_list) == [1, 2]
+        assert sorted(call.args[1].id for call in mock_email.call_args_list) == [1, 2]
+        assert outcomes == {1: "email", 2: "email"}
+
+    def test_all_configs_failed(self):
+        """Test an alert is only failed when no config delivered it."""
+        configs = {
+            "mx_changed": [
+                _config("webhook", "https://hooks/alice", user_id="alice"),
+                _config("email", "bob@example.com", user_id="bob"),
+            ]
+        }
+
+        with patch("app.core.notifications.send_webhook_notification", AsyncMock(return_value=True)), \
+             patch("app.core.notifications.send_email_notification", AsyncMock(return_value=False)):
+            assert asyncio.run(dispatch_alerts([_alert(1)], configs, MagicMock())) == {1: "webhook"}
+
+        with patch("app.core.notifications.send_webhook_notification", AsyncMock(return_value=False)), \
+             patch("app.core.notifications.send_email_notification", AsyncMock(return_value=False)):
+            assert asyncio.run(dispatch_alerts([_alert(1)], configs, MagicMock())) == {1: None}
+
+    def test_shared_client_and_per_target_cap(self):
+        """Test sends share one client and respect the per-target concurrency cap."""
+        configs = {"mx_changed": [_config("webhook", "https://hooks/a")]}
+        client = MagicMock()
+        in_flight = {"now": 0, "max": 0}
+
+        async def fake_webhook(url, alert, client=None):
+            assert client is not None
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0)
+            in_flight["now"] -= 1
+            return True
+
+        with patch("app.core.notifications.send_webhook_notification", side_effect=fake_webhook), \
+             patch("app.core.notifications.NOTIFICATION_PER_TARGET_CONCURRENCY", 3):
+            outcomes = asyncio.run(dispatch_alerts([_alert(i) for i in range(20)], configs, client))
+
+        assert set(outcomes.values()) == {"webhook"}
+        assert in_flight["max"] == 3
+
+
+class TestUpdateAlertStatuses:
+    """Tests for bulk status updates."""
+
+    def test_one_update_per_outcome_group(self):
+        """Test statuses are written with one UPDATE per (status, method) group."""
+        db = MagicMock()
+
+        update_alert_statuses(db, {1: "webhook", 2: "webhook", 3: None, 4: NO_NOTIFICATION})
+
+        statements = [str(call.args[0]) for call in db.execute.call_args_list]
+        assert len(statements) == 3
+        assert all(sql.startswith("UPDATE alerts SET") for sql in statements)
+        assert sum("notification_method" in sql for sql in statements) == 1
+        db.commit.assert_not_called()
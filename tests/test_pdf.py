@@ -5,6 +5,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app.main import app
 from app.db.models import Company, DomainSignal, LeadScore
+from app.core.lead_read_model import refresh_lead_read_model
 from app.db.session import SessionLocal
 
 
@@ -53,6 +54,8 @@ def test_domain(db: Session):
     )
     db.add(score)
 
+    db.commit()
+    refresh_lead_read_model(db, [domain])
     db.commit()
     return domain
 
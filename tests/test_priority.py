@@ -1,7 +1,9 @@
 """Tests for priority score calculation."""
 
+import sqlite3
+
 import pytest
-from app.core.priority import calculate_priority_score
+from app.core.priority import calculate_priority_score, priority_score_sql
 
 
 class TestPriorityScore:
@@ -74,3 +76,25 @@ class TestPriorityScore:
         """Test unknown segment (should return 7)."""
         assert calculate_priority_score("Unknown", 80) == 7
         assert calculate_priority_score("", 80) == 7
+
+
+class TestPriorityScoreSQL:
+    """Test SQL priority expression parity with calculate_priority_score."""
+
+    def test_sql_expression_matches_python(self):
+        """SQL CASE expression returns the same priority for every segment/score."""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE leads (segment TEXT, readiness_score INTEGER)")
+        segments = ["Migration", "Existing", "Cold", "Skip", "Unknown", "", " Migration ", None]
+        scores = list(range(0, 101)) + [None]
+        rows = [(segment, score) for segment in segments for score in scores]
+        conn.executemany("INSERT INTO leads VALUES (?, ?)", rows)
+
+        results = conn.execute(
+            f"SELECT segment, readiness_score, {priority_score_sql()} FROM leads"
+        ).fetchall()
+        conn.close()
+
+        assert len(results) == len(rows)
+        for segment, score, priority in results:
+            assert priority == calculate_priority_score(segment, score), (segment, score)
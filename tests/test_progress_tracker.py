@@ -4,7 +4,7 @@ import pytest
 import json
 import sys
 from datetime import datetime
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch, MagicMock
 
 # Mock redis module before importing progress_tracker
 mock_redis_module = MagicMock()
@@ -17,28 +17,99 @@ sys.modules["redis"] = mock_redis_module
 from app.core.progress_tracker import ProgressTracker, get_progress_tracker
 
 
+class FakeRedis:
+    """Minimal in-memory Redis (strings, hashes, lists, pipelines) for tracker tests."""
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def setex(self, key, ttl, value):
+        self.commands.append("setex")
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def expire(self, key, ttl):
+        return key in self.data
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        self.commands.append("hset")
+        h = self.data.setdefault(key, {})
+        if field is not None:
+            h[field] = str(value)
+        for k, v in (mapping or {}).items():
+            h[k] = str(v)
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hincrby(self, key, field, amount):
+        self.commands.append("hincrby")
+        h = self.data.setdefault(key, {})
+        h[field] = str(int(h.get(field, 0)) + amount)
+        return int(h[field])
+
+    def rpush(self, key, *values):
+        self.commands.append("rpush")
+        self.data.setdefault(key, []).extend(values)
+
+    def ltrim(self, key, start, end):
+        items = self.data.get(key, [])
+        n = len(items)
+        start = max(n + start, 0) if start < 0 else start
+        end = n + end if end < 0 else end
+        self.data[key] = items[start : end + 1]
+
+    def lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        n = len(items)
+        start = max(n + start, 0) if start < 0 else start
+        end = n + end if end < 0 else end
+        return items[start : end + 1]
+
+
+class FakePipeline:
+    """Queues commands and runs them on execute() (like a MULTI/EXEC pipeline)."""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        self.redis_client.commands.append("execute")
+        return [getattr(self.redis_client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
 class TestProgressTracker:
     """Test progress tracker functionality."""
 
     @pytest.fixture
-    def mock_redis(self):
-        """Create a mock Redis client."""
-        redis_mock = Mock()
-        redis_mock.get.return_value = None
-        redis_mock.setex.return_value = None
-        redis_mock.hset.return_value = None
-        redis_mock.hgetall.return_value = {}
-        redis_mock.expire.return_value = None
-        return redis_mock
+    def fake_redis(self):
+        """Create an in-memory Redis."""
+        return FakeRedis()
 
     @pytest.fixture
-    def tracker(self, mock_redis):
-        """Create a progress tracker with mocked Redis."""
+    def tracker(self, fake_redis):
+        """Create a progress tracker with in-memory Redis."""
         tracker = ProgressTracker()
-        tracker.redis_client = mock_redis
+        tracker.redis_client = fake_redis
         return tracker
 
-    def test_create_job(self, tracker, mock_redis):
+    def test_create_job(self, tracker, fake_redis):
         """Test job creation."""
         domain_list = ["example.com", "google.com"]
         job_id = tracker.create_job(domain_list)
@@ -47,16 +118,13 @@ class TestProgressTracker:
         assert job_id is not None
         assert isinstance(job_id, str)
 
-        # Should call setex twice (job data + domain list)
-        assert mock_redis.setex.call_count == 2
-
-        # Check job data structure
-        # setex(key, ttl, value) - so args are: (key, ttl, value)
-        call_args = mock_redis.setex.call_args_list[0]
-        job_key = call_args[0][0]
-        job_data = json.loads(call_args[0][2])  # value is 3rd argument
+        # State hash + domain list written in one round trip
+        assert fake_redis.commands.count("execute") == 1
+        state_key = f"bulk_scan:job:{job_id}:state"
+        assert state_key in fake_redis.data
+        assert json.loads(fake_redis.data[f"bulk_scan:job:{job_id}:domains"]) == domain_list
 
-        assert job_key.startswith("bulk_scan:job:")
+        job_data = tracker.get_job(job_id)
         assert job_data["status"] == "pending"
         assert job_data["total"] == 2
         assert job_data["processed"] == 0
@@ -64,139 +132,147 @@ class TestProgressTracker:
         assert job_data["failed"] == 0
         assert job_data["errors"] == []
 
-    def test_get_job_not_found(self, tracker, mock_redis):
+    def test_get_job_not_found(self, tracker):
         """Test getting non-existent job."""
-        mock_redis.get.return_value = None
         result = tracker.get_job("nonexistent")
         assert result is None
 
-    def test_get_job_found(self, tracker, mock_redis):
+    def test_get_job_found(self, tracker, fake_redis):
         """Test getting existing job."""
-        job_data = {
+        fake_redis.data["bulk_scan:job:test-job:state"] = {
             "job_id": "test-job",
             "status": "running",
-            "total": 10,
-            "processed": 5,
-            "succeeded": 4,
-            "failed": 1,
-            "errors": [],
+            "total": "10",
+            "processed": "5",
+            "succeeded": "4",
+            "failed": "1",
         }
-        mock_redis.get.return_value = json.dumps(job_data)
 
         result = tracker.get_job("test-job")
         assert result is not None
         assert result["status"] == "running"
         assert result["total"] == 10
         assert result["processed"] == 5
+        assert result["progress"] == 50
 
-    def test_update_progress(self, tracker, mock_redis):
+    def test_update_progress(self, tracker):
         """Test progress update."""
-        # Setup existing job
-        job_data = {
-            "job_id": "test-job",
-            "status": "running",
-            "total": 10,
-            "processed": 0,
-            "succeeded": 0,
-            "failed": 0,
-            "errors": [],
-        }
-        mock_redis.get.return_value = json.dumps(job_data)
+        job_id = tracker.create_job(["d%d.com" % i for i in range(10)])
 
         # Update progress
-        tracker.update_progress("test-job", 5, 4, 1, None)
-
-        # Should call setex to update job
-        assert mock_redis.setex.call_count > 0
+        tracker.update_progress(job_id, 5, 4, 1, None)
 
-        # Check updated data
-        call_args = mock_redis.setex.call_args
-        updated_job = json.loads(call_args[0][2])  # value is 3rd argument
+        updated_job = tracker.get_job(job_id)
         assert updated_job["processed"] == 5
         assert updated_job["succeeded"] == 4
         assert updated_job["failed"] == 1
         assert updated_job["progress"] == 50  # 5/10 * 100
 
-    def test_update_progress_with_error(self, tracker, mock_redis):
+    def test_update_progress_with_error(self, tracker):
         """Test progress update with error."""
-        # Setup existing job
-        job_data = {
-            "job_id": "test-job",
-            "status": "running",
-            "total": 10,
-            "processed": 0,
-            "succeeded": 0,
-            "failed": 0,
-            "errors": [],
-        }
-        mock_redis.get.return_value = json.dumps(job_data)
+        job_id = tracker.create_job(["d%d.com" % i for i in range(10)])
 
         # Update progress with error
         error = {"domain": "example.com", "error": "Test error", "timestamp": None}
-        tracker.update_progress("test-job", 1, 0, 1, error)
+        tracker.update_progress(job_id, 1, 0, 1, error)
 
         # Check error was added
-        call_args = mock_redis.setex.call_args
-        updated_job = json.loads(call_args[0][2])  # value is 3rd argument
+        updated_job = tracker.get_job(job_id)
         assert len(updated_job["errors"]) == 1
         assert updated_job["errors"][0]["domain"] == "example.com"
         assert updated_job["errors"][0]["error"] == "Test error"
         assert updated_job["errors"][0]["timestamp"] is not None  # Should be set
 
-    def test_set_status(self, tracker, mock_redis):
+    def test_increment_progress_accumulates(self, tracker, fake_redis):
+        """Test increments from several writers add up (HINCRBY, no lost updates)."""
+        job_id = tracker.create_job(["d%d.com" % i for i in range(10)])
+        fake_redis.commands.clear()
+
+        tracker.increment_progress(job_id, processed=3, succeeded=2, failed=1,
+                                   errors=[{"domain": "a.com", "error": "x"}])
+        tracker.increment_progress(job_id, processed=4, succeeded=4)
+
+        # One round trip per update, state never read back
+        assert fake_redis.commands.count("execute") == 2
+        assert "setex" not in fake_redis.commands
+
+        job = tracker.get_job(job_id)
+        assert job["processed"] == 7
+        assert job["succeeded"] == 6
+        assert job["failed"] == 1
+        assert job["progress"] == 70
+        assert [e["domain"] for e in job["errors"]] == ["a.com"]
+
+    def test_errors_capped_and_limited(self, tracker):
+        """Test the error list keeps only the most recent errors."""
+        tracker.max_errors = 5
+        job_id = tracker.create_job(["example.com"])
+
+        tracker.increment_progress(
+            job_id,
+            failed=8,
+            errors=[{"domain": f"d{i}.com", "error": "x"} for i in range(8)],
+        )
+
+        job = tracker.get_job(job_id)
+        assert job["failed"] == 8
+        assert [e["domain"] for e in job["errors"]] == [f"d{i}.com" for i in range(3, 8)]
+        assert [e["domain"] for e in tracker.get_job(job_id, max_errors=2)["errors"]] == ["d6.com", "d7.com"]
+        assert tracker.get_job(job_id, max_errors=0)["errors"] == []
+
+    def test_set_status(self, tracker):
         """Test status update."""
-        # Setup existing job
-        job_data = {
-            "job_id": "test-job",
-            "status": "running",
-            "total": 10,
-            "processed": 0,
-            "succeeded": 0,
-            "failed": 0,
-            "errors": [],
-        }
-        mock_redis.get.return_value = json.dumps(job_data)
+        job_id = tracker.create_job(["example.com"])
 
         # Set status to completed
-        tracker.set_status("test-job", "completed")
+        tracker.set_status(job_id, "completed")
 
         # Check status was updated
-        call_args = mock_redis.setex.call_args
-        updated_job = json.loads(call_args[0][2])  # value is 3rd argument
-        assert updated_job["status"] == "completed"
+        assert tracker.get_job(job_id)["status"] == "completed"
 
-    def test_store_result(self, tracker, mock_redis):
+    def test_set_status_missing_job(self, tracker, fake_redis):
+        """Test status update for an expired job does not recreate it."""
+        tracker.set_status("missing", "completed")
+
+        assert fake_redis.data == {}
+
+    def test_store_result(self, tracker, fake_redis):
         """Test storing scan result."""
         result = {"domain": "example.com", "score": 75, "segment": "Migration"}
 
         tracker.store_result("test-job", "example.com", result)
 
-        # Should call hset to store result
-        mock_redis.hset.assert_called_once()
-        call_args = mock_redis.hset.call_args
-        assert call_args[0][0].endswith(":results")
-        assert call_args[0][1] == "example.com"
-        stored_result = json.loads(call_args[0][2])
+        stored = fake_redis.data["bulk_scan:job:test-job:results"]
+        stored_result = json.loads(stored["example.com"])
         assert stored_result["domain"] == "example.com"
         assert stored_result["score"] == 75
 
-    def test_get_results(self, tracker, mock_redis):
+    def test_store_results_batch(self, tracker, fake_redis):
+        """Test storing a batch of results in one round trip."""
+        tracker.store_results(
+            "test-job",
+            {"a.com": {"domain": "a.com", "score": 1}, "b.com": {"domain": "b.com", "score": 2}},
+        )
+
+        assert fake_redis.commands.count("execute") == 1
+        assert len(tracker.get_results("test-job")) == 2
+
+    def test_get_results(self, tracker, fake_redis):
         """Test getting scan results."""
-        results = {
+        fake_redis.data["bulk_scan:job:test-job:results"] = {
             "example.com": json.dumps({"domain": "example.com", "score": 75}),
             "google.com": json.dumps({"domain": "google.com", "score": 80}),
         }
-        mock_redis.hgetall.return_value = results
 
         results_list = tracker.get_results("test-job")
 
         assert len(results_list) == 2
         assert results_list[0]["domain"] in ["example.com", "google.com"]
 
-    def test_get_domain_list(self, tracker, mock_redis):
+    def test_get_domain_list(self, tracker, fake_redis):
         """Test getting domain list."""
         domain_list = ["example.com", "google.com"]
-        mock_redis.get.return_value = json.dumps(domain_list)
+        fake_redis.data["bulk_scan:job:test-job:domains"] = json.dumps(domain_list)
 
         result = tracker.get_domain_list("test-job")
 
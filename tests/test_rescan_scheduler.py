@@ -0,0 +1,197 @@
+"""Tests for the resumable daily rescan scheduler (G18)."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import RescanRun
+from app.core.rescan_scheduler import (
+    RESCAN_MIN_AGE_HOURS,
+    RESCAN_RUN_STALL_SECONDS,
+    build_chunk_query,
+    build_snapshot_query,
+    claim_rescan_run,
+    holds_rescan_run,
+    next_rescan_chunk,
+    record_rescan_chunk,
+    snapshot_rescan_candidates,
+    start_or_resume_run,
+)
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+def _run(**overrides):
+    values = {"as_of": NOW, "status": "running", "budget": 250, "processed": 0, "updated_at": NOW}
+    values.update(overrides)
+    return RescanRun(**values)
+
+
+class TestCandidateRanking:
+    """Test the per-run ranking snapshot and its keyset-paged chunks."""
+
+    def test_snapshot_query_shape(self):
+        """Test ranking terms and ordering of the once-per-run snapshot."""
+        sql = build_snapshot_query()
+
+        assert "INSERT INTO rescan_run_candidates (run_id, domain, staleness)" in sql
+        assert "EXTRACT(EPOCH FROM (:as_of - ds.scanned_at))" in sql
+        assert "ds.expires_at < :expiry_until" in sql
+        assert "FROM signal_change_history h" in sql
+        assert "ds.scanned_at < :stale_before" in sql
+        assert "ORDER BY staleness DESC, domain" in sql
+
+    def test_snapshot_keeps_budget_and_drops_old_runs(self):
+        """Test a new run stores its budget of candidates and older snapshots are removed."""
+        db = MagicMock()
+        db.execute.return_value.rowcount = 250
+
+        assert snapshot_rescan_candidates(db, _run(id=3)) == 250
+
+        delete, insert = db.execute.call_args_list
+        assert "DELETE FROM rescan_run_candidates WHERE run_id <> :run_id" in str(delete.args[0])
+        assert delete.args[1] == {"run_id": 3}
+        params = insert.args[1]
+        assert (params["run_id"], params["limit"]) == (3, 250)
+        assert params["stale_before"] == NOW - timedelta(hours=RESCAN_MIN_AGE_HOURS)
+
+    def test_chunks_page_the_snapshot(self):
+        """Test chunks read the snapshot instead of re-ranking domain_signals."""
+        sql = build_chunk_query(with_cursor=False)
+
+        assert "FROM rescan_run_candidates c" in sql
+        assert "ORDER BY c.staleness DESC, c.domain" in sql
+        assert "signal_change_history" not in sql
+        assert ":cursor_domain" not in sql
+
+    def test_first_chunk_has_no_cursor(self):
+        """Test the first chunk of a run starts from the top of the snapshot."""
+        db = MagicMock()
+
+        next_rescan_chunk(db, _run(id=3), 100)
+
+        sql, params = str(db.execute.call_args.args[0]), db.execute.call_args.args[1]
+        assert ":cursor_staleness" not in sql
+        assert params == {"run_id": 3, "as_of": NOW, "limit": 100}
+
+    def test_resumes_after_cursor(self):
+        """Test later chunks continue after the checkpointed (staleness, domain)."""
+        db = MagicMock()
+
+        next_rescan_chunk(db, _run(id=3, cursor_staleness=30.5, cursor_domain="b.com"), 50)
+
+        sql, params = str(db.execute.call_args.args[0]), db.execute.call_args.args[1]
+        assert "c.staleness < :cursor_staleness" in sql
+        assert params["cursor_staleness"] == 30.5
+        assert params["cursor_domain"] == "b.com"
+
+
+class TestCheckpoint:
+    """Test checkpoint updates and run lifecycle."""
+
+    def test_record_chunk_advances_cursor(self):
+        """Test the cursor moves to the last rescanned row."""
+        run = _run()
+        rows = [MagicMock(domain="a.com", staleness=90.0), MagicMock(domain="b.com", staleness=40.0)]
+
+        record_rescan_chunk(run, rows)
+
+        assert (run.processed, run.cursor_staleness, run.cursor_domain) == (2, 40.0, "b.com")
+        assert run.status == "running"
+
+    def test_record_chunk_completes_at_budget(self):
+        """Test a run is completed once its budget is spent."""
+        run = _run(budget=2)
+
+        record_rescan_chunk(run, [MagicMock(domain="a.com", staleness=1.0)] * 2)
+
+        assert run.status == "completed"
+        assert run.completed_at is not None
+
+    @patch("app.core.rescan_scheduler._latest_run", return_value=None)
+    def test_starts_first_run(self, _):
+        """Test a run is started when none exists."""
+        db = MagicMock()
+
+        with patch("app.core.rescan_scheduler.snapshot_rescan_candidates") as mock_snapshot:
+            run, action = start_or_resume_run(db, budget=500, now=NOW)
+
+        assert action == "started"
+        assert (run.as_of, run.budget, run.processed) == (NOW, 500, 0)
+        db.add.assert_called_once_with(run)
+        mock_snapshot.assert_called_once_with(db, run)
+
+    def test_resumes_stalled_run(self):
+        """Test a running run without a recent checkpoint is claimed and resumed."""
+        stalled = _run(updated_at=NOW - timedelta(seconds=RESCAN_RUN_STALL_SECONDS + 1))
+        db = MagicMock()
+        db.execute.return_value.rowcount = 1
+        with patch("app.core.rescan_scheduler._latest_run", return_value=stalled):
+            run, action = start_or_resume_run(db, budget=500, now=NOW + timedelta(seconds=1))
+
+        assert (run, action) == (stalled, "resumed")
+        assert run.updated_at == NOW + timedelta(seconds=1)
+
+    def test_stalled_run_claimed_elsewhere(self):
+        """Test a stalled run touched by someone else since loading is not resumed twice."""
+        stalled = _run(updated_at=NOW - timedelta(seconds=RESCAN_RUN_STALL_SECONDS + 1))
+        db = MagicMock()
+        db.execute.return_value.rowcount = 0
+        with patch("app.core.rescan_scheduler._latest_run", return_value=stalled):
+            assert start_or_resume_run(db, budget=500, now=NOW)[1] == "running"
+
+
+class TestLease:
+    """Test run claims (compare-and-set on updated_at) and lease checks."""
+
+    def test_claim_is_compare_and_set(self):
+        """Test the claim only matches the run as loaded (same updated_at, still running)."""
+        run = _run(id=5)
+        db = MagicMock()
+        db.execute.return_value.rowcount = 1
+
+        assert claim_rescan_run(db, run, now=NOW + timedelta(minutes=1)) is True
+
+        compiled = db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "WHERE rescan_runs.id = %(id_1)s AND rescan_runs.status = %(status_1)s" in str(compiled)
+        assert compiled.params["updated_at_1"] == NOW
+        assert compiled.params["updated_at"] == NOW + timedelta(minutes=1)
+        assert run.updated_at == NOW + timedelta(minutes=1)
+
+    def test_lost_claim_keeps_run(self):
+        run = _run(id=5)
+        db = MagicMock()
+        db.execute.return_value.rowcount = 0
+
+        assert claim_rescan_run(db, run, now=NOW + timedelta(minutes=1)) is False
+        assert run.updated_at == NOW
+
+    def test_holds_locks_and_compares_lease(self):
+        """Test the lease check locks the row and fails once the run moved on."""
+        run = _run(id=5)
+        db = MagicMock()
+
+        assert holds_rescan_run(db, run, NOW) is True
+        db.refresh.assert_called_once_with(run, with_for_update=True)
+        assert holds_rescan_run(db, run, NOW - timedelta(seconds=1)) is False
+        run.status = "abandoned"
+        assert holds_rescan_run(db, run, NOW) is False
+
+    def test_active_or_finished_run_left_alone(self):
+        """Test healthy and finished runs of the day are not restarted."""
+        db = MagicMock()
+        with patch("app.core.rescan_scheduler._latest_run", return_value=_run()):
+            assert start_or_resume_run(db, 500, now=NOW + timedelta(minutes=5))[1] == "running"
+        with patch("app.core.rescan_scheduler._latest_run", return_value=_run(status="completed")):
+            assert start_or_resume_run(db, 500, now=NOW + timedelta(hours=3))[1] == "done"
+        db.add.assert_not_called()
+
+    def test_next_day_abandons_unfinished_run(self):
+        """Test an unfinished run from the previous day is abandoned for a new one."""
+        old = _run(as_of=NOW - timedelta(days=1))
+        with patch("app.core.rescan_scheduler._latest_run", return_value=old):
+            run, action = start_or_resume_run(MagicMock(), 500, now=NOW)
+
+        assert action == "started"
+        assert old.status == "abandoned"
+        assert run is not old
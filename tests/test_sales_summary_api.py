@@ -10,7 +10,7 @@ from sqlalchemy.exc import OperationalError
 
 from app.db.models import Base, Company, DomainSignal, LeadScore
 from app.main import app
-from app.db.session import get_db
+from tests.conftest import override_db_dependencies
 
 # Test database URL
 TEST_DATABASE_URL = os.getenv(
@@ -101,7 +101,7 @@ def client(db_session):
         finally:
             pass
 
-    app.dependency_overrides[get_db] = override_get_db
+    override_db_dependencies(app, override_get_db)
     test_client = TestClient(app)
     yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,122 @@
+"""Tests for batched scan result persistence (domain_signals / lead_scores UPSERT)."""
+
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from app.core.scan_persistence import (
+    domain_signal_row,
+    lead_score_row,
+    upsert_scan_results,
+)
+
+
+def _compile(call):
+    return call.args[0].compile(dialect=postgresql.dialect())
+
+
+class TestRowBuilders:
+    """Test row construction from analyzer results."""
+
+    def test_domain_signal_row(self):
+        """Test domain_signals row from DNS + WHOIS results."""
+        row = domain_signal_row(
+            "example.com",
+            {"spf": True, "dkim": False, "dmarc_policy": "reject", "dmarc_coverage": 50, "mx_root": "outlook.com"},
+            {"registrar": "Reg", "expires_at": None, "nameservers": ["ns1.example.com"]},
+            "success",
+            local_provider=None,
+        )
+
+        assert row["domain"] == "example.com"
+        assert row["mx_root"] == "outlook.com"
+        assert row["dmarc_coverage"] == 50
+        assert row["registrar"] == "Reg"
+        assert row["scan_status"] == "success"
+
+    def test_domain_signal_row_without_whois(self):
+        """Test WHOIS columns are None when WHOIS failed."""
+        row = domain_signal_row("example.com", {}, None, "whois_failed")
+
+        assert row["spf"] is False
+        assert row["registrar"] is None
+        assert row["nameservers"] is None
+
+    def test_lead_score_row(self):
+        """Test lead_scores row from a scoring result."""
+        row = lead_score_row(
+            "example.com",
+            {"score": 80, "segment": "Migration", "reason": "r", "priority_category": "P1"},
+        )
+
+        assert row["readiness_score"] == 80
+        assert row["segment"] == "Migration"
+        assert row["priority_category"] == "P1"
+        assert row["technical_heat"] is None
+
+
+class TestUpsertScanResults:
+    """Test the batched UPSERT statements."""
+
+    @patch("app.core.scan_persistence.apply_score_bucket_deltas")
+    @patch("app.core.scan_persistence.load_score_buckets", return_value={"a.com": ("Migration", 80)})
+    @patch("app.core.scan_persistence.refresh_lead_read_model")
+    def test_one_upsert_per_table(self, mock_refresh, mock_load, mock_apply):
+        """Test a batch is written with one INSERT ... ON CONFLICT per table."""
+        db = MagicMock()
+        db.identity_map.values.return_value = []
+        signals = [domain_signal_row(d, {}, None, "success") for d in ["b.com", "a.com"]]
+        scores = [lead_score_row(d, {"score": 1, "segment": "Cold", "reason": ""}) for d in ["b.com", "a.com"]]
+
+        count = upsert_scan_results(db, signals, scores)
+
+        assert count == 2
+        assert db.execute.call_count == 2
+        signal_sql = str(_compile(db.execute.call_args_list[0]))
+        score_sql = str(_compile(db.execute.call_args_list[1]))
+        assert "INSERT INTO domain_signals" in signal_sql
+        assert "ON CONFLICT (domain) DO UPDATE" in signal_sql
+        assert "scanned_at = now()" in signal_sql
+        assert "INSERT INTO lead_scores" in score_sql
+        assert "updated_at = now()" in score_sql
+        # Rows written in domain order (stable lock order across batches)
+        params = _compile(db.execute.call_args_list[0]).params
+        assert params["domain_m0"] == "a.com"
+        assert params["domain_m1"] == "b.com"
+        db.commit.assert_not_called()
+        # Read model refreshed for the written domains (same transaction)
+        assert mock_refresh.call_args.args[:2] == (db, {"a.com", "b.com"})
+        # Dashboard buckets: a.com moved Migration/80 -> Cold/1, b.com is new
+        assert mock_load.call_args.args[1] == ["a.com", "b.com"]
+        assert mock_apply.call_args.args[1] == {("Migration", 80): -1, ("Cold", 1): 2}
+
+    @patch("app.core.scan_persistence.apply_score_bucket_deltas")
+    @patch("app.core.scan_persistence.load_score_buckets", return_value={})
+    @patch("app.core.scan_persistence.refresh_lead_read_model")
+    def test_duplicates_collapsed_and_chunked(self, mock_refresh, mock_load, mock_apply):
+        """Test duplicate domains keep the last row and chunks are respected."""
+        db = MagicMock()
+        db.identity_map.values.return_value = []
+        signals = [
+            domain_signal_row("a.com", {"spf": False}, None, "success"),
+            domain_signal_row("a.com", {"spf": True}, None, "success"),
+            domain_signal_row("b.com", {}, None, "success"),
+        ]
+
+        count = upsert_scan_results(db, signals, [], chunk_size=1)
+
+        assert count == 2
+        # 2 signal chunks, no score statements
+        assert db.execute.call_count == 2
+        params = _compile(db.execute.call_args_list[0]).params
+        assert params["spf_m0"] is True
+
+    @patch("app.core.scan_persistence.apply_score_bucket_deltas")
+    @patch("app.core.scan_persistence.load_score_buckets", return_value={})
+    @patch("app.core.scan_persistence.refresh_lead_read_model")
+    def test_empty_batch(self, mock_refresh, mock_load, mock_apply):
+        """Test nothing is executed for an empty batch."""
+        db = MagicMock()
+        db.identity_map.values.return_value = []
+
+        assert upsert_scan_results(db, [], []) == 0
+        db.execute.assert_not_called()
@@ -1,15 +1,25 @@
 """Tests for single domain scanning (DNS/WHOIS analysis)."""
 
+import asyncio
+import httpx
 import pytest
-from unittest.mock import patch, MagicMock
+import dns.resolver
+from unittest.mock import patch, MagicMock, AsyncMock
 from app.core.analyzer_dns import (
     analyze_dns,
+    analyze_dns_many,
     get_mx_records,
     check_spf,
     check_dkim,
     check_dmarc,
 )
-from app.core.analyzer_whois import get_whois_info
+from app.core.analyzer_whois import (
+    close_rdap_clients,
+    get_whois_info,
+    get_whois_info_many,
+    _get_rdap_client,
+    _try_rdap,
+)
 
 
 class TestDNSAnalyzer:
@@ -108,7 +118,7 @@ class TestDNSAnalyzer:
 
         assert result == "reject"
 
-    @patch("app.core.analyzer_dns.dns.resolver.Resolver")
+    @patch("app.core.analyzer_dns.dns.asyncresolver.Resolver")
     def test_analyze_dns_success(self, mock_resolver_class):
         """Test complete DNS analysis."""
         mock_resolver = MagicMock()
@@ -118,14 +128,21 @@ class TestDNSAnalyzer:
         mock_mx = MagicMock()
         mock_mx.preference = 10
         mock_mx.exchange = "mail.example.com."
-        mock_resolver.resolve.side_effect = [
-            [mock_mx],  # MX query
-            [MagicMock(strings=[b"v=spf1 include:_spf.google.com ~all"])],  # SPF
-            [MagicMock(strings=[b"v=DKIM1; k=rsa"])],  # DKIM
-            [MagicMock(strings=[b"v=DMARC1; p=quarantine"])],  # DMARC
-        ]
+        answers = {
+            ("example.com", "MX"): [mock_mx],
+            ("example.com", "TXT"): [MagicMock(strings=[b"v=spf1 include:_spf.google.com ~all"])],
+            ("default._domainkey.example.com", "TXT"): [MagicMock(strings=[b"v=DKIM1; k=rsa"])],
+            ("_dmarc.example.com", "TXT"): [MagicMock(strings=[b"v=DMARC1; p=quarantine"])],
+        }
 
-        result = analyze_dns("example.com")
+        async def resolve(qname, rdtype):
+            if (qname, rdtype) not in answers:
+                raise dns.resolver.NXDOMAIN()
+            return answers[(qname, rdtype)]
+
+        mock_resolver.resolve = AsyncMock(side_effect=resolve)
+
+        result = analyze_dns("example.com", use_cache=False)
 
         assert result["status"] == "success"
         assert len(result["mx_records"]) > 0
@@ -133,7 +150,7 @@ class TestDNSAnalyzer:
         assert result["dkim"] is True
         assert result["dmarc_policy"] == "quarantine"
 
-    @patch("app.core.analyzer_dns.dns.resolver.Resolver")
+    @patch("app.core.analyzer_dns.dns.asyncresolver.Resolver")
     def test_analyze_dns_timeout(self, mock_resolver_class):
         """Test DNS analysis timeout handling."""
         import dns.exception
@@ -141,7 +158,7 @@ class TestDNSAnalyzer:
         mock_resolver = MagicMock()
         mock_resolver_class.return_value = mock_resolver
         # Make all DNS queries timeout (MX, SPF, DKIM, DMARC)
-        mock_resolver.resolve.side_effect = dns.exception.Timeout()
+        mock_resolver.resolve = AsyncMock(side_effect=dns.exception.Timeout())
 
         result = analyze_dns("example.com")
 
@@ -152,6 +169,48 @@ class TestDNSAnalyzer:
         assert result["mx_records"] == []
         assert result["spf"] is False
 
+    @patch("app.core.analyzer_dns.dns.asyncresolver.Resolver")
+    def test_analyze_dns_dkim_alternate_selector(self, mock_resolver_class):
+        """Test DKIM falls back to alternate selectors when default has no record."""
+        mock_resolver = MagicMock()
+        mock_resolver_class.return_value = mock_resolver
+
+        async def resolve(qname, rdtype):
+            if qname == "selector1._domainkey.example.com":
+                return [MagicMock(strings=[b"v=DKIM1; k=rsa; p=MIGf"])]
+            raise dns.resolver.NoAnswer()
+
+        mock_resolver.resolve = AsyncMock(side_effect=resolve)
+
+        result = analyze_dns("example.com", use_cache=False)
+
+        assert result["dkim"] is True
+        assert result["spf"] is False
+        assert result["dmarc_coverage"] is None
+
+    @patch("app.core.analyzer_dns.dns.asyncresolver.Resolver")
+    def test_analyze_dns_many(self, mock_resolver_class):
+        """Test batch DNS analysis returns one analyze_dns-shaped result per domain."""
+        mock_resolver = MagicMock()
+        mock_resolver_class.return_value = mock_resolver
+
+        async def resolve(qname, rdtype):
+            if qname == "_dmarc.a.com":
+                return [MagicMock(strings=[b"v=DMARC1; p=reject; pct=50"])]
+            raise dns.resolver.NXDOMAIN()
+
+        mock_resolver.resolve = AsyncMock(side_effect=resolve)
+
+        results = analyze_dns_many(["a.com", "b.com", "a.com"], use_cache=False)
+
+        assert list(results.keys()) == ["a.com", "b.com"]
+        assert results["a.com"]["dmarc_policy"] == "reject"
+        assert results["a.com"]["dmarc_coverage"] == 50
+        assert results["b.com"]["dmarc_policy"] is None
+        assert set(results["b.com"].keys()) == set(results["a.com"].keys())
+        # Single resolver shared by the whole batch
+        assert mock_resolver_class.call_count == 1
+
 
 class TestWHOISAnalyzer:
     """Test WHOIS analysis functions."""
@@ -236,6 +295,120 @@ class TestWHOISAnalyzer:
         assert result is None
 
 
+def _rdap_payload(registrar):
+    return {
+        "entities": [
+            {"roles": ["registrar"], "vcardArray": ["vcard", [["fn", {}, "text", registrar]]]}
+        ],
+        "events": [{"eventAction": "expiration", "eventDate": "2030-01-31T00:00:00Z"}],
+        "nameservers": [{"ldhName": "NS1.EXAMPLE.NET."}],
+    }
+
+
+def _mock_rdap_kwargs(handler):
+    """Client settings routing RDAP requests to a MockTransport handler."""
+    return lambda: {"timeout": 3, "transport": httpx.MockTransport(handler)}
+
+
+class TestRDAPClientPool:
+    """Test pooled RDAP clients and batch WHOIS lookups."""
+
+    def setup_method(self):
+        close_rdap_clients()
+
+    def teardown_method(self):
+        close_rdap_clients()
+
+    def test_try_rdap_reuses_client_per_registry(self):
+        """Test sync lookups share one keep-alive client per RDAP base URL."""
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.host)
+            return httpx.Response(200, json=_rdap_payload("Registrar " + request.url.host))
+
+        with patch("app.core.analyzer_whois._rdap_client_kwargs", _mock_rdap_kwargs(handler)):
+            first = _try_rdap("a.com")
+            _try_rdap("b.com")
+            _try_rdap("c.org")
+
+            assert _get_rdap_client("https://rdap.verisign.com/com/v1/domain/") is _get_rdap_client(
+                "https://rdap.verisign.com/com/v1/domain/"
+            )
+
+        assert first["registrar"] == "Registrar rdap.verisign.com"
+        assert first["nameservers"] == ["ns1.example.net"]
+        assert str(first["expires_at"]) == "2030-01-31"
+        assert requested == ["rdap.verisign.com", "rdap.verisign.com", "rdap.org.org"]
+        from app.core import analyzer_whois
+
+        assert len(analyzer_whois._rdap_clients) == 2
+
+    @patch("app.core.analyzer_whois._try_whois")
+    def test_get_whois_info_many_dedupes_and_falls_back(self, mock_whois):
+        """Test batch lookups query each domain once and fall back to WHOIS."""
+        mock_whois.return_value = ({"registrar": "Fallback", "expires_at": None, "nameservers": None}, True)
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.path)
+            if request.url.path.endswith("/missing.com"):
+                return httpx.Response(404)
+            return httpx.Response(200, json=_rdap_payload("RDAP"))
+
+        with patch("app.core.analyzer_whois._rdap_client_kwargs", _mock_rdap_kwargs(handler)):
+            results = get_whois_info_many(
+                ["a.com", "missing.com", "a.com", "example.zz"], use_cache=False
+            )
+
+        assert list(results.keys()) == ["a.com", "missing.com", "example.zz"]
+        assert results["a.com"]["registrar"] == "RDAP"
+        assert results["missing.com"]["registrar"] == "Fallback"
+        assert results["example.zz"]["registrar"] == "Fallback"
+        assert sorted(requested) == ["/com/v1/domain/a.com", "/com/v1/domain/missing.com"]
+        # Unknown TLD (no RDAP server) and RDAP 404 both fall back to WHOIS
+        assert sorted(call.args[0] for call in mock_whois.call_args_list) == ["example.zz", "missing.com"]
+
+    @patch("app.core.analyzer_whois.RDAP_MIN_INTERVAL_PER_REGISTRY", 0)
+    @patch("app.core.analyzer_whois.RDAP_MAX_CONCURRENCY_PER_REGISTRY", 2)
+    def test_get_whois_info_many_caps_registry_concurrency(self):
+        """Test in-flight requests per registry never exceed the cap."""
+        in_flight = {"now": 0, "max": 0}
+
+        async def handler(request):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return httpx.Response(200, json=_rdap_payload("RDAP"))
+
+        domains = [f"d{i}.com" for i in range(8)]
+        with patch("app.core.analyzer_whois._rdap_client_kwargs", _mock_rdap_kwargs(handler)):
+            results = get_whois_info_many(domains, use_cache=False, max_concurrency=8)
+
+        assert all(results[domain]["registrar"] == "RDAP" for domain in domains)
+        assert in_flight["max"] == 2
+
+    @patch("app.core.analyzer_whois._set_cache")
+    @patch("app.core.analyzer_whois._check_cache")
+    def test_get_whois_info_many_uses_cache(self, mock_check, mock_set):
+        """Test cached domains skip RDAP and fresh results are cached."""
+        cached = {"registrar": "Cached", "expires_at": None, "nameservers": None}
+        mock_check.side_effect = lambda domain: cached if domain == "a.com" else None
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.path)
+            return httpx.Response(200, json=_rdap_payload("RDAP"))
+
+        with patch("app.core.analyzer_whois._rdap_client_kwargs", _mock_rdap_kwargs(handler)):
+            results = get_whois_info_many(["a.com", "b.com"])
+
+        assert results["a.com"] is cached
+        assert requested == ["/com/v1/domain/b.com"]
+        mock_set.assert_called_once_with("b.com", results["b.com"])
+
+
 class TestAnalyzerEdgeCases:
     """Test edge cases for analyzers."""
 
@@ -247,14 +420,14 @@ class TestAnalyzerEdgeCases:
         assert "status" in result
         assert result["mx_records"] == []
 
-    @patch("app.core.analyzer_dns.dns.resolver.Resolver")
+    @patch("app.core.analyzer_dns.dns.asyncresolver.Resolver")
     def test_analyze_dns_empty_mx(self, mock_resolver_class):
         """Test DNS analysis when no MX records found."""
         import dns.resolver
 
         mock_resolver = MagicMock()
         mock_resolver_class.return_value = mock_resolver
-        mock_resolver.resolve.side_effect = dns.resolver.NoAnswer()
+        mock_resolver.resolve = AsyncMock(side_effect=dns.resolver.NoAnswer())
 
         result = analyze_dns("example.com")
 
@@ -8,7 +8,12 @@ from app.core.scorer import (
     load_rules,
     check_hard_fail,
 )
-from app.core.provider_map import classify_provider, load_providers
+from app.core.provider_map import (
+    classify_local_provider,
+    classify_many,
+    classify_provider,
+    load_providers,
+)
 
 
 class TestScoringRules:
@@ -205,6 +210,40 @@ class TestProviderMapping:
         # Should be Local if not matching any known provider
         assert provider in ["Local", "Unknown"]
 
+    def test_classify_provider_label_boundaries(self):
+        """Test roots match whole labels only (subdomains yes, lookalikes no)."""
+        assert classify_provider("MX1.Mail.Protection.Outlook.com.") == "M365"
+        assert classify_provider("outlook.com") == "M365"
+        assert classify_provider("mail.outlook.com-mx.example.net") == "Local"
+        assert classify_provider("notgoogle.com") == "Local"
+
+    def test_classify_many(self):
+        """Test batch classification de-duplicates inputs."""
+        result = classify_many(["aspmx.l.google.com", None, "mail.example.com", "aspmx.l.google.com"])
+
+        assert result == {
+            "aspmx.l.google.com": "Google",
+            None: "Unknown",
+            "mail.example.com": "Local",
+        }
+
+    def test_classify_local_provider(self):
+        """Test local hosting provider lookup."""
+        assert classify_local_provider("mail.natro.com") == "Natro"
+        assert classify_local_provider("mx.mail.natro.com") == "Natro"
+        assert classify_local_provider("mail.example.com") is None
+        assert classify_local_provider(None) is None
+
+    def test_classify_local_provider_label_aligned(self):
+        """Test local provider domains match whole labels, not substrings."""
+        assert classify_local_provider("natro.com") == "Natro"
+        assert classify_local_provider("mx.turkhost.com.tr") == "TürkHost"
+        assert classify_local_provider("mail.natro.com.example.net") == "Natro"
+        # Substring-only hits (matched before the label index) no longer match
+        assert classify_local_provider("mail.mynatro.com") is None
+        assert classify_local_provider("mx.cloudns.com") is None
+        assert classify_local_provider("mail.natro.community") is None
+
 
 class TestScorerEdgeCases:
     """Test edge cases for scorer."""
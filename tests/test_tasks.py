@@ -3,13 +3,15 @@
 import pytest
 from unittest.mock import patch, MagicMock, Mock
 from sqlalchemy.orm import Session
-from app.db.models import Company, DomainSignal, LeadScore, Alert
+from datetime import datetime, timezone
+from app.db.models import Company, DomainSignal, LeadScore, Alert, RescanRun
 from app.db.session import SessionLocal
 from app.core.progress_tracker import get_progress_tracker
 from app.core.tasks import (
     bulk_scan_task,
     process_pending_alerts_task,
     daily_rescan_task,
+    rescan_chunk_task,
     scan_single_domain,
 )
 
@@ -74,8 +76,8 @@ class TestBulkScanTask:
         mock_task = MagicMock()
         mock_task.request = MagicMock()
 
-        with patch("app.core.tasks.rescan_domain") as mock_rescan:
-            mock_rescan.return_value = {
+        with patch("app.core.rescan.rescan_domains") as mock_rescan:
+            mock_rescan.return_value = [{
                 "success": True,
                 "domain": test_domain_with_signal,
                 "result": {
@@ -87,13 +89,14 @@ class TestBulkScanTask:
                 "signal_changes": 1,
                 "score_changes": 0,
                 "alerts_created": 1,
-            }
+            }]
 
             # Call task directly (not as Celery task)
             bulk_scan_task(mock_task, job_id, is_rescan=True)
 
-            # Verify rescan was called
-            mock_rescan.assert_called_once_with(test_domain_with_signal, db)
+            # Verify rescan was called once for the batch
+            mock_rescan.assert_called_once()
+            assert mock_rescan.call_args.args[0] == [test_domain_with_signal]
 
             # Verify job status
             job = tracker.get_job(job_id)
@@ -112,22 +115,25 @@ class TestBulkScanTask:
         mock_task = MagicMock()
         mock_task.request = MagicMock()
 
-        with patch("app.core.tasks.scan_single_domain") as mock_scan:
-            mock_scan.return_value = {
-                "success": True,
-                "domain": test_company.domain,
-                "result": {
+        with patch("app.core.tasks.scan_domains_concurrent") as mock_scan:
+            mock_scan.return_value = [
+                {
+                    "success": True,
                     "domain": test_company.domain,
-                    "score": 75,
-                    "segment": "Migration",
-                },
-            }
+                    "result": {
+                        "domain": test_company.domain,
+                        "score": 75,
+                        "segment": "Migration",
+                    },
+                }
+            ]
 
             # Call task directly
             bulk_scan_task(mock_task, job_id, is_rescan=False)
 
-            # Verify scan was called
-            mock_scan.assert_called_once_with(test_company.domain, db)
+            # Verify the batch was scanned in one call
+            mock_scan.assert_called_once()
+            assert mock_scan.call_args.args[0] == [test_company.domain]
 
             # Verify job status
             job = tracker.get_job(job_id)
@@ -145,24 +151,10 @@ class TestBulkScanTask:
         from app.core.progress_tracker import get_progress_tracker
 
         tracker = get_progress_tracker()
-        # Create job but don't store domain list
-        job_id = "test-job-no-domains"
-        job_key = f"bulk_scan:job:{job_id}"
-        import json
-        from datetime import datetime
-
-        job_data = {
-            "job_id": job_id,
-            "status": "pending",
-            "total": 0,
-            "processed": 0,
-            "succeeded": 0,
-            "failed": 0,
-            "errors": [],
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
-        }
-        tracker.redis_client.setex(job_key, 3600, json.dumps(job_data))
+        # Create job, then drop its domain list
+        job_id = tracker.create_job(["no-domains.com"])
+        tracker.redis_client.delete(f"{tracker.job_prefix}{job_id}:domains")
+        assert tracker.get_job(job_id)["status"] == "pending"
 
         mock_task = MagicMock()
 
@@ -181,8 +173,8 @@ class TestBulkScanTask:
 
         mock_task = MagicMock()
 
-        with patch("app.core.tasks.scan_single_domain") as mock_scan:
-            mock_scan.return_value = {"success": False, "error": "Scan failed"}
+        with patch("app.core.tasks.scan_domains_concurrent") as mock_scan:
+            mock_scan.return_value = [{"success": False, "error": "Scan failed"}]
 
             bulk_scan_task(mock_task, job_id, is_rescan=False)
 
@@ -201,7 +193,7 @@ class TestBulkScanTask:
 
         mock_task = MagicMock()
 
-        with patch("app.core.tasks.scan_single_domain") as mock_scan:
+        with patch("app.core.tasks.scan_domains_concurrent") as mock_scan:
             mock_scan.side_effect = Exception("Unexpected error")
 
             # Should not raise, should handle gracefully
@@ -264,49 +256,38 @@ class TestProcessPendingAlertsTask:
 
 
 class TestDailyRescanTask:
-    """Tests for daily_rescan_task."""
-
-    def test_daily_rescan_task_no_domains(self, db: Session):
-        """Test daily_rescan_task with no domains to rescan."""
-        mock_task = MagicMock()
-
-        result = daily_rescan_task(mock_task)
+    """Tests for daily_rescan_task and rescan_chunk_task."""
 
-        assert result["status"] == "completed"
-        assert result["total"] == 0
-        assert "No domains to rescan" in result["message"]
-
-    def test_daily_rescan_task_with_domains(
-        self, db: Session, test_company, test_domain_with_signal
-    ):
-        """Test daily_rescan_task with domains to rescan."""
-        mock_task = MagicMock()
+    def test_daily_rescan_task_starts_run(self, db: Session):
+        """Test daily_rescan_task starts a run and hands it to rescan_chunk_task."""
+        with patch("app.core.tasks.rescan_chunk_task") as mock_chunk, \
+             patch("app.core.rescan_scheduler._latest_run", return_value=None):
+            result = daily_rescan_task()
 
-        with patch("app.core.tasks.bulk_scan_task") as mock_bulk_scan:
-            mock_bulk_scan.delay = MagicMock()
+        assert result["status"] == "started"
+        mock_chunk.delay.assert_called_once_with(result["run_id"])
 
-            with patch("app.core.tasks.get_progress_tracker") as mock_tracker:
-                mock_tracker_instance = MagicMock()
-                mock_tracker_instance.create_job = MagicMock(return_value="test-job-id")
-                mock_tracker.return_value = mock_tracker_instance
+    def test_rescan_chunk_task_completes_without_candidates(self, db: Session):
+        """Test a run with no stale domains is marked completed."""
+        run = RescanRun(as_of=datetime.now(timezone.utc), status="running", budget=10, processed=0)
+        db.add(run)
+        db.commit()
 
-                result = daily_rescan_task(mock_task)
+        with patch("app.core.rescan_scheduler.next_rescan_chunk", return_value=[]), \
+             patch("app.core.tasks.rescan_chunk_task.delay") as mock_delay:
+            result = rescan_chunk_task(run.id)
 
-                assert result["status"] == "completed"
-                assert result["total"] > 0
-                # Verify bulk_scan_task.delay was called
-                assert mock_bulk_scan.delay.called
+        assert result["status"] == "completed"
+        mock_delay.assert_not_called()
 
     def test_daily_rescan_task_exception(self, db: Session):
         """Test daily_rescan_task exception handling."""
-        mock_task = MagicMock()
-
-        with patch("app.core.tasks.DomainSignal") as mock_signal:
-            mock_signal.query = MagicMock()
-            mock_signal.query.distinct = MagicMock(side_effect=Exception("DB error"))
-
+        with patch(
+            "app.core.rescan_scheduler.start_or_resume_run",
+            side_effect=Exception("DB error"),
+        ):
             with pytest.raises(Exception):
-                daily_rescan_task(mock_task)
+                daily_rescan_task()
 
 
 class TestScanSingleDomain:
@@ -8,8 +8,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
 
 from app.db.models import Base, Company, DomainSignal, LeadScore
+from app.core.lead_read_model import refresh_lead_read_model
 from app.main import app
-from app.db.session import get_db
+from tests.conftest import override_db_dependencies
 
 # Test database URL
 TEST_DATABASE_URL = os.getenv(
@@ -85,7 +86,7 @@ def client(db_session):
         finally:
             pass
 
-    app.dependency_overrides[get_db] = override_get_db
+    override_db_dependencies(app, override_get_db)
     test_client = TestClient(app)
     yield test_client
     app.dependency_overrides.clear()
@@ -142,6 +143,8 @@ def test_leads(db_session):
         db_session.add(lead_score)
 
     db_session.commit()
+    refresh_lead_read_model(db_session, [domain for domain, *_ in test_domains])
+    db_session.commit()
 
     return test_domains
 
@@ -410,3 +413,55 @@ class TestCombinedFeatures:
         ]
         assert scores == sorted(scores, reverse=True)
 
+
+
+class TestKeysetPagination:
+    """Test keyset (cursor) pagination of GET /leads."""
+
+    def test_cursor_pages_cover_all_leads(self, client, test_leads):
+        """Following next_cursor returns every lead exactly once, in order."""
+        first = client.get("/leads?sort_by=readiness_score&sort_order=desc&page_size=3")
+        assert first.status_code == 200
+        data = first.json()
+        domains = [lead["domain"] for lead in data["leads"]]
+        scores = [lead["readiness_score"] for lead in data["leads"]]
+
+        cursor = data["next_cursor"]
+        while cursor:
+            response = client.get(
+                f"/leads?sort_by=readiness_score&sort_order=desc&page_size=3&cursor={cursor}"
+            )
+            assert response.status_code == 200
+            page = response.json()
+            domains.extend(lead["domain"] for lead in page["leads"])
+            scores.extend(lead["readiness_score"] for lead in page["leads"])
+            cursor = page["next_cursor"]
+
+        assert len(domains) == len(set(domains)) == data["total"]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_cursor_for_other_sort_rejected(self, client, test_leads):
+        """A cursor issued for one sort order cannot be replayed with another."""
+        response = client.get("/leads?sort_by=domain&page_size=2")
+        cursor = response.json()["next_cursor"]
+        assert cursor is not None
+
+        response = client.get(f"/leads?sort_by=provider&page_size=2&cursor={cursor}")
+        assert response.status_code == 400
+
+    def test_cursor_round_trip(self):
+        """Cursor encoding preserves sort values (datetimes as ISO strings)."""
+        from datetime import datetime, timezone
+        from app.api.leads import encode_leads_cursor, decode_leads_cursor
+
+        scanned_at = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        cursor = encode_leads_cursor("scanned_at:desc", [scanned_at, "example.com"])
+
+        assert decode_leads_cursor(cursor, "scanned_at:desc", 2) == [
+            scanned_at.isoformat(),
+            "example.com",
+        ]
+        with pytest.raises(ValueError):
+            decode_leads_cursor(cursor, "domain:asc", 2)
+        with pytest.raises(ValueError):
+            decode_leads_cursor("not-a-cursor", "scanned_at:desc", 2)
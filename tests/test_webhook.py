@@ -8,8 +8,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
 
 from app.db.models import Base, ApiKey, Company, RawLead
-from app.core.api_key_auth import hash_api_key, generate_api_key
+from app.core.api_key_auth import hash_api_key, generate_api_key, api_key_lookup_id
 from app.main import app
+from tests.conftest import override_db_dependencies
 
 # Priority: TEST_DATABASE_URL > HUNTER_DATABASE_URL > DATABASE_URL > default
 TEST_DATABASE_URL = os.getenv(
@@ -54,15 +55,13 @@ def db_session():
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with database dependency override."""
-    from app.db.session import get_db
-
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
-    app.dependency_overrides[get_db] = override_get_db
+    override_db_dependencies(app, override_get_db)
     test_client = TestClient(app)
 
     yield test_client
@@ -77,7 +76,11 @@ def api_key(db_session):
     key_hash = hash_api_key(api_key_value)
 
     api_key_record = ApiKey(
-        key_hash=key_hash, name="test-api-key", rate_limit_per_minute=60, is_active=True
+        key_hash=key_hash,
+        key_prefix=api_key_lookup_id(api_key_value),
+        name="test-api-key",
+        rate_limit_per_minute=60,
+        is_active=True,
     )
     db_session.add(api_key_record)
     db_session.commit()
@@ -230,6 +233,29 @@ def test_webhook_enrichment(client, api_key, db_session):
     assert company.linkedin_pattern is not None
 
 
+def test_webhook_legacy_api_key(client, db_session):
+    """Test that a legacy key (no lookup id, NULL key_prefix) still authenticates."""
+    api_key_value = "legacy-webhook-key-123"
+    api_key_record = ApiKey(
+        key_hash=hash_api_key(api_key_value),
+        key_prefix=None,
+        name="legacy-key",
+        rate_limit_per_minute=60,
+        is_active=True,
+    )
+    db_session.add(api_key_record)
+    db_session.commit()
+
+    response = client.post(
+        "/ingest/webhook",
+        json={"domain": "legacy-key.com", "company_name": "Legacy Inc"},
+        headers={"X-API-Key": api_key_value},
+    )
+
+    assert response.status_code == 201
+    assert response.json()["status"] == "success"
+
+
 def test_webhook_inactive_api_key(client, db_session):
     """Test that inactive API key is rejected."""
     api_key_value = generate_api_key()
@@ -237,6 +263,7 @@ def test_webhook_inactive_api_key(client, db_session):
 
     api_key_record = ApiKey(
         key_hash=key_hash,
+        key_prefix=api_key_lookup_id(api_key_value),
         name="inactive-key",
         rate_limit_per_minute=60,
         is_active=False,
@@ -0,0 +1,234 @@
+"""Tests for batch webhook ingestion (/ingest/webhook/batch)."""
+
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.main import app
+from app.db.session import get_db
+from app.db.models import ApiKey
+from app.core.api_key_auth import verify_api_key
+from app.core.merger import bulk_update_company_enrichment
+from app.core.webhook_retry import create_webhook_retries_bulk
+from app.api.ingest import _process_webhook_batch
+
+
+@pytest.fixture
+def db():
+    return MagicMock()
+
+
+@pytest.fixture
+def limiter():
+    """Per-key rate limiter that grants every requested token."""
+    limiter = MagicMock()
+    limiter.acquire_many.side_effect = lambda tokens: (tokens, 0.0)
+    with patch("app.api.ingest.get_api_key_limiter", return_value=limiter):
+        yield limiter
+
+
+@pytest.fixture
+def client(db, limiter):
+    """Test client with a mocked session and a fixed API key."""
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[verify_api_key] = lambda: ApiKey(id=7, name="crm", rate_limit_per_minute=60)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def bulk():
+    """Patch the set-based writers used by the batch endpoint."""
+    with patch("app.api.ingest.bulk_upsert_companies") as upsert, \
+            patch("app.api.ingest.bulk_update_company_enrichment") as enrich, \
+            patch("app.api.ingest.bulk_insert_raw_leads") as raw_leads, \
+            patch("app.api.ingest.create_webhook_retries_bulk") as retries:
+        yield {"upsert": upsert, "enrich": enrich, "raw_leads": raw_leads, "retries": retries}
+
+
+class TestWebhookBatchEndpoint:
+    """Test request parsing and per-item results."""
+
+    def test_json_array(self, client, db, bulk):
+        """Test valid leads are written in one chunk and invalid ones tracked."""
+        leads = [
+            {"domain": "https://www.Example.com", "company_name": "Example", "contact_emails": ["a@example.com"]},
+            {"domain": "not a domain"},
+            {"domain": "other.com"},
+        ]
+
+        response = client.post("/api/v1/ingest/webhook/batch", json=leads)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["status"], data["total"], data["ingested"], data["failed"]) == ("partial", 3, 2, 1)
+        assert [r["status"] for r in data["results"]] == ["success", "invalid", "success"]
+        assert data["results"][0]["domain"] == "example.com"
+        assert data["results"][0]["enriched"] is True
+        assert data["results"][2]["enriched"] is False
+
+        bulk["upsert"].assert_called_once()
+        assert [row["domain"] for row in bulk["upsert"].call_args.args[1]] == ["example.com", "other.com"]
+        assert [row["domain"] for row in bulk["enrich"].call_args.args[1]] == ["example.com"]
+        raw_leads = bulk["raw_leads"].call_args.args[1]
+        assert raw_leads[0]["payload"]["original_domain"] == "https://www.Example.com"
+        assert raw_leads[0]["payload"]["api_key_id"] == 7
+
+        retries = bulk["retries"].call_args.args[1]
+        assert len(retries) == 1
+        assert retries[0]["max_retries"] == 0
+        assert retries[0]["payload"] == {"domain": "not a domain"}
+        # One commit for the chunk, one for the retry records
+        assert db.commit.call_count == 2
+
+    def test_ndjson_stream(self, client, bulk):
+        """Test NDJSON bodies are parsed per line, bad lines become invalid items."""
+        body = "\n".join([json.dumps({"domain": "a.com"}), "{broken", "", json.dumps({"domain": "b.com"})])
+
+        response = client.post(
+            "/api/v1/ingest/webhook/batch",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        data = response.json()
+        assert [r["status"] for r in data["results"]] == ["success", "invalid", "success"]
+        assert data["results"][1]["error"].startswith("Invalid JSON line")
+        assert bulk["retries"].call_args.args[1][0]["payload"] == {"raw": "{broken"}
+
+    def test_legacy_path(self, client, bulk):
+        """Test the unversioned route and the {"leads": [...]} envelope."""
+        response = client.post("/ingest/webhook/batch", json={"leads": [{"domain": "a.com"}]})
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "success"
+        bulk["retries"].assert_not_called()
+
+    def test_not_an_array(self, client, bulk):
+        """Test a single object body is rejected."""
+        response = client.post("/api/v1/ingest/webhook/batch", json={"domain": "a.com"})
+
+        assert response.status_code == 400
+        bulk["upsert"].assert_not_called()
+
+    def test_batch_too_large(self, client, bulk):
+        """Test batches over the limit are rejected before any write."""
+        with patch("app.api.ingest.WEBHOOK_BATCH_MAX_ITEMS", 2):
+            response = client.post(
+                "/api/v1/ingest/webhook/batch",
+                json=[{"domain": f"d{i}.com"} for i in range(3)],
+            )
+
+        assert response.status_code == 413
+        bulk["upsert"].assert_not_called()
+
+    def test_body_too_large(self, client, bulk):
+        """Test oversized bodies are rejected by Content-Length and while streaming."""
+        with patch("app.api.ingest.WEBHOOK_BATCH_MAX_BYTES", 64):
+            declared = client.post("/api/v1/ingest/webhook/batch", json=[{"domain": f"d{i}.com"} for i in range(10)])
+            streamed = client.post(
+                "/api/v1/ingest/webhook/batch",
+                content=(json.dumps({"domain": f"d{i}.com"}).encode() + b"\n" for i in range(10)),
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+
+        assert declared.status_code == 413
+        assert streamed.status_code == 413
+        assert "Request body too large" in streamed.json()["detail"]
+        bulk["upsert"].assert_not_called()
+
+    def test_charged_per_lead(self, client, limiter, bulk):
+        """Test a batch costs one rate-limit token per lead (one already taken by auth)."""
+        response = client.post("/api/v1/ingest/webhook/batch", json=[{"domain": f"d{i}.com"} for i in range(5)])
+
+        assert response.status_code == 200
+        limiter.acquire_many.assert_called_once_with(4)
+
+    def test_rate_limited(self, client, limiter, bulk):
+        """Test a batch larger than the remaining budget is rejected before any write."""
+        limiter.acquire_many.side_effect = lambda tokens: (2, 1.0)
+
+        response = client.post("/api/v1/ingest/webhook/batch", json=[{"domain": f"d{i}.com"} for i in range(5)])
+
+        assert response.status_code == 429
+        assert "leads per minute" in response.json()["detail"]
+        bulk["upsert"].assert_not_called()
+
+
+class TestProcessWebhookBatch:
+    """Test chunked writes and failure routing."""
+
+    def test_chunks_committed_separately(self, db, bulk):
+        """Test each chunk is one upsert, one raw_lead insert and one commit."""
+        items = [({"domain": f"d{i}.com"}, None) for i in range(5)]
+
+        results = _process_webhook_batch(items, 7, "crm", db, chunk_size=2)
+
+        assert all(result.status == "success" for result in results)
+        assert bulk["upsert"].call_count == 3
+        assert bulk["raw_leads"].call_count == 3
+        assert db.commit.call_count == 3
+
+    def test_failed_chunk_routed_to_retries(self, db, bulk):
+        """Test a failing chunk is rolled back and its leads queued for retry."""
+        bulk["raw_leads"].side_effect = [None, RuntimeError("boom")]
+        items = [({"domain": f"d{i}.com"}, None) for i in range(4)]
+
+        results = _process_webhook_batch(items, 7, "crm", db, chunk_size=2)
+
+        assert [result.status for result in results] == ["success", "success", "failed", "failed"]
+        assert "boom" in results[2].error
+        db.rollback.assert_called_once()
+        retries = bulk["retries"].call_args.args[1]
+        assert [retry["domain"] for retry in retries] == ["d2.com", "d3.com"]
+        assert all("max_retries" not in retry for retry in retries)
+
+
+class TestBulkWriters:
+    """Test the set-based statements behind the batch endpoint."""
+
+    def test_bulk_update_company_enrichment(self):
+        """Test enrichment is one executemany UPDATE, last row per domain wins."""
+        db = MagicMock()
+        rows = [
+            {"domain": "a.com", "contact_emails": ["x@a.com"], "contact_quality_score": 10, "linkedin_pattern": None},
+            {"domain": "a.com", "contact_emails": ["y@a.com"], "contact_quality_score": 20, "linkedin_pattern": "first.last"},
+        ]
+
+        with patch("app.core.merger.refresh_lead_read_model") as mock_refresh:
+            assert bulk_update_company_enrichment(db, rows) == 1
+
+        stmt, params = db.execute.call_args.args
+        assert "UPDATE companies SET contact_emails" in str(stmt.compile(dialect=postgresql.dialect()))
+        assert params == [
+            {
+                "b_domain": "a.com",
+                "b_contact_emails": ["y@a.com"],
+                "b_contact_quality_score": 20,
+                "b_linkedin_pattern": "first.last",
+            }
+        ]
+        assert mock_refresh.call_args.args[1] == ["a.com"]
+        db.commit.assert_not_called()
+
+    def test_create_webhook_retries_bulk(self):
+        """Test retries are inserted in one executemany call with defaults."""
+        db = MagicMock()
+
+        count = create_webhook_retries_bulk(
+            db,
+            [
+                {"api_key_id": 7, "payload": {"domain": "a.com"}, "domain": "a.com"},
+                {"api_key_id": 7, "payload": {"raw": "x"}, "domain": None, "max_retries": 0},
+            ],
+        )
+
+        assert count == 2
+        assert db.execute.call_count == 1
+        rows = db.execute.call_args.args[1]
+        assert [row["max_retries"] for row in rows] == [3, 0]
+        assert {row["status"] for row in rows} == {"pending"}
+        assert {row["retry_count"] for row in rows} == {0}
+        db.commit.assert_not_called()